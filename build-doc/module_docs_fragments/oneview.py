@@ -46,6 +46,77 @@ options:
         choices: ['true', 'false']
 '''
 
+    BATCH = '''
+options:
+    items:
+        description:
+            - List of resources to manage in a single task, as an alternative to C(data). Each item has the C(data) of
+              a resource and optionally its C(state), C(present) or C(absent), which defaults to the module C(state).
+            - All the resources are retrieved once and the changes are applied in parallel, limited by
+              C(max_concurrency).
+        required: false
+'''
+
+    CONCURRENCY = '''
+options:
+    max_concurrency:
+        description:
+            - Maximum number of requests sent at the same time by the parts of the task that run concurrently, as
+              described in the other options of the module.
+        default: 8
+        required: false
+'''
+
+    STREAM = '''
+options:
+    stream_to:
+        description:
+            - Path of a local file where the collection is written as newline-delimited JSON, one resource per line,
+              instead of returning it in the facts. The collection is requested page by page, so the memory used does
+              not grow with its size. The facts only have a manifest with the C(path), C(count) and C(checksum)
+              (SHA-256) of the file.
+        required: false
+    page_size:
+        description:
+            - Number of resources requested per page when C(stream_to) is set.
+        default: 500
+        required: false
+'''
+
+    SNAPSHOT = '''
+options:
+    snapshot_dir:
+        description:
+            - Directory of a local snapshot of the collection, refreshed incrementally. Each run only requests the
+              resources modified since the previous one and the URIs of the collection, which drop the deleted
+              resources, so the facts are the same as the ones of a full listing. The collection is fully listed
+              again after C(snapshot_ttl), and when C(start) or C(count) are set.
+        required: false
+    snapshot_ttl:
+        description:
+            - Seconds after which the snapshot of C(snapshot_dir) expires and the collection is fully listed again.
+        default: 86400
+        required: false
+'''
+
+    TRANSFER = '''
+options:
+    chunk_size:
+        description:
+            - Size in bytes of the chunks of the file sent or received at a time. The file is streamed, with its
+              progress logged. An upload interrupted by a network error is sent again from the start with backoff,
+              and a download is resumed from the received bytes.
+        default: 1048576
+        required: false
+    checksum_dir:
+        description:
+            - Directory of a local ledger of the transferred files. When set, an upload is skipped while the appliance
+              still has the resource created by a previous upload of a file with the same SHA-256 checksum, and a
+              download is skipped while the destination is unchanged since it was downloaded from the same version
+              of the resource. An interrupted download is resumed on the next run.
+        required: false
+'''
+
     FACTSPARAMS = '''
 options:
     params:
@@ -58,3 +129,13 @@ options:
             C(sort): The sort order of the returned data set."
         required: false
 '''
+
+    FACTSFIELDS = '''
+options:
+    fields:
+        description:
+            - List of top-level attributes returned for each resource of the collection, validated against the known
+              attributes of the resource. They are requested as a server side projection when the API supports one,
+              and the other attributes are removed from the response otherwise.
+        required: false
+'''
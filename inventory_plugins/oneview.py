@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+name: oneview
+plugin_type: inventory
+short_description: HPE OneView server hardware inventory source.
+description:
+    - Builds an inventory with the server hardware of a OneView appliance, grouped by enclosure, scope, server
+      hardware type and server profile template.
+    - The server hardware, server profiles, enclosures, scopes and the other collections are listed in parallel,
+      requesting only the attributes used by the inventory.
+    - Uses a YAML configuration file that ends with C(oneview.yml) or C(oneview.yaml).
+requirements:
+    - "python >= 3.6.9"
+    - "hpeOneView >= 6.1.0"
+options:
+    plugin:
+        description: Token that ensures this is a source file for the C(oneview) plugin.
+        required: true
+        choices: ['oneview']
+    config:
+        description:
+            - Path to a .json configuration file containing the OneView client configuration.
+              When neither it nor C(hostname) are set, the configuration is read from the environment variables.
+        type: path
+    hostname:
+        description: IP address or hostname for the appliance.
+        type: str
+    username:
+        description: Username for API authentication.
+        type: str
+    password:
+        description: Password for API authentication.
+        type: str
+    auth_login_domain:
+        description: Authentication login domain.
+        type: str
+    api_version:
+        description: OneView API Version.
+        type: int
+    max_concurrency:
+        description: Maximum number of collections listed at the same time.
+        type: int
+        default: 8
+extends_documentation_fragment:
+    - constructed
+    - inventory_cache
+'''
+
+EXAMPLES = '''
+# oneview.yml
+plugin: oneview
+config: /etc/ansible/oneview_config.json
+cache: true
+cache_plugin: jsonfile
+cache_connection: ~/.ansible/oneview_inventory_cache
+cache_timeout: 600
+keyed_groups:
+  - key: oneview_power_state
+    prefix: power
+'''
+
+import os
+import sys
+from functools import partial
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_native
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+try:
+    from ansible.module_utils.oneview import (OneViewModuleException, create_oneview_client, get_all_projected,
+                                              run_concurrently, HAS_HPE_ONEVIEW)
+except ImportError:
+    # the module_utils of this repository are not shipped to the controller plugins, load them from the library
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library'))
+    from module_utils.oneview import (OneViewModuleException, create_oneview_client, get_all_projected,
+                                      run_concurrently, HAS_HPE_ONEVIEW)
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = 'oneview'
+
+    CONNECTION_OPTIONS = ('config', 'hostname', 'username', 'password', 'auth_login_domain', 'api_version')
+
+    # collection: (OneViewClient attribute, fields used by the inventory, get_all params)
+    COLLECTIONS = dict(
+        server_hardware=('server_hardware', ['uri', 'name', 'serverName', 'serialNumber', 'model', 'powerState',
+                                             'status', 'locationUri', 'serverHardwareTypeUri', 'serverProfileUri'], {}),
+        server_profiles=('server_profiles', ['uri', 'name', 'serverProfileTemplateUri'], {}),
+        server_profile_templates=('server_profile_templates', ['uri', 'name'], {}),
+        server_hardware_types=('server_hardware_types', ['uri', 'name'], {}),
+        enclosures=('enclosures', ['uri', 'name'], {}),
+        scopes=('scopes', ['uri', 'name'], {}),
+        # the scopes of the server hardware are only listed by the index
+        server_hardware_scopes=('index_resources', ['uri', 'scopeUris'], dict(category='server-hardware')),
+    )
+
+    def verify_file(self, path):
+        return super(InventoryModule, self).verify_file(path) and path.endswith(('oneview.yml', 'oneview.yaml'))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option('cache')
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        collections = None
+        if attempt_to_read_cache:
+            try:
+                collections = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if collections is None:
+            collections = self._fetch_collections()
+        if cache_needs_update:
+            self._cache[cache_key] = collections
+
+        self._populate(collections)
+
+    def _fetch_collections(self):
+        if not HAS_HPE_ONEVIEW:
+            raise AnsibleError('The hpeOneView Python SDK is required for this plugin.')
+
+        params = dict((option, self.get_option(option)) for option in self.CONNECTION_OPTIONS)
+        try:
+            oneview_client = create_oneview_client(params)
+            calls = [(collection, partial(get_all_projected, getattr(oneview_client, client_attribute), fields,
+                                          **get_all_params))
+                     for collection, (client_attribute, fields, get_all_params) in sorted(self.COLLECTIONS.items())]
+            return dict(run_concurrently(calls, self.get_option('max_concurrency')))
+        except OneViewModuleException as exception:
+            raise AnsibleError(to_native(exception))
+
+    def _add_to_group(self, prefix, name, host):
+        if name:
+            group = self.inventory.add_group(self._sanitize_group_name('{0}_{1}'.format(prefix, name)))
+            self.inventory.add_child(group, host)
+
+    def _populate(self, collections):
+        def names_by_uri(collection):
+            return dict((resource['uri'], resource.get('name')) for resource in collections.get(collection) or [])
+
+        enclosures = names_by_uri('enclosures')
+        hardware_types = names_by_uri('server_hardware_types')
+        templates = names_by_uri('server_profile_templates')
+        scopes = names_by_uri('scopes')
+        profiles = dict((profile['uri'], profile) for profile in collections.get('server_profiles') or [])
+        server_scopes = dict((resource['uri'], resource.get('scopeUris') or [])
+                             for resource in collections.get('server_hardware_scopes') or [])
+        strict = self.get_option('strict')
+
+        for server in collections.get('server_hardware') or []:
+            host = server['name']
+            self.inventory.add_host(host)
+
+            profile = profiles.get(server.get('serverProfileUri')) or {}
+            variables = dict(
+                oneview_uri=server['uri'],
+                oneview_server_name=server.get('serverName'),
+                oneview_serial_number=server.get('serialNumber'),
+                oneview_model=server.get('model'),
+                oneview_power_state=server.get('powerState'),
+                oneview_status=server.get('status'),
+                oneview_enclosure=enclosures.get(server.get('locationUri')),
+                oneview_server_hardware_type=hardware_types.get(server.get('serverHardwareTypeUri')),
+                oneview_server_profile=profile.get('name'),
+                oneview_server_profile_template=templates.get(profile.get('serverProfileTemplateUri')),
+                oneview_scopes=[scopes[uri] for uri in server_scopes.get(server['uri'], []) if uri in scopes],
+            )
+            for name, value in variables.items():
+                self.inventory.set_variable(host, name, value)
+
+            self._add_to_group('enclosure', variables['oneview_enclosure'], host)
+            self._add_to_group('server_hardware_type', variables['oneview_server_hardware_type'], host)
+            self._add_to_group('server_profile_template', variables['oneview_server_profile_template'], host)
+            for scope in variables['oneview_scopes']:
+                self._add_to_group('scope', scope, host)
+
+            self._set_composite_vars(self.get_option('compose'), variables, host, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), variables, host, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), variables, host, strict=strict)
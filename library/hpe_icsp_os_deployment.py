@@ -100,10 +100,15 @@ from future import standard_library
 
 standard_library.install_aliases()
 
-import time
 import hpICsp
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.icsp import ICspHelper
+from ansible.module_utils.oneview import OneViewWaiter, OneViewModuleTimeoutError
+
+# Seconds waited for the server to be registered in ICsp, polling with exponential backoff
+SERVER_TIMEOUT = 600
+SERVER_POLL_INITIAL_DELAY = 5
+SERVER_POLL_MAX_DELAY = 30
 
 
 def deploy_server(module):
@@ -139,19 +144,18 @@ def deploy_server(module):
     if bp is None:
         return module.fail_json(msg='Cannot find OS Build plan: ' + os_build_plan)
 
-    timeout = 600
-    while True:
+    def get_server():
         if ilo_address:
-            server = icsphelper.get_server_by_ilo_address(ilo_address)
-        else:
-            server = icsphelper.get_server_by_serial(server_id)
-        if server:
-            break
-        if timeout < 0:
-            module.fail_json(msg='Cannot find server in ICSP.')
-            return
-        timeout -= 30
-        time.sleep(30)
+            return icsphelper.get_server_by_ilo_address(ilo_address)
+        return icsphelper.get_server_by_serial(server_id)
+
+    waiter = OneViewWaiter(timeout=SERVER_TIMEOUT, initial_delay=SERVER_POLL_INITIAL_DELAY,
+                           max_delay=SERVER_POLL_MAX_DELAY)
+    try:
+        server = waiter.until(get_server, 'the server')
+    except OneViewModuleTimeoutError:
+        module.fail_json(msg='Cannot find server in ICSP.')
+        return
 
     server = sv.get_server(server['uri'])
     if server['state'] == 'OK':
@@ -52,9 +52,19 @@ options:
       description:
         - List with Artifact Bundle properties and its associated states.
       required: true
+    image_streamer_hostnames:
+      description:
+        - Image Streamer appliances the C(localArtifactBundleFilePath) file is uploaded to on state C(present),
+          instead of the C(image_streamer_hostname) of the configuration. The file is read once and uploaded to the
+          appliances without the Artifact Bundle concurrently, up to C(max_concurrency) at the same time, and the
+          status of each of them is returned. Only supported on state C(present).
+      type: list
+      required: false
 
 extends_documentation_fragment:
     - oneview
+    - oneview.transfer
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -88,6 +98,16 @@ EXAMPLES = '''
       destinationFilePath: '~/downloaded_archive.zip'
   delegate_to: localhost
 
+- name: Download the backup archive only when it changed, resuming interrupted downloads
+  image_streamer_artifact_bundle:
+    config: "{{ config }}"
+    state: archive_download
+    checksum_dir: ~/.ansible/oneview_transfers
+    data:
+      destinationFilePath: '/backups/artifact_bundles.zip'
+  delegate_to: localhost
+- debug: var=artifact_bundle_download
+
 - name: Upload an Artifact Bundle
   image_streamer_artifact_bundle:
     config: "{{ config }}"
@@ -96,6 +116,31 @@ EXAMPLES = '''
       localArtifactBundleFilePath: '~/uploaded_artifact.zip'
   delegate_to: localhost
 
+- name: Upload an Artifact Bundle to several Image Streamer appliances, four at a time
+  image_streamer_artifact_bundle:
+    config: "{{ config }}"
+    state: present
+    image_streamer_hostnames:
+      - 172.16.101.190
+      - 172.16.101.191
+      - 172.16.101.192
+    max_concurrency: 4
+    data:
+      localArtifactBundleFilePath: '~/uploaded_artifact.zip'
+  delegate_to: localhost
+- debug: var=artifact_bundle_distribution
+
+- name: Upload an Artifact Bundle only once, in chunks of 8 MB
+  image_streamer_artifact_bundle:
+    config: "{{ config }}"
+    state: present
+    chunk_size: 8388608
+    checksum_dir: ~/.ansible/oneview_uploads
+    data:
+      localArtifactBundleFilePath: '~/uploaded_artifact.zip'
+  delegate_to: localhost
+- debug: var=artifact_bundle_upload
+
 - name: Upload Backup an Artifact Bundle
   image_streamer_artifact_bundle:
     config: "{{ config }}"
@@ -157,9 +202,33 @@ artifact_bundle_deployment_group:
     description: Has the OneView facts about the Deployment Group.
     returned: On state 'backup_extract', 'backup_upload', and 'backup_create'.
     type: dict
+
+artifact_bundle_download:
+    description: The C(path), C(size) and C(checksum) of the downloaded file, the number of C(transfers), the byte
+                 the last transfer C(resumed_from) and whether the download was C(skipped).
+    returned: On state 'download' and 'archive_download'.
+    type: dict
+
+artifact_bundle_distribution:
+    description: The C(name), C(status) (C(uploaded) or C(present)), C(uri), number of C(transfers), duration in
+                 C(seconds) and throughput in C(bytes_per_second) of the upload to each of the
+                 C(image_streamer_hostnames).
+    returned: On state 'present', when image_streamer_hostnames is set.
+    type: list
+
+artifact_bundle_upload:
+    description: The C(path), C(size) and C(checksum) of the uploaded file, the number of C(transfers) and whether the
+                 upload was C(skipped).
+    returned: When a file is uploaded, on state 'present' and 'backup_upload'.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, compare
+from collections import OrderedDict
+from functools import partial
+
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError,
+                                          OneViewModuleConcurrentCallsError, OneViewFileUpload, OneViewFileDownload,
+                                          OneViewFileDistribution, create_image_streamer_client, compare)
 
 
 class ArtifactBundleModule(OneViewModule):
@@ -172,11 +241,15 @@ class ArtifactBundleModule(OneViewModule):
     MSG_UPLOADED = 'Artifact Bundle uploaded successfully.'
     MSG_BACKUP_UPLOADED = 'Backup for Artifact Bundle uploaded successfully.'
     MSG_ARCHIVE_DOWNLOADED = 'Archive of Artifact Bundle downloaded successfully.'
+    MSG_ALREADY_DOWNLOADED = 'Artifact Bundle is already downloaded.'
     MSG_BACKUP_CREATED = 'Backup of Artifact Bundle created successfully.'
     MSG_EXTRACTED = 'Artifact Bundle extracted successfully.'
     MSG_BACKUP_EXTRACTED = 'Artifact Bundle extracted successfully.'
     MSG_REQUIRED = "An existing Artifact Bundle is required."
     MSG_BACKUP_REQUIRED = "An existing Backup is required"
+    MSG_DISTRIBUTED = 'Artifact Bundle uploaded to the Image Streamer appliances.'
+    MSG_DISTRIBUTION_STATE_NOT_SUPPORTED = 'The image_streamer_hostnames are only supported on state present.'
+    MSG_DISTRIBUTION_FILE_REQUIRED = 'The localArtifactBundleFilePath is required to upload to the image_streamer_hostnames.'
 
     argument_spec = dict(
         state=dict(
@@ -184,18 +257,27 @@ class ArtifactBundleModule(OneViewModule):
             choices=['present', 'absent', 'download', 'archive_download', 'backup_create',
                      'backup_upload', 'extract', 'backup_extract']
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        image_streamer_hostnames=dict(type='list', elements='str'),
+        **dict(OneViewModule.ONEVIEW_TRANSFER_ARGS, **OneViewModule.ONEVIEW_CONCURRENCY_ARGS)
     )
 
     def __init__(self):
         super(ArtifactBundleModule, self).__init__(additional_arg_spec=self.argument_spec)
-        self.i3s_client = self.oneview_client.create_image_streamer_client()
-        self.set_resource_object(self.i3s_client.artifact_bundles)
+        self.image_streamer_hostnames = self.module.params.get('image_streamer_hostnames')
+        if self.image_streamer_hostnames:
+            self.i3s_clients = OrderedDict((hostname, create_image_streamer_client(self.oneview_client, hostname))
+                                           for hostname in self.image_streamer_hostnames)
+        else:
+            self.i3s_client = self.oneview_client.create_image_streamer_client()
+            self.set_resource_object(self.i3s_client.artifact_bundles)
 
     def execute_module(self):
         ansible_facts = {}
 
-        if self.state == 'present':
+        if self.image_streamer_hostnames:
+            changed, msg, ansible_facts = self.__distribute()
+        elif self.state == 'present':
             changed, msg, ansible_facts = self.__present()
         elif self.state == 'absent':
             return self.resource_absent()
@@ -226,8 +308,51 @@ class ArtifactBundleModule(OneViewModule):
 
     def __upload(self):
         file_name = self.data['localArtifactBundleFilePath']
-        artifact_bundle = self.resource_client.upload_bundle_from_file(file_name)
-        return True, self.MSG_UPLOADED, dict(artifact_bundle=artifact_bundle)
+        upload = self.__file_upload(file_name)
+        artifact_bundle = upload.find_uploaded(self.resource_client.URI)
+        if artifact_bundle:
+            return False, self.MSG_ALREADY_PRESENT, dict(artifact_bundle=artifact_bundle,
+                                                         artifact_bundle_upload=upload.manifest)
+
+        artifact_bundle = upload.upload(self.resource_client.URI,
+                                        partial(self.resource_client.upload_bundle_from_file, file_name))
+        return True, self.MSG_UPLOADED, dict(artifact_bundle=artifact_bundle, artifact_bundle_upload=upload.manifest)
+
+    def __distribute(self):
+        if self.state != 'present':
+            raise OneViewModuleValueError(self.MSG_DISTRIBUTION_STATE_NOT_SUPPORTED)
+        file_name = self.data.get('localArtifactBundleFilePath')
+        if not file_name:
+            raise OneViewModuleValueError(self.MSG_DISTRIBUTION_FILE_REQUIRED)
+
+        def upload_to(hostname, upload):
+            artifact_bundles = self.i3s_clients[hostname].artifact_bundles
+            existing = artifact_bundles.get_by_name(self.data['name']) if self.data.get('name') else None
+            if existing:
+                return False, existing.data
+            existing = upload.find_uploaded(artifact_bundles.URI)
+            if existing:
+                return False, existing
+            return True, upload.upload(artifact_bundles.URI, partial(artifact_bundles.upload_bundle_from_file, file_name))
+
+        distribution = OneViewFileDistribution(file_name, self.module.params.get('chunk_size'),
+                                               self.module.params.get('checksum_dir'),
+                                               self.module.params.get('max_concurrency'), self.module.log).distribute(
+            [(hostname, i3s_client.connection) for hostname, i3s_client in self.i3s_clients.items()], upload_to)
+
+        failed = OrderedDict((target['name'], target['msg']) for target in distribution
+                             if target['status'] == OneViewFileDistribution.STATUS_FAILED)
+        if failed:
+            raise OneViewModuleConcurrentCallsError(failed)
+
+        changed = any(target['status'] == OneViewFileDistribution.STATUS_UPLOADED for target in distribution)
+        return changed, self.MSG_DISTRIBUTED if changed else self.MSG_ALREADY_PRESENT, dict(
+            artifact_bundle_distribution=distribution)
+
+    def __file_upload(self, file_name, checksum_dir=True):
+        checksum_dir = self.module.params.get('checksum_dir') if checksum_dir else None
+        return OneViewFileUpload(self.i3s_client.connection, file_name, self.module.params.get('chunk_size'),
+                                 checksum_dir, log=self.module.log)
 
     def __create(self):
         self.current_resource = self.resource_client.create(self.data)
@@ -249,8 +374,18 @@ class ArtifactBundleModule(OneViewModule):
     def __download(self):
         if not self.current_resource:
             raise OneViewModuleResourceNotFound(self.MSG_REQUIRED)
-        self.current_resource.download(self.data['destinationFilePath'])
-        return False, self.MSG_DOWNLOADED, {}
+        return self.__download_file(self.resource_client.DOWNLOAD_PATH, self.MSG_DOWNLOADED)
+
+    def __download_file(self, path, msg):
+        resource = self.current_resource.data
+        uri = '{0}/{1}'.format(path, resource['uri'].split('/')[-1])
+        download = OneViewFileDownload(self.i3s_client.connection, uri, self.data['destinationFilePath'],
+                                       resource.get('eTag') or resource.get('modified'),
+                                       self.module.params.get('chunk_size'), self.module.params.get('checksum_dir'),
+                                       log=self.module.log)
+        if not download.download():
+            msg = self.MSG_ALREADY_DOWNLOADED
+        return not download.skipped, msg, dict(artifact_bundle_download=download.manifest)
 
     def __extract(self):
         if not self.current_resource:
@@ -268,8 +403,7 @@ class ArtifactBundleModule(OneViewModule):
             raise OneViewModuleResourceNotFound(self.MSG_BACKUP_REQUIRED)
 
         self.current_resource = self.resource_client.get_backup(self.allbackups[0]['uri'])
-        self.current_resource.download_archive(self.data['destinationFilePath'])
-        return False, self.MSG_ARCHIVE_DOWNLOADED, {}
+        return self.__download_file(self.resource_client.BACKUP_ARCHIVE_PATH, self.MSG_ARCHIVE_DOWNLOADED)
 
     def __extract_backup(self):
         self.allbackups = self.resource_client.get_all_backups()
@@ -282,9 +416,13 @@ class ArtifactBundleModule(OneViewModule):
 
     def __upload_backup(self):
         if self.data.get('localBackupArtifactBundleFilePath') and self.data.get('deploymentGroupURI'):
-            deployment_group = self.resource_client.upload_backup_bundle_from_file(
-                self.data['localBackupArtifactBundleFilePath'], self.data['deploymentGroupURI'])
-        return True, self.MSG_BACKUP_UPLOADED, dict(artifact_bundle_deployment_group=deployment_group)
+            file_name = self.data['localBackupArtifactBundleFilePath']
+            # uploading a backup restores it on the deployment group, so it is never skipped by the checksum ledger
+            upload = self.__file_upload(file_name, checksum_dir=False)
+            deployment_group = upload.upload(self.data['deploymentGroupURI'], partial(
+                self.resource_client.upload_backup_bundle_from_file, file_name, self.data['deploymentGroupURI']))
+        return True, self.MSG_BACKUP_UPLOADED, dict(artifact_bundle_deployment_group=deployment_group,
+                                                    artifact_bundle_upload=upload.manifest)
 
 
 def main():
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -120,6 +121,7 @@ class DeploymentPlanFactsModule(OneViewModule):
     def __init__(self):
         super(DeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
         self.i3s_client = self.oneview_client.create_image_streamer_client()
+        self.resource_client = self.i3s_client.deployment_plans
 
     def execute_module(self):
         name = self.module.params.get("name")
@@ -136,7 +138,7 @@ class DeploymentPlanFactsModule(OneViewModule):
                 environmental_configuration = self.i3s_client.deployment_plans.get_osdp(deployment_plan['uri'])
                 ansible_facts['deployment_plans'][0]['deployment_plan_osdp'] = environmental_configuration
         else:
-            ansible_facts['deployment_plans'] = self.i3s_client.deployment_plans.get_all(**self.facts_params)
+            ansible_facts['deployment_plans'] = self.resource_client.get_all(**self.facts_params)
 
         return dict(changed=False, ansible_facts=ansible_facts)
 
@@ -45,9 +45,19 @@ options:
         description:
             - List with Golden Image properties and its associated states.
         required: true
+    image_streamer_hostnames:
+        description:
+            - Image Streamer appliances the C(localImageFilePath) file is uploaded to on state C(present), instead of
+              the C(image_streamer_hostname) of the configuration. The file is read once and uploaded to the
+              appliances without the Golden Image concurrently, up to C(max_concurrency) at the same time, and the
+              status of each of them is returned. Only supported on state C(present).
+        type: list
+        required: false
 
 extends_documentation_fragment:
     - oneview
+    - oneview.transfer
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -92,6 +102,25 @@ EXAMPLES = '''
       newName: 'Golden Image Renamed'
   delegate_to: localhost
 
+- name: Upload a Golden Image to several Image Streamer appliances, four at a time
+  image_streamer_golden_image:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 600
+    state: present
+    image_streamer_hostnames:
+      - 172.16.101.190
+      - 172.16.101.191
+      - 172.16.101.192
+    max_concurrency: 4
+    data:
+      name: 'Demo Golden Image upload'
+      description: "Test"
+      localImageFilePath: '~/image_file.zip'
+  delegate_to: localhost
+- debug: var=golden_image_distribution
+
 - name: Download the Golden Image to the file path provided
   image_streamer_golden_image:
     hostname: 172.16.101.48
@@ -104,6 +133,20 @@ EXAMPLES = '''
       destination_file_path: '~/downloaded_image.zip'
   delegate_to: localhost
 
+- name: Download the Golden Image only when it changed, resuming interrupted downloads
+  image_streamer_golden_image:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 600
+    state: downloaded
+    checksum_dir: ~/.ansible/oneview_transfers
+    data:
+      name: 'Demo Golden Image'
+      destination_file_path: '/backups/golden_image.zip'
+  delegate_to: localhost
+- debug: var=golden_image_download
+
 - name: Download the Golden Image archive log to the file path provided
   image_streamer_golden_image:
     hostname: 172.16.101.48
@@ -133,9 +176,32 @@ golden_image:
     description: Has the OneView facts about the Golden Image.
     returned: On state 'present'.
     type: dict
+
+golden_image_download:
+    description: The C(path), C(size) and C(checksum) of the downloaded file, the number of C(transfers), the byte
+                 the last transfer C(resumed_from) and whether the download was C(skipped).
+    returned: On state 'downloaded' and 'archive_downloaded'.
+    type: dict
+
+golden_image_distribution:
+    description: The C(name), C(status) (C(uploaded) or C(present)), C(uri), number of C(transfers), duration in
+                 C(seconds) and throughput in C(bytes_per_second) of the upload to each of the
+                 C(image_streamer_hostnames).
+    returned: On state 'present', when image_streamer_hostnames is set.
+    type: list
+
+golden_image_upload:
+    description: The C(path), C(size) and C(checksum) of the uploaded file and the number of C(transfers).
+    returned: On state 'present', when the Golden Image is uploaded.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase, OneViewModuleValueError, OneViewModuleResourceNotFound, compare
+from collections import OrderedDict
+from functools import partial
+
+from ansible.module_utils.oneview import (OneViewModuleBase, OneViewModuleValueError, OneViewModuleResourceNotFound,
+                                          OneViewModuleConcurrentCallsError, OneViewFileUpload, OneViewFileDownload,
+                                          OneViewFileDistribution, create_image_streamer_client, compare)
 
 
 class GoldenImageModule(OneViewModuleBase):
@@ -146,27 +212,42 @@ class GoldenImageModule(OneViewModuleBase):
     MSG_DELETED = 'Golden Image deleted successfully.'
     MSG_DOWNLOADED = 'Golden Image downloaded successfully.'
     MSG_ARCHIVE_DOWNLOADED = 'Golden Image archive downloaded successfully.'
+    MSG_ALREADY_DOWNLOADED = 'Golden Image is already downloaded.'
     MSG_ALREADY_ABSENT = 'Golden Image is already absent.'
     MSG_WAS_NOT_FOUND = 'Golden Image was not found.'
     MSG_CANT_CREATE_AND_UPLOAD = "You can use an existent OS Volume or upload an Image, you cannot do both."
     MSG_MISSING_MANDATORY_ATTRIBUTES = 'Mandatory field is missing: osVolumeURI or localImageFilePath are required.'
     MSG_OS_VOLUME_WAS_NOT_FOUND = 'OS Volume was not found.'
     MSG_BUILD_PLAN_WAS_NOT_FOUND = 'OS Build Plan was not found.'
+    MSG_DISTRIBUTED = 'Golden Image uploaded to the Image Streamer appliances.'
+    MSG_DISTRIBUTION_STATE_NOT_SUPPORTED = 'The image_streamer_hostnames are only supported on state present.'
+    MSG_DISTRIBUTION_FILE_REQUIRED = 'The localImageFilePath is required to upload to the image_streamer_hostnames.'
 
     argument_spec = dict(
         state=dict(
             required=True,
             choices=['present', 'absent', 'downloaded', 'archive_downloaded']
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        image_streamer_hostnames=dict(type='list', elements='str'),
+        **dict(OneViewModuleBase.ONEVIEW_TRANSFER_ARGS, **OneViewModuleBase.ONEVIEW_CONCURRENCY_ARGS)
     )
 
     def __init__(self):
         super(GoldenImageModule, self).__init__(additional_arg_spec=self.argument_spec)
-        self.i3s_client = self.oneview_client.create_image_streamer_client()
-        self.resource_client = self.i3s_client.golden_images
+        self.image_streamer_hostnames = self.module.params.get('image_streamer_hostnames')
+        if self.image_streamer_hostnames:
+            self.i3s_clients = OrderedDict((hostname, create_image_streamer_client(self.oneview_client, hostname))
+                                           for hostname in self.image_streamer_hostnames)
+        else:
+            self.i3s_client = self.oneview_client.create_image_streamer_client()
+            self.resource_client = self.i3s_client.golden_images
 
     def execute_module(self):
+        if self.image_streamer_hostnames:
+            changed, msg, ansible_facts = self.__distribute(self.data)
+            return dict(changed=changed, msg=msg, ansible_facts=ansible_facts)
+
         resource = self.get_by_name(self.data['name'])
 
         if self.state == 'present':
@@ -202,6 +283,7 @@ class GoldenImageModule(OneViewModuleBase):
         self.__check_present_consistency(data)
 
         file_path = data.pop('localImageFilePath', None)
+        facts = {}
 
         if not resource:
             if data.get('osVolumeURI'):
@@ -209,7 +291,11 @@ class GoldenImageModule(OneViewModuleBase):
                 msg = self.MSG_CREATED
                 changed = True
             elif file_path:
-                resource = self.i3s_client.golden_images.upload(file_path, data)
+                upload = OneViewFileUpload(self.i3s_client.connection, file_path, self.module.params.get('chunk_size'),
+                                           log=self.module.log)
+                resource = upload.upload(self.resource_client.URI,
+                                         partial(self.i3s_client.golden_images.upload, file_path, data))
+                facts['golden_image_upload'] = upload.manifest
                 msg = self.MSG_UPLOADED
                 changed = True
             else:
@@ -225,7 +311,37 @@ class GoldenImageModule(OneViewModuleBase):
             else:
                 msg = self.MSG_ALREADY_PRESENT
 
-        return changed, msg, dict(golden_image=resource)
+        facts['golden_image'] = resource
+        return changed, msg, facts
+
+    def __distribute(self, data):
+        if self.state != 'present':
+            raise OneViewModuleValueError(self.MSG_DISTRIBUTION_STATE_NOT_SUPPORTED)
+        data = dict(data)
+        file_path = data.pop('localImageFilePath', None)
+        if not file_path:
+            raise OneViewModuleValueError(self.MSG_DISTRIBUTION_FILE_REQUIRED)
+
+        def upload_to(hostname, upload):
+            golden_images = self.i3s_clients[hostname].golden_images
+            existing = golden_images.get_by('name', data['name'])
+            if existing:
+                return False, existing[0]
+            return True, upload.upload(golden_images.URI, partial(golden_images.upload, file_path, data))
+
+        distribution = OneViewFileDistribution(file_path, self.module.params.get('chunk_size'),
+                                               max_concurrency=self.module.params.get('max_concurrency'),
+                                               log=self.module.log).distribute(
+            [(hostname, i3s_client.connection) for hostname, i3s_client in self.i3s_clients.items()], upload_to)
+
+        failed = OrderedDict((target['name'], target['msg']) for target in distribution
+                             if target['status'] == OneViewFileDistribution.STATUS_FAILED)
+        if failed:
+            raise OneViewModuleConcurrentCallsError(failed)
+
+        changed = any(target['status'] == OneViewFileDistribution.STATUS_UPLOADED for target in distribution)
+        return changed, self.MSG_DISTRIBUTED if changed else self.MSG_ALREADY_PRESENT, dict(
+            golden_image_distribution=distribution)
 
     def __replace_name_by_uris(self, data):
         vol_name = data.pop('osVolumeName', None)
@@ -250,12 +366,20 @@ class GoldenImageModule(OneViewModuleBase):
             raise OneViewModuleResourceNotFound(self.MSG_BUILD_PLAN_WAS_NOT_FOUND)
 
     def __download(self, data, resource):
-        self.i3s_client.golden_images.download(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_DOWNLOADED, {}
+        return self.__download_file('download', data, resource, self.MSG_DOWNLOADED)
 
     def __download_archive(self, data, resource):
-        self.i3s_client.golden_images.download_archive(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_ARCHIVE_DOWNLOADED, {}
+        return self.__download_file('archive', data, resource, self.MSG_ARCHIVE_DOWNLOADED)
+
+    def __download_file(self, path, data, resource, msg):
+        uri = '{0}/{1}/{2}'.format(self.i3s_client.golden_images.URI, path, resource['uri'].split('/')[-1])
+        download = OneViewFileDownload(self.i3s_client.connection, uri, data['destination_file_path'],
+                                       resource.get('eTag') or resource.get('modified'),
+                                       self.module.params.get('chunk_size'), self.module.params.get('checksum_dir'),
+                                       log=self.module.log)
+        if not download.download():
+            msg = self.MSG_ALREADY_DOWNLOADED
+        return not download.skipped, msg, dict(golden_image_download=download.manifest)
 
 
 def main():
@@ -20,17 +20,50 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 
 import abc
 import collections
+import hashlib
+import inspect
 import json
 import logging
+import mmap
 import os
+import random
+import socket
+import ssl
+import tempfile
+import threading
+import time
 import traceback
 
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing.pool import ThreadPool
+
 try:
     from hpeOneView.oneview_client import OneViewClient
+    from hpeOneView.image_streamer.image_streamer_client import ImageStreamerClient
+    from hpeOneView.exceptions import HPEOneViewException
     HAS_HPE_ONEVIEW = True
 except ImportError:
     HAS_HPE_ONEVIEW = False
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+try:
+    import sqlite3
+    HAS_SQLITE3 = True
+except ImportError:
+    HAS_SQLITE3 = False
+
+try:
+    import amqp
+    HAS_AMQP = True
+except ImportError:
+    HAS_AMQP = False
+
 try:
     from ansible.module_utils import six
     from ansible.module_utils._text import to_native
@@ -42,7 +75,7 @@ from ansible.module_utils.basic import AnsibleModule
 
 
 # NOTE: VALIDATE IF REQUIRED
-from copy import deepcopy
+from copy import copy, deepcopy
 from collections import OrderedDict
 # NOTE: VALIDATE IF REQUIRED
 
@@ -93,8 +126,10 @@ def transform_list_to_dict(list_):
 
 
 # Makes a deep merge of 2 dictionaries and returns the merged dictionary
+# Only the dictionaries along the merged keys are copied, the other values are shared with the arguments,
+# which are never modified
 def dict_merge(original_resource_dict, data_dict):
-    resource_dict = deepcopy(original_resource_dict)
+    resource_dict = copy(original_resource_dict)
     for key, val in data_dict.items():
         if not resource_dict.get(key):
             resource_dict[key] = val
@@ -126,7 +161,7 @@ def merge_list_by_key(original_list, updated_list, key, ignore_when_null=None, r
     if not original_list:
         return updated_list
 
-    items_map = collections.OrderedDict([(i[key], i.copy()) for i in original_list])
+    items_map = dict((i[key], i) for i in original_list)
 
     merged_items = collections.OrderedDict()
 
@@ -136,10 +171,14 @@ def merge_list_by_key(original_list, updated_list, key, ignore_when_null=None, r
             for ignored_key in ignore_when_null:
                 if ignored_key in item and item[ignored_key] is None:
                     item.pop(ignored_key)
+            # only the original items present on updated_list are copied
+            merged_item = merged_items.get(item_key)
+            if merged_item is None:
+                merged_item = items_map[item_key].copy()
             if replace_key and item.get(replace_key) == replace_value:
-                item[replace_key] = items_map[item_key][replace_key]
-            merged_items[item_key] = items_map[item_key]
-            merged_items[item_key].update(item)
+                item[replace_key] = merged_item[replace_key]
+            merged_item.update(item)
+            merged_items[item_key] = merged_item
             # merged_items[item_key] = dict_merge(merged_items[item_key], item)
         else:
             merged_items[item_key] = item
@@ -158,13 +197,50 @@ def _sort_by_keys(resource1, resource2):
     return resource1, resource2
 
 
+# Same output as json.dumps(obj, sort_keys=True), without building an encoder on every call
+_SORTED_JSON_ENCODER = json.JSONEncoder(sort_keys=True)
+
+
 def _str_sorted(obj):
     if isinstance(obj, collections.Mapping):
-        return json.dumps(obj, sort_keys=True)
+        return _SORTED_JSON_ENCODER.encode(obj)
     else:
         return str(obj)
 
 
+def _sorted_with_keys(resource):
+    """
+    Sorts a list in the same order as sorted(resource, key=_str_sorted), keeping the sort keys.
+    :arg list resource: List of values.
+    :return: tuple: The sorted list and a dict with the sort key of each element, by element id.
+    """
+    values = list(resource)
+    decorated = sorted((_str_sorted(value), index) for index, value in enumerate(values))
+    keys = dict((id(values[index]), key) for key, index in decorated)
+    return [values[index] for _, index in decorated], keys
+
+
+def _same_sort_key(value1, key1, value2, key2):
+    """
+    Checks whether two dicts are equivalent through the sort keys computed for them, without a recursive comparison.
+    The same JSON means the same content, except for empty lists inside lists, which compare_list never
+    considers equal.
+    :return: bool: True when the dicts are equivalent, False when a recursive comparison is needed.
+    """
+    if not isinstance(value1, collections.Mapping) or not isinstance(value2, collections.Mapping):
+        return False
+    return key1 == key2 and '[[]' not in key1 and ', []' not in key1
+
+
+def _debug_difference(message, resource1, resource2):
+    """
+    Logs a difference found by the comparison. The resources are only formatted when debug is enabled, since
+    formatting them on every recursion level costs more than the comparison itself.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message + "resource1 = {0}, resource2 = {1}".format(resource1, resource2))
+
+
 def _standardize_value(value):
     """
     Convert value to string to enhance the comparison.
@@ -194,10 +270,9 @@ def compare_lig(first_resource, second_resource):
     resource1 = first_resource
     resource2 = second_resource
 
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
     # The first resource is True / Not Null and the second resource is False / Null
     if resource1 and not resource2:
-        logger.debug("resource1 and not resource2. " + debug_resources)
+        _debug_difference("resource1 and not resource2. ", resource1, resource2)
         return False
 
     # Checks all keys in first dict against the second dict
@@ -207,12 +282,12 @@ def compare_lig(first_resource, second_resource):
             if sort_by_uplink_set_location(resource1[key], resource2[key]):
                 continue
             else:
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         if key not in resource2:
             if resource1[key] is not None:
                 # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         # If both values are null, empty or False it will be considered equal.
         elif not resource1[key] and not resource2[key]:
@@ -220,15 +295,15 @@ def compare_lig(first_resource, second_resource):
         elif isinstance(resource1[key], collections.Mapping):
             # recursive call
             if not compare_lig(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         elif isinstance(resource1[key], list):
             # change comparison function to compare_list
             if not compare_list_lig(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         elif _standardize_value(resource1[key]) != _standardize_value(resource2[key]):
-            logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+            _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
             return False
 
     # Checks all keys in the second dict, looking for missing elements
@@ -236,7 +311,7 @@ def compare_lig(first_resource, second_resource):
         if key not in resource1:
             if resource2[key] is not None:
                 # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
 
     return True
@@ -257,10 +332,9 @@ def compare(first_resource, second_resource):
     resource1 = first_resource
     resource2 = second_resource
 
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
     # The first resource is True / Not Null and the second resource is False / Null
     if resource1 and not resource2:
-        logger.debug("resource1 and not resource2. " + debug_resources)
+        _debug_difference("resource1 and not resource2. ", resource1, resource2)
         return False
 
     # Checks all keys in first dict against the second dict
@@ -268,7 +342,7 @@ def compare(first_resource, second_resource):
         if key not in resource2:
             if resource1[key] is not None:
                 # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         # If both values are null, empty or False it will be considered equal.
         elif not resource1[key] and not resource2[key]:
@@ -276,15 +350,15 @@ def compare(first_resource, second_resource):
         elif isinstance(resource1[key], collections.Mapping):
             # recursive call
             if not compare(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         elif isinstance(resource1[key], list):
             # change comparison function to compare_list
             if not compare_list(resource1[key], resource2[key]):
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
         elif _standardize_value(resource1[key]) != _standardize_value(resource2[key]):
-            logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+            _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
             return False
 
     # Checks all keys in the second dict, looking for missing elements
@@ -292,7 +366,7 @@ def compare(first_resource, second_resource):
         if key not in resource1:
             if resource2[key] is not None:
                 # Inexistent key is equivalent to exist with value None
-                logger.debug(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key) + debug_resources)
+                _debug_difference(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), resource1, resource2)
                 return False
 
     return True
@@ -310,38 +384,91 @@ def compare_list(first_resource, second_resource):
 
     resource1 = first_resource
     resource2 = second_resource
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
     # The second list is null / empty  / False
     if not resource2:
-        logger.debug("resource 2 is null. " + debug_resources)
+        _debug_difference("resource 2 is null. ", resource1, resource2)
         return False
 
     if len(resource1) != len(resource2):
-        logger.debug("resources have different length. " + debug_resources)
+        _debug_difference("resources have different length. ", resource1, resource2)
         return False
 
-    resource1 = sorted(resource1, key=_str_sorted)
-    resource2 = sorted(resource2, key=_str_sorted)
+    resource1, keys1 = _sorted_with_keys(first_resource)
+    resource2, keys2 = _sorted_with_keys(second_resource)
 
     for i, val in enumerate(resource1):
-        if isinstance(val, collections.Mapping):
+        if _same_sort_key(val, keys1[id(val)], resource2[i], keys2[id(resource2[i])]):
+            continue
+        elif isinstance(val, collections.Mapping):
             # change comparison function to compare dictionaries
             if not compare(val, resource2[i]):
-                logger.debug("resources are different. " + debug_resources)
+                _debug_difference("resources are different. ", first_resource, second_resource)
                 return False
         elif isinstance(val, list):
             # recursive call
             if not compare_list(val, resource2[i]):
-                logger.debug("lists are different. " + debug_resources)
+                _debug_difference("lists are different. ", first_resource, second_resource)
                 return False
         elif _standardize_value(val) != _standardize_value(resource2[i]):
-            logger.debug("values are different. " + debug_resources)
+            _debug_difference("values are different. ", first_resource, second_resource)
             return False
 
     # no differences found
     return True
 
 
+def _json_pointer(path, key):
+    return path + '/' + to_native(key).replace('~', '~0').replace('/', '~1')
+
+
+def json_patch(first_resource, second_resource, path=''):
+    """
+    Builds the RFC 6902 JSON Patch that turns the first resource into the second one, following the compare rules.
+    Particularities of the patch:
+        - It is empty when compare returns True for the resources.
+        - Values considered equal by compare are not patched.
+        - Lists are replaced as a whole, since compare ignores the elements order.
+    :arg dict first_resource: first dictionary
+    :arg dict second_resource: second dictionary
+    :arg str path: JSON Pointer of the resources, used for the recursion.
+    :return: list: Patch operations.
+    """
+    resource1 = first_resource
+    resource2 = second_resource
+
+    # The first resource is True / Not Null and the second resource is False / Null
+    if resource1 and not resource2:
+        return [dict(op='replace', path=path, value=resource2)]
+
+    operations = []
+    for key in resource1:
+        key_path = _json_pointer(path, key)
+        if key not in resource2:
+            if resource1[key] is not None:
+                # Inexistent key is equivalent to exist with value None
+                operations.append(dict(op='remove', path=key_path))
+        # If both values are null, empty or False it will be considered equal.
+        elif not resource1[key] and not resource2[key]:
+            continue
+        elif isinstance(resource1[key], collections.Mapping) and isinstance(resource2[key], collections.Mapping):
+            operations.extend(json_patch(resource1[key], resource2[key], key_path))
+        elif isinstance(resource1[key], collections.Mapping):
+            if not compare(resource1[key], resource2[key]):
+                operations.append(dict(op='replace', path=key_path, value=resource2[key]))
+        elif isinstance(resource1[key], list):
+            if not compare_list(resource1[key], resource2[key]):
+                operations.append(dict(op='replace', path=key_path, value=resource2[key]))
+        elif _standardize_value(resource1[key]) != _standardize_value(resource2[key]):
+            operations.append(dict(op='replace', path=key_path, value=resource2[key]))
+
+    # Checks all keys in the second dict, looking for missing elements
+    for key in resource2.keys():
+        if key not in resource1 and resource2[key] is not None:
+            operations.append(dict(op='add', path=_json_pointer(path, key), value=resource2[key]))
+
+    return operations
+
+
 def compare_list_lig(first_resource, second_resource):
     """
     Recursively compares lists contents equivalence, ignoring types and element orders.
@@ -354,35 +481,36 @@ def compare_list_lig(first_resource, second_resource):
 
     resource1 = first_resource
     resource2 = second_resource
-    debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
     # The second list is null / empty  / False
     if not resource2:
-        logger.debug("resource 2 is null. " + debug_resources)
+        _debug_difference("resource 2 is null. ", resource1, resource2)
         return False
 
     if len(resource1) != len(resource2):
-        logger.debug("resources have different length. " + debug_resources)
+        _debug_difference("resources have different length. ", resource1, resource2)
         return False
 
-    resource1 = sorted(resource1, key=_str_sorted)
-    resource2 = sorted(resource2, key=_str_sorted)
+    resource1, keys1 = _sorted_with_keys(first_resource)
+    resource2, keys2 = _sorted_with_keys(second_resource)
 
     # sort resources by specific keys
     resource1, resource2 = _sort_by_keys(resource1, resource2)
 
     for i, val in enumerate(resource1):
-        if isinstance(val, collections.Mapping):
+        if _same_sort_key(val, keys1[id(val)], resource2[i], keys2[id(resource2[i])]):
+            continue
+        elif isinstance(val, collections.Mapping):
             # change comparison function to compare dictionaries
             if not compare_lig(val, resource2[i]):
-                logger.debug("resources are different. " + debug_resources)
+                _debug_difference("resources are different. ", first_resource, second_resource)
                 return False
         elif isinstance(val, list):
             # recursive call
             if not compare_list_lig(val, resource2[i]):
-                logger.debug("lists are different. " + debug_resources)
+                _debug_difference("lists are different. ", first_resource, second_resource)
                 return False
         elif _standardize_value(val) != _standardize_value(resource2[i]):
-            logger.debug("values are different. " + debug_resources)
+            _debug_difference("values are different. ", first_resource, second_resource)
             return False
 
     # no differences found
@@ -398,37 +526,28 @@ def sort_by_uplink_set_location(resource1, resource2):
     :return: True when equal; False when different.
     """
 
-    # Check first list elements
+    if not resource1:
+        return True
+
+    # Index the locations of the second list, a location being the sorted entries of its
+    # inner elements, e.g. ('Bay_3', 'Enclosure_1', 'Port_75')
+    locations_res2 = set(_uplink_set_location(config_dict) for config_dict in resource2)
+
+    # Check each first list element is present in second list
     for config_dict in resource1:
-        location_entries = config_dict["logicalLocation"]["locationEntries"]
-
-        # Append all types together ['Bay_3', 'Enclosure_1', 'Port_75']
-        each_location = []
-        for local_entry in location_entries:
-            # Combine the values for comparison, 'Bay_3' if type='Bay' and relative value=3
-            value = local_entry.get('type', '') + "_" + str(local_entry.get('relativeValue', ''))
-            each_location.append(value)
-
-        # Check second elements and add each entry in all_entries list
-        all_entries = []
-        for config_dict_res2 in resource2:
-            location_entries_res2 = config_dict_res2["logicalLocation"]["locationEntries"]
-
-            each_location_res2 = []
-            for local_entry_res2 in location_entries_res2:
-                value_res2 = local_entry_res2.get('type', '') + "_" + str(local_entry_res2.get('relativeValue', ''))
-                each_location_res2.append(value_res2)
-
-            if each_location_res2 not in all_entries:
-                all_entries.append(sorted(each_location_res2))
-
-        # Check first list element is present in second list
-        if not sorted(each_location) in all_entries:
+        if _uplink_set_location(config_dict) not in locations_res2:
             return False
 
     return True
 
 
+def _uplink_set_location(config_dict):
+    # Combine the values for comparison, 'Bay_3' if type='Bay' and relative value=3
+    location_entries = config_dict["logicalLocation"]["locationEntries"]
+    return tuple(sorted(local_entry.get('type', '') + "_" + str(local_entry.get('relativeValue', ''))
+                        for local_entry in location_entries))
+
+
 class OneViewModuleException(Exception):
     """
     OneView base Exception.
@@ -488,6 +607,1630 @@ class OneViewModuleResourceNotFound(OneViewModuleException):
     pass
 
 
+class OneViewModuleTimeoutError(OneViewModuleException):
+    """
+    OneView Timeout Error.
+    The exception is raised when a OneViewWaiter reaches its deadline before the condition is met.
+    Attributes:
+       msg (str): Exception message.
+       oneview_response (dict): OneView rest response.
+    """
+    pass
+
+
+class OneViewModuleConcurrentCallsError(OneViewModuleException):
+    """
+    OneView Concurrent Calls Exception.
+    The exception is raised by run_concurrently when any of the calls failed, after all of them finished.
+    Attributes:
+       msg (str): Exception message, with the error of each failed call in the order of the calls.
+       errors (OrderedDict): Exception raised by each failed call, by key, in the order of the calls.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super(OneViewModuleConcurrentCallsError, self).__init__('; '.join(
+            '{0}: {1}'.format(key, getattr(error, 'msg', None) or to_native(error)) for key, error in errors.items()))
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def run_concurrently(calls, max_concurrency=DEFAULT_MAX_CONCURRENCY, timings=None):
+    """
+    Runs independent calls, such as the GETs of several subresources, with at most max_concurrency of them at the
+    same time. All the calls run even when some of them fail.
+    :arg list calls: Pairs of key and function without arguments.
+    :arg int max_concurrency: Maximum number of simultaneous calls.
+    :arg dict timings: When given, receives the duration in seconds of each call, by key.
+    :return: OrderedDict: The value returned by each function, by key, in the order of the calls.
+    """
+    calls = list(calls)
+
+    def call(function):
+        started = time.time()
+        try:
+            return True, function(), time.time() - started
+        except Exception as exception:
+            return False, exception, time.time() - started
+
+    if len(calls) < 2 or max_concurrency < 2:
+        outcomes = [call(function) for key, function in calls]
+    else:
+        pool = ThreadPool(min(max_concurrency, len(calls)))
+        try:
+            outcomes = pool.map(call, [function for key, function in calls])
+        finally:
+            pool.close()
+
+    keys = [key for key, function in calls]
+    if timings is not None:
+        timings.update((key, round(duration, 3)) for key, (succeeded, value, duration) in zip(keys, outcomes))
+
+    errors = OrderedDict((key, value) for key, (succeeded, value, duration) in zip(keys, outcomes) if not succeeded)
+    if errors:
+        raise OneViewModuleConcurrentCallsError(errors)
+
+    return OrderedDict((key, value) for key, (succeeded, value, duration) in zip(keys, outcomes))
+
+
+def iter_concurrently(function, items, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Applies a function to each item with at most max_concurrency of them at the same time, yielding the results in
+    the order of the items as soon as they are available, so the first results can be consumed while the others are
+    still being requested.
+    :arg function function: Function with a single argument. It should not raise, since the first exception stops
+        the iteration.
+    :arg list items: Items given to the function.
+    :arg int max_concurrency: Maximum number of simultaneous calls.
+    :return: generator: The value returned by the function for each item.
+    """
+    if max_concurrency < 2:
+        for item in items:
+            yield function(item)
+        return
+
+    pool = ThreadPool(max_concurrency)
+    try:
+        for result in pool.imap(function, items):
+            yield result
+    finally:
+        pool.terminate()
+
+
+DEFAULT_STREAM_PAGE_SIZE = 500
+
+
+def iter_pages(get_all, params=None, page_size=DEFAULT_STREAM_PAGE_SIZE):
+    """
+    Walks a collection page by page, so only one page is in memory at a time.
+    The 'start' and 'count' params delimit the members walked, as in a single get_all; the other params are sent
+    with every page request.
+    :arg function get_all: Function that gets the members of the collection, such as the get_all of a resource client.
+    :arg dict params: Params of get_all.
+    :arg int page_size: Maximum number of members requested per page.
+    :return: generator: The list of members of each page.
+    """
+    params = dict(params or {})
+    start = params.pop('start', None) or 0
+    remaining = params.pop('count', None)
+    if remaining is not None and remaining < 0:
+        remaining = None
+
+    while remaining is None or remaining > 0:
+        count = page_size if remaining is None else min(page_size, remaining)
+        page = get_all(start=start, count=count, **params)
+        if page:
+            yield page
+        if len(page) < count:
+            break
+        start += len(page)
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def stream_to_file(get_all, path, params=None, page_size=DEFAULT_STREAM_PAGE_SIZE):
+    """
+    Writes all members of a collection as newline-delimited JSON, walking it page by page with iter_pages.
+    The file is written next to the path and renamed when complete, so the path never has a partial collection.
+    :arg function get_all: Function that gets the members of the collection, such as the get_all of a resource client.
+    :arg str path: Path of the NDJSON file.
+    :arg dict params: Params of get_all.
+    :arg int page_size: Maximum number of members requested per page.
+    :return: dict: Manifest with the path, the count of members and the SHA-256 checksum of the file.
+    """
+    return write_ndjson(path, (member for page in iter_pages(get_all, params, page_size) for member in page))
+
+
+def write_ndjson(path, records):
+    """
+    Writes records as newline-delimited JSON while they are produced.
+    The file is written next to the path and renamed when complete, so the path never has a partial file.
+    :arg str path: Path of the NDJSON file.
+    :arg iterable records: JSON serializable records, one per line.
+    :return: dict: Manifest with the path, the count of records and the SHA-256 checksum of the file.
+    """
+    checksum = hashlib.sha256()
+    count = 0
+    partial_path = path + '.part'
+    try:
+        with open(partial_path, 'wb') as ndjson_file:
+            for record in records:
+                line = (json.dumps(record) + '\n').encode('utf-8')
+                ndjson_file.write(line)
+                checksum.update(line)
+                count += 1
+        os.rename(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    return dict(path=path, count=count, checksum=checksum.hexdigest())
+
+
+# Top-level attributes of the resources, by collection URI, used to validate the 'fields' of the facts modules.
+# The fields of the collections not registered are not validated.
+FACTS_COMMON_FIELDS = ('category', 'created', 'description', 'eTag', 'modified', 'name', 'scopesUri', 'state',
+                       'status', 'type', 'uri')
+FACTS_FIELDS_REGISTRY = {
+    '/rest/enclosures': (
+        'applianceBayCount', 'applianceBays', 'deviceBayCount', 'deviceBays', 'enclosureGroupUri', 'enclosureModel',
+        'enclosureType', 'enclosureTypeUri', 'fanBayCount', 'fanBays', 'firmwareBaselineName', 'firmwareBaselineUri',
+        'interconnectBayCount', 'interconnectBays', 'isFwManaged', 'licensingIntent', 'logicalEnclosureUri',
+        'managerBays', 'partNumber', 'powerAllocatedWatts', 'powerAvailableWatts', 'powerCapacityWatts', 'powerMode',
+        'powerSupplyBayCount', 'powerSupplyBays', 'rackName', 'refreshState', 'serialNumber', 'stateReason',
+        'supportState', 'uidState', 'uuid', 'version'),
+    '/rest/ethernet-networks': (
+        'connectionTemplateUri', 'ethernetNetworkType', 'fabricUri', 'ipv6SubnetUri', 'privateNetwork', 'purpose',
+        'smartLink', 'subnetUri', 'vlanId'),
+    '/rest/fc-networks': (
+        'autoLoginRedistribution', 'connectionTemplateUri', 'fabricType', 'fabricUri', 'linkStabilityTime',
+        'managedSanUri'),
+    '/rest/interconnects': (
+        'deviceResetState', 'enclosureName', 'enclosureType', 'enclosureUri', 'firmwareVersion', 'hostName',
+        'interconnectIP', 'interconnectLocation', 'interconnectMAC', 'interconnectTypeUri', 'ipAddressList',
+        'logicalInterconnectUri', 'migrationState', 'model', 'partNumber', 'portCount', 'ports', 'powerState',
+        'productName', 'roles', 'serialNumber', 'snmpConfiguration', 'stackingDomainId', 'stackingDomainRole',
+        'stackingMemberId', 'subPortCount', 'uidState'),
+    '/rest/logical-interconnects': (
+        'consistencyStatus', 'enclosureType', 'enclosureUris', 'ethernetSettings', 'fabricUri', 'fcoeSettings',
+        'firmware', 'igmpSettings', 'interconnectMap', 'interconnects', 'internalNetworkUris',
+        'logicalInterconnectGroupUri', 'portFlapProtection', 'portMonitor', 'qosConfiguration', 'snmpConfiguration',
+        'stackingHealth', 'telemetryConfiguration'),
+    '/rest/server-hardware': (
+        'formFactor', 'licensingIntent', 'locationUri', 'maintenanceMode', 'memoryMb', 'model', 'mpFirmwareVersion',
+        'mpHostInfo', 'mpModel', 'mpState', 'partNumber', 'physicalServerHardwareUri', 'platform', 'portMap',
+        'position', 'powerLock', 'powerState', 'processorCoreCount', 'processorCount', 'processorSpeedMhz',
+        'processorType', 'refreshState', 'romVersion', 'serialNumber', 'serverGroupUri', 'serverHardwareTypeUri',
+        'serverName', 'serverProfileUri', 'shortModel', 'stateReason', 'uidState', 'uuid', 'virtualSerialNumber',
+        'virtualUuid'),
+    '/rest/server-profiles': (
+        'affinity', 'associatedServer', 'bios', 'boot', 'bootMode', 'connectionSettings', 'enclosureBay',
+        'enclosureGroupUri', 'enclosureUri', 'firmware', 'hideUnusedFlexNics', 'inProgress', 'iscsiInitiatorName',
+        'localStorage', 'macType', 'managementProcessor', 'osDeploymentSettings', 'profileUUID', 'refreshState',
+        'sanStorage', 'serialNumber', 'serialNumberType', 'serverHardwareTypeUri', 'serverHardwareUri',
+        'serverProfileTemplateUri', 'taskUri', 'templateCompliance', 'uuid', 'wwnType'),
+    '/rest/tasks': (
+        'associatedResource', 'associatedTaskUri', 'completedSteps', 'computedPercentComplete', 'data',
+        'expectedDuration', 'hidden', 'isCancellable', 'owner', 'parentTaskUri', 'percentComplete', 'progressUpdates',
+        'stateReason', 'taskErrors', 'taskOutput', 'taskState', 'taskStatus', 'taskType', 'totalSteps',
+        'userInitiated'),
+}
+
+
+def validate_facts_fields(collection_uri, fields):
+    """
+    Validates the fields requested to a facts module against FACTS_FIELDS_REGISTRY.
+    :arg str collection_uri: URI of the collection, as in the URI attribute of the resource clients.
+    :arg list fields: Top-level attributes requested.
+    """
+    registered_fields = FACTS_FIELDS_REGISTRY.get(collection_uri)
+    if registered_fields is None:
+        return
+
+    unknown_fields = [field for field in fields if field not in registered_fields and field not in FACTS_COMMON_FIELDS]
+    if unknown_fields:
+        raise OneViewModuleValueError(OneViewModule.MSG_UNKNOWN_FIELDS.format(
+            collection_uri, ', '.join(unknown_fields), ', '.join(sorted(FACTS_COMMON_FIELDS + registered_fields))))
+
+
+def _accepts_argument(function, name):
+    try:
+        parameters = inspect.signature(function).parameters
+        return name in parameters or any(p.kind == p.VAR_KEYWORD for p in parameters.values())
+    except AttributeError:
+        # Python 2
+        spec = inspect.getargspec(function)
+        return name in spec.args or spec.keywords is not None
+
+
+def project_fields(resource, fields):
+    """
+    Keeps only the given top-level attributes of a resource.
+    :arg dict resource: Resource data.
+    :arg list fields: Top-level attributes to keep.
+    :return: dict: The resource with only the given attributes that it has.
+    """
+    return dict((field, resource[field]) for field in fields if field in resource)
+
+
+def get_all_projected(resource_client, fields, **params):
+    """
+    Lists the resources of a collection with only the given top-level fields. They are requested as a server side
+    projection when the get_all of the resource client accepts them, or the one of its helper for the resource
+    objects of the SDK, and projected client side otherwise.
+    :arg resource_client: Resource client of the collection.
+    :arg list fields: Top-level attributes to keep.
+    :arg params: Params of the get_all.
+    :return: list: The projected resources.
+    """
+    get_all = resource_client.get_all
+    helper = getattr(resource_client, '_helper', None)
+    if not _accepts_argument(get_all, 'fields') and helper is not None:
+        get_all = helper.get_all
+
+    if _accepts_argument(get_all, 'fields'):
+        params = dict(params, fields=','.join(fields))
+    return [project_fields(resource, fields) for resource in get_all(**params)]
+
+
+class OneViewFieldsProjection(object):
+    """
+    Resource client of a facts module with 'fields': its get_all returns only the given fields of each resource.
+    See get_all_projected. All the other attributes are the ones of the resource client.
+    """
+
+    def __init__(self, resource_client, fields):
+        self.resource_client = resource_client
+        self.fields = fields
+
+    def __getattr__(self, name):
+        return getattr(self.resource_client, name)
+
+    def get_all(self, **params):
+        return get_all_projected(self.resource_client, self.fields, **params)
+
+
+def build_oneview_config(params):
+    """
+    Builds the OneView client configuration from the module parameters, falling back to the JSON
+    configuration file and then to the environment variables, in the same order used by the modules.
+    :arg dict params: Module parameters.
+    :return: dict: OneView client configuration.
+    """
+    if params.get('hostname'):
+        return dict(ip=params['hostname'],
+                    credentials=dict(userName=params['username'], password=params['password'],
+                                     authLoginDomain=params.get('auth_login_domain', '')),
+                    api_version=params['api_version'],
+                    image_streamer_ip=params.get('image_streamer_hostname'))
+    elif params.get('config'):
+        with open(params['config']) as json_data:
+            return json.load(json_data)
+
+    return dict(ip=os.environ.get('ONEVIEWSDK_IP', ''),
+                image_streamer_ip=os.environ.get('ONEVIEWSDK_IMAGE_STREAMER_IP', ''),
+                api_version=os.environ.get('ONEVIEWSDK_API_VERSION', ''),
+                ssl_certificate=os.environ.get('ONEVIEWSDK_SSL_CERTIFICATE', ''),
+                credentials=dict(userName=os.environ.get('ONEVIEWSDK_USERNAME', ''),
+                                 authLoginDomain=os.environ.get('ONEVIEWSDK_AUTH_LOGIN_DOMAIN', ''),
+                                 password=os.environ.get('ONEVIEWSDK_PASSWORD', ''),
+                                 sessionID=os.environ.get('ONEVIEWSDK_SESSIONID', '')),
+                proxy=os.environ.get('ONEVIEWSDK_PROXY', ''),
+                timeout=os.environ.get('ONEVIEWSDK_CONNECTION_TIMEOUT'))
+
+
+class OneViewFileCache(object):
+    """
+    On-disk cache shared by the module processes running on the same controller.
+    Each entry is stored in a JSON file named after the hash of its key and expires after the TTL.
+    Processes working on the same key can be serialized with an advisory file lock.
+    """
+
+    def __init__(self, directory, namespace, ttl):
+        self.directory = os.path.join(os.path.expanduser(directory), namespace)
+        self.ttl = ttl
+
+    def _path(self, key):
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.json')
+
+    def _ensure_directory(self):
+        try:
+            os.makedirs(self.directory, 0o700)
+        except OSError:
+            if not os.path.isdir(self.directory):
+                raise
+
+    @contextmanager
+    def lock(self, key):
+        if not HAS_FCNTL:
+            yield
+            return
+
+        self._ensure_directory()
+        lock_file = open(self._path(key) + '.lock', 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def get(self, key):
+        try:
+            with open(self._path(key)) as cache_file:
+                entry = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if entry.get('expires', 0) < time.time():
+            return None
+        return entry.get('value')
+
+    def set(self, key, value):
+        self._ensure_directory()
+        path = self._path(key)
+        temp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+
+        # Entries may hold session tokens, so they are only readable by the owner
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as cache_file:
+            json.dump(dict(expires=time.time() + self.ttl, value=value), cache_file)
+        os.rename(temp_path, path)
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class OneViewSessionCache(object):
+    """
+    Opt-in cache of OneView session tokens, reused across module invocations.
+    It is enabled by setting the ONEVIEW_SESSION_CACHE_DIR environment variable, and the entries expire
+    ONEVIEW_SESSION_CACHE_TTL seconds after the login, however often they are reused. Entries are keyed by
+    hostname, username, auth_login_domain and api_version.
+    When the appliance answers a request of the client with 401 Unauthorized, because the session expired or was
+    revoked during the task, the client logs in again, refreshes the cache and sends the request once more. Only the
+    requests sent through the connection do_http are retried; file downloads and multipart uploads are not.
+    """
+    CACHE_DIR_ENV = 'ONEVIEW_SESSION_CACHE_DIR'
+    CACHE_TTL_ENV = 'ONEVIEW_SESSION_CACHE_TTL'
+    DEFAULT_TTL = 3600
+    LOGIN_SESSIONS_URI = '/rest/login-sessions'
+
+    def __init__(self, directory, ttl=DEFAULT_TTL):
+        self.cache = OneViewFileCache(directory, 'sessions', ttl)
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates the session cache from the environment variables.
+        :return: OneViewSessionCache or None when the cache is not enabled.
+        """
+        directory = os.environ.get(cls.CACHE_DIR_ENV)
+        if not directory:
+            return None
+        return cls(directory, int(os.environ.get(cls.CACHE_TTL_ENV) or cls.DEFAULT_TTL))
+
+    @staticmethod
+    def _key(config):
+        credentials = config.get('credentials') or {}
+        return [config.get('ip'),
+                credentials.get('userName'),
+                credentials.get('authLoginDomain') or '',
+                str(config.get('api_version') or '')]
+
+    def create_client(self, config):
+        """
+        Creates a OneViewClient reusing a cached session when there is a valid one.
+        When the appliance rejects the cached session, it logs in again with the credentials.
+        The lock prevents parallel forks from logging in at the same time with the same credentials.
+        :arg dict config: OneView client configuration.
+        :return: OneViewClient
+        """
+        if (config.get('credentials') or {}).get('sessionID'):
+            return OneViewClient(config)
+
+        key = self._key(config)
+        with self.cache.lock(key):
+            session_id = self.cache.get(key)
+            client = None
+            if session_id:
+                session_config = deepcopy(config)
+                session_config['credentials'] = dict(config['credentials'], sessionID=session_id)
+                try:
+                    # the entry keeps the expiration of the login that created the session
+                    client = OneViewClient(session_config)
+                except HPEOneViewException:
+                    logger.debug("Cached session was rejected by the appliance. Logging in again.")
+                    self.cache.invalidate(key)
+
+            if not client:
+                client = OneViewClient(deepcopy(config))
+                self.cache.set(key, client.connection.get_session_id())
+
+        self._login_again_on_unauthorized(client.connection, config, key)
+        return client
+
+    def _login_again_on_unauthorized(self, connection, config, key):
+        do_http = connection.do_http
+
+        def do_http_logging_in_again(method, path, body, custom_headers=None):
+            response, response_body = do_http(method, path, body, custom_headers=custom_headers)
+            if response.status != 401 or path.startswith(self.LOGIN_SESSIONS_URI):
+                return response, response_body
+
+            rejected_session_id = connection.get_session_id()
+            with self.cache.lock(key):
+                session_id = self.cache.get(key)
+                if session_id and session_id != rejected_session_id:
+                    # another process already logged in again
+                    connection.set_session_id(session_id)
+                else:
+                    logger.debug("Session was rejected by the appliance during the task. Logging in again.")
+                    self.cache.invalidate(key)
+                    connection.login(deepcopy(config['credentials']))
+                    self.cache.set(key, connection.get_session_id())
+            return do_http(method, path, body, custom_headers=custom_headers)
+
+        connection.do_http = do_http_logging_in_again
+
+
+class OneViewApiVersionCache(object):
+    """
+    Opt-in cache of the API version negotiated with each appliance.
+    When the api_version is not set, the SDK asks the appliance for its current version before logging in.
+    Caching that value removes one request from every task. It is enabled by setting the
+    ONEVIEW_API_VERSION_CACHE_DIR environment variable, and the entries expire after
+    ONEVIEW_API_VERSION_CACHE_TTL seconds.
+    """
+    CACHE_DIR_ENV = 'ONEVIEW_API_VERSION_CACHE_DIR'
+    CACHE_TTL_ENV = 'ONEVIEW_API_VERSION_CACHE_TTL'
+    DEFAULT_TTL = 86400
+
+    def __init__(self, directory, ttl=DEFAULT_TTL):
+        self.cache = OneViewFileCache(directory, 'api_versions', ttl)
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates the API version cache from the environment variables.
+        :return: OneViewApiVersionCache or None when the cache is not enabled.
+        """
+        directory = os.environ.get(cls.CACHE_DIR_ENV)
+        if not directory:
+            return None
+        return cls(directory, int(os.environ.get(cls.CACHE_TTL_ENV) or cls.DEFAULT_TTL))
+
+    def apply(self, config):
+        """
+        Sets the cached API version in the configuration when it does not define one.
+        :arg dict config: OneView client configuration.
+        :return: bool: True when the cached API version was applied.
+        """
+        if config.get('api_version'):
+            return False
+
+        api_version = self.cache.get([config.get('ip')])
+        if not api_version:
+            return False
+
+        config['api_version'] = api_version
+        return True
+
+    def store(self, config, api_version):
+        """
+        Stores the API version negotiated with the appliance.
+        :arg dict config: OneView client configuration.
+        :arg int api_version: Negotiated API version.
+        """
+        if api_version:
+            self.cache.set([config.get('ip')], api_version)
+
+    def invalidate(self, hostname):
+        """
+        Drops the cached API version of an appliance, so the next client negotiates it again.
+        :arg str hostname: Appliance hostname or IP.
+        """
+        self.cache.invalidate([hostname])
+
+
+class OneViewFactsSnapshot(object):
+    """
+    Local snapshot of the collections listed by the facts modules, refreshed incrementally.
+    Each snapshot keeps the resources of a collection and the latest 'modified' among them. A refresh only requests
+    the resources modified since then and the URIs of the collection, which drop the deleted resources and give the
+    order of the listing, so the result is the same as the one of a full listing.
+    The collection is fully listed again when the snapshot expires after the TTL, or when a URI of the collection was
+    not retrieved.
+    """
+    DEFAULT_TTL = 86400
+
+    def __init__(self, directory, ttl=DEFAULT_TTL):
+        self.cache = OneViewFileCache(directory, 'facts', ttl)
+
+    @staticmethod
+    def _can_store(resources):
+        return all('uri' in resource and 'modified' in resource for resource in resources)
+
+    @staticmethod
+    def _refresh_changes(snapshot, get_all, list_uris, params):
+        # the URIs are listed before the changes, so a resource created in between is always retrieved
+        uris = list_uris(**params)
+
+        filters = params.get('filter') or []
+        if not isinstance(filters, list):
+            filters = [filters]
+        modified_filter = "modified >= '{0}'".format(snapshot['watermark'])
+        changes = get_all(**dict(params, filter=filters + [modified_filter]))
+        if not OneViewFactsSnapshot._can_store(changes):
+            return None
+
+        resources_by_uri = dict((resource['uri'], resource) for resource in snapshot['resources'])
+        resources_by_uri.update((resource['uri'], resource) for resource in changes)
+        if any(uri not in resources_by_uri for uri in uris):
+            return None
+        return [resources_by_uri[uri] for uri in uris]
+
+    def refresh(self, key, get_all, list_uris, params=None):
+        """
+        Lists a collection from its snapshot, requesting only the changes since the last refresh.
+        :arg list key: JSON serializable key of the collection, with the appliance and the params.
+        :arg get_all: Function that lists the resources with the params.
+        :arg list_uris: Function that lists only the URIs of the resources with the params.
+        :arg dict params: Filter and sort of the listing.
+        :return: list: The resources of the collection.
+        """
+        params = params or {}
+        with self.cache.lock(key):
+            snapshot = self.cache.get(key)
+            resources = None
+            if snapshot and snapshot.get('watermark'):
+                resources = self._refresh_changes(snapshot, get_all, list_uris, params)
+            if resources is None:
+                resources = get_all(**params)
+
+            if self._can_store(resources):
+                watermark = max([resource['modified'] for resource in resources] or [None])
+                self.cache.set(key, dict(watermark=watermark, resources=resources))
+        return resources
+
+
+class OneViewInventory(object):
+    """
+    Opt-in local inventory of OneView resources in a SQLite database, filled by the oneview_inventory_sync module.
+    It indexes the resources of each appliance and collection by the attributes in INDEXED_ATTRIBUTES, so the
+    modules resolve lookups like names, hostnames and IPs to URIs without listing the collection.
+    It is enabled by setting the ONEVIEW_INVENTORY_PATH environment variable, and the collections synced more than
+    ONEVIEW_INVENTORY_MAX_AGE seconds ago are not used.
+    """
+    PATH_ENV = 'ONEVIEW_INVENTORY_PATH'
+    MAX_AGE_ENV = 'ONEVIEW_INVENTORY_MAX_AGE'
+    DEFAULT_MAX_AGE = 300
+
+    # index name: attributes of the resources indexed under it
+    INDEXED_ATTRIBUTES = OrderedDict([
+        ('name', ('name',)),
+        ('uri', ('uri',)),
+        ('serialNumber', ('serialNumber',)),
+        ('hostname', ('hostname', 'hostName', 'activeOaPreferredIP', 'standbyOaPreferredIP')),
+        ('ip', ('interconnectIP', 'ipAddress')),
+        ('scope', ('scopeUris',)),
+    ])
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS collections (appliance TEXT, collection TEXT, synced REAL, '
+        'PRIMARY KEY (appliance, collection))',
+        'CREATE TABLE IF NOT EXISTS resources (appliance TEXT, collection TEXT, uri TEXT, data TEXT, '
+        'PRIMARY KEY (appliance, collection, uri))',
+        'CREATE TABLE IF NOT EXISTS lookups (appliance TEXT, collection TEXT, attribute TEXT, value TEXT, uri TEXT)',
+        'CREATE INDEX IF NOT EXISTS lookups_by_value ON lookups (appliance, collection, attribute, value)',
+    )
+
+    def __init__(self, path, max_age=DEFAULT_MAX_AGE):
+        self.path = os.path.expanduser(path)
+        self.max_age = max_age
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates the inventory from the environment variables.
+        :return: OneViewInventory or None when the inventory is not enabled.
+        """
+        path = os.environ.get(cls.PATH_ENV)
+        if not path or not HAS_SQLITE3:
+            return None
+        return cls(path, int(os.environ.get(cls.MAX_AGE_ENV) or cls.DEFAULT_MAX_AGE))
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+                yield connection
+        finally:
+            connection.close()
+
+    @classmethod
+    def _lookups(cls, resource):
+        for index, attributes in cls.INDEXED_ATTRIBUTES.items():
+            values = set()
+            for attribute in attributes:
+                value = resource.get(attribute)
+                if isinstance(value, list):
+                    values.update(value)
+                elif value:
+                    values.add(value)
+            for value in values:
+                yield index, to_native(value)
+
+    @classmethod
+    def matches(cls, resource, index, value):
+        """
+        Tells whether a resource has an indexed value, ignoring the case like the lookups of the API.
+        :arg dict resource: Resource data.
+        :arg str index: Name of the index, one of INDEXED_ATTRIBUTES.
+        :arg value: Value of the indexed attribute.
+        :return: bool
+        """
+        value = to_native(value).lower()
+        return any(name == index and indexed.lower() == value for name, indexed in cls._lookups(resource))
+
+    def sync(self, appliance, collection, resources):
+        """
+        Replaces the resources of a collection in the inventory.
+        :arg str appliance: Appliance hostname or IP.
+        :arg str collection: URI of the collection.
+        :arg list resources: All the resources of the collection.
+        """
+        key = (appliance, collection)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM resources WHERE appliance = ? AND collection = ?', key)
+            connection.execute('DELETE FROM lookups WHERE appliance = ? AND collection = ?', key)
+            connection.executemany('INSERT INTO resources VALUES (?, ?, ?, ?)',
+                                   [key + (resource['uri'], json.dumps(resource)) for resource in resources])
+            connection.executemany('INSERT INTO lookups VALUES (?, ?, ?, ?, ?)',
+                                   [key + (index, value, resource['uri'])
+                                    for resource in resources for index, value in self._lookups(resource)])
+            connection.execute('INSERT OR REPLACE INTO collections VALUES (?, ?, ?)', key + (time.time(),))
+
+    def lookup(self, appliance, collection, index, value):
+        """
+        Resolves the URIs of the resources of a collection by an indexed value.
+        :arg str appliance: Appliance hostname or IP.
+        :arg str collection: URI of the collection.
+        :arg str index: Name of the index, one of INDEXED_ATTRIBUTES.
+        :arg value: Value of the indexed attribute.
+        :return: list: The URIs found, or None when the collection was not synced within the max age.
+        """
+        key = (appliance, collection)
+        with self._connect() as connection:
+            synced = connection.execute('SELECT synced FROM collections WHERE appliance = ? AND collection = ?',
+                                        key).fetchone()
+            if not synced or synced[0] < time.time() - self.max_age:
+                return None
+            rows = connection.execute('SELECT uri FROM lookups WHERE appliance = ? AND collection = ? '
+                                      'AND attribute = ? AND value = ? ORDER BY uri',
+                                      key + (index, to_native(value))).fetchall()
+        return [row[0] for row in rows]
+
+    def invalidate(self, appliance, collection, uri):
+        """
+        Removes a resource that changed or was removed since the collection was synced.
+        :arg str appliance: Appliance hostname or IP.
+        :arg str collection: URI of the collection.
+        :arg str uri: URI of the resource.
+        """
+        key = (appliance, collection, uri)
+        with self._connect() as connection:
+            connection.execute('DELETE FROM resources WHERE appliance = ? AND collection = ? AND uri = ?', key)
+            connection.execute('DELETE FROM lookups WHERE appliance = ? AND collection = ? AND uri = ?', key)
+
+
+class OneViewStateChangeListener(object):
+    """
+    Listens to the state-change message bus (SCMB) of the appliance, the AMQP stream where OneView publishes every
+    change of its resources, to wake the waits of a OneViewWaiter as soon as a change arrives.
+    It is enabled by setting the ONEVIEW_SCMB environment variable and requires the amqp Python package. The
+    connection authenticates with the RabbitMQ client certificate of the appliance, with the 'default' alias.
+    """
+    ENABLED_ENV = 'ONEVIEW_SCMB'
+    PORT = 5671
+    EXCHANGE = 'scmb'
+    KEY_PAIR_ALIAS = 'default'
+    POLL_INTERVAL = 1
+
+    def __init__(self, host, ca_certificates, certificate, key, routing_keys):
+        """
+        :arg str host: Hostname or IP of the appliance.
+        :arg str ca_certificates: PEM certificates of the appliance certificate authority.
+        :arg str certificate: PEM RabbitMQ client certificate.
+        :arg str key: PEM RabbitMQ client key.
+        :arg list routing_keys: Routing keys of the changes listened, like 'scmb.server-hardware.#'.
+        """
+        self.host = host
+        self.ca_certificates = ca_certificates
+        self.certificate = certificate
+        self.key = key
+        self.routing_keys = routing_keys
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._connection = None
+        self._thread = None
+
+    @classmethod
+    def from_environment(cls, oneview_client, routing_keys):
+        """
+        Creates and starts the listener when it is enabled, getting the certificates from the appliance.
+        The listener is not used when it cannot be started, since waits still poll the condition without it.
+        :arg oneview_client: The OneViewClient.
+        :arg list routing_keys: Routing keys of the changes listened.
+        :return: OneViewStateChangeListener or None when the listener is not enabled or cannot be started.
+        """
+        if not os.environ.get(cls.ENABLED_ENV) or not HAS_AMQP:
+            return None
+
+        try:
+            key_pair = oneview_client.certificate_rabbitmq.get_key_pair(cls.KEY_PAIR_ALIAS)
+            ca_certificates = '\n'.join(member['certificateDetails']['base64Data']
+                                        for member in oneview_client.certificate_authority.get_all())
+            listener = cls(oneview_client.connection.get_host(), ca_certificates, key_pair['base64SSLCertData'],
+                           key_pair['base64SSLKeyData'], routing_keys)
+            listener.start()
+            return listener
+        except Exception as exception:
+            logger.debug("State-change message bus not available, polling only: {0}".format(exception))
+            return None
+
+    def _ssl_context(self):
+        context = ssl.create_default_context(cadata=self.ca_certificates)
+        # the appliance certificate is issued for its own name, not for the address used to reach it
+        context.check_hostname = False
+        directory = tempfile.mkdtemp()
+        try:
+            paths = []
+            for name, content in (('certificate.pem', self.certificate), ('key.pem', self.key)):
+                paths.append(os.path.join(directory, name))
+                with os.fdopen(os.open(paths[-1], os.O_WRONLY | os.O_CREAT, 0o600), 'w') as pem_file:
+                    pem_file.write(content)
+            context.load_cert_chain(*paths)
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+        return context
+
+    def start(self):
+        """
+        Connects to the message bus and consumes the changes in a background thread.
+        """
+        self._connection = amqp.Connection('{0}:{1}'.format(self.host, self.PORT), login_method='EXTERNAL',
+                                           ssl=self._ssl_context())
+        self._connection.connect()
+        channel = self._connection.channel()
+        queue = channel.queue_declare(exclusive=True).queue
+        for routing_key in self.routing_keys:
+            channel.queue_bind(queue, exchange=self.EXCHANGE, routing_key=routing_key)
+        channel.basic_consume(queue, callback=self.notify, no_ack=True)
+
+        self._thread = threading.Thread(target=self._consume)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _consume(self):
+        while not self._stopped.is_set():
+            try:
+                self._connection.drain_events(timeout=self.POLL_INTERVAL)
+            except socket.timeout:
+                continue
+            except Exception as exception:
+                logger.debug("State-change message bus closed: {0}".format(exception))
+                break
+
+    def notify(self, message=None):
+        """
+        Wakes the current wait. Called for every message received.
+        """
+        self._changed.set()
+
+    def wait(self, timeout):
+        """
+        Waits until a change arrives or the timeout expires.
+        :arg float timeout: Maximum number of seconds to wait.
+        :return: bool: True when a change arrived.
+        """
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
+
+    def close(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(self.POLL_INTERVAL * 2)
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+
+
+class OneViewWaiter(object):
+    """
+    Waits for a condition, polling it with exponential backoff and jitter until a deadline.
+    When a OneViewStateChangeListener is given, the waits between polls end as soon as a change is published, so the
+    condition is checked again right away instead of on the next tick.
+    """
+    DEFAULT_TIMEOUT = 600
+    MSG_TIMEOUT = 'Timed out after {0} seconds waiting for {1}.'
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, initial_delay=1, max_delay=30, factor=2, listener=None,
+                 min_delay=0):
+        """
+        :arg float timeout: Seconds until the deadline of each wait.
+        :arg float initial_delay: Delay after the first poll. The delays grow by factor up to max_delay, and each
+            one is randomized between its half and its whole, so concurrent tasks do not poll in lockstep.
+        :arg float max_delay: Maximum delay between polls.
+        :arg float factor: Growth of the delay after each poll.
+        :arg OneViewStateChangeListener listener: Ends the delays when a change is published.
+        :arg float min_delay: Seconds of each delay that the changes of the listener cannot end, for the waits
+            whose routing keys also match changes unrelated to them.
+        """
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.listener = listener
+        self.min_delay = min_delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.listener:
+            self.listener.close()
+
+    def delay(self, attempt):
+        """
+        :arg int attempt: Number of the poll or attempt, starting at 1.
+        :return: float: The randomized delay after it, in seconds.
+        """
+        delay = min(self.initial_delay * self.factor ** (attempt - 1), self.max_delay)
+        return delay / 2.0 + random.uniform(0, delay / 2.0)
+
+    def sleep(self, seconds):
+        """
+        Sleeps, unless a change is published after the min_delay.
+        :arg float seconds: Maximum number of seconds to sleep.
+        """
+        if self.listener:
+            min_delay = min(self.min_delay, seconds)
+            if min_delay > 0:
+                time.sleep(min_delay)
+            self.listener.wait(seconds - min_delay)
+        else:
+            time.sleep(seconds)
+
+    def backoff(self, attempt):
+        """
+        Sleeps the delay after a failed attempt, before retrying it.
+        :arg int attempt: Number of the failed attempt, starting at 1.
+        """
+        self.sleep(self.delay(attempt))
+
+    def until(self, condition, description):
+        """
+        Polls the condition until it returns a truthy value.
+        :arg function condition: Function without arguments.
+        :arg str description: What is waited for, for the timeout message.
+        :return: The value returned by the condition.
+        """
+        deadline = time.time() + self.timeout
+        attempt = 0
+        while True:
+            attempt += 1
+            result = condition()
+            if result:
+                return result
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise OneViewModuleTimeoutError(self.MSG_TIMEOUT.format(self.timeout, description))
+            self.sleep(min(self.delay(attempt), remaining))
+
+
+class OneViewRetryPolicy(object):
+    """
+    Declarative retry of the operations that fail with a transient error of the appliance, like a concurrent
+    operation on the same resource. Only the failed operation is issued again, on the same client, backing off with a
+    OneViewWaiter until the deadline. The errors with other codes are raised at once.
+    """
+
+    def __init__(self, error_codes=(), timeout=OneViewWaiter.DEFAULT_TIMEOUT, initial_delay=1, max_delay=30,
+                 factor=2, routing_keys=()):
+        """
+        :arg list error_codes: The retryable OneView error codes.
+        :arg float timeout: Seconds after the first attempt when the error is raised instead of retried.
+        :arg float initial_delay: Delay before the first retry. See OneViewWaiter.
+        :arg float max_delay: Maximum delay between the retries.
+        :arg float factor: Growth of the delay after each retry.
+        :arg list routing_keys: Routing keys of the changes of the state-change message bus that end the delays,
+            when it is enabled. See OneViewStateChangeListener.
+        """
+        self.error_codes = frozenset(error_codes)
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.routing_keys = list(routing_keys)
+
+    @staticmethod
+    def error_code(exception):
+        """
+        :arg Exception exception: An exception of the SDK or of the modules.
+        :return: str: The OneView error code of the exception, or None.
+        """
+        error_code = getattr(exception, 'error_code', None)
+        if error_code:
+            return error_code
+        response = getattr(exception, 'oneview_response', None)
+        if isinstance(response, dict):
+            return response.get('errorCode')
+        return None
+
+    def is_retryable(self, exception):
+        return self.error_code(exception) in self.error_codes
+
+    def run(self, operation, create_waiter=None):
+        """
+        Runs the operation, retrying it while it fails with a retryable error and the deadline was not reached.
+        :arg function operation: Function without arguments.
+        :arg function create_waiter: Receives the keyword arguments of a OneViewWaiter and returns it, like
+            OneViewModule.create_waiter. Called on the first retry. Defaults to a OneViewWaiter without listener.
+        :return: The value returned by the operation.
+        """
+        deadline = time.time() + self.timeout
+        attempt = 0
+        waiter = None
+        try:
+            while True:
+                attempt += 1
+                try:
+                    return operation()
+                except Exception as exception:
+                    remaining = deadline - time.time()
+                    if not self.is_retryable(exception) or remaining <= 0:
+                        raise
+                    logger.debug("Retrying after error {0}, attempt {1}".format(self.error_code(exception), attempt))
+
+                if waiter is None:
+                    waiter_args = dict(timeout=self.timeout, initial_delay=self.initial_delay,
+                                       max_delay=self.max_delay, factor=self.factor)
+                    waiter = create_waiter(self.routing_keys, **waiter_args) if create_waiter \
+                        else OneViewWaiter(**waiter_args)
+                waiter.sleep(min(waiter.delay(attempt), remaining))
+        finally:
+            if waiter is not None:
+                waiter.close()
+
+
+SERVER_HARDWARE_ASSIGNMENT_STRATEGIES = ('first', 'random', 'hash', 'reservation')
+
+
+def _rendezvous_order(candidates, key):
+    # highest random weight hashing: each key prefers its own order of the candidates, stable when others change
+    return sorted(candidates, key=lambda uri: hashlib.sha256('{0}|{1}'.format(key, uri).encode('utf-8')).hexdigest(),
+                  reverse=True)
+
+
+class OneViewServerHardwareReservations(object):
+    """
+    Ledger of the server hardware chosen by the server profiles being created, shared by the forks running on the
+    same controller through a locked file, so parallel tasks do not choose the same server hardware.
+    The reservations expire after the TTL, when the server profile should already be assigned.
+    """
+    DEFAULT_TTL = 600
+
+    def __init__(self, directory, ttl=DEFAULT_TTL):
+        self.cache = OneViewFileCache(directory, 'reservations', ttl)
+        self.ttl = ttl
+
+    def reserve(self, appliance, candidates, owner):
+        """
+        Reserves one of the candidates for the owner, preferring the one already reserved by it, and then the free
+        candidates in the order of rendezvous hashing of the owner. When all of them are reserved by others, the first
+        one in that order is returned without reserving it, so the creation races for it and retries on a conflict
+        like with the other strategies, instead of leaving the server profile unassigned.
+        :arg str appliance: Hostname of the appliance.
+        :arg list candidates: URIs of the available server hardware.
+        :arg str owner: Name of the server profile.
+        :return: str: The URI of the chosen server hardware, or None when there are no candidates.
+        """
+        if not candidates:
+            return None
+
+        key = ['server-hardware', appliance]
+        with self.cache.lock(key):
+            now = time.time()
+            ledger = dict((uri, reservation) for uri, reservation in (self.cache.get(key) or {}).items()
+                          if reservation['expires'] > now)
+            reserved = [uri for uri in candidates if ledger.get(uri, {}).get('owner') == owner]
+            ordered = _rendezvous_order(candidates, owner)
+            free = [uri for uri in ordered if uri not in ledger]
+            if not reserved and not free:
+                return ordered[0]
+
+            chosen = (reserved or free)[0]
+            ledger[chosen] = dict(owner=owner, expires=now + self.ttl)
+            self.cache.set(key, ledger)
+            return chosen
+
+
+def choose_server_hardware(candidates, strategy='first', key=None, reservations=None, appliance=None):
+    """
+    Chooses the server hardware assigned to a new server profile among the available ones.
+    :arg list candidates: URIs of the available server hardware, in the order returned by the appliance.
+    :arg str strategy: One of SERVER_HARDWARE_ASSIGNMENT_STRATEGIES. C(first) chooses the first candidate,
+        C(random) a random one, C(hash) the first in the order of rendezvous hashing of the key, and C(reservation)
+        reserves one in the OneViewServerHardwareReservations, so parallel tasks choose different ones.
+    :arg str key: Name of the server profile, for the hash and reservation strategies.
+    :arg OneViewServerHardwareReservations reservations: The ledger of the reservation strategy.
+    :arg str appliance: Hostname of the appliance, for the reservation strategy.
+    :return: str: The URI of the server hardware, or None when there are no candidates.
+    """
+    if not candidates:
+        return None
+    if strategy == 'random':
+        return random.choice(candidates)
+    if strategy == 'hash':
+        return _rendezvous_order(candidates, key)[0]
+    if strategy == 'reservation':
+        return reservations.reserve(appliance, candidates, key)
+    return candidates[0]
+
+
+DEFAULT_TRANSFER_CHUNK_SIZE = 1048576
+
+
+def file_checksum(path, chunk_size=DEFAULT_TRANSFER_CHUNK_SIZE):
+    """
+    :arg str path: Path of a local file.
+    :arg int chunk_size: Size of the chunks read at a time.
+    :return: str: The SHA-256 checksum of the file.
+    """
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as local_file:
+        for chunk in iter(partial(local_file.read, chunk_size), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+class OneViewFileUpload(object):
+    """
+    Uploads a local file, like a firmware bundle or a golden image, to the appliance or to an Image Streamer.
+    The SDK upload functions run with a multipart POST that streams the file in fixed-size chunks, reporting the
+    progress, instead of copying the whole file to an encoded temporary file before sending it. The upload
+    endpoints have no range support, so a transfer interrupted by a network error is sent again from the start,
+    with backoff, up to 'attempts' times.
+    When 'checksum_dir' is set, the SHA-256 checksum of each uploaded file is recorded there with the URI of the
+    resource created by the upload, so the upload is skipped while the appliance still has that resource.
+    The file can also be streamed from a 'source' buffer with its content, like the memory mapping shared by the
+    uploads of an OneViewFileDistribution.
+    """
+    BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
+    LEDGER_TTL = 90 * 86400
+    PROGRESS_STEPS = 10
+
+    def __init__(self, connection, file_path, chunk_size=DEFAULT_TRANSFER_CHUNK_SIZE, checksum_dir=None, attempts=3,
+                 log=None, source=None, checksum=None):
+        """
+        :arg connection: The connection of the OneView or Image Streamer client.
+        :arg str file_path: Path of the local file.
+        :arg int chunk_size: Size of the chunks sent at a time.
+        :arg str checksum_dir: Directory of the ledger of the checksums of the uploaded files.
+        :arg int attempts: Maximum number of transfers of the file.
+        :arg function log: Receives the progress messages, like AnsibleModule.log.
+        :arg source: Buffer with the content of the file, streamed instead of reading the file.
+        :arg str checksum: SHA-256 checksum of the file, when already known.
+        """
+        self.connection = connection
+        self.file_path = os.path.expanduser(file_path)
+        self.chunk_size = chunk_size or DEFAULT_TRANSFER_CHUNK_SIZE
+        self.ledger = OneViewFileCache(checksum_dir, 'uploads', self.LEDGER_TTL) if checksum_dir else None
+        self.attempts = attempts
+        self.log = log or logger.debug
+        self.source = source
+        self.size = len(source) if source is not None else os.path.getsize(self.file_path)
+        self.checksum = checksum
+        if self.ledger and not self.checksum:
+            self.checksum = file_checksum(self.file_path, self.chunk_size)
+        self.transfers = 0
+        self.skipped = False
+
+    @property
+    def manifest(self):
+        """
+        :return: dict: The path, size and checksum of the file, the number of transfers and whether it was skipped.
+        """
+        return dict(path=self.file_path, size=self.size, checksum=self.checksum, transfers=self.transfers,
+                    skipped=self.skipped)
+
+    def _ledger_key(self, collection):
+        return [self.connection.get_host(), collection, self.checksum]
+
+    def find_uploaded(self, collection):
+        """
+        :arg str collection: URI of the collection of the uploaded resources, like '/rest/firmware-drivers'.
+        :return: dict: The resource created by a previous upload of the same file, when the appliance still has it.
+        """
+        if not self.ledger:
+            return None
+        uri = self.ledger.get(self._ledger_key(collection))
+        if not uri:
+            return None
+        try:
+            resource = self.connection.get(uri)
+        except HPEOneViewException:
+            self.ledger.invalidate(self._ledger_key(collection))
+            return None
+        self.skipped = True
+        return resource
+
+    def upload(self, collection, upload_function):
+        """
+        Runs an SDK upload function, streaming the file, and records the checksum of the file.
+        :arg str collection: URI of the collection of the uploaded resources.
+        :arg function upload_function: Function without arguments that uploads the file with the SDK.
+        :return: The value returned by the upload function.
+        """
+        self.connection.post_multipart = self.post_multipart
+        try:
+            result = upload_function()
+        finally:
+            del self.connection.post_multipart
+
+        uri = result.get('uri') if isinstance(result, dict) else None
+        if self.ledger and uri:
+            self.ledger.set(self._ledger_key(collection), uri)
+        return result
+
+    def _parts(self, base_name):
+        preamble = ('--{0}\r\nContent-Disposition: form-data; name="file"; filename="{1}"\r\n'
+                    'Content-Type: application/octet-stream\r\n\r\n').format(self.BOUNDARY, base_name)
+        epilogue = '\r\n--{0}--\r\n\r\n'.format(self.BOUNDARY)
+        return preamble.encode('utf-8'), epilogue.encode('utf-8')
+
+    def post_multipart(self, uri, fields, files, baseName, verbose=False):
+        """
+        Replaces the post_multipart of the connection during the upload. Same arguments and return.
+        """
+        waiter = OneViewWaiter()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.transfers += 1
+            try:
+                return self._send(uri, baseName)
+            except (IOError, OSError, six.moves.http_client.HTTPException) as exception:
+                if attempt >= self.attempts:
+                    raise
+                self.log("Upload of {0} interrupted: {1}. Sending it again.".format(self.file_path, exception))
+                waiter.backoff(attempt)
+
+    def _chunks(self):
+        if self.source is not None:
+            # the mmap of Python 2 has no memoryview, its slices are copies of the chunks
+            view = self.source if six.PY2 else memoryview(self.source)
+            for offset in range(0, self.size, self.chunk_size):
+                yield view[offset:offset + self.chunk_size]
+            return
+
+        with open(self.file_path, 'rb') as local_file:
+            for chunk in iter(partial(local_file.read, self.chunk_size), b''):
+                yield chunk
+
+    def _send(self, uri, base_name):
+        preamble, epilogue = self._parts(base_name)
+        checksum = hashlib.sha256()
+        step = max(self.size // self.PROGRESS_STEPS, 1)
+        conn = self.connection.get_connection()
+        try:
+            conn.connect()
+            conn.putrequest('POST', uri)
+            conn.putheader('uploadfilename', base_name)
+            conn.putheader('auth', self.connection._headers['auth'])
+            conn.putheader('Content-Type', 'multipart/form-data; boundary={0}'.format(self.BOUNDARY))
+            conn.putheader('Content-Length', len(preamble) + self.size + len(epilogue))
+            conn.putheader('X-API-Version', self.connection._apiVersion)
+            conn.endheaders()
+
+            conn.send(preamble)
+            sent = 0
+            for chunk in self._chunks():
+                conn.send(chunk)
+                checksum.update(chunk)
+                if (sent + len(chunk)) // step > sent // step:
+                    self.log("Uploading {0}: {1} of {2} bytes sent.".format(self.file_path, sent + len(chunk),
+                                                                            self.size))
+                sent += len(chunk)
+            conn.send(epilogue)
+
+            response = conn.getresponse()
+            body = response.read().decode('utf-8')
+        finally:
+            conn.close()
+
+        self.checksum = checksum.hexdigest()
+        if body:
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        if response.status >= 400:
+            raise HPEOneViewException(body)
+        return response, body
+
+
+class OneViewFileDistribution(object):
+    """
+    Uploads the same local file to many appliances, like a golden image replicated to several Image Streamers, with
+    at most 'max_concurrency' uploads at the same time. The file is mapped in memory once, and the uploads stream it
+    from that shared mapping instead of each of them reading it from the disk. The checksum is computed only once.
+    A failed upload does not stop the others, and the status of each target is reported.
+    """
+    STATUS_UPLOADED = 'uploaded'
+    STATUS_PRESENT = 'present'
+    STATUS_FAILED = 'failed'
+
+    def __init__(self, file_path, chunk_size=DEFAULT_TRANSFER_CHUNK_SIZE, checksum_dir=None,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, log=None):
+        """
+        :arg str file_path: Path of the local file.
+        :arg int chunk_size: Size of the chunks sent at a time.
+        :arg str checksum_dir: Directory of the ledger of the checksums of the uploaded files.
+        :arg int max_concurrency: Maximum number of simultaneous uploads.
+        :arg function log: Receives the progress messages, like AnsibleModule.log.
+        """
+        self.file_path = os.path.expanduser(file_path)
+        self.chunk_size = chunk_size
+        self.checksum_dir = checksum_dir
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.log = log
+
+    @contextmanager
+    def _mapped_file(self):
+        with open(self.file_path, 'rb') as local_file:
+            if not os.fstat(local_file.fileno()).st_size:
+                # empty files cannot be mapped
+                yield b''
+                return
+            source = mmap.mmap(local_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield source
+        finally:
+            try:
+                source.close()
+            except BufferError:
+                # a chunk is still referenced by an error; the mapping is closed when it is collected
+                pass
+
+    def distribute(self, targets, upload_target):
+        """
+        :arg list targets: Pairs of name and connection of each target, like the hostname of an Image Streamer and
+            the connection of its client.
+        :arg function upload_target: Function with the name of a target and the OneViewFileUpload to it. It returns
+            whether it uploaded the file, with the OneViewFileUpload, and the resource uploaded or already present.
+        :return: list: The name, status, resource URI, number of transfers, duration in seconds and throughput in
+            bytes per second of the upload to each target, in the order of the targets.
+        """
+        with self._mapped_file() as source:
+            checksum = hashlib.sha256(source).hexdigest() if self.checksum_dir else None
+
+            def distribute_to(target):
+                name, connection = target
+                upload = OneViewFileUpload(connection, self.file_path, self.chunk_size, self.checksum_dir,
+                                           log=self.log, source=source, checksum=checksum)
+                started = time.time()
+                try:
+                    uploaded, resource = upload_target(name, upload)
+                except Exception as exception:
+                    return dict(name=name, status=self.STATUS_FAILED, transfers=upload.transfers,
+                                seconds=round(time.time() - started, 3),
+                                msg=getattr(exception, 'msg', None) or to_native(exception))
+
+                seconds = time.time() - started
+                status = dict(name=name, status=self.STATUS_UPLOADED if uploaded else self.STATUS_PRESENT,
+                              uri=resource.get('uri') if isinstance(resource, dict) else None,
+                              transfers=upload.transfers, seconds=round(seconds, 3))
+                if uploaded:
+                    status['bytes_per_second'] = int(upload.size / seconds) if seconds else None
+                return status
+
+            return list(iter_concurrently(distribute_to, list(targets), self.max_concurrency))
+
+
+def create_image_streamer_client(oneview_client, hostname):
+    """
+    Creates the client of an Image Streamer appliance, other than the one of the module configuration, that shares
+    the session of the OneView client.
+    :arg OneViewClient oneview_client: The OneView client.
+    :arg str hostname: IP address or hostname of the Image Streamer appliance.
+    :return: ImageStreamerClient
+    """
+    connection = oneview_client.connection
+    return ImageStreamerClient(hostname, connection.get_session_id(), connection._apiVersion, connection._sslBundle)
+
+
+class OneViewFileDownload(object):
+    """
+    Downloads a file, like an artifact bundle, a backup or a golden image, from the appliance or from an Image
+    Streamer in fixed-size chunks, reporting the progress, to a '.part' file next to the destination. The file is
+    verified against the size announced by the appliance and only then renamed to the destination, so an interrupted
+    download never leaves a truncated file in its place. A transfer interrupted by a network error resumes from the
+    received bytes with a range request, or starts again when the appliance does not support them, with backoff, up
+    to 'attempts' times.
+    When 'checksum_dir' is set, the version of the resource and the size, modification time and checksum of each
+    downloaded file are recorded there, so a download is skipped while the destination is unchanged and the resource
+    has the same version, and an interrupted download resumes on the next run.
+    """
+    PART_SUFFIX = '.part'
+    LEDGER_TTL = 90 * 86400
+    PROGRESS_STEPS = 10
+    MAX_REDIRECTS = 3
+    HEADERS = {'Accept': 'application/octetstream;q=0.8, application/json'}
+
+    MSG_INCOMPLETE = 'Download of {0} incomplete: {1} of {2} bytes received.'
+    MSG_UNEXPECTED_RANGE = 'Download of {0} resumed at byte {1} instead of {2}.'
+    MSG_TOO_MANY_REDIRECTS = 'Download of {0} redirected more than {1} times.'
+
+    def __init__(self, connection, uri, destination, version=None, chunk_size=DEFAULT_TRANSFER_CHUNK_SIZE,
+                 checksum_dir=None, attempts=3, log=None):
+        """
+        :arg connection: The connection of the OneView or Image Streamer client.
+        :arg str uri: URI of the downloaded file, like '/rest/artifact-bundles/download/<id>'.
+        :arg str destination: Path of the local file.
+        :arg str version: Version of the downloaded resource, like its eTag or modified date.
+        :arg int chunk_size: Size of the chunks written at a time.
+        :arg str checksum_dir: Directory of the ledger of the downloaded files.
+        :arg int attempts: Maximum number of transfers of the file.
+        :arg function log: Receives the progress messages, like AnsibleModule.log.
+        """
+        self.connection = connection
+        self.uri = uri
+        self.destination = os.path.expanduser(destination)
+        self.part_path = self.destination + self.PART_SUFFIX
+        self.version = version
+        self.chunk_size = chunk_size or DEFAULT_TRANSFER_CHUNK_SIZE
+        self.ledger = OneViewFileCache(checksum_dir, 'downloads', self.LEDGER_TTL) if checksum_dir else None
+        self.attempts = attempts
+        self.log = log or logger.debug
+        self.size = None
+        self.checksum = None
+        self.etag = None
+        self.transfers = 0
+        self.resumed_from = 0
+        self.skipped = False
+
+    @property
+    def manifest(self):
+        """
+        :return: dict: The path, size and checksum of the file, the number of transfers, the byte the last transfer
+            resumed from and whether the download was skipped.
+        """
+        return dict(path=self.destination, size=self.size, checksum=self.checksum, transfers=self.transfers,
+                    resumed_from=self.resumed_from, skipped=self.skipped)
+
+    def _ledger_key(self, kind):
+        return [self.connection.get_host(), self.uri, self.destination, kind]
+
+    def _ledger_get(self, kind):
+        entry = self.ledger.get(self._ledger_key(kind)) if self.ledger and self.version else None
+        return entry if entry and entry.get('version') == self.version else None
+
+    def is_downloaded(self):
+        """
+        :return: bool: Whether the destination is the file downloaded for this version of the resource.
+        """
+        downloaded = self._ledger_get('downloaded')
+        if not downloaded or not os.path.isfile(self.destination):
+            return False
+        stat = os.stat(self.destination)
+        if stat.st_size != downloaded['size'] or stat.st_mtime != downloaded['mtime']:
+            return False
+        self.size = downloaded['size']
+        self.checksum = downloaded['checksum']
+        self.skipped = True
+        return True
+
+    def download(self):
+        """
+        Downloads the file, unless the destination is already the file downloaded for this version of the resource.
+        :return: bool: Whether the file was downloaded.
+        """
+        if self.is_downloaded():
+            return False
+
+        partial_download = self._ledger_get('partial')
+        if partial_download:
+            self.etag = partial_download.get('etag')
+        elif os.path.exists(self.part_path):
+            # a part left by a download of an unknown version cannot be resumed
+            os.remove(self.part_path)
+
+        waiter = OneViewWaiter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._transfer()
+                break
+            except (IOError, OSError, six.moves.http_client.HTTPException) as exception:
+                if attempt >= self.attempts:
+                    raise
+                self.log("Download of {0} interrupted: {1}. Resuming it.".format(self.destination, exception))
+                waiter.backoff(attempt)
+
+        os.rename(self.part_path, self.destination)
+        if self.ledger and self.version:
+            self.ledger.set(self._ledger_key('downloaded'), dict(
+                version=self.version, size=self.size, mtime=os.stat(self.destination).st_mtime,
+                checksum=self.checksum))
+            self.ledger.invalidate(self._ledger_key('partial'))
+        return True
+
+    def _request(self, headers):
+        uri = self.uri
+        for _ in range(self.MAX_REDIRECTS + 1):
+            conn = self.connection.get_connection()
+            try:
+                conn.request('GET', uri, '', headers)
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+
+            if response.status in (301, 302, 303, 307):
+                uri = response.getheader('Location')
+                conn.close()
+            elif response.status >= 400 and response.status != 416:
+                body = response.read().decode('utf-8')
+                conn.close()
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    pass
+                raise HPEOneViewException(body)
+            else:
+                return conn, response
+        raise HPEOneViewException(self.MSG_TOO_MANY_REDIRECTS.format(self.uri, self.MAX_REDIRECTS))
+
+    def _transfer(self):
+        headers = dict(self.connection._headers, **self.HEADERS)
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        if offset:
+            headers['Range'] = 'bytes={0}-'.format(offset)
+            if self.etag:
+                headers['If-Range'] = self.etag
+
+        self.transfers += 1
+        conn, response = self._request(headers)
+        try:
+            if response.status == 416:
+                # the part does not fit the file anymore
+                os.remove(self.part_path)
+                raise IOError(self.MSG_UNEXPECTED_RANGE.format(self.destination, offset, 0))
+
+            checksum = hashlib.sha256()
+            if response.status == 206:
+                start, total = self._content_range(response)
+                if start != offset:
+                    os.remove(self.part_path)
+                    raise IOError(self.MSG_UNEXPECTED_RANGE.format(self.destination, start, offset))
+                with open(self.part_path, 'rb') as part_file:
+                    for chunk in iter(partial(part_file.read, self.chunk_size), b''):
+                        checksum.update(chunk)
+                mode = 'ab'
+                self.resumed_from = offset
+            else:
+                total = response.getheader('Content-Length')
+                total = int(total) if total is not None else None
+                offset = 0
+                mode = 'wb'
+                self.resumed_from = 0
+
+            self.etag = response.getheader('ETag') or self.etag
+            if self.ledger and self.version:
+                self.ledger.set(self._ledger_key('partial'), dict(version=self.version, etag=self.etag))
+
+            received = offset
+            step = max((total or 0) // self.PROGRESS_STEPS, 1)
+            with open(self.part_path, mode) as part_file:
+                for chunk in iter(partial(response.read, self.chunk_size), b''):
+                    part_file.write(chunk)
+                    checksum.update(chunk)
+                    if total and (received + len(chunk)) // step > received // step:
+                        self.log("Downloading {0}: {1} of {2} bytes received.".format(self.destination,
+                                                                                      received + len(chunk), total))
+                    received += len(chunk)
+        finally:
+            conn.close()
+
+        if total is not None and received != total:
+            raise IOError(self.MSG_INCOMPLETE.format(self.destination, received, total))
+        self.size = received
+        self.checksum = checksum.hexdigest()
+
+    @staticmethod
+    def _content_range(response):
+        # Content-Range: bytes <start>-<end>/<total or *>
+        byte_range, total = response.getheader('Content-Range', '').split(' ')[-1].split('/')
+        return int(byte_range.split('-')[0]), int(total) if total.isdigit() else None
+
+
+def create_cached_oneview_client(params):
+    """
+    Creates the OneViewClient through the session and API version caches, when any of them is enabled.
+    A cached API version rejected by the appliance is dropped and negotiated again.
+    :arg dict params: Module parameters.
+    :return: OneViewClient or None when no cache is enabled.
+    """
+    session_cache = OneViewSessionCache.from_environment()
+    version_cache = OneViewApiVersionCache.from_environment()
+    if not session_cache and not version_cache:
+        return None
+
+    def create_client(config):
+        if session_cache:
+            return session_cache.create_client(config)
+        return OneViewClient(deepcopy(config))
+
+    config = build_oneview_config(params)
+    original_api_version = config.get('api_version')
+    cached_version_applied = version_cache and version_cache.apply(config)
+
+    try:
+        oneview_client = create_client(config)
+    except HPEOneViewException:
+        if not cached_version_applied:
+            raise
+        logger.debug("Cached API version was rejected by the appliance. Negotiating it again.")
+        version_cache.invalidate(config.get('ip'))
+        config['api_version'] = original_api_version
+        cached_version_applied = False
+        oneview_client = create_client(config)
+
+    if version_cache and not original_api_version and not cached_version_applied:
+        version_cache.store(config, oneview_client.api_version)
+
+    return oneview_client
+
+
+def create_oneview_client(params):
+    """
+    Creates the OneViewClient from the connection parameters of the modules: through the session and API version
+    caches when any of them is enabled, from the hostname and credentials, from the environment variables when no
+    config file is set, or from the config file.
+    :arg dict params: Module parameters.
+    :return: OneViewClient
+    """
+    cached_client = create_cached_oneview_client(params)
+    if cached_client:
+        return cached_client
+    elif params.get('hostname'):
+        return OneViewClient(build_oneview_config(params))
+    elif not params.get('config'):
+        return OneViewClient.from_environment_variables()
+    else:
+        return OneViewClient.from_json_file(params['config'])
+
+
 # @six.add_metaclass(abc.ABCMeta)
 class OneViewModule(object):
     MSG_CREATED = 'Resource created successfully.'
@@ -511,34 +2254,72 @@ class OneViewModule(object):
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
 
-    def __init__(self, additional_arg_spec=None, validate_etag_support=False):
+    DEFAULT_MAX_CONCURRENCY = DEFAULT_MAX_CONCURRENCY
+    ONEVIEW_STREAM_ARGS = dict(stream_to=dict(type='path'), page_size=dict(type='int', default=DEFAULT_STREAM_PAGE_SIZE))
+    ONEVIEW_CONCURRENCY_ARGS = dict(max_concurrency=dict(type='int', default=DEFAULT_MAX_CONCURRENCY))
+    BATCH_STATES = ['present', 'absent']
+    ONEVIEW_BATCH_ARGS = dict(items=dict(type='list', elements='dict',
+                                         options=dict(data=dict(type='dict', required=True),
+                                                      state=dict(type='str', choices=BATCH_STATES))),
+                              **ONEVIEW_CONCURRENCY_ARGS)
+
+    MSG_BATCH_APPLIED = '{0} created, {1} updated, {2} deleted.'
+    MSG_BATCH_FAILED = 'Failed to apply {0} of {1} items: {2}'
+    MSG_BATCH_DUPLICATED_NAME = 'Duplicated name in items: {0}'
+    MSG_BATCH_ITEM_DATA_MISSING = 'Missing mandatory field in item: data'
+    MSG_BATCH_INVALID_STATE = 'Invalid state of item {0}: {1}. Valid states: {2}.'
+    MSG_UNKNOWN_FIELDS = 'Unknown fields of {0}: {1}. Known fields: {2}.'
+    MSG_FIELDS_NOT_SUPPORTED = 'This module does not support fields.'
+    MSG_NAMES_NOT_FOUND = 'Resources not found: {0}'
+
+    ONEVIEW_FACTS_FIELDS_ARGS = dict(fields=dict(type='list', elements='str'))
+    ONEVIEW_SNAPSHOT_ARGS = dict(snapshot_dir=dict(type='path'),
+                                 snapshot_ttl=dict(type='int', default=OneViewFactsSnapshot.DEFAULT_TTL))
+    ONEVIEW_TRANSFER_ARGS = dict(chunk_size=dict(type='int', default=DEFAULT_TRANSFER_CHUNK_SIZE),
+                                 checksum_dir=dict(type='path'))
+
+    # The retryable errors of the module, used by retry. Modules register their error codes overriding it.
+    RETRY_POLICY = OneViewRetryPolicy()
+
+    def __init__(self, additional_arg_spec=None, validate_etag_support=False, batch_support=False):
         """
         OneViewModuleBase constructor.
         :arg dict additional_arg_spec: Additional argument spec definition.
         :arg bool validate_etag_support: Enables support to eTag validation.
+        :arg bool batch_support: Accepts an 'items' list to manage many resources in a single task, as an
+            alternative to 'data'. See execute_batch.
+        Facts modules, the ones with 'params' and without 'state', also accept 'fields'. See prepare_facts_fields.
         """
-        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support)
+        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support, batch_support)
 
-        self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+        if batch_support:
+            self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True,
+                                        required_one_of=[['data', 'items']], mutually_exclusive=[['data', 'items']])
+        else:
+            self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
         self.resource_client = None
         self.current_resource = None
+        self.diff = None
 
         self.state = self.module.params.get('state')
         self.data = self.module.params.get('data')
+        self.items = self.module.params.get('items') if batch_support else None
 
         self._check_hpe_oneview_sdk()
         self._create_oneview_client()
+        self.inventory = OneViewInventory.from_environment()
 
         # Preload params for get_all - used by facts
         self.facts_params = self.module.params.get('params') or {}
+        self.facts_fields = self.module.params.get('fields')
 
         # Preload options as dict - used by facts
         self.options = transform_list_to_dict(self.module.params.get('options'))
 
         self.validate_etag_support = validate_etag_support
 
-    def _build_argument_spec(self, additional_arg_spec, validate_etag_support):
+    def _build_argument_spec(self, additional_arg_spec, validate_etag_support, batch_support=False):
 
         merged_arg_spec = dict()
         merged_arg_spec.update(self.ONEVIEW_COMMON_ARGS)
@@ -549,6 +2330,15 @@ class OneViewModule(object):
         if additional_arg_spec:
             merged_arg_spec.update(additional_arg_spec)
 
+        if 'params' in merged_arg_spec and 'state' not in merged_arg_spec:
+            merged_arg_spec.update(self.ONEVIEW_FACTS_FIELDS_ARGS)
+
+        if batch_support:
+            merged_arg_spec.update(self.ONEVIEW_BATCH_ARGS)
+            # either data or items is required
+            if 'data' in merged_arg_spec:
+                merged_arg_spec['data'] = dict(merged_arg_spec['data'], required=False)
+
         return merged_arg_spec
 
     def _check_hpe_oneview_sdk(self):
@@ -556,17 +2346,7 @@ class OneViewModule(object):
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
     def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
-        else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+        self.oneview_client = create_oneview_client(self.module.params)
 
     def set_resource_object(self, resource_client, name=None):
         self.resource_client = resource_client
@@ -585,10 +2365,38 @@ class OneViewModule(object):
                 uri = self.module.params["uri"]
 
         if name:
-            self.current_resource = self.resource_client.get_by_name(name)
+            self.current_resource = self.get_by_index('name', name, partial(self.resource_client.get_by_name, name))
         elif uri:
             self.current_resource = self.resource_client.get_by_uri(uri)
 
+    def get_by_index(self, index, value, fallback, resource_client=None):
+        """
+        Gets a resource by an indexed value, resolving its URI from the inventory when it is enabled.
+        See OneViewInventory.
+        :arg str index: Name of the index, one of OneViewInventory.INDEXED_ATTRIBUTES.
+        :arg value: Value of the indexed attribute.
+        :arg fallback: Function without arguments that looks the resource up through the API, called when the
+            inventory is not enabled, is stale or misses the resource, or when the resource no longer has the value.
+        :arg resource_client: Resource client of the collection. Defaults to the resource client of the module.
+        :return: The resource object returned by get_by_uri or by the fallback.
+        """
+        resource_client = resource_client or self.resource_client
+        collection = getattr(resource_client, 'URI', None)
+        if self.inventory and collection:
+            appliance = self.oneview_client.connection.get_host()
+            uris = self.inventory.lookup(appliance, collection, index, value)
+            if uris:
+                try:
+                    resource = resource_client.get_by_uri(uris[0])
+                except HPEOneViewException:
+                    logger.debug("Resource {0} of the inventory was not found. Looking it up.".format(uris[0]))
+                else:
+                    if self.inventory.matches(resource.data, index, value):
+                        return resource
+                    logger.debug("Resource {0} of the inventory changed its {1}. Looking it up.".format(uris[0], index))
+                self.inventory.invalidate(appliance, collection, uris[0])
+        return fallback()
+
     @abc.abstractmethod
     def execute_module(self):
         """
@@ -610,7 +2418,13 @@ class OneViewModule(object):
                 if not self.module.params.get('validate_etag'):
                     self.oneview_client.connection.disable_etag_validation()
 
-            result = self.execute_module()
+            if self.facts_fields:
+                self.prepare_facts_fields()
+
+            if self.items:
+                result = self.execute_batch()
+            else:
+                result = self.execute_module()
 
             if not result:
                 result = {}
@@ -618,12 +2432,294 @@ class OneViewModule(object):
             if "changed" not in result:
                 result['changed'] = False
 
+            if self.diff is not None and self.module._diff and 'diff' not in result:
+                result['diff'] = self.diff
+
             self.module.exit_json(**result)
 
         except OneViewModuleException as exception:
             error_msg = '; '.join(to_native(e) for e in exception.args)
             self.module.fail_json(msg=error_msg, exception=traceback.format_exc())
 
+    def prepare_facts_fields(self):
+        """
+        Prepares the get_all of the facts modules to return only the 'fields' of each resource.
+        The fields are validated against FACTS_FIELDS_REGISTRY and the resource client is replaced by a
+        OneViewFieldsProjection, which requests them as a server side projection, through the helper of the
+        resource objects of the SDK when their get_all does not accept them, and projects them client side otherwise.
+        """
+        if self.resource_client is None:
+            raise OneViewModuleValueError(self.MSG_FIELDS_NOT_SUPPORTED)
+
+        validate_facts_fields(getattr(self.resource_client, 'URI', None), self.facts_fields)
+
+        self.resource_client = OneViewFieldsProjection(self.resource_client, self.facts_fields)
+
+    def set_diff(self, before, after):
+        """
+        Records the changes of the resource, returned as the diff result when Ansible runs with --diff.
+        :arg dict before: Resource before the changes.
+        :arg dict after: Resource after the changes.
+        :return: list: The JSON Patch with the changes.
+        """
+        patch = json_patch(before, after)
+        self.diff = dict(before=before, after=after, patch=patch)
+        return patch
+
+    def prepare_batch(self, items_data):
+        """
+        Hook called by execute_batch with the data of all items before they are compared with the current
+        resources. Modules override it to validate the data or replace names by URIs for all the items at once.
+        :arg list items_data: Data of each item, changed in place.
+        """
+        pass
+
+    def execute_batch(self):
+        """
+        Generic implementation of the present and absent states for a list of resources, used instead of
+        execute_module when the module receives the 'items' parameter. Each item has the 'data' of a resource
+        and optionally its 'state', which defaults to the module state.
+        All current resources are retrieved with a single get_all, the items to create, update or delete are worked
+        out locally and the changes are applied with at most 'max_concurrency' simultaneous requests.
+        :return: A dictionary with the results of each item, in the items order, and the aggregate changed.
+        """
+        items = []
+        names = set()
+        for item in self.items:
+            if not item.get('data'):
+                raise OneViewModuleValueError(self.MSG_BATCH_ITEM_DATA_MISSING)
+            data = deepcopy(item['data'])
+            if not data.get('name'):
+                raise OneViewModuleValueError(self.MSG_MANDATORY_FIELD_MISSING)
+            if data['name'] in names:
+                raise OneViewModuleValueError(self.MSG_BATCH_DUPLICATED_NAME.format(data['name']))
+            names.add(data['name'])
+            state = item.get('state') or self.state
+            if state not in self.BATCH_STATES:
+                raise OneViewModuleValueError(self.MSG_BATCH_INVALID_STATE.format(
+                    data['name'], state, ', '.join(self.BATCH_STATES)))
+            items.append((state, data))
+
+        self.prepare_batch([data for state, data in items])
+
+        current_resources = dict((resource['name'], resource) for resource in self.resource_client.get_all())
+        plan = [self._plan_batch_item(state, data, current_resources.get(data['name'])) for state, data in items]
+
+        results = self._apply_batch(plan)
+
+        failed = [result for result in results if result.get('failed')]
+        changed = any(result['changed'] for result in results)
+
+        if failed:
+            self.module.fail_json(msg=self.MSG_BATCH_FAILED.format(len(failed), len(results), '; '.join(
+                '{0}: {1}'.format(result['name'], result['msg']) for result in failed)), changed=changed, items=results)
+
+        actions = [item['action'] for item in plan]
+        return dict(changed=changed,
+                    msg=self.MSG_BATCH_APPLIED.format(actions.count('create'), actions.count('update'),
+                                                      actions.count('delete')),
+                    items=results)
+
+    def _plan_batch_item(self, state, data, current):
+        scope_uris = data.pop('scopeUris', None)
+        if "newName" in data:
+            data["name"] = data.pop("newName")
+
+        item = dict(action=None, state=state, data=data, current=current, scope_uris=None)
+
+        if state == 'absent':
+            if current:
+                item['action'] = 'delete'
+            return item
+
+        if not current:
+            item['action'] = 'create'
+            if scope_uris:
+                item['scope_uris'] = scope_uris
+            return item
+
+        merged_data = dict_merge(current, data)
+        if not compare(current, merged_data):
+            item.update(action='update', data=merged_data)
+        else:
+            item['data'] = current
+
+        if scope_uris is not None and (current.get('scopeUris') is None or set(current['scopeUris']) != set(scope_uris)):
+            item['action'] = item['action'] or 'scopes'
+            item['scope_uris'] = scope_uris
+
+        return item
+
+    def _apply_batch(self, plan):
+        pending = [item for item in plan if item['action']]
+        if not pending or self.module.check_mode:
+            return [self._batch_item_result(item, item['data'], changed=bool(item['action'])) for item in plan]
+
+        # _apply_batch_item records the errors of each item instead of raising them
+        applied = iter(self.run_concurrently(
+            (index, partial(self._apply_batch_item, item)) for index, item in enumerate(pending)).values())
+
+        return [next(applied) if item['action'] else self._batch_item_result(item, item['data'], changed=False)
+                for item in plan]
+
+    def get_all_facts(self):
+        """
+        Lists the resources of a facts module with the facts params. When 'snapshot_dir' is set and the whole
+        collection is requested, the listing is refreshed incrementally from a local snapshot.
+        See OneViewFactsSnapshot.
+        :return: list: The resources.
+        """
+        snapshot_dir = self.module.params.get('snapshot_dir')
+        params = dict((key, value) for key, value in self.facts_params.items() if key not in ('start', 'count'))
+        paginated = self.facts_params.get('start', 0) != 0 or self.facts_params.get('count', -1) != -1
+        if not snapshot_dir or paginated:
+            return self.resource_client.get_all(**self.facts_params)
+
+        # the projected resources of 'fields' are kept apart from the whole ones
+        key = [self.oneview_client.connection.get_host(), self.module.params.get('api_version'),
+               getattr(self.resource_client, 'URI', None), params, sorted(self.facts_fields or [])]
+        snapshot = OneViewFactsSnapshot(snapshot_dir,
+                                        self.module.params.get('snapshot_ttl') or OneViewFactsSnapshot.DEFAULT_TTL)
+        return snapshot.refresh(key, self.resource_client.get_all, self._list_uris, params)
+
+    def _list_uris(self, **params):
+        resource_client = self.resource_client
+        if isinstance(resource_client, OneViewFieldsProjection):
+            resource_client = resource_client.resource_client
+
+        return [resource['uri'] for resource in get_all_projected(resource_client, ['uri'], **params)]
+
+    def run_concurrently(self, calls, timings=None):
+        """
+        Runs independent calls with at most 'max_concurrency' simultaneous requests, when the module has this
+        argument. See the run_concurrently function.
+        :arg list calls: Pairs of key and function without arguments.
+        :arg dict timings: When given, receives the duration in seconds of each call, by key.
+        :return: OrderedDict: The value returned by each function, by key, in the order of the calls.
+        """
+        return run_concurrently(calls, self.module.params.get('max_concurrency') or self.DEFAULT_MAX_CONCURRENCY,
+                                timings)
+
+    def is_multi_resource_facts(self):
+        """
+        Tells whether a facts module gathers its 'options' for many resources, instead of for the resource of
+        'name': when 'names' is set, or when the facts params have a 'filter' and 'name' is not set.
+        :return: bool
+        """
+        if self.module.params.get('name') or not self.options:
+            return False
+        return bool(self.module.params.get('names') or self.facts_params.get('filter'))
+
+    def get_resources_by_names(self):
+        """
+        Resolves the resources of a multi-resource facts module from a single listing, with the facts params.
+        When 'names' is set, only the named resources are returned, in the order of the names.
+        :return: list: The resources.
+        """
+        resources = self.get_all_facts()
+        names = self.module.params.get('names')
+        if not names:
+            return resources
+
+        by_name = dict((resource.get('name'), resource) for resource in resources)
+        names = list(OrderedDict.fromkeys(names))
+        missing = [name for name in names if name not in by_name]
+        if missing:
+            raise OneViewModuleResourceNotFound(self.MSG_NAMES_NOT_FOUND.format(', '.join(missing)))
+        return [by_name[name] for name in names]
+
+    def gather_options_by_uri(self, resources, get_option_calls):
+        """
+        Gathers the options of many resources, requesting the options of at most 'max_concurrency' resources at
+        the same time. When 'stream_to' is set, the options of each resource are written to that NDJSON file as soon
+        as they are gathered, as one line with the facts of the options and the 'uri' of the resource.
+        The options of all resources are gathered even when some of them fail.
+        :arg list resources: The resources, as returned by get_all.
+        :arg function get_option_calls: Receives a resource object and returns its pairs of fact name and function
+            without arguments that gets the option.
+        :return: The facts of the options of each resource by URI, or the manifest of the file when 'stream_to'
+            is set.
+        """
+        connection = self.oneview_client.connection
+        resource_client = self.resource_client
+
+        def gather(resource):
+            try:
+                resource_object = resource_client.new(connection, resource)
+                options = OrderedDict((fact, function()) for fact, function in get_option_calls(resource_object))
+                return resource['uri'], True, options
+            except Exception as exception:
+                return resource['uri'], False, exception
+
+        max_concurrency = self.module.params.get('max_concurrency') or self.DEFAULT_MAX_CONCURRENCY
+
+        def gathered():
+            errors = OrderedDict()
+            for uri, succeeded, value in iter_concurrently(gather, resources, max_concurrency):
+                if succeeded:
+                    yield uri, value
+                else:
+                    errors[uri] = value
+            if errors:
+                raise OneViewModuleConcurrentCallsError(errors)
+
+        stream_to = self.module.params.get('stream_to')
+        if stream_to:
+            return write_ndjson(stream_to, (dict(options, uri=uri) for uri, options in gathered()))
+        return OrderedDict(gathered())
+
+    def retry(self, operation, *args, **kwargs):
+        """
+        Calls an operation, retrying it on the errors registered in the RETRY_POLICY of the module.
+        See OneViewRetryPolicy.
+        :arg function operation: The operation, like a method of the current resource.
+        :arg args: Arguments of the operation.
+        :arg kwargs: Keyword arguments of the operation.
+        :return: The value returned by the operation.
+        """
+        return self.RETRY_POLICY.run(partial(operation, *args, **kwargs), self.create_waiter)
+
+    def create_waiter(self, routing_keys, **kwargs):
+        """
+        Creates a OneViewWaiter whose waits also end on the changes published in the state-change message bus, when
+        it is enabled. See OneViewStateChangeListener.
+        :arg list routing_keys: Routing keys of the changes that end the waits, like 'scmb.server-hardware.#'.
+        :arg kwargs: Arguments of OneViewWaiter, like the timeout and the delays.
+        :return: OneViewWaiter
+        """
+        listener = OneViewStateChangeListener.from_environment(self.oneview_client, routing_keys)
+        return OneViewWaiter(listener=listener, **kwargs)
+
+    def _apply_batch_item(self, item):
+        try:
+            if item['action'] == 'create':
+                resource = self.resource_client.create(item['data'])
+            else:
+                resource = self.resource_client.new(self.oneview_client.connection, item['current'])
+                if item['action'] == 'delete':
+                    resource.delete()
+                elif item['action'] == 'update':
+                    resource.update(item['data'])
+
+            if item['scope_uris'] is not None:
+                resource = resource.patch(operation='replace', path='/scopeUris', value=item['scope_uris'])
+
+            return self._batch_item_result(item, resource.data, changed=True)
+        except Exception as exception:
+            return dict(name=item['data']['name'], state=item['state'], changed=False, failed=True,
+                        msg=to_native(exception))
+
+    def _batch_item_result(self, item, data, changed):
+        msg = dict(create=self.MSG_CREATED, update=self.MSG_UPDATED, scopes=self.MSG_UPDATED,
+                   delete=self.MSG_DELETED).get(item['action'])
+        if not msg:
+            msg = self.MSG_ALREADY_ABSENT if item['state'] == 'absent' else self.MSG_ALREADY_PRESENT
+
+        result = dict(name=item['data']['name'], state=item['state'], changed=changed, msg=msg)
+        if item['state'] == 'present':
+            result['resource'] = data
+        return result
+
     def resource_absent(self, method='delete'):
         """
         Generic implementation of the absent state for the OneView resources.
@@ -684,6 +2780,7 @@ class OneViewModule(object):
         if compare(self.current_resource.data, updated_data):
             msg = self.MSG_ALREADY_PRESENT
         else:
+            self.set_diff(self.current_resource.data, updated_data)
             self.current_resource.update(updated_data)
             changed = True
             msg = self.MSG_UPDATED
@@ -754,6 +2851,7 @@ class OneViewModule(object):
         if compare(self.current_resource.data, updated_data):
             msg = self.MSG_ALREADY_PRESENT
         else:
+            self.set_diff(self.current_resource.data, updated_data)
             changed = True
             msg = self.MSG_UPDATED
         return (changed, msg)
@@ -817,6 +2915,10 @@ class OneViewModuleBase(object):
     resource_client = None
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
+    ONEVIEW_TRANSFER_ARGS = dict(chunk_size=dict(type='int', default=DEFAULT_TRANSFER_CHUNK_SIZE),
+                                 checksum_dir=dict(type='path'))
+    ONEVIEW_CONCURRENCY_ARGS = dict(max_concurrency=dict(type='int', default=DEFAULT_MAX_CONCURRENCY))
+    ONEVIEW_STREAM_ARGS = dict(stream_to=dict(type='path'), page_size=dict(type='int', default=DEFAULT_STREAM_PAGE_SIZE))
 
     def __init__(self, additional_arg_spec=None, validate_etag_support=False):
         """
@@ -860,17 +2962,7 @@ class OneViewModuleBase(object):
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
     def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
-        else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+        self.oneview_client = create_oneview_client(self.module.params)
 
     @abc.abstractmethod
     def execute_module(self):
@@ -1009,15 +3101,16 @@ class LIGMerger(object):
     def _merge_uplink_set(self, current_resource, data):
         existing_uplinksets = data['uplinkSets']
         current_uplinksets = current_resource['uplinkSets']
-        current_uplinks_left = deepcopy(current_uplinksets)
+        existing_names = set(existing_uplink['name'] for existing_uplink in existing_uplinksets)
 
-        for index, existing_uplink in enumerate(existing_uplinksets):
-            for current_uplink in current_uplinksets:
-                if current_uplink['name'] == existing_uplink['name']:
-                    current_uplinks_left.remove(current_uplink)  # removes the common uplinksets from current uplinksets
+        current_uplinks_by_name = {}
+        for current_uplink in current_uplinksets:
+            current_uplinks_by_name.setdefault(current_uplink['name'], []).append(current_uplink)
 
-                    if not compare_lig(current_uplink, existing_uplink):
-                        existing_uplinksets[index] = dict_merge(current_uplink, existing_uplink)
+        for index, existing_uplink in enumerate(existing_uplinksets):
+            for current_uplink in current_uplinks_by_name.get(existing_uplink['name'], []):
+                if not compare_lig(current_uplink, existing_uplink):
+                    existing_uplinksets[index] = dict_merge(current_uplink, existing_uplink)
 
             # checks to ignore extra parameters in uplink set to achieve idempotency
             if existing_uplink.get('logicalPortConfigInfos') and isinstance(existing_uplink['logicalPortConfigInfos'], list):
@@ -1026,7 +3119,8 @@ class LIGMerger(object):
                         port_config['desiredFecMode'] = "Auto"
 
         # appends the missing uplinks from current resource to existing resource based on name
-        existing_uplinksets += current_uplinks_left
+        existing_uplinksets += [current_uplink for current_uplink in current_uplinksets
+                                if current_uplink['name'] not in existing_names]
 
         return existing_uplinksets
 
@@ -1069,8 +3163,7 @@ class SPKeys(object):
 
 class ServerProfileMerger(object):
     def merge_data(self, resource, data):
-        merged_data = deepcopy(resource)
-        merged_data = dict_merge(merged_data, data)
+        merged_data = dict_merge(resource, data)
 
         merged_data = self._merge_bios_and_boot(merged_data, resource, data)
         merged_data = self._merge_connections(merged_data, resource, data)
@@ -1116,16 +3209,14 @@ class ServerProfileMerger(object):
         return merged_data
 
     def _merge_connections_boot(self, merged_data, resource):
-        existing_connection_map = {x[SPKeys.ID]: x.copy() for x in resource[SPKeys.CONNECTIONS]}
+        existing_connection_map = {x[SPKeys.ID]: x for x in resource[SPKeys.CONNECTIONS]}
         for merged_connection in merged_data[SPKeys.CONNECTIONS]:
             conn_id = merged_connection[SPKeys.ID]
             existing_conn_has_boot = conn_id in existing_connection_map and SPKeys.BOOT in existing_connection_map[
                 conn_id]
             if existing_conn_has_boot and SPKeys.BOOT in merged_connection:
                 current_connection = existing_connection_map[conn_id]
-                boot_settings_merged = deepcopy(current_connection[SPKeys.BOOT])
-                boot_settings_merged = dict_merge(boot_settings_merged, merged_connection[SPKeys.BOOT])
-                merged_connection[SPKeys.BOOT] = boot_settings_merged
+                merged_connection[SPKeys.BOOT] = dict_merge(current_connection[SPKeys.BOOT], merged_connection[SPKeys.BOOT])
         return merged_data
 
     def _merge_san_storage(self, merged_data, data, resource):
@@ -1259,12 +3350,254 @@ class ServerProfileMerger(object):
 
     def _merge_dict(self, merged_data, resource, data, key):
         if resource[key]:
-            merged_dict = deepcopy(resource[key])
-            merged_dict.update(deepcopy(data[key]))
+            merged_dict = copy(resource[key])
+            merged_dict.update(data[key])
         merged_data[key] = merged_dict
         return merged_data
 
 
+class OneViewNameResolver(object):
+    """
+    Memoizing name lookup for the OneView resource collections, meant to live for a single module run.
+    The names wanted from a collection can be prefetched with a single filtered get_all, and every lookup is
+    answered from an in-memory index afterwards. Misses are remembered too, so a name is never requested twice.
+    Optionally, the resolved name/URI pairs are shared across runs through an on-disk cache, enabled by the
+    ONEVIEW_NAME_CACHE_DIR environment variable and expired after ONEVIEW_NAME_CACHE_TTL seconds.
+    """
+    CACHE_DIR_ENV = 'ONEVIEW_NAME_CACHE_DIR'
+    CACHE_TTL_ENV = 'ONEVIEW_NAME_CACHE_TTL'
+    DEFAULT_TTL = 300
+    PREFETCH_BATCH_SIZE = 50
+
+    def __init__(self, hostname=None, cache=None):
+        self.hostname = hostname
+        self.cache = cache
+        self._index = {}
+
+    @classmethod
+    def from_environment(cls, hostname=None):
+        """
+        Creates a resolver, backed by the on-disk cache when it is enabled through the environment variables.
+        :arg str hostname: Appliance hostname, part of the on-disk cache keys.
+        :return: OneViewNameResolver
+        """
+        directory = os.environ.get(cls.CACHE_DIR_ENV)
+        cache = None
+        if directory:
+            cache = OneViewFileCache(directory, 'names', int(os.environ.get(cls.CACHE_TTL_ENV) or cls.DEFAULT_TTL))
+        return cls(hostname, cache)
+
+    @staticmethod
+    def _collection(resource_client):
+        # The SDK builds a new resource client on each property access, so collections are identified by URI
+        return str(getattr(resource_client, 'URI', None) or id(resource_client))
+
+    def _key(self, resource_client, name):
+        return (self._collection(resource_client), to_native(name).lower())
+
+    def _cache_key(self, key):
+        return [to_native(self.hostname), key[0], key[1]]
+
+    def _load_from_cache(self, key):
+        if not self.cache:
+            return False
+        resource = self.cache.get(self._cache_key(key))
+        if resource:
+            self._index[key] = resource
+            return True
+        return False
+
+    def _store(self, key, resource):
+        self._index[key] = resource
+        if self.cache and resource and resource.get('uri'):
+            self.cache.set(self._cache_key(key), dict(name=resource.get('name'), uri=resource['uri']))
+
+    def prefetch(self, resource_client, names):
+        """
+        Loads the given names from a collection into the index, using the minimum number of requests.
+        :arg resource_client: OneView resource client of the collection.
+        :arg list names: Resource names.
+        """
+        pending = OrderedDict()
+        for name in names:
+            if name is None:
+                continue
+            key = self._key(resource_client, name)
+            if key not in self._index and key not in pending and not self._load_from_cache(key):
+                pending[key] = name
+
+        if len(pending) == 1:
+            key, name = list(pending.items())[0]
+            results = resource_client.get_by('name', name)
+            self._store(key, results[0] if results else None)
+            return
+
+        pending_items = list(pending.items())
+        for start in range(0, len(pending_items), self.PREFETCH_BATCH_SIZE):
+            batch = OrderedDict(pending_items[start:start + self.PREFETCH_BATCH_SIZE])
+            name_filter = ' OR '.join("name='{0}'".format(name) for name in batch.values())
+            found = {}
+            for resource in resource_client.get_all(filter='"{0}"'.format(name_filter)) or []:
+                key = self._key(resource_client, resource.get('name', ''))
+                if key in batch and key not in found:
+                    found[key] = resource
+            for key in batch:
+                self._store(key, found.get(key))
+
+    def get(self, resource_client, name):
+        """
+        Gets a resource by name from the index, fetching it when it was not prefetched.
+        :arg resource_client: OneView resource client of the collection.
+        :arg str name: Resource name.
+        :return: dict: The resource found or None.
+        """
+        self.prefetch(resource_client, [name])
+        return self._index.get(self._key(resource_client, name))
+
+
+class OneViewNetworkResolver(object):
+    """
+    Resolves network names of different types through the index search, meant to live for a single module run.
+    A batch of names is searched across all the requested network categories with a single request, instead of
+    one request per name and network type. The results are kept in memory, so each name is searched only once.
+    """
+    FC_NETWORKS = 'fc-networks'
+    FCOE_NETWORKS = 'fcoe-networks'
+    NETWORK_SETS = 'network-sets'
+    ETHERNET_NETWORKS = 'ethernet-networks'
+    ALL_CATEGORIES = [FC_NETWORKS, FCOE_NETWORKS, NETWORK_SETS, ETHERNET_NETWORKS]
+
+    MSG_AMBIGUOUS_NAME = 'Network name "{0}" is ambiguous, it matches: {1}'
+    SEARCH_BATCH_SIZE = 50
+
+    def __init__(self, oneview_client):
+        self.oneview_client = oneview_client
+        self._index = {}
+        self._searched = set()
+
+    def search(self, names, categories=None):
+        """
+        Loads the networks with the given names into the index, with one request per batch of names.
+        :arg list names: Network names.
+        :arg list categories: Network categories to search. Defaults to all of them.
+        """
+        categories = categories or self.ALL_CATEGORIES
+        pending = OrderedDict()
+        for name in names:
+            if name is None:
+                continue
+            lower_name = to_native(name).lower()
+            if any((lower_name, category) not in self._searched for category in categories):
+                pending[lower_name] = name
+
+        pending_names = list(pending.values())
+        for start in range(0, len(pending_names), self.SEARCH_BATCH_SIZE):
+            batch = pending_names[start:start + self.SEARCH_BATCH_SIZE]
+            name_filter = ' OR '.join("name='{0}'".format(name) for name in batch)
+            resources = self.oneview_client.index_resources.get_all(category=categories,
+                                                                    filter='"{0}"'.format(name_filter))
+            for resource in resources or []:
+                lower_name = to_native(resource.get('name', '')).lower()
+                if lower_name in pending and resource.get('category') in categories:
+                    self._index.setdefault(lower_name, OrderedDict()).setdefault(resource['category'], resource['uri'])
+
+            for name in batch:
+                for category in categories:
+                    self._searched.add((to_native(name).lower(), category))
+
+    def resolve(self, names, categories=None):
+        """
+        Resolves network names, searching the ones that were not loaded yet.
+        :arg list names: Network names.
+        :arg list categories: Network categories accepted for the names. Defaults to all of them.
+        :return: OrderedDict: Name to (category, uri) map with the names found.
+        :raises OneViewModuleValueError: When a name matches networks of more than one of the categories.
+        """
+        categories = categories or self.ALL_CATEGORIES
+        self.search(names, categories)
+
+        resolved = OrderedDict()
+        for name in names:
+            if name is None:
+                continue
+            matches = [(category, uri) for category, uri in self._index.get(to_native(name).lower(), {}).items()
+                       if category in categories]
+            if len(matches) > 1:
+                raise OneViewModuleValueError(self.MSG_AMBIGUOUS_NAME.format(name, ', '.join(uri for _, uri in matches)))
+            if matches:
+                resolved[name] = matches[0]
+        return resolved
+
+    def get_uri(self, name, categories=None):
+        """
+        Resolves a single network name.
+        :arg str name: Network name.
+        :arg list categories: Network categories accepted for the name. Defaults to all of them.
+        :return: str: The network URI or None when it is not found.
+        """
+        resolved = self.resolve([name], categories)
+        return resolved[name][1] if name in resolved else None
+
+
+class OneViewRangeIndex(object):
+    """
+    Index of the ID pool ranges of the subnets, by URI and by name, meant to live for a single module run.
+    The ranges have no collection endpoint, so the ranges of the subnets are fetched by URI with at most
+    max_concurrency simultaneous requests, and each of them is requested only once.
+    """
+
+    def __init__(self, resource_client, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.resource_client = resource_client
+        self.max_concurrency = max_concurrency
+        self._ranges = {}
+        self._names = {}
+
+    def fetch(self, range_uris):
+        """
+        Gets ranges by URI, requesting the ones that are not in the index yet.
+        :arg list range_uris: Range URIs.
+        :return: list: The range resource objects, in the order of the URIs.
+        """
+        range_uris = list(range_uris)
+        pending = [uri for uri in OrderedDict.fromkeys(range_uris) if uri not in self._ranges]
+        self._ranges.update(run_concurrently([(uri, partial(self.resource_client.get_by_uri, uri)) for uri in pending],
+                                             self.max_concurrency))
+        return [self._ranges[uri] for uri in range_uris]
+
+    def get_all(self, subnets):
+        """
+        Gets the ranges of the subnets, with all of them requested at once.
+        :arg list subnets: Subnets, as returned by get_all or the data of the resource objects.
+        :return: list: The range resource objects, in the order of the subnets and of their 'rangeUris'.
+        """
+        return self.fetch([uri for subnet in subnets for uri in subnet['rangeUris']])
+
+    def get_by_name(self, subnet, name):
+        """
+        Gets a range of the subnet by name.
+        :arg dict subnet: The subnet data.
+        :arg str name: Range name.
+        :return: The range resource object or None when the subnet has no range with this name.
+        """
+        names = self._names.get(subnet['uri'])
+        if names is None:
+            names = {}
+            for resource in self.get_all([subnet]):
+                names.setdefault(resource.data['name'], resource)
+            self._names[subnet['uri']] = names
+        return names.get(name)
+
+    def invalidate(self, range_uri):
+        """
+        Removes a range from the index after it changes, so it is requested again the next time.
+        :arg str range_uri: Range URI.
+        """
+        resource = self._ranges.pop(range_uri, None)
+        for subnet_uri, names in list(self._names.items()):
+            if any(indexed is resource for indexed in names.values()):
+                del self._names[subnet_uri]
+
+
 class ServerProfileReplaceNamesByUris(object):
     SCOPE_NOT_FOUND = 'Scope not found: '
     SERVER_PROFILE_OS_DEPLOYMENT_NOT_FOUND = 'OS Deployment Plan not found: '
@@ -1282,6 +3615,9 @@ class ServerProfileReplaceNamesByUris(object):
 
     def replace(self, oneview_client, data):
         self.oneview_client = oneview_client
+        self.resolver = OneViewNameResolver.from_environment(oneview_client.connection.get_host())
+        self.network_resolver = OneViewNetworkResolver(oneview_client)
+        self._prefetch_names(data)
         self._replace_os_deployment_name_by_uri(data)
         self._replace_enclosure_group_name_by_uri(data)
         self._replace_networks_name_by_uri(data)
@@ -1293,10 +3629,31 @@ class ServerProfileReplaceNamesByUris(object):
         self._replace_sas_logical_jbod_name_by_uri(data)
         self._replace_initial_scope_name_by_uri(data)
 
+    def _prefetch_names(self, data):
+        """
+        Loads all the names referenced by lists in the profile, one filtered query per collection.
+        """
+        connections = self._get_connections(data)
+        volume_attachments = (data.get('sanStorage') or {}).get('volumeAttachments') or []
+        sas_logical_jbods = (data.get('localStorage') or {}).get('sasLogicalJBODs') or []
+
+        self.resolver.prefetch(self.oneview_client.volumes,
+                               [v['volumeName'] for v in volume_attachments if not v.get('volumeUri') and v.get('volumeName')])
+        storage_pool_names = [v.get('volumeStoragePoolName') for v in volume_attachments]
+        storage_pool_names += [((v.get('volume') or {}).get('properties') or {}).get('storagePoolName') for v in volume_attachments]
+        self.resolver.prefetch(self.oneview_client.storage_pools, storage_pool_names)
+        self.resolver.prefetch(self.oneview_client.storage_systems,
+                               [v.get('volumeStorageSystemName') for v in volume_attachments])
+        self.resolver.prefetch(self.oneview_client.interconnects,
+                               [c.get('interconnectName') for c in (data.get('connections') or [])])
+        self.resolver.prefetch(self.oneview_client.sas_logical_jbods,
+                               [j.get('sasLogicalJBODName') for j in sas_logical_jbods])
+        self._prefetch_networks([c.get('networkName') for c in connections])
+
     def _get_resource_uri_from_name(self, name, message, resource_client):
-        resource_by_name = resource_client.get_by('name', name)
+        resource_by_name = self.resolver.get(resource_client, name)
         if resource_by_name:
-            return resource_by_name[0]['uri']
+            return resource_by_name['uri']
         else:
             raise OneViewModuleResourceNotFound(message + name)
 
@@ -1329,15 +3686,15 @@ class ServerProfileReplaceNamesByUris(object):
         self._replace_name_by_uri(data, 'enclosureGroupName', self.SERVER_PROFILE_ENCLOSURE_GROUP_NOT_FOUND,
                                   self.oneview_client.enclosure_groups)
 
-    def _replace_networks_name_by_uri(self, data):
+    def _get_connections(self, data):
         if data.get("connections"):
-            connections = data["connections"]
+            return data["connections"]
         elif data.get("connectionSettings") and data["connectionSettings"].get("connections"):
-            connections = data["connectionSettings"]["connections"]
-        else:
-            return
+            return data["connectionSettings"]["connections"]
+        return []
 
-        for connection in connections:
+    def _replace_networks_name_by_uri(self, data):
+        for connection in self._get_connections(data):
             if 'networkName' in connection:
                 name = connection.pop('networkName')
                 if name is not None:
@@ -1353,9 +3710,9 @@ class ServerProfileReplaceNamesByUris(object):
         if len(volume_attachments) > 0:
             for volume in volume_attachments:
                 if not volume.get('volumeUri') and volume.get('volumeName'):
-                    resource_by_name = self.oneview_client.volumes.get_by('name', volume['volumeName'])
+                    resource_by_name = self.resolver.get(self.oneview_client.volumes, volume['volumeName'])
                     if resource_by_name:
-                        volume['volumeUri'] = resource_by_name[0]['uri']
+                        volume['volumeUri'] = resource_by_name['uri']
                         del volume['volumeName']
                     else:
                         logger.debug("The volumeUri is null in the volumeAttachments list, it will be understood "
@@ -1403,20 +3760,11 @@ class ServerProfileReplaceNamesByUris(object):
                 self._replace_name_by_uri(jbod, 'sasLogicalJBODName', self.SAS_LOGICAL_JBOD_NOT_FOUND,
                                           self.oneview_client.sas_logical_jbods)
 
-    def _get_network_by_name(self, name):
-        fc_networks = self.oneview_client.fc_networks.get_by('name', name)
-        if fc_networks:
-            return fc_networks[0]
+    def _prefetch_networks(self, names):
+        self.network_resolver.search(names)
 
-        fcoe_networks = self.oneview_client.fcoe_networks.get_by('name', name)
-        if fcoe_networks:
-            return fcoe_networks[0]
-
-        network_sets = self.oneview_client.network_sets.get_by('name', name)
-        if network_sets:
-            return network_sets[0]
-
-        ethernet_networks = self.oneview_client.ethernet_networks.get_by('name', name)
-        if not ethernet_networks:
+    def _get_network_by_name(self, name):
+        uri = self.network_resolver.get_uri(name)
+        if not uri:
             raise OneViewModuleResourceNotFound(self.SERVER_PROFILE_NETWORK_NOT_FOUND + name)
-        return ethernet_networks[0]
+        return dict(name=name, uri=uri)
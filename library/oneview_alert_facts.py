@@ -39,6 +39,7 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.stream
 '''
 
 EXAMPLES = '''
@@ -76,6 +77,17 @@ EXAMPLES = '''
       filter: "urgency='High'"
 
 - debug: var=alerts
+
+- name: Write all alerts to a file, one per line
+  oneview_alert_facts:
+    config: "{{ config }}"
+    stream_to: /tmp/alerts.ndjson
+    page_size: 1000
+    params:
+      filter: "alertState='Active'"
+  delegate_to: localhost
+
+- debug: var=alerts_manifest
 '''
 
 RETURN = '''
@@ -83,19 +95,29 @@ alerts:
     description: The list of alerts.
     returned: Always, but can be null.
     type: list
+alerts_manifest:
+    description: Manifest of the file with the alerts, with its C(path), C(count) and C(checksum).
+    returned: When C(stream_to) is set.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+from ansible.module_utils.oneview import OneViewModuleBase, stream_to_file
 
 
 class AlertFactsModule(OneViewModuleBase):
     def __init__(self):
         argument_spec = dict(
-            params=dict(required=False, type='dict')
+            params=dict(required=False, type='dict'),
+            **OneViewModuleBase.ONEVIEW_STREAM_ARGS
         )
         super(AlertFactsModule, self).__init__(additional_arg_spec=argument_spec)
 
     def execute_module(self):
+        if self.module.params.get('stream_to'):
+            manifest = stream_to_file(self.oneview_client.alerts.get_all, self.module.params['stream_to'],
+                                      self.facts_params, self.module.params['page_size'])
+            return dict(changed=False, ansible_facts=dict(alerts_manifest=manifest))
+
         facts = self.oneview_client.alerts.get_all(**self.facts_params)
 
         return dict(changed=False, ansible_facts=dict(alerts=facts))
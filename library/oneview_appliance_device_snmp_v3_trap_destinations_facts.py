@@ -56,6 +56,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -36,6 +36,7 @@ author:
     "Gianluca Zecchi (@gzecchi)"
 extends_documentation_fragment:
     - oneview
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -381,6 +381,8 @@ enclosure:
     type: dict
 '''
 
+from functools import partial
+
 from ansible.module_utils.oneview import (OneViewModule,
                                           OneViewModuleResourceNotFound,
                                           OneViewModuleValueError)
@@ -540,7 +542,8 @@ class EnclosureModule(OneViewModule):
         scope_uris = configuration_data.pop('scopeUris', None)
 
         if 'hostname' in self.data:
-            resource_by_hostname = self.resource_client.get_by_hostname(self.data['hostname'])
+            resource_by_hostname = self.get_by_index('hostname', self.data['hostname'],
+                                                     partial(self.resource_client.get_by_hostname, self.data['hostname']))
             if not resource_by_hostname:
                 self.current_resource = self.resource_client.add(configuration_data)
                 message = self.MSG_CREATED
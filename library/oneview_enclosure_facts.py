@@ -45,10 +45,24 @@ options:
         - "List with options to gather additional facts about an Enclosure and related resources.
           Options allowed: C(script), C(environmentalConfiguration), and C(utilization). For the option C(utilization),
           you can provide specific parameters."
+        - "To gather additional facts it is required inform the Enclosure name, the C(names) of many Enclosures or a
+          C(filter) in C(params). Otherwise, these options will be ignored."
+    names:
+      description:
+        - Names of the Enclosures whose C(options) are gathered. The Enclosures are resolved from a single listing
+          and the options of up to C(max_concurrency) Enclosures are requested at the same time. The options are
+          returned by Enclosure URI in C(enclosures_options), or, when C(stream_to) is set, written to that file as
+          one line per Enclosure, with its C(uri).
+        - When C(names) is not set but C(params) has a C(filter), the options are gathered in the same way for all
+          the Enclosures matched.
 
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.concurrency
+    - oneview.stream
+    - oneview.factsfields
+    - oneview.snapshot
 '''
 
 EXAMPLES = '''
@@ -62,6 +76,29 @@ EXAMPLES = '''
   delegate_to: localhost
 - debug: var=enclosures
 
+- name: Gather facts about all Enclosures, requesting only the changes since the previous run
+  oneview_enclosure_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    snapshot_dir: ~/.ansible/oneview_snapshots
+  no_log: true
+  delegate_to: localhost
+- debug: var=enclosures
+
+- name: Write all the Enclosures to a file, one Enclosure per line, requesting 100 Enclosures per page
+  oneview_enclosure_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    stream_to: /tmp/enclosures.ndjson
+    page_size: 100
+  no_log: true
+  delegate_to: localhost
+- debug: var=enclosures_manifest
+
 - name: Gather paginated, filtered and sorted facts about Enclosures
   oneview_enclosure_facts:
     params:
@@ -126,6 +163,38 @@ EXAMPLES = '''
   delegate_to: localhost
 - debug: var=enclosures
 - debug: var=enclosure_utilization
+
+- name: Gather the environmental configuration and the utilization of many Enclosures
+  oneview_enclosure_facts:
+    names:
+      - Test-Enclosure-1
+      - Test-Enclosure-2
+    options:
+      - environmentalConfiguration
+      - utilization
+    max_concurrency: 16
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+  no_log: true
+  delegate_to: localhost
+- debug: var=enclosures_options
+
+- name: Write the utilization of all the Enclosures with a critical status to a file, one Enclosure per line
+  oneview_enclosure_facts:
+    params:
+      filter: status='Critical'
+    options:
+      - utilization
+    stream_to: /tmp/enclosures_utilization.ndjson
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+  no_log: true
+  delegate_to: localhost
+- debug: var=enclosures_options_manifest
 '''
 
 RETURN = '''
@@ -148,13 +217,33 @@ enclosure_utilization:
     description: Has all the OneView facts about the utilization of an Enclosure.
     returned: When requested, but can be null.
     type: dict
+
+enclosures_options:
+    description: The facts of the options of each Enclosure, by URI.
+    returned: When options are requested for C(names) or a C(filter), without C(stream_to).
+    type: dict
+
+enclosures_options_manifest:
+    description: Manifest of the file with the options of each Enclosure, with its C(path), C(count) and C(checksum).
+    returned: When options are requested for C(names) or a C(filter), with C(stream_to).
+    type: dict
+
+enclosures_manifest:
+    description: Manifest of the file with the Enclosures, with its C(path), C(count) and C(checksum).
+    returned: When C(stream_to) is set, without C(name), C(names) or options for a C(filter).
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from functools import partial
+
+from ansible.module_utils.oneview import OneViewModule, stream_to_file
 
 
 class EnclosureFactsModule(OneViewModule):
-    argument_spec = dict(name=dict(type='str'), options=dict(type='list'), params=dict(type='dict'))
+    argument_spec = dict(name=dict(type='str'), names=dict(type='list', elements='str'), options=dict(type='list'),
+                         params=dict(type='dict'), **OneViewModule.ONEVIEW_STREAM_ARGS)
+    argument_spec.update(OneViewModule.ONEVIEW_CONCURRENCY_ARGS)
+    argument_spec.update(OneViewModule.ONEVIEW_SNAPSHOT_ARGS)
 
     def __init__(self):
         super(EnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
@@ -167,32 +256,49 @@ class EnclosureFactsModule(OneViewModule):
         if self.current_resource:
             enclosures = [self.current_resource.data]
             if self.options:
-                ansible_facts = self._gather_optional_facts(self.options)
-        elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            enclosures = self.resource_client.get_all(**self.facts_params)
-        else:
+                ansible_facts = self._gather_optional_facts()
+        elif self.is_multi_resource_facts():
+            enclosures = self.get_resources_by_names()
+            options = self.gather_options_by_uri(enclosures, self._get_option_calls)
+            if self.module.params.get('stream_to'):
+                ansible_facts['enclosures_options_manifest'] = options
+            else:
+                ansible_facts['enclosures_options'] = options
+        elif self.module.params.get("name") or self.module.params.get('uri'):
             enclosures = []
+        elif self.module.params.get('stream_to'):
+            enclosures = None
+            ansible_facts['enclosures_manifest'] = stream_to_file(self.resource_client.get_all,
+                                                                  self.module.params['stream_to'], self.facts_params,
+                                                                  self.module.params['page_size'])
+        else:
+            enclosures = self.get_all_facts()
 
-        ansible_facts['enclosures'] = enclosures
+        if enclosures is not None:
+            ansible_facts['enclosures'] = enclosures
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
 
-    def _gather_optional_facts(self, options):
+    def _gather_optional_facts(self):
 
-        ansible_facts = {}
+        return dict((fact, function()) for fact, function in self._get_option_calls(self.current_resource))
+
+    def _get_option_calls(self, enclosure):
+
+        calls = []
 
-        if options.get('script'):
-            ansible_facts['enclosure_script'] = self.current_resource.get_script()
-        if options.get('environmentalConfiguration'):
-            env_config = self.current_resource.get_environmental_configuration()
-            ansible_facts['enclosure_environmental_configuration'] = env_config
-        if options.get('utilization'):
-            ansible_facts['enclosure_utilization'] = self._get_utilization(options['utilization'])
+        if self.options.get('script'):
+            calls.append(('enclosure_script', enclosure.get_script))
+        if self.options.get('environmentalConfiguration'):
+            calls.append(('enclosure_environmental_configuration', enclosure.get_environmental_configuration))
+        if self.options.get('utilization'):
+            calls.append(('enclosure_utilization', partial(self._get_utilization, enclosure,
+                                                           self.options['utilization'])))
 
-        return ansible_facts
+        return calls
 
-    def _get_utilization(self, params):
+    def _get_utilization(self, enclosure, params):
         fields = view = refresh = filter = ''
         if isinstance(params, dict):
             fields = params.get('fields')
@@ -200,10 +306,10 @@ class EnclosureFactsModule(OneViewModule):
             refresh = params.get('refresh')
             filter = params.get('filter')
 
-        return self.current_resource.get_utilization(fields=fields,
-                                                     filter=filter,
-                                                     refresh=refresh,
-                                                     view=view)
+        return enclosure.get_utilization(fields=fields,
+                                         filter=filter,
+                                         refresh=refresh,
+                                         view=view)
 
 
 def main():
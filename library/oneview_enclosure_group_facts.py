@@ -48,6 +48,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
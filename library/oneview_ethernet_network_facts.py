@@ -46,6 +46,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
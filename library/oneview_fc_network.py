@@ -42,12 +42,14 @@ options:
         choices: ['present', 'absent']
     data:
         description:
-            - List with the Fibre Channel Network properties.
-        required: true
+            - List with the Fibre Channel Network properties. Required unless C(items) is set.
+        required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.batch
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -130,6 +132,23 @@ EXAMPLES = '''
         - "{{ fc_network_1.results[2].ansible_facts.fc_network.uri }}"
   delegate_to: localhost
   when: currentVersion >= '1600'
+
+- name: Ensure several Fibre Channel Networks in a single task
+  oneview_fc_network:
+    config: "{{ config }}"
+    state: present
+    max_concurrency: 8
+    items:
+      - data:
+          name: "Fibre Channel Network 1"
+          fabricType: FabricAttach
+      - data:
+          name: "Fibre Channel Network 2"
+          fabricType: FabricAttach
+      - state: absent
+        data:
+          name: "Fibre Channel Network 3"
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -137,9 +156,13 @@ fc_network:
     description: Has the facts about the managed OneView FC Network.
     returned: On state 'present'. Can be null.
     type: dict
+items:
+    description: Results of each item, in the order of the items, when the module receives C(items).
+    returned: When C(items) is set.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, compare
+from ansible.module_utils.oneview import OneViewModule, OneViewModuleValueError, compare
 
 
 class FcNetworkModule(OneViewModule):
@@ -149,6 +172,7 @@ class FcNetworkModule(OneViewModule):
     BULK_MSG_DELETED = 'FC Networks deleted successfully.'
     MSG_ALREADY_PRESENT = 'FC Network is already present.'
     MSG_ALREADY_ABSENT = 'FC Network is already absent.'
+    MSG_BANDWIDTH_NOT_SUPPORTED = 'The bandwidth is not supported with items, set it in a task per FC Network.'
     RESOURCE_FACT_NAME = 'fc_network'
 
     def __init__(self):
@@ -159,7 +183,8 @@ class FcNetworkModule(OneViewModule):
                                        choices=['present', 'absent']))
 
         super(FcNetworkModule, self).__init__(additional_arg_spec=additional_arg_spec,
-                                              validate_etag_support=True)
+                                              validate_etag_support=True,
+                                              batch_support=True)
 
         self.set_resource_object(self.oneview_client.fc_networks)
         self.connection_templates = self.oneview_client.connection_templates
@@ -179,6 +204,10 @@ class FcNetworkModule(OneViewModule):
 
         return dict(changed=changed, msg=msg, ansible_facts=ansible_facts)
 
+    def prepare_batch(self, items_data):
+        if any('bandwidth' in data for data in items_data):
+            raise OneViewModuleValueError(self.MSG_BANDWIDTH_NOT_SUPPORTED)
+
     def _present(self):
         scope_uris = self.data.pop('scopeUris', None)
         bandwidth = self.data.pop('bandwidth', None)
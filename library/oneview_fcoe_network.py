@@ -44,12 +44,14 @@ options:
         choices: ['present', 'absent']
     data:
         description:
-            - List with FCoE Network properties.
-        required: true
+            - List with FCoE Network properties. Required unless C(items) is set.
+        required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.batch
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -101,6 +103,23 @@ EXAMPLES = '''
       networkUris:
         -  "/rest/fcoe-networks/e2f0031b-52bd-4223-9ac1-d91cb519d548"
   delegate_to: localhost
+
+- name: Ensure several FCoE Networks in a single task
+  oneview_fcoe_network:
+    config: "{{ config }}"
+    state: present
+    max_concurrency: 8
+    items:
+      - data:
+          name: "FCoE Network 1"
+          vlanId: 201
+      - data:
+          name: "FCoE Network 2"
+          vlanId: 202
+      - state: absent
+        data:
+          name: "FCoE Network 3"
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -108,6 +127,10 @@ fcoe_network:
     description: Has the facts about the OneView FCoE Networks.
     returned: On state 'present'. Can be null.
     type: dict
+items:
+    description: Results of each item, in the order of the items, when the module receives C(items).
+    returned: When C(items) is set.
+    type: list
 '''
 
 from ansible.module_utils.oneview import OneViewModule
@@ -129,7 +152,8 @@ class FcoeNetworkModule(OneViewModule):
                                               choices=['present', 'absent']))
 
         super(FcoeNetworkModule, self).__init__(additional_arg_spec=additional_arg_spec,
-                                                validate_etag_support=True)
+                                                validate_etag_support=True,
+                                                batch_support=True)
 
         self.set_resource_object(self.oneview_client.fcoe_networks)
 
@@ -27,7 +27,7 @@ short_description: Upload OneView Firmware Bundle resources.
 description:
     - Upload an SPP ISO image file or a hotfix file to the appliance.
 notes:
-   - "This module is non-idempotent"
+   - "This module is non-idempotent, unless C(checksum_dir) is set"
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -46,6 +46,7 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.transfer
 '''
 
 EXAMPLES = '''
@@ -55,6 +56,15 @@ EXAMPLES = '''
     state: present
     file_path: "/home/user/Downloads/hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm"
 
+- name: Ensure that the SPP is present, uploading it only once
+  oneview_firmware_bundle:
+    config: "{{ config_file_path }}"
+    state: present
+    file_path: "/home/user/Downloads/SPP2021.05.0.iso"
+    chunk_size: 8388608
+    checksum_dir: ~/.ansible/oneview_uploads
+
+- debug: var=firmware_bundle_upload
 '''
 
 RETURN = '''
@@ -62,17 +72,27 @@ firmware_bundle:
     description: Has the facts about the OneView Firmware Bundle.
     returned: Always. Can be null.
     type: dict
+
+firmware_bundle_upload:
+    description: The C(path), C(size) and C(checksum) of the file, the number of C(transfers) and whether the upload
+                 was C(skipped).
+    returned: Always.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+from functools import partial
+
+from ansible.module_utils.oneview import OneViewModuleBase, OneViewFileUpload
 
 
 class FirmwareBundleModule(OneViewModuleBase):
     MSG_FIRMWARE_BUNDLE_UPLOADED = 'Firmware Bundle uploaded sucessfully.'
+    MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT = 'Firmware Bundle is already present.'
 
     argument_spec = dict(
         state=dict(required=True, choices=['present']),
-        file_path=dict(required=True, type='str')
+        file_path=dict(required=True, type='str'),
+        **OneViewModuleBase.ONEVIEW_TRANSFER_ARGS
     )
 
     def __init__(self):
@@ -80,11 +100,20 @@ class FirmwareBundleModule(OneViewModuleBase):
 
     def execute_module(self):
         file_path = self.module.params['file_path']
+        firmware_bundles = self.oneview_client.firmware_bundles
+        upload = OneViewFileUpload(self.oneview_client.connection, file_path, self.module.params.get('chunk_size'),
+                                   self.module.params.get('checksum_dir'), log=self.module.log)
+
+        firmware = upload.find_uploaded(firmware_bundles.URI)
+        if firmware:
+            return dict(changed=False,
+                        msg=self.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+                        ansible_facts=dict(firmware_bundle=firmware, firmware_bundle_upload=upload.manifest))
 
-        new_firmware = self.oneview_client.firmware_bundles.upload(file_path)
+        new_firmware = upload.upload(firmware_bundles.URI, partial(firmware_bundles.upload, file_path))
         return dict(changed=True,
                     msg=self.MSG_FIRMWARE_BUNDLE_UPLOADED,
-                    ansible_facts=dict(firmware_bundle=new_firmware))
+                    ansible_facts=dict(firmware_bundle=new_firmware, firmware_bundle_upload=upload.manifest))
 
 
 def main():
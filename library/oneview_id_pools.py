@@ -45,6 +45,24 @@ options:
         description:
             - dict with required params.
         required: true
+    consumers:
+        description:
+            - Requests of many consumers handled in a single task by the C(allocate), C(collect) and C(validate)
+              states, instead of one task per consumer. Each consumer has a unique C(name) and either the C(count)
+              of IDs to allocate, 1 by default, or the C(idList) to reserve, collect or validate.
+            - C(allocate) requests all the IDs with the minimum number of allocator calls of up to C(batch_size) IDs
+              each and assigns them to the consumers in their order. When the pool cannot provide all of them, the
+              IDs already allocated by the task are collected back and the task fails.
+            - C(collect) returns the IDs of all the consumers with collector calls of up to C(batch_size) IDs each.
+            - C(validate) is a dry run, which checks the C(idList) of all the consumers with a single validate call.
+        required: false
+        type: list
+    batch_size:
+        description:
+            - Largest count of IDs requested by a single allocator or collector call of the C(consumers).
+        default: 1000
+        required: false
+        type: int
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
@@ -87,6 +105,34 @@ EXAMPLES = '''
       poolType: '{{ poolType }}'
       rangeUris: '{{ id_pool["idList"] }}'
   delegate_to: localhost
+
+- name: Allocates the virtual MAC addresses of many server profiles at once
+  oneview_id_pools:
+    config: "{{ config }}"
+    state: allocate
+    data:
+      poolType: vmac
+    consumers:
+      - name: profile-01
+        count: 2
+      - name: profile-02
+        count: 4
+  delegate_to: localhost
+
+- debug: var=id_pool_assignments
+
+- name: Checks that the IDs of many server profiles can be reserved, without reserving them
+  oneview_id_pools:
+    config: "{{ config }}"
+    state: validate
+    data:
+      poolType: vwwn
+    consumers:
+      - name: profile-01
+        idList: ["10:00:2c:6c:28:80:00:00", "10:00:2c:6c:28:80:00:01"]
+      - name: profile-02
+        idList: ["10:00:2c:6c:28:80:00:02"]
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -95,8 +141,14 @@ id_pool:
     returned: On all states
     type: dict
 
+id_pool_assignments:
+    description: The IDs allocated, collected or valid of each consumer, by name, in the order of the consumers.
+    returned: When C(consumers) is set.
+    type: dict
 '''
 
+from collections import OrderedDict
+
 from ansible.module_utils.oneview import OneViewModule, OneViewModuleValueError
 
 
@@ -107,7 +159,12 @@ class IdPoolsModule(OneViewModule):
     MSG_VALIDATED = 'Pool IDs are valid'
     MSG_ALREADY_PRESENT = 'Pool Updated already.'
     MSG_IDS_NOT_AVAILABLE = 'Ids not available'
+    MSG_IDS_NOT_VALID = 'Pool IDs are not valid: {0}'
+    MSG_CONSUMERS_STATE_NOT_SUPPORTED = "'consumers' is not supported by the state {0}."
+    MSG_CONSUMER_NAME_REQUIRED = "Each consumer requires a unique 'name'."
+    MSG_CONSUMER_ID_LIST_REQUIRED = "The consumer {0} requires an 'idList'."
     RESOURCE_FACT_NAME = 'id_pools'
+    DEFAULT_BATCH_SIZE = 1000
 
     def __init__(self):
 
@@ -117,6 +174,8 @@ class IdPoolsModule(OneViewModule):
                 choices=['allocate', 'collect', 'validate', 'update_pool_type']
             ),
             data=dict(required=True, type='dict'),
+            consumers=dict(required=False, type='list', elements='dict'),
+            batch_size=dict(required=False, type='int', default=self.DEFAULT_BATCH_SIZE),
         )
 
         super(IdPoolsModule, self).__init__(additional_arg_spec=argument_spec, validate_etag_support=True)
@@ -131,6 +190,9 @@ class IdPoolsModule(OneViewModule):
         idList = self.data.pop('idList', [])
         count = self.data.pop('count', 0)
 
+        if self.module.params.get('consumers'):
+            return self.__execute_consumers(poolType)
+
         if self.state == 'update_pool_type':
             changed, msg, id_pool = self.__update_pool_type(poolType)
         elif self.state == 'allocate':
@@ -166,6 +228,91 @@ class IdPoolsModule(OneViewModule):
         except OneViewModuleValueError:
             raise OneViewModuleValueError(self.MSG_IDS_NOT_AVAILABLE)
 
+    def __execute_consumers(self, pool_type):
+        if self.state not in ('allocate', 'collect', 'validate'):
+            raise OneViewModuleValueError(self.MSG_CONSUMERS_STATE_NOT_SUPPORTED.format(self.state))
+
+        consumers = self.module.params['consumers']
+        names = [consumer.get('name') for consumer in consumers]
+        if not all(names) or len(set(names)) != len(names):
+            raise OneViewModuleValueError(self.MSG_CONSUMER_NAME_REQUIRED)
+        if self.state != 'allocate':
+            for consumer in consumers:
+                if not consumer.get('idList'):
+                    raise OneViewModuleValueError(self.MSG_CONSUMER_ID_LIST_REQUIRED.format(consumer['name']))
+
+        if self.state == 'allocate':
+            changed, msg, assignments = self.__allocate_consumers(consumers, pool_type)
+        elif self.state == 'collect':
+            changed, msg, assignments = self.__collect_consumers(consumers, pool_type)
+        else:
+            changed, msg, assignments = self.__validate_consumers(consumers, pool_type)
+
+        id_list = [id_ for ids in assignments.values() for id_ in ids]
+        return dict(changed=changed,
+                    msg=msg,
+                    ansible_facts=dict(id_pool=dict(poolType=pool_type, idList=id_list, count=len(id_list)),
+                                       id_pool_assignments=assignments))
+
+    def __batches(self, items):
+        batch_size = self.module.params.get('batch_size') or self.DEFAULT_BATCH_SIZE
+        return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+    def __allocate_consumers(self, consumers, pool_type):
+        reserved = [id_ for consumer in consumers for id_ in consumer.get('idList') or []]
+        count = sum(consumer.get('count', 1) for consumer in consumers if not consumer.get('idList'))
+
+        allocated = []
+        try:
+            for id_list in self.__batches(reserved):
+                ids = self.resource_client.allocate({'idList': id_list}, pool_type).get('idList') or []
+                allocated.extend(ids)
+                if set(id_list) - set(ids):
+                    raise OneViewModuleValueError(self.MSG_IDS_NOT_AVAILABLE)
+            generated = []
+            for batch in self.__batches(range(count)):
+                ids = self.resource_client.allocate({'count': len(batch)}, pool_type).get('idList') or []
+                allocated.extend(ids)
+                generated.extend(ids)
+                if len(ids) < len(batch):
+                    raise OneViewModuleValueError(self.MSG_IDS_NOT_AVAILABLE)
+        except Exception:
+            # nothing of a partial allocation is kept, so the task can be retried
+            for id_list in self.__batches(allocated):
+                self.resource_client.collect({'idList': id_list}, pool_type)
+            raise
+
+        assignments = OrderedDict()
+        for consumer in consumers:
+            if consumer.get('idList'):
+                assignments[consumer['name']] = list(consumer['idList'])
+            else:
+                consumer_count = consumer.get('count', 1)
+                assignments[consumer['name']], generated = generated[:consumer_count], generated[consumer_count:]
+        return True, self.MSG_ALLOCATED, assignments
+
+    def __collect_consumers(self, consumers, pool_type):
+        collected = set()
+        for id_list in self.__batches([id_ for consumer in consumers for id_ in consumer['idList']]):
+            collected.update(self.resource_client.collect({'idList': id_list}, pool_type).get('idList') or [])
+
+        assignments = OrderedDict((consumer['name'], [id_ for id_ in consumer['idList'] if id_ in collected])
+                                  for consumer in consumers)
+        if collected:
+            return True, self.MSG_COLLECTED, assignments
+        return False, self.MSG_IDS_NOT_AVAILABLE, assignments
+
+    def __validate_consumers(self, consumers, pool_type):
+        id_list = [id_ for consumer in consumers for id_ in consumer['idList']]
+        valid = set(self.resource_client.validate({'idList': id_list}, pool_type).get('idList') or [])
+
+        assignments = OrderedDict((consumer['name'], [id_ for id_ in consumer['idList'] if id_ in valid])
+                                  for consumer in consumers)
+        invalid = [id_ for id_ in id_list if id_ not in valid]
+        if invalid:
+            return False, self.MSG_IDS_NOT_VALID.format(', '.join(invalid)), assignments
+        return False, self.MSG_VALIDATED, assignments
+
     def __validate(self, idDict, poolType):
         validate = self.resource_client.validate(idDict, poolType)
 
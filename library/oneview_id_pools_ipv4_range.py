@@ -26,6 +26,8 @@ module: oneview_id_pools_ipv4_range
 short_description: Manage OneView ID pools IPV4 Range resources.
 description:
     - Provides an interface to manage ID pools IPV4 Range resources. Can create, update, or delete.
+    - When the range is found by C(name) and C(subnetUri), the ranges of the subnet are requested concurrently, up to
+      C(max_concurrency) at the same time.
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -47,6 +49,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -72,7 +75,7 @@ id_pools_ipv4_range:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, OneViewRangeIndex
 
 
 class IdPoolsIpv4RangeModule(OneViewModule):
@@ -88,11 +91,14 @@ class IdPoolsIpv4RangeModule(OneViewModule):
         additional_arg_spec = dict(data=dict(required=True, type='dict'),
                                    state=dict(
                                        required=True,
-                                       choices=['present', 'absent']))
+                                       choices=['present', 'absent']),
+                                   **OneViewModule.ONEVIEW_CONCURRENCY_ARGS)
 
         super(IdPoolsIpv4RangeModule, self).__init__(additional_arg_spec=additional_arg_spec,
                                                      validate_etag_support=True)
         self.resource_client = self.oneview_client.id_pools_ipv4_ranges
+        self.range_index = OneViewRangeIndex(self.resource_client,
+                                             self.module.params.get('max_concurrency') or self.DEFAULT_MAX_CONCURRENCY)
 
     def execute_module(self):
         self.current_resource = None
@@ -102,10 +108,7 @@ class IdPoolsIpv4RangeModule(OneViewModule):
         # Do preliminary check before creating a new range
         elif self.data.get('subnetUri') and self.data.get('name'):
             subnet = self.oneview_client.id_pools_ipv4_subnets.get_by_uri(self.data.get('subnetUri'))
-            for range_uri in subnet.data['rangeUris']:
-                maybe_resource = self.resource_client.get_by_uri(range_uri)
-                if maybe_resource.data['name'] == self.data['name']:
-                    self.current_resource = maybe_resource
+            self.current_resource = self.range_index.get_by_name(subnet.data, self.data['name'])
 
         if self.state == 'present':
             return self._present()
@@ -143,7 +146,8 @@ class IdPoolsIpv4RangeModule(OneViewModule):
                 response['changed'] = True
                 self.data['idList'] = id_list
                 response['ansible_facts']['id_pools_ipv4_range'] = \
-                    self.resource_client.update_collector(dict(idList=id_list), self.data.get('uri'))
+                    self.resource_client.update_collector(dict(idList=id_list), self.__range_uri())
+                self.range_index.invalidate(self.__range_uri())
                 return response
             elif update_allocator:
                 self.data['idList'] = id_list
@@ -151,9 +155,14 @@ class IdPoolsIpv4RangeModule(OneViewModule):
                 response['msg'] = self.MSG_UPDATED
                 response['changed'] = True
                 response['ansible_facts']['id_pools_ipv4_range'] = \
-                    self.resource_client.update_allocator(dict(idList=id_list, count=count), self.data.get('uri'))
+                    self.resource_client.update_allocator(dict(idList=id_list, count=count), self.__range_uri())
+                self.range_index.invalidate(self.__range_uri())
         return response
 
+    def __range_uri(self):
+        # the range found by name in the subnet has no 'uri' in the data
+        return self.data.get('uri') or self.current_resource.data['uri']
+
 
 def main():
     IdPoolsIpv4RangeModule().run()
@@ -26,6 +26,7 @@ module: oneview_id_pools_ipv4_range_facts
 short_description: Retrieve the facts about one or more of the OneView ID Pools IPV4 Ranges.
 description:
     - Retrieve the facts about one or more of the ID Pools IPV4 Ranges from OneView.
+    - The ranges of the subnets are requested concurrently, up to C(max_concurrency) at the same time.
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -53,6 +54,8 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.concurrency
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -124,7 +127,7 @@ id_pools_ipv4_ranges_allocated_fragments:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, OneViewRangeIndex, project_fields
 
 
 class IdPoolsIpv4RangeFactsModule(OneViewModule):
@@ -134,10 +137,13 @@ class IdPoolsIpv4RangeFactsModule(OneViewModule):
             uri=dict(required=False, type='str'),
             subnetUri=dict(required=False, type='str'),
             options=dict(required=False, type='list'),
-            params=dict(required=False, type='dict')
+            params=dict(required=False, type='dict'),
+            **OneViewModule.ONEVIEW_CONCURRENCY_ARGS
         )
         super(IdPoolsIpv4RangeFactsModule, self).__init__(additional_arg_spec=argument_spec)
         self.resource_client = self.oneview_client.id_pools_ipv4_ranges
+        self.range_index = OneViewRangeIndex(self.resource_client,
+                                             self.module.params.get('max_concurrency') or self.DEFAULT_MAX_CONCURRENCY)
 
     def execute_module(self):
         facts = {}
@@ -148,25 +154,23 @@ class IdPoolsIpv4RangeFactsModule(OneViewModule):
         elif self.module.params.get('subnetUri'):
             subnet = self.oneview_client.id_pools_ipv4_subnets.get_by_uri(self.module.params.get('subnetUri'))
             if self.module.params.get('name'):
-                for range_uri in subnet.data['rangeUris']:
-                    maybe_resource = self.resource_client.get_by_uri(range_uri).data
-                    if maybe_resource['name'] == self.module.params.get('name'):
-                        id_pools_ipv4_ranges = maybe_resource
-                        break
+                resource = self.range_index.get_by_name(subnet.data, self.module.params['name'])
+                if resource:
+                    id_pools_ipv4_ranges = resource.data
             else:
                 is_specific_resource = False
-                for range_uri in subnet.data['rangeUris']:
-                    id_pools_ipv4_ranges.append(self.resource_client.get_by_uri(range_uri).data)
+                id_pools_ipv4_ranges = [resource.data for resource in self.range_index.get_all([subnet.data])]
         else:
             is_specific_resource = False
             subnets = self.oneview_client.id_pools_ipv4_subnets.get_all()
-            for subnet in subnets:
-                for range_uri in subnet['rangeUris']:
-                    range_data = self.resource_client.get_by_uri(range_uri).data
-                    id_pools_ipv4_ranges.append(range_data)
+            id_pools_ipv4_ranges = [resource.data for resource in self.range_index.get_all(subnets)]
 
         self.__get_options(facts, id_pools_ipv4_ranges, is_specific_resource)
 
+        if self.facts_fields and not is_specific_resource:
+            # the ranges are fetched by URI, without a server side projection
+            id_pools_ipv4_ranges = [project_fields(resource, self.facts_fields) for resource in id_pools_ipv4_ranges]
+
         facts['id_pools_ipv4_ranges'] = [id_pools_ipv4_ranges] if is_specific_resource else id_pools_ipv4_ranges
 
         return dict(changed=False, ansible_facts=facts)
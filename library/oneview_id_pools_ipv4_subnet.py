@@ -101,7 +101,7 @@ class IdPoolsIpv4SubnetModule(OneViewModule):
         changed, msg, ipv4_subnet = False, '', {}
 
         if self.data.get('networkId', ''):
-            self.current_resource = self.resource_client.get_by_field('networkId', self.data.get('networkId'))
+            self.current_resource = self.__get_by_network_id(self.data['networkId'])
         elif self.data.get('uri', ''):
             self.current_resource = self.resource_client.get_by_uri(self.data.get('uri'))
 
@@ -116,6 +116,11 @@ class IdPoolsIpv4SubnetModule(OneViewModule):
         elif self.state == 'absent':
             return self.resource_absent()
 
+    def __get_by_network_id(self, network_id):
+        # filtered by the appliance, instead of listing all the subnets
+        subnets = self.resource_client.get_by('networkId', network_id)
+        return self.resource_client.new(self.oneview_client.connection, subnets[0]) if subnets else None
+
     def __allocator(self, resource):
         subnet_id = resource.data['allocatorUri'].split('/')[-2]
         allocate = self.resource_client.allocate({'count': self.data['count']}, subnet_id)
@@ -116,6 +116,8 @@ interconnect:
     type: dict
 '''
 
+from functools import partial
+
 from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError)
 from hpeOneView.resources.resource import extract_id_from_uri
 
@@ -198,13 +200,18 @@ class InterconnectModule(OneViewModule):
             raise OneViewModuleValueError(self.MSG_MISSING_KEY)
 
         if not self.current_resource and interconnect_ip:
-            interconnects = self.oneview_client.interconnects.get_by('interconnectIP', interconnect_ip) or []
-            if interconnects:
-                self.current_resource = self.resource_client.get_by_uri(interconnects[0]["uri"])
+            self.current_resource = self.get_by_index('ip', interconnect_ip,
+                                                      partial(self.__get_by_ip, interconnect_ip))
 
         if not self.current_resource:
             raise OneViewModuleResourceNotFound(self.MSG_INTERCONNECT_NOT_FOUND)
 
+    def __get_by_ip(self, interconnect_ip):
+        interconnects = self.oneview_client.interconnects.get_by('interconnectIP', interconnect_ip) or []
+        if interconnects:
+            return self.resource_client.get_by_uri(interconnects[0]["uri"])
+        return None
+
     def change_state(self, state):
         changed = False
 
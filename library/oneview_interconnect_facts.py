@@ -46,13 +46,26 @@ options:
           C(ports) gets all interconnect ports.
           C(port) gets a specific interconnect port.
           C(pluggableModuleInformation) gets all the SFP information."
-        - "To gather additional facts it is required inform the Interconnect name. Otherwise, these options will be
-          ignored."
+        - "To gather additional facts it is required inform the Interconnect name, the C(names) of many
+          Interconnects or a C(filter) in C(params). Otherwise, these options will be ignored."
+        - The options of an Interconnect are gathered concurrently, up to C(max_concurrency) at the same time.
+      required: false
+    names:
+      description:
+        - Names of the Interconnects whose C(options) are gathered. The Interconnects are resolved from a single
+          listing and the options of up to C(max_concurrency) Interconnects are requested at the same time. The
+          options are returned by Interconnect URI in C(interconnects_options), or, when C(stream_to) is set,
+          written to that file as one line per Interconnect, with its C(uri).
+        - When C(names) is not set but C(params) has a C(filter), the options are gathered in the same way for all
+          the Interconnects matched.
       required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.concurrency
+    - oneview.stream
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -183,6 +196,40 @@ EXAMPLES = '''
 - debug: var=interconnects
 - debug: var=interconnect_pluggable_module_information
 
+- name: Write the port statistics of many interconnects to a file, one interconnect per line
+  oneview_interconnect_facts:
+    config: "{{ config }}"
+    names:
+      - '0000A66102, interconnect 2'
+      - '0000A66103, interconnect 2'
+    options:
+      - statistics
+      - ports
+    max_concurrency: 16
+    stream_to: /tmp/interconnects_statistics.ndjson
+  delegate_to: localhost
+
+- debug: var=interconnects_options_manifest
+
+- name: Gather the statistics of all the interconnects of an enclosure
+  oneview_interconnect_facts:
+    config: "{{ config }}"
+    params:
+      filter: "enclosureName='0000A66102'"
+    options:
+      - statistics
+  delegate_to: localhost
+
+- debug: var=interconnects_options
+
+- name: Write all interconnects to a file, one per line
+  oneview_interconnect_facts:
+    config: "{{ config }}"
+    stream_to: /tmp/interconnects.ndjson
+    page_size: 1000
+  delegate_to: localhost
+
+- debug: var=interconnects_manifest
 '''
 
 RETURN = '''
@@ -225,9 +272,32 @@ interconnect_pluggable_module_information:
     description: The plugged SFPs information.
     returned: When requested, but can be null.
     type: list
+
+interconnect_option_timings:
+    description: Duration in seconds of the request of each option, by fact name.
+    returned: When options are requested.
+    type: dict
+
+interconnects_options:
+    description: The facts of the options of each Interconnect, by URI.
+    returned: When options are requested for C(names) or a C(filter), without C(stream_to).
+    type: dict
+
+interconnects_options_manifest:
+    description: Manifest of the file with the options of each Interconnect, with its C(path), C(count) and
+                 C(checksum).
+    returned: When options are requested for C(names) or a C(filter), with C(stream_to).
+    type: dict
+
+interconnects_manifest:
+    description: Manifest of the file with the interconnects, with its C(path), C(count) and C(checksum).
+    returned: When C(stream_to) is set.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from functools import partial
+
+from ansible.module_utils.oneview import OneViewModule, stream_to_file
 from hpeOneView.resources.resource import extract_id_from_uri
 
 
@@ -237,8 +307,10 @@ class InterconnectFactsModule(OneViewModule):
     def __init__(self):
         argument_spec = dict(
             name=dict(required=False, type='str'),
+            names=dict(required=False, type='list', elements='str'),
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
+            **dict(OneViewModule.ONEVIEW_STREAM_ARGS, **OneViewModule.ONEVIEW_CONCURRENCY_ARGS)
         )
         super(InterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec)
         self.set_resource_object(self.oneview_client.interconnects)
@@ -251,6 +323,16 @@ class InterconnectFactsModule(OneViewModule):
 
             if self.module.params.get('options'):
                 self.__get_options(facts)
+        elif self.is_multi_resource_facts():
+            facts['interconnects'] = self.get_resources_by_names()
+            options = self.gather_options_by_uri(facts['interconnects'], self.__get_option_calls)
+            if self.module.params.get('stream_to'):
+                facts['interconnects_options_manifest'] = options
+            else:
+                facts['interconnects_options'] = options
+        elif self.module.params.get('stream_to'):
+            facts['interconnects_manifest'] = stream_to_file(self.resource_client.get_all, self.module.params['stream_to'],
+                                                             self.facts_params, self.module.params['page_size'])
         else:
             facts['interconnects'] = self.resource_client.get_all(**self.facts_params)
 
@@ -260,38 +342,46 @@ class InterconnectFactsModule(OneViewModule):
         )
 
     def __get_options(self, facts):
+        # the options are independent GETs, gathered in parallel
+        timings = dict()
+        facts.update(self.run_concurrently(self.__get_option_calls(self.current_resource), timings))
+        facts['interconnect_option_timings'] = timings
+
+    def __get_option_calls(self, interconnect):
+        calls = []
+
         if self.options.get('nameServers'):
-            name_servers = self.current_resource.get_name_servers()
-            facts['interconnect_name_servers'] = name_servers
+            calls.append(('interconnect_name_servers', interconnect.get_name_servers))
 
         if self.options.get('statistics'):
-            facts['interconnect_statistics'] = self.current_resource.get_statistics()
+            calls.append(('interconnect_statistics', interconnect.get_statistics))
 
         if self.options.get('portStatistics'):
             port_name = self.options['portStatistics']
-            port_statistics = self.current_resource.get_statistics(port_name)
-            facts['interconnect_port_statistics'] = port_statistics
+            calls.append(('interconnect_port_statistics', partial(interconnect.get_statistics, port_name)))
 
         if self.options.get('subPortStatistics'):
-            facts['interconnect_subport_statistics'] = None
             sub_options = self.options['subPortStatistics']
             if isinstance(sub_options, dict) and sub_options.get('portName') and sub_options.get('subportNumber'):
-                facts['interconnect_subport_statistics'] = self.current_resource.get_subport_statistics(
-                    sub_options['portName'], sub_options['subportNumber'])
+                calls.append(('interconnect_subport_statistics',
+                              partial(interconnect.get_subport_statistics,
+                                      sub_options['portName'], sub_options['subportNumber'])))
+            else:
+                calls.append(('interconnect_subport_statistics', lambda: None))
 
         if self.options.get('ports'):
-            ports = self.current_resource.get_ports()
-            facts['interconnect_ports'] = ports
+            calls.append(('interconnect_ports', interconnect.get_ports))
 
         if self.options.get('port'):
             port_name = self.options.get('port')
-            port_id = "{}:{}".format(extract_id_from_uri(self.current_resource.data['uri']), port_name)
-            port = self.current_resource.get_port(port_id)
-            facts['interconnect_port'] = port
+            port_id = "{}:{}".format(extract_id_from_uri(interconnect.data['uri']), port_name)
+            calls.append(('interconnect_port', partial(interconnect.get_port, port_id)))
 
         if self.options.get('pluggableModuleInformation'):
-            sfp_info = self.current_resource.get_pluggable_module_information()
-            facts['interconnect_pluggable_module_information'] = sfp_info
+            calls.append(('interconnect_pluggable_module_information',
+                          interconnect.get_pluggable_module_information))
+
+        return calls
 
 
 def main():
@@ -54,6 +54,7 @@ notes:
     - This resource is available for API version 300 or later
 extends_documentation_fragment:
     - oneview
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
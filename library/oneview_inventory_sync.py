@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_inventory_sync
+short_description: Sync OneView resources to a local inventory.
+description:
+    - Lists OneView collections and stores their resources in a local SQLite inventory, indexed by name, URI,
+      serial number, hostname, IP and scope.
+    - When the C(ONEVIEW_INVENTORY_PATH) environment variable points to the inventory, the other modules resolve
+      those lookups from it and get the resources by URI, instead of listing or filtering the collection. The
+      collections synced more than C(ONEVIEW_INVENTORY_MAX_AGE) seconds ago (300 by default) are not used, and the
+      lookups missed by the inventory fall back to the API.
+version_added: "2.9"
+requirements:
+    - "python >= 3.6.9"
+    - "hpeOneView >= 6.1.0"
+author: "Hewlett Packard Enterprise"
+options:
+    collections:
+      description:
+        - Names of the OneView client collections to sync, like C(enclosures), C(interconnects),
+          C(server_hardware) or C(storage_systems). They are listed concurrently, up to C(max_concurrency) at the
+          same time.
+      required: true
+      type: list
+    path:
+      description:
+        - Path of the SQLite inventory. Defaults to the C(ONEVIEW_INVENTORY_PATH) environment variable.
+      required: false
+
+extends_documentation_fragment:
+    - oneview
+    - oneview.concurrency
+'''
+
+EXAMPLES = '''
+- name: Sync the enclosures, interconnects and storage systems to the local inventory
+  oneview_inventory_sync:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    path: ~/.ansible/oneview_inventory.db
+    collections:
+      - enclosures
+      - interconnects
+      - storage_systems
+  delegate_to: localhost
+
+- debug: var=oneview_inventory
+'''
+
+RETURN = '''
+oneview_inventory:
+    description: The C(path) of the inventory and the number of resources synced by collection.
+    returned: Always.
+    type: dict
+'''
+
+import os
+
+from ansible.module_utils.oneview import OneViewModule, OneViewModuleValueError, OneViewInventory, HAS_SQLITE3
+
+
+class InventorySyncModule(OneViewModule):
+    MSG_SYNCED = 'Inventory synced.'
+    MSG_PATH_REQUIRED = "The inventory path is required, either as 'path' or in the {0} environment variable."
+    MSG_SQLITE3_REQUIRED = 'The sqlite3 Python module is required.'
+    MSG_UNSUPPORTED_COLLECTION = 'Collection not supported by the inventory: {0}'
+
+    def __init__(self):
+        argument_spec = dict(
+            collections=dict(required=True, type='list', elements='str'),
+            path=dict(required=False, type='path'),
+            **OneViewModule.ONEVIEW_CONCURRENCY_ARGS
+        )
+        super(InventorySyncModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        if not HAS_SQLITE3:
+            raise OneViewModuleValueError(self.MSG_SQLITE3_REQUIRED)
+
+        path = self.module.params.get('path') or os.environ.get(OneViewInventory.PATH_ENV)
+        if not path:
+            raise OneViewModuleValueError(self.MSG_PATH_REQUIRED.format(OneViewInventory.PATH_ENV))
+
+        resource_clients = [(name, self.__get_resource_client(name)) for name in self.module.params['collections']]
+        listings = self.run_concurrently([(name, resource_client.get_all)
+                                          for name, resource_client in resource_clients])
+
+        inventory = OneViewInventory(path)
+        appliance = self.oneview_client.connection.get_host()
+        for name, resource_client in resource_clients:
+            inventory.sync(appliance, resource_client.URI, listings[name])
+
+        return dict(changed=True,
+                    msg=self.MSG_SYNCED,
+                    ansible_facts=dict(oneview_inventory=dict(
+                        path=inventory.path,
+                        collections=dict((name, len(resources)) for name, resources in listings.items()))))
+
+    def __get_resource_client(self, name):
+        resource_client = getattr(self.oneview_client, name, None)
+        if not getattr(resource_client, 'URI', None) or not hasattr(resource_client, 'get_all'):
+            raise OneViewModuleValueError(self.MSG_UNSUPPORTED_COLLECTION.format(name))
+        return resource_client
+
+
+def main():
+    InventorySyncModule().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -323,8 +323,8 @@ li_inconsistency_report:
     type: dict
 '''
 
-import time
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError, compare
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError,
+                                          OneViewRetryPolicy, compare)
 
 
 class LogicalInterconnectModule(OneViewModule):
@@ -347,6 +347,10 @@ class LogicalInterconnectModule(OneViewModule):
     MSG_NO_CHANGES_PROVIDED = 'Nothing to do.'
     MSG_NO_OPTIONS_PROVIDED = 'No options provided.'
 
+    # another operation on the same logical interconnect, like an update of its firmware or settings
+    RETRY_POLICY = OneViewRetryPolicy(['CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT'], timeout=1800,
+                                      initial_delay=5, max_delay=60, routing_keys=['scmb.logical-interconnects.#'])
+
     argument_spec = dict(
         state=dict(
             required=True,
@@ -410,17 +414,9 @@ class LogicalInterconnectModule(OneViewModule):
         return result
 
     def __compliance(self):
-        # This block will handle the exception caused by parallel operations made on same resource
-        try:
-            li = self.current_resource.update_compliance()
-            return True, self.MSG_CONSISTENT, dict(logical_interconnect=li)
-        except Exception as e:
-            attrib_val = getattr(e, 'oneview_response', None)
-            if attrib_val and attrib_val.get('errorCode') == 'CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT':
-                time.sleep(60)
-                main()
-            else:
-                raise e
+        # parallel operations made on same resource are retried
+        li = self.retry(self.current_resource.update_compliance)
+        return True, self.MSG_CONSISTENT, dict(logical_interconnect=li)
 
     def __update_ethernet_settings(self):
         self.__validate_options('ethernetSettings', self.data)
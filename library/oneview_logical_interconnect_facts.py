@@ -57,11 +57,14 @@ options:
           C(telemetry_configuration) gets the telemetry configuration of the logical interconnect.
           C(ethernet_settings) gets the Ethernet interconnect settings for the Logical Interconnect.
         - These options are valid just when a C(name) is provided. Otherwise it will be ignored."
+        - The options are gathered concurrently, up to C(max_concurrency) at the same time.
       required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.concurrency
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -196,6 +199,11 @@ ethernet_settings:
     description: The Ethernet Interconnect Settings.
     returned: When requested, but can be null.
     type: dict
+
+logical_interconnect_option_timings:
+    description: Duration in seconds of the request of each option, by option name.
+    returned: When options are requested.
+    type: dict
 '''
 
 from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound
@@ -208,6 +216,7 @@ class LogicalInterconnectFactsModule(OneViewModule):
         name=dict(required=False, type='str'),
         options=dict(required=False, type='list'),
         params=dict(required=False, type='dict'),
+        **OneViewModule.ONEVIEW_CONCURRENCY_ARGS
     )
 
     def __init__(self):
@@ -255,10 +264,10 @@ class LogicalInterconnectFactsModule(OneViewModule):
         return facts
 
     def __get_options(self, options):
-        facts = dict()
-
-        for option in options:
-            facts[option] = self.options[option]()
+        # the options are independent GETs, gathered in parallel
+        timings = dict()
+        facts = dict(self.run_concurrently([(option, self.options[option]) for option in options], timings))
+        facts['logical_interconnect_option_timings'] = timings
 
         return facts
 
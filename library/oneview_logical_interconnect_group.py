@@ -138,7 +138,7 @@ logical_interconnect_group:
     type: dict
 '''
 
-from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound,
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewNetworkResolver,
                                           compare_lig, dict_merge, LIGMerger)
 
 
@@ -174,6 +174,7 @@ class LogicalInterconnectGroupModule(OneViewModule):
         changed = False
         scope_uris = self.data.pop('scopeUris', None)
 
+        self.__search_network_names()
         self.__replace_name_by_uris()
 
         if 'uplinkSets' in self.data:
@@ -231,6 +232,18 @@ class LogicalInterconnectGroupModule(OneViewModule):
             msg = self.MSG_UPDATED
         return changed, msg
 
+    # loads all the network and network set names referenced in the LIG with a single index search
+    def __search_network_names(self):
+        self.network_resolver = OneViewNetworkResolver(self.oneview_client)
+        names = list(self.data.get('internalNetworkNames') or [])
+        for uplinkSet in self.data.get('uplinkSets') or []:
+            names.extend(uplinkSet.get('networkNames') or [])
+            names.extend(uplinkSet.get('networkSetNames') or [])
+        if names:
+            self.network_resolver.search(names, [OneViewNetworkResolver.ETHERNET_NETWORKS,
+                                                 OneViewNetworkResolver.FC_NETWORKS,
+                                                 OneViewNetworkResolver.NETWORK_SETS])
+
     def __replace_name_by_uris(self):
         if self.data.get('internalNetworkNames'):
             self.__replace_internal_network_names_by_uris()
@@ -274,19 +287,20 @@ class LogicalInterconnectGroupModule(OneViewModule):
 
     def __get_network_uri(self, name, network_type):
         if network_type == 'Ethernet':
-            network_name = self.oneview_client.ethernet_networks.get_by_name(name)
+            category = OneViewNetworkResolver.ETHERNET_NETWORKS
         else:
-            network_name = self.oneview_client.fc_networks.get_by_name(name)
+            category = OneViewNetworkResolver.FC_NETWORKS
 
-        if network_name:
-            return network_name.data['uri']
+        network_uri = self.network_resolver.get_uri(name, [category])
+        if network_uri:
+            return network_uri
         else:
             raise OneViewModuleResourceNotFound(self.MSG_NETWORK_NOT_FOUND)
 
     def __get_network_set(self, name):
-        network_set = self.oneview_client.network_sets.get_by_name(name)
-        if network_set:
-            return network_set.data['uri']
+        network_set_uri = self.network_resolver.get_uri(name, [OneViewNetworkResolver.NETWORK_SETS])
+        if network_set_uri:
+            return network_set_uri
         else:
             raise OneViewModuleResourceNotFound(self.MSG_NETWORK_SET_NOT_FOUND)
 
@@ -40,12 +40,14 @@ options:
       choices: ['present', 'absent']
     data:
       description:
-        - List with the Network Set properties.
-      required: true
+        - List with the Network Set properties. Required unless C(items) is set.
+      required: false
 
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
+    - oneview.batch
+    - oneview.concurrency
 '''
 
 EXAMPLES = '''
@@ -99,6 +101,25 @@ EXAMPLES = '''
         - /rest/scopes/01SC123456
         - /rest/scopes/02SC123456
   delegate_to: localhost
+
+- name: Ensure several Network Sets in a single task
+  oneview_network_set:
+    config: "{{ config }}"
+    state: present
+    max_concurrency: 8
+    items:
+      - data:
+          name: "Network Set 1"
+          networkUris:
+            - Test Ethernet Network_1
+      - data:
+          name: "Network Set 2"
+          networkUris:
+            - Test Ethernet Network_2
+      - state: absent
+        data:
+          name: "Network Set 3"
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -106,9 +127,14 @@ network_set:
     description: Has the facts about the Network Set.
     returned: On state 'present', but can be null.
     type: dict
+items:
+    description: Results of each item, in the order of the items, when the module receives C(items).
+    returned: When C(items) is set.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, compare
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError,
+                                          OneViewNetworkResolver, compare)
 
 
 class NetworkSetModule(OneViewModule):
@@ -119,6 +145,7 @@ class NetworkSetModule(OneViewModule):
     MSG_ALREADY_ABSENT = 'Network Set is already absent.'
     MSG_ETHERNET_NETWORK_NOT_FOUND = 'Ethernet Network not found: '
     MSG_CONNECTION_TEMPLATE_NOT_FOUND = 'Connection Template not found.'
+    MSG_BANDWIDTH_NOT_SUPPORTED = 'The bandwidth is not supported with items, set it in a task per Network Set.'
     RESOURCE_FACT_NAME = 'network_set'
 
     argument_spec = dict(
@@ -130,7 +157,8 @@ class NetworkSetModule(OneViewModule):
 
     def __init__(self):
         super(NetworkSetModule, self).__init__(additional_arg_spec=self.argument_spec,
-                                               validate_etag_support=True)
+                                               validate_etag_support=True,
+                                               batch_support=True)
         self.set_resource_object(self.oneview_client.network_sets)
         self.connection_templates = self.oneview_client.connection_templates
 
@@ -145,7 +173,7 @@ class NetworkSetModule(OneViewModule):
 
         bandwidth = self.data.pop('bandwidth', None)
         scope_uris = self.data.pop('scopeUris', None)
-        self.__replace_network_name_by_uri(self.data)
+        self.__replace_network_name_by_uri([self.data])
         result = self.resource_present(self.RESOURCE_FACT_NAME)
 
         if bandwidth:
@@ -162,28 +190,38 @@ class NetworkSetModule(OneViewModule):
             result = self.resource_scopes_set(result, self.RESOURCE_FACT_NAME, scope_uris)
         return result
 
-    def __get_ethernet_network_by_name(self, name):
-
-        result = self.oneview_client.ethernet_networks.get_by('name', name)
-        return result[0] if result else None
-
     def __get_network_uri(self, network_name_or_uri):
 
         if network_name_or_uri and network_name_or_uri.startswith('/rest/ethernet-networks'):
             return network_name_or_uri
         else:
-            enet_network = self.__get_ethernet_network_by_name(network_name_or_uri)
-            if enet_network:
-                return enet_network['uri']
+            network_uri = self.network_resolver.get_uri(network_name_or_uri, [OneViewNetworkResolver.ETHERNET_NETWORKS])
+            if network_uri:
+                return network_uri
             else:
                 raise OneViewModuleResourceNotFound(self.MSG_ETHERNET_NETWORK_NOT_FOUND + network_name_or_uri)
 
-    def __replace_network_name_by_uri(self, data):
-
-        if 'networkUris' in data:
-            data['networkUris'] = [self.__get_network_uri(x) for x in data['networkUris']]
-        if 'nativeNetworkUri' in data and data['nativeNetworkUri']:
-            data['nativeNetworkUri'] = self.__get_network_uri(data['nativeNetworkUri'])
+    def prepare_batch(self, items_data):
+        if any('bandwidth' in data for data in items_data):
+            raise OneViewModuleValueError(self.MSG_BANDWIDTH_NOT_SUPPORTED)
+        self.__replace_network_name_by_uri(items_data)
+
+    def __replace_network_name_by_uri(self, data_list):
+        self.network_resolver = OneViewNetworkResolver(self.oneview_client)
+        names = []
+        for data in data_list:
+            names.extend(data.get('networkUris') or [])
+            if data.get('nativeNetworkUri'):
+                names.append(data['nativeNetworkUri'])
+        names = [x for x in names if not x.startswith('/rest/ethernet-networks')]
+        if names:
+            self.network_resolver.search(names, [OneViewNetworkResolver.ETHERNET_NETWORKS])
+
+        for data in data_list:
+            if 'networkUris' in data:
+                data['networkUris'] = [self.__get_network_uri(x) for x in data['networkUris']]
+            if 'nativeNetworkUri' in data and data['nativeNetworkUri']:
+                data['nativeNetworkUri'] = self.__get_network_uri(data['nativeNetworkUri'])
 
     # Update network set connection template with bandwidth
     def __update_connection_template(self, bandwidth):
@@ -41,6 +41,7 @@ options:
         - "List with options to gather additional facts about Server Hardware related resources.
           Options allowed: C(bios), C(javaRemoteConsoleUrl), C(environmentalConfig), C(iloSsoUrl), C(remoteConsoleUrl),
           C(utilization), C(firmware), C(firmwares) and C(physicalServerHardware)."
+        - The options are gathered concurrently, up to C(max_concurrency) at the same time.
       required: false
 notes:
     - The options C(firmware) and C(firmwares) are only available for API version 300 or later.
@@ -48,6 +49,10 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.concurrency
+    - oneview.stream
+    - oneview.factsfields
+    - oneview.snapshot
 '''
 
 EXAMPLES = '''
@@ -78,6 +83,20 @@ EXAMPLES = '''
 - debug: msg="{{server_hardwares | map(attribute='name') | list }}"
 
 
+- name: Gather only the name and power state of all Server Hardwares
+  oneview_server_hardware_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    fields:
+      - name
+      - powerState
+  delegate_to: localhost
+
+- debug: var=server_hardwares
+
+
 - name: Gather facts about a Server Hardware by name
   oneview_server_hardware_facts:
     hostname: 172.16.101.48
@@ -158,6 +177,15 @@ EXAMPLES = '''
   delegate_to: localhost
 
 - debug: var=server_hardware_firmware
+
+- name: Write all server hardwares to a file, one per line
+  oneview_server_hardware_facts:
+    config: "{{ config }}"
+    stream_to: /tmp/server_hardwares.ndjson
+    page_size: 1000
+  delegate_to: localhost
+
+- debug: var=server_hardwares_manifest
 '''
 
 RETURN = '''
@@ -210,9 +238,14 @@ server_hardware_physical_server_hardware:
     description: Has all the facts describing an 'SDX' partition. Used with SDX enclosures only.
     returned: When requested, but can be null.
     type: dict
+
+server_hardwares_manifest:
+    description: Manifest of the file with the server hardwares, with its C(path), C(count) and C(checksum).
+    returned: When C(stream_to) is set.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, stream_to_file
 
 
 class ServerHardwareFactsModule(OneViewModule):
@@ -221,51 +254,62 @@ class ServerHardwareFactsModule(OneViewModule):
             name=dict(required=False, type='str'),
             uri=dict(required=False, type='str'),
             options=dict(required=False, type='list'),
-            params=dict(required=False, type='dict')
+            params=dict(required=False, type='dict'),
+            **dict(OneViewModule.ONEVIEW_STREAM_ARGS, **OneViewModule.ONEVIEW_CONCURRENCY_ARGS)
         )
+        argument_spec.update(OneViewModule.ONEVIEW_SNAPSHOT_ARGS)
         super(ServerHardwareFactsModule, self).__init__(additional_arg_spec=argument_spec)
         self.set_resource_object(self.oneview_client.server_hardware)
 
     def execute_module(self):
-        ansible_facts = {}
+        option_calls = []
         server_hardwares = []
+        manifest = None
 
         if self.module.params.get('name') or self.module.params.get('uri'):
             if self.current_resource:
                 server_hardwares = self.current_resource.data
                 if self.options:
-                    ansible_facts = self.gather_option_facts()
+                    option_calls = self.gather_option_calls()
+        elif self.module.params.get('stream_to'):
+            manifest = stream_to_file(self.resource_client.get_all, self.module.params['stream_to'],
+                                      self.facts_params, self.module.params['page_size'])
         else:
-            server_hardwares = self.resource_client.get_all(**self.facts_params)
+            server_hardwares = self.get_all_facts()
 
         if self.options and self.options.get('firmwares'):
-            ansible_facts['server_hardware_firmwares'] = self.get_all_firmwares()
+            option_calls.append(('server_hardware_firmwares', self.get_all_firmwares))
 
-        ansible_facts["server_hardwares"] = server_hardwares
+        # the options are independent GETs, gathered in parallel and returned in the same order
+        ansible_facts = dict(self.run_concurrently(option_calls))
+        if manifest:
+            ansible_facts["server_hardwares_manifest"] = manifest
+        else:
+            ansible_facts["server_hardwares"] = server_hardwares
 
         return dict(changed=False, ansible_facts=ansible_facts)
 
-    def gather_option_facts(self):
-        ansible_facts = {}
+    def gather_option_calls(self):
+        calls = []
 
         if self.options.get('bios'):
-            ansible_facts['server_hardware_bios'] = self.current_resource.get_bios()
+            calls.append(('server_hardware_bios', self.current_resource.get_bios))
         if self.options.get('environmentalConfig'):
-            ansible_facts['server_hardware_env_config'] = self.current_resource.get_environmental_configuration()
+            calls.append(('server_hardware_env_config', self.current_resource.get_environmental_configuration))
         if self.options.get('javaRemoteConsoleUrl'):
-            ansible_facts['server_hardware_java_remote_console_url'] = self.current_resource.get_java_remote_console_url()
+            calls.append(('server_hardware_java_remote_console_url', self.current_resource.get_java_remote_console_url))
         if self.options.get('iloSsoUrl'):
-            ansible_facts['server_hardware_ilo_sso_url'] = self.current_resource.get_ilo_sso_url()
+            calls.append(('server_hardware_ilo_sso_url', self.current_resource.get_ilo_sso_url))
         if self.options.get('physicalServerHardware'):
-            ansible_facts['server_hardware_physical_server_hardware'] = self.current_resource.get_physical_server_hardware()
+            calls.append(('server_hardware_physical_server_hardware', self.current_resource.get_physical_server_hardware))
         if self.options.get('remoteConsoleUrl'):
-            ansible_facts['server_hardware_remote_console_url'] = self.current_resource.get_remote_console_url()
+            calls.append(('server_hardware_remote_console_url', self.current_resource.get_remote_console_url))
         if self.options.get('utilization'):
-            ansible_facts['server_hardware_utilization'] = self.get_utilization()
+            calls.append(('server_hardware_utilization', self.get_utilization))
         if self.options.get('firmware'):
-            ansible_facts['server_hardware_firmware'] = self.current_resource.get_firmware()
+            calls.append(('server_hardware_firmware', self.current_resource.get_firmware))
 
-        return ansible_facts
+        return calls
 
     def get_all_firmwares(self):
         if isinstance(self.options['firmwares'], bool):
@@ -64,6 +64,24 @@ options:
     description:
       - Dict with query parameters.
     required: False
+  assignment_strategy:
+    description:
+      - How the Server Hardware is chosen among the available ones when it is automatically assigned.
+        C(first) chooses the first one listed by the appliance. C(random) chooses a random one. C(hash) chooses one by
+        hashing the name of the Server Profile, so each profile prefers a different Server Hardware.
+        C(reservation) also hashes the name and records the choice in a ledger shared by the forks on the
+        controller, so the profiles created in parallel choose different Server Hardware on the first try.
+      - The Server Hardware that failed to be assigned because of a concurrent assignment is not chosen again.
+    default: first
+    choices: ['first', 'random', 'hash', 'reservation']
+  reservation_dir:
+    description:
+      - Directory of the ledger of the C(reservation) strategy.
+    default: ~/.ansible/oneview_reservations
+  reservation_ttl:
+    description:
+      - Seconds a Server Hardware stays reserved by the C(reservation) strategy.
+    default: 600
 notes:
     - "For the following data, you can provide either a name or a URI: enclosureGroupName or enclosureGroupUri,
        osDeploymentPlanName or osDeploymentPlanUri (on the osDeploymentSettings), networkName or networkUri (on the
@@ -233,6 +251,9 @@ from ansible.module_utils.oneview import (OneViewModule,
                                           OneViewModuleTaskError,
                                           SPKeys,
                                           OneViewModuleException,
+                                          OneViewServerHardwareReservations,
+                                          SERVER_HARDWARE_ASSIGNMENT_STRATEGIES,
+                                          choose_server_hardware,
                                           compare)
 
 
@@ -256,12 +277,23 @@ class ServerProfileModule(OneViewModule):
                                        " not associated with a server profile template."
 
     CONCURRENCY_FAILOVER_RETRIES = 25
+    # Delays, in seconds, between the retries of the conflicting operations. If the state-change message bus is
+    # enabled, the retries also start when the server hardware or profiles change, but not before the minimum delay,
+    # since any change of the appliance matches.
+    CONFLICT_INITIAL_DELAY = 2
+    CONFLICT_MAX_DELAY = 20
+    CONFLICT_MIN_DELAY = 10
+    CONFLICT_ROUTING_KEYS = ['scmb.server-hardware.#', 'scmb.server-profiles.#']
+    UPDATE_FAILED_DELAY = 10
 
     argument_spec = dict(
         state=dict(choices=['present', 'absent', 'compliant'], default='present'),
         data=dict(type='dict', required=True),
         params=dict(type='dict', required=False),
-        auto_assign_server_hardware=dict(type='bool', default=True)
+        auto_assign_server_hardware=dict(type='bool', default=True),
+        assignment_strategy=dict(choices=list(SERVER_HARDWARE_ASSIGNMENT_STRATEGIES), default='first'),
+        reservation_dir=dict(type='path', default='~/.ansible/oneview_reservations'),
+        reservation_ttl=dict(type='int', default=OneViewServerHardwareReservations.DEFAULT_TTL)
     )
 
     def __init__(self):
@@ -274,6 +306,8 @@ class ServerProfileModule(OneViewModule):
         self.server_hardware = self.oneview_client.server_hardware
         self.os_deployment_plans = self.oneview_client.os_deployment_plans
         self.server_template = None
+        # server hardware assigned concurrently by others, not chosen again
+        self.__unavailable_server_hardware = set()
 
     def execute_module(self):
         self.auto_assign_server_hardware = self.module.params.get('auto_assign_server_hardware')
@@ -426,7 +460,7 @@ class ServerProfileModule(OneViewModule):
             power_on_msg = 'Some server profile attributes cannot be changed while the server hardware is powered on.'
             if power_on_msg in error_msg:
                 self.module.log("Update failed due to powered on Server Hardware. Powering off before retrying.")
-                time.sleep(10)  # sleep timer to avoid timing issues after update operation failed
+                time.sleep(self.UPDATE_FAILED_DELAY)  # sleep timer to avoid timing issues after update operation failed
 
                 # When reassigning Server Hardwares, both the original and the new SH should be set to OFF
                 self.__set_server_hardware_power_state(self.current_resource.data['serverHardwareUri'], 'Off')
@@ -440,33 +474,45 @@ class ServerProfileModule(OneViewModule):
             else:
                 raise OneViewModuleException(error_msg)
 
+    def __create_conflict_waiter(self):
+        return self.create_waiter(self.CONFLICT_ROUTING_KEYS, initial_delay=self.CONFLICT_INITIAL_DELAY,
+                                  max_delay=self.CONFLICT_MAX_DELAY, min_delay=self.CONFLICT_MIN_DELAY)
+
     def __create_profile(self):
         tries = 0
+        waiter = None
         self.__remove_inconsistent_data()
-        while tries < self.CONCURRENCY_FAILOVER_RETRIES:
-            try:
-                tries += 1
-
-                server_hardware_uri = self._auto_assign_server_profile()
-
-                if server_hardware_uri:
-                    self.module.log(msg="Power off the Server Hardware before create the Server Profile")
-                    self.__set_server_hardware_power_state(server_hardware_uri, 'Off')
-
-                # Build the data to create a new server profile based on a template if informed
-                server_profile = self.__build_new_profile_data(server_hardware_uri)
-                self.module.log(msg="Request Server Profile creation")
-                return self.resource_client.create(server_profile, **self.params)
-
-            except OneViewModuleTaskError as task_error:
-                self.module.log("Error code: {} Message: {}".format(str(task_error.error_code), str(task_error.msg)))
-                if task_error.error_code in self.ASSIGN_HARDWARE_ERROR_CODES:
-                    # if this is because the server is already assigned, someone grabbed it before we assigned,
-                    # ignore and try again
-                    # This waiting time was chosen empirically and it could differ according to the hardware.
-                    time.sleep(10)
-                else:
-                    raise task_error
+        try:
+            while tries < self.CONCURRENCY_FAILOVER_RETRIES:
+                try:
+                    tries += 1
+
+                    server_hardware_uri = self._auto_assign_server_profile()
+
+                    if server_hardware_uri:
+                        self.module.log(msg="Power off the Server Hardware before create the Server Profile")
+                        self.__set_server_hardware_power_state(server_hardware_uri, 'Off')
+
+                    # Build the data to create a new server profile based on a template if informed
+                    server_profile = self.__build_new_profile_data(server_hardware_uri)
+                    self.module.log(msg="Request Server Profile creation")
+                    return self.resource_client.create(server_profile, **self.params)
+
+                except OneViewModuleTaskError as task_error:
+                    self.module.log("Error code: {} Message: {}".format(str(task_error.error_code),
+                                                                        str(task_error.msg)))
+                    if task_error.error_code in self.ASSIGN_HARDWARE_ERROR_CODES:
+                        if server_hardware_uri:
+                            self.__unavailable_server_hardware.add(server_hardware_uri)
+                        # if this is because the server is already assigned, someone grabbed it before we assigned,
+                        # ignore and try again, backing off so the concurrent tasks do not retry in lockstep
+                        waiter = waiter or self.__create_conflict_waiter()
+                        waiter.backoff(tries)
+                    else:
+                        raise task_error
+        finally:
+            if waiter:
+                waiter.close()
 
         raise OneViewModuleException(self.MSG_ERROR_ALLOCATE_SERVER_HARDWARE)
 
@@ -575,15 +621,23 @@ class ServerProfileModule(OneViewModule):
                     serverHardwareTypeUri=server_hardware_type)
 
         # targets will list empty bays. We need to pick one that has a server
-        index = 0
-        server_hardware_uri = None
-        while not server_hardware_uri and index < len(available_server_hardware):
-            server_hardware_uri = available_server_hardware[index]['serverHardwareUri']
-            index = index + 1
+        candidates = [target['serverHardwareUri'] for target in available_server_hardware
+                      if target.get('serverHardwareUri')]
+        server_hardware_uri = self.__choose_server_hardware(
+            [uri for uri in candidates if uri not in self.__unavailable_server_hardware] or candidates)
 
         self.module.log(msg="Found available server hardware: '{}'".format(server_hardware_uri))
         return server_hardware_uri
 
+    def __choose_server_hardware(self, candidates):
+        strategy = self.module.params.get('assignment_strategy') or 'first'
+        reservations = None
+        if strategy == 'reservation':
+            reservations = OneViewServerHardwareReservations(self.module.params['reservation_dir'],
+                                                             self.module.params['reservation_ttl'])
+        return choose_server_hardware(candidates, strategy, self.data.get('name'), reservations,
+                                      self.oneview_client.connection.get_host())
+
     def __delete_profile(self):
         if not self.current_resource:
             return False, self.MSG_ALREADY_ABSENT
@@ -52,6 +52,8 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.factsfields
+    - oneview.snapshot
 '''
 
 EXAMPLES = '''
@@ -249,7 +251,8 @@ class ServerProfileFactsModule(OneViewModule):
         name=dict(type='str'),
         uri=dict(type='str'),
         options=dict(type='list'),
-        params=dict(type='dict')
+        params=dict(type='dict'),
+        **OneViewModule.ONEVIEW_SNAPSHOT_ARGS
     )
 
     def __init__(self):
@@ -263,7 +266,7 @@ class ServerProfileFactsModule(OneViewModule):
         if self.current_resource:
             server_profiles = [self.current_resource.data]
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            server_profiles = self.resource_client.get_all(**self.facts_params)
+            server_profiles = self.get_all_facts()
 
         if self.options:
             ansible_facts = self.__gather_option_facts()
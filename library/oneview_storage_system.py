@@ -144,6 +144,7 @@ storage_system:
 
 import collections
 from copy import deepcopy
+from functools import partial
 from ansible.module_utils.oneview import OneViewModule, OneViewModuleValueError, compare, dict_merge
 
 
@@ -238,7 +239,7 @@ class StorageSystemModule(OneViewModule):
 
         if hostname:
             get_method = getattr(self.oneview_client.storage_systems, "get_by_{}".format(hostname_key))
-            self.current_resource = get_method(hostname)
+            self.current_resource = self.get_by_index('hostname', hostname, partial(get_method, hostname))
 
             if self.data['credentials'].get(new_hostname_key):
                 self.data['credentials'][hostname_key] = self.data['credentials'].pop(new_hostname_key)
@@ -38,6 +38,8 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.stream
+    - oneview.factsfields
 '''
 
 EXAMPLES = '''
@@ -88,6 +90,15 @@ EXAMPLES = '''
       count: 5
       view: "flat-tree"
       filter: "taskState='Warning'"
+
+- name: Write all tasks to a file, one per line
+  oneview_task_facts:
+    config: "{{ config }}"
+    stream_to: /tmp/tasks.ndjson
+    page_size: 1000
+  delegate_to: localhost
+
+- debug: var=tasks_manifest
 '''
 
 RETURN = '''
@@ -95,21 +106,31 @@ tasks:
     description: The list of tasks.
     returned: Always, but can be null.
     type: list
+tasks_manifest:
+    description: Manifest of the file with the tasks, with its C(path), C(count) and C(checksum).
+    returned: When C(stream_to) is set.
+    type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModule
+from ansible.module_utils.oneview import OneViewModule, stream_to_file
 
 
 class TaskFactsModule(OneViewModule):
     def __init__(self):
         argument_spec = dict(
-            params=dict(required=False, type='dict')
+            params=dict(required=False, type='dict'),
+            **OneViewModule.ONEVIEW_STREAM_ARGS
         )
         super(TaskFactsModule, self).__init__(additional_arg_spec=argument_spec)
 
         self.set_resource_object(self.oneview_client.tasks)
 
     def execute_module(self):
+        if self.module.params.get('stream_to'):
+            manifest = stream_to_file(self.resource_client.get_all, self.module.params['stream_to'],
+                                      self.facts_params, self.module.params['page_size'])
+            return dict(changed=False, ansible_facts=dict(tasks_manifest=manifest))
+
         facts = self.resource_client.get_all(**self.facts_params)
 
         return dict(changed=False, ansible_facts=dict(tasks=facts))
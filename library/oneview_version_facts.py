@@ -30,6 +30,13 @@ version_added: "2.5"
 requirements:
     - "hpeOneView >= 4.3.0"
 author: "Priyanka Sood (@soodpr)"
+options:
+    invalidate_api_version_cache:
+      description:
+        - Drops the API version cached for the appliance, so the next tasks negotiate it again.
+          It only applies when the cache is enabled through the C(ONEVIEW_API_VERSION_CACHE_DIR) environment variable.
+      type: bool
+      default: false
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
@@ -41,6 +48,11 @@ EXAMPLES = '''
     config: "{{ config_file_path }}"
 
 - debug: var=version
+
+- name: Drop the cached API version after upgrading the appliance
+  oneview_version_facts:
+    config: "{{ config_file_path }}"
+    invalidate_api_version_cache: true
 '''
 
 RETURN = '''
@@ -50,14 +62,20 @@ version:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+from ansible.module_utils.oneview import OneViewModuleBase, OneViewApiVersionCache
 
 
 class VersionFactsModule(OneViewModuleBase):
     def __init__(self):
-        super(VersionFactsModule, self).__init__(additional_arg_spec=dict())
+        argument_spec = dict(invalidate_api_version_cache=dict(type='bool', default=False))
+        super(VersionFactsModule, self).__init__(additional_arg_spec=argument_spec)
 
     def execute_module(self):
+        if self.module.params.get('invalidate_api_version_cache'):
+            version_cache = OneViewApiVersionCache.from_environment()
+            if version_cache:
+                version_cache.invalidate(self.oneview_client.connection.get_host())
+
         version = self.oneview_client.versions.get_version()
         return dict(changed=False,
                     ansible_facts=dict(version=version))
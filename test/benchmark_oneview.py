@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+"""
+Opt-in benchmark of the helpers of module_utils/oneview.py against the legacy implementations kept as reference in
+test_oneview.py, on large synthetic server profiles and LIGs. It reports the best time of each implementation and,
+where tracemalloc is available, its peak memory, without asserting on them. It is not collected by the unit tests:
+
+    PYTHONPATH=test:library python test/benchmark_oneview.py --repeat 5 compare
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import timeit
+
+from collections import OrderedDict
+from copy import deepcopy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from module_utils.oneview import LIGMerger, ServerProfileMerger, compare, compare_lig, dict_merge, sort_by_uplink_set_location
+from test_oneview import (LegacyComparison, LegacyLIGMerger, LegacyServerProfileMerger, build_compared_resources,
+                          build_large_lig, build_large_profile, build_lig_changes, build_profile_changes,
+                          legacy_dict_merge, legacy_sort_by_uplink_set_location)
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(function):
+    BENCHMARKS[function.__name__.replace('benchmark_', '', 1)] = function
+    return function
+
+
+def measure(function, repeat, *args):
+    """Returns the best time of 'repeat' calls of the function and the peak memory of one of them, in bytes."""
+    best = min(timeit.repeat(lambda: function(*args), number=1, repeat=repeat))
+    if not tracemalloc:
+        return best, None
+    tracemalloc.start()
+    try:
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+@benchmark
+def benchmark_compare():
+    """compare and compare_lig on a large profile and LIG, against a shuffled copy and a changed one."""
+    for build, new_compare, lig in [(build_large_profile, compare, False), (build_large_lig, compare_lig, True)]:
+        resource = build()
+        for other, expected in build_compared_resources(resource):
+            case = '{0} equal={1}'.format(new_compare.__name__, expected)
+            yield case, 'legacy', LegacyComparison(lig=lig).compare, (resource, other)
+            yield case, 'new', new_compare, (resource, other)
+
+
+@benchmark
+def benchmark_merge():
+    """dict_merge and the server profile merge of an update of half of the connections and volumes of a large profile."""
+    resource = build_large_profile()
+    data = build_profile_changes(resource, random.Random(1))
+    for case, legacy_merge, new_merge in [('dict_merge', legacy_dict_merge, dict_merge),
+                                          ('ServerProfileMerger', LegacyServerProfileMerger().merge_data,
+                                           ServerProfileMerger().merge_data)]:
+        # the merges change the data, each call gets its own copy
+        yield case, 'legacy', lambda merge=legacy_merge: merge(resource, deepcopy(data)), ()
+        yield case, 'new', lambda merge=new_merge: merge(resource, deepcopy(data)), ()
+
+
+@benchmark
+def benchmark_lig():
+    """
+    sort_by_uplink_set_location on hundreds of port locations, quadratic in the legacy version, and the merge of a LIG
+    with hundreds of uplink sets and thousands of port locations.
+    """
+    port_configs = build_large_lig(uplink_sets=1, ports=300)['uplinkSets'][0]['logicalPortConfigInfos']
+    reversed_port_configs = list(reversed(port_configs))
+    case = 'sort_by_uplink_set_location'
+    yield case, 'legacy', legacy_sort_by_uplink_set_location, (reversed_port_configs, port_configs)
+    yield case, 'new', sort_by_uplink_set_location, (reversed_port_configs, port_configs)
+
+    lig = build_large_lig(uplink_sets=400, ports=8)
+    data = build_lig_changes(lig, random.Random(1))
+    for version, merger in [('legacy', LegacyLIGMerger()), ('new', LIGMerger())]:
+        # the merge changes both the LIG and the data, each call gets its own copies
+        yield 'LIGMerger', version, lambda merger=merger: merger.merge_data(deepcopy(lig), deepcopy(data)), ()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the OneView module utils against their legacy versions.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs of each implementation, the best one is reported.')
+    parser.add_argument('names', nargs='*', help='Benchmarks to run, all by default: {0}.'.format(', '.join(BENCHMARKS)))
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error('unknown benchmarks: {0}'.format(', '.join(unknown)))
+
+    print('{0:<45} {1:<8} {2:>10} {3:>12}'.format('case', 'version', 'seconds', 'peak KB'))
+    for name in args.names or BENCHMARKS:
+        for case, version, function, function_args in BENCHMARKS[name]():
+            seconds, peak = measure(function, args.repeat, *function_args)
+            print('{0:<45} {1:<8} {2:>10.4f} {3:>12}'.format(
+                case, version, seconds, '-' if peak is None else peak // 1024))
+
+
+if __name__ == '__main__':
+    main()
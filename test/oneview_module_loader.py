@@ -39,6 +39,8 @@ from module_utils.oneview import (OneViewModuleBase,
                                   SPKeys,
                                   ServerProfileMerger,
                                   ServerProfileReplaceNamesByUris,
+                                  OneViewApiVersionCache,
+                                  OneViewInventory,
                                   _str_sorted,
                                   merge_list_by_key,
                                   transform_list_to_dict,
@@ -110,6 +112,7 @@ from oneview_interconnect import InterconnectModule
 from oneview_interconnect_facts import InterconnectFactsModule
 from oneview_interconnect_link_topology_facts import InterconnectLinkTopologyFactsModule
 from oneview_interconnect_type_facts import InterconnectTypeFactsModule
+from oneview_inventory_sync import InventorySyncModule
 from oneview_internal_link_set_facts import InternalLinkSetFactsModule
 from oneview_label import LabelModule
 from oneview_label_facts import LabelFactsModule
@@ -0,0 +1,641 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+"""
+Local stand-in for the OneView and Image Streamer REST APIs, to run the modules end-to-end without an appliance,
+measuring the requests they send. It keeps the resources in memory and serves them over HTTPS to the hpeOneView SDK:
+the login sessions, the version, the paginated and filtered collections, the tasks of the changes and the eTags of
+the resources. The other endpoints are added with OneViewSimulator.route.
+
+Standalone, for playbooks pointed to it with the 'hostname' printed on start:
+
+    python test/oneview_simulator.py --port 8443 --fixtures test/fixtures/oneview_simulator.json --latency 0.05
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+
+from collections import OrderedDict, namedtuple
+from copy import deepcopy
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlencode
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import urlencode
+    from urlparse import parse_qs
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+
+SimulatorRequest = namedtuple('SimulatorRequest', ['method', 'path', 'query', 'headers', 'body'])
+
+
+def create_self_signed_certificate(directory):
+    """
+    Creates the certificate of the simulator, valid for 30 days.
+    :arg str directory: Directory where the PEM files are written.
+    :return: tuple: The paths of the certificate and of the key.
+    """
+    if not HAS_CRYPTOGRAPHY:
+        raise RuntimeError('The cryptography Python module is required to create the certificate of the simulator, '
+                           'otherwise give a certfile and a keyfile.')
+    key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.utcnow()
+    certificate = (x509.CertificateBuilder()
+                   .subject_name(name)
+                   .issuer_name(name)
+                   .public_key(key.public_key())
+                   .serial_number(x509.random_serial_number())
+                   .not_valid_before(now - datetime.timedelta(days=1))
+                   .not_valid_after(now + datetime.timedelta(days=30))
+                   .sign(key, hashes.SHA256(), default_backend()))
+
+    certfile = os.path.join(directory, 'simulator.crt')
+    keyfile = os.path.join(directory, 'simulator.key')
+    with open(certfile, 'wb') as cert_file:
+        cert_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, 'wb') as key_file:
+        key_file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                         serialization.NoEncryption()))
+    return certfile, keyfile
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    simulator = None
+
+    def _handle(self):
+        started = time.time()
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+
+        path = self.path.partition('?')[0]
+        latency = self.simulator.latency
+        time.sleep(latency(self.command, path) if callable(latency) else latency)
+
+        headers = dict((name.lower(), value) for name, value in self.headers.items())
+        status, body, headers = self.simulator.handle(self.command, self.path, headers, raw_body)
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.simulator.record(self.command, self.path, status, len(raw_body), len(payload), time.time() - started)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OneViewSimulator(object):
+    """
+    Stateful OneView REST API served on a local port, seeded with resources from JSON fixture files.
+    The POST, PUT, PATCH and DELETE requests are answered with completed tasks, like the appliance does for most of
+    the resources, and the PUT, PATCH and DELETE requests are rejected when the eTag given in the body or in the
+    If-Match header is not the current one. Each request may be delayed by a latency and failed by the injected
+    errors, and is recorded with its status, payload sizes and duration.
+    """
+    DEFAULT_API_VERSION = 2800
+    MINIMUM_API_VERSION = 120
+    DEFAULT_PAGE_SIZE = 100
+    USERNAME = 'administrator'
+    PASSWORD = 'simulator'
+    ETAG_ERROR_CODE = 'PRECONDITION_FAILED'
+    TASKS_URI = '/rest/tasks'
+    POLL_INTERVAL = 0.05
+
+    FILTER_TERM = re.compile(r"""^'?([\w.]+)'?\s*(=|<>|!=)\s*(?:'([^']*)'|"([^"]*)"|(\S+))$""")
+
+    def __init__(self, fixtures=None, latency=0, page_size=DEFAULT_PAGE_SIZE, api_version=DEFAULT_API_VERSION,
+                 error_rate=0, seed=None, certfile=None, keyfile=None):
+        """
+        :arg list fixtures: JSON files, or directories of them, loaded with load_fixtures.
+        :arg latency: Seconds added to each request, or a function of the method and the path that returns them.
+        :arg int page_size: Maximum number of members of each page of the collections.
+        :arg int api_version: Current API version of the simulated appliance.
+        :arg float error_rate: Probability of each request failing with a 500 error.
+        :arg int seed: Seed of the random errors, so they fail the same requests on each run.
+        :arg str certfile: PEM certificate of the server. A self-signed one is created when it is not given.
+        :arg str keyfile: PEM key of the certificate.
+        """
+        self.latency = latency
+        self.page_size = page_size
+        self.api_version = api_version
+        self.error_rate = error_rate
+        self.certfile = certfile
+        self.keyfile = keyfile
+
+        self.collections = OrderedDict()
+        self.sessions = set()
+        self.requests = []
+        self._resources = {}
+        self._routes = []
+        self._errors = []
+        self._random = random.Random(seed)
+        self._etags = itertools.count(1)
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+        self._certificate_dir = None
+
+        for path in fixtures or []:
+            self.load_fixtures(path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self, host='127.0.0.1', port=0):
+        """
+        Starts serving the API in a background thread.
+        :arg str host: Address to listen on.
+        :arg int port: Port to listen on. A free one is chosen by default.
+        :return: OneViewSimulator: This simulator.
+        """
+        certfile, keyfile = self.certfile, self.keyfile
+        if not certfile:
+            self._certificate_dir = tempfile.mkdtemp(prefix='oneview_simulator')
+            certfile, keyfile = create_self_signed_certificate(self._certificate_dir)
+        # PROTOCOL_TLS_SERVER is only available from Python 3.6
+        context = ssl.SSLContext(getattr(ssl, 'PROTOCOL_TLS_SERVER', ssl.PROTOCOL_SSLv23))
+        context.load_cert_chain(certfile, keyfile)
+
+        handler = type('SimulatorRequestHandler', (_RequestHandler,), dict(simulator=self))
+        self._server = _ThreadingHTTPServer((host, port), handler)
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='oneview-simulator',
+                                        kwargs=dict(poll_interval=self.POLL_INTERVAL))
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving the API and removes the certificate created on start."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+        if self._certificate_dir:
+            shutil.rmtree(self._certificate_dir, ignore_errors=True)
+            self._certificate_dir = None
+
+    @property
+    def hostname(self):
+        """The 'host:port' to give as the OneView or Image Streamer hostname."""
+        host, port = self._server.server_address[:2]
+        return '{0}:{1}'.format(host, port)
+
+    def config(self, **overrides):
+        """
+        Builds the configuration of the OneViewClient, with the Image Streamer served by this simulator too.
+        :arg overrides: Configuration entries to replace.
+        :return: dict: The configuration.
+        """
+        config = dict(ip=self.hostname,
+                      image_streamer_ip=self.hostname,
+                      api_version=self.api_version,
+                      credentials=dict(userName=self.USERNAME, password=self.PASSWORD))
+        config.update(overrides)
+        return config
+
+    def module_params(self, **params):
+        """
+        Builds the params of a module connected to this simulator.
+        :arg params: The other params of the module.
+        :return: dict: The params.
+        """
+        module_params = dict(config=None, hostname=self.hostname, image_streamer_hostname=self.hostname,
+                             username=self.USERNAME, password=self.PASSWORD, api_version=self.api_version,
+                             auth_login_domain=None)
+        module_params.update(params)
+        return module_params
+
+    def load_fixtures(self, path):
+        """
+        Seeds the resources of a JSON fixture file, or of all the JSON files of a directory, in name order. Each file
+        is an object with the resources of each collection by the URI of the collection.
+        :arg str path: File or directory.
+        """
+        paths = [path]
+        if os.path.isdir(path):
+            paths = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json')]
+        for fixture_path in paths:
+            with open(fixture_path) as fixture_file:
+                for collection_uri, resources in json.load(fixture_file, object_pairs_hook=OrderedDict).items():
+                    self.seed(collection_uri, resources)
+
+    def seed(self, collection_uri, resources):
+        """
+        Adds resources to a collection, completing their uri, category, eTag and dates when they are missing.
+        :arg str collection_uri: URI of the collection, like /rest/fc-networks.
+        :arg list resources: Resources.
+        :return: list: The resources added.
+        """
+        with self._lock:
+            return [self._store(collection_uri, deepcopy(resource)) for resource in resources]
+
+    def get(self, uri):
+        """
+        Gets a copy of a resource.
+        :arg str uri: URI of the resource.
+        :return: dict: The resource or None when it does not exist.
+        """
+        with self._lock:
+            collection_uri = self._resources.get(uri)
+            return deepcopy(self.collections[collection_uri][uri]) if collection_uri else None
+
+    def route(self, method, pattern, handler):
+        """
+        Serves an endpoint that is not a collection or a resource, like the actions on a resource.
+        :arg str method: HTTP method.
+        :arg str pattern: Regular expression matched against the whole path, without the query string.
+        :arg function handler: Receives the simulator and a SimulatorRequest, with the query parsed, the header names
+            in lowercase and the body decoded from JSON, and returns the status and the body, and optionally the headers.
+        """
+        self._routes.append((method.upper(), re.compile(pattern + '$'), handler))
+
+    def inject_error(self, status=500, method=None, path=None, times=1, error_code='INTERNAL_ERROR', message=None,
+                     in_task=False):
+        """
+        Fails the next requests that match.
+        :arg int status: HTTP status of the error.
+        :arg str method: HTTP method of the requests to fail. All of them by default.
+        :arg str path: Regular expression searched in the path of the requests to fail. All of them by default.
+        :arg int times: Number of requests to fail.
+        :arg str error_code: The errorCode of the error.
+        :arg str message: The message of the error.
+        :arg bool in_task: Answers the requests with a task in the Error state, without applying them, instead of
+            an HTTP error.
+        """
+        with self._lock:
+            self._errors.append(dict(status=status, method=method and method.upper(),
+                                     path=path and re.compile(path), times=times, error_code=error_code,
+                                     message=message or 'Error injected by the simulator.', in_task=in_task))
+
+    def record(self, method, target, status, request_bytes, response_bytes, seconds):
+        with self._lock:
+            self.requests.append(dict(method=method, path=target.partition('?')[0], target=target, status=status,
+                                      request_bytes=request_bytes, response_bytes=response_bytes,
+                                      seconds=round(seconds, 6)))
+
+    def request_count(self, method=None, path=None):
+        """
+        Counts the requests received.
+        :arg str method: HTTP method of the requests counted. All of them by default.
+        :arg str path: Regular expression searched in the path of the requests counted. All of them by default.
+        :return: int: The number of requests.
+        """
+        with self._lock:
+            requests = [request for request in self.requests if not method or request['method'] == method.upper()]
+            return len([request for request in requests if not path or re.search(path, request['path'])])
+
+    def summary(self):
+        """
+        Sums up the requests received.
+        :return: dict: The number of requests, in total and by method, their payload sizes and their duration.
+        """
+        with self._lock:
+            methods = OrderedDict()
+            for request in self.requests:
+                methods[request['method']] = methods.get(request['method'], 0) + 1
+            return dict(requests=len(self.requests),
+                        methods=methods,
+                        request_bytes=sum(request['request_bytes'] for request in self.requests),
+                        response_bytes=sum(request['response_bytes'] for request in self.requests),
+                        seconds=round(sum(request['seconds'] for request in self.requests), 6))
+
+    def reset_requests(self):
+        """Forgets the requests received, keeping the resources."""
+        with self._lock:
+            self.requests = []
+
+    def handle(self, method, target, headers, raw_body):
+        """
+        Answers a request.
+        :arg str method: HTTP method.
+        :arg str target: Path with the query string.
+        :arg dict headers: Headers, with lowercase names.
+        :arg bytes raw_body: Body.
+        :return: tuple: The status, the body to send as JSON or None, and the headers.
+        """
+        path, _, query_string = target.partition('?')
+        try:
+            body = json.loads(raw_body.decode('utf-8')) if raw_body else None
+        except ValueError:
+            body = raw_body
+        request = SimulatorRequest(method.upper(), path, parse_qs(query_string, keep_blank_values=True), headers, body)
+
+        with self._lock:
+            try:
+                response = self._dispatch(request, target)
+            except ValueError as error:
+                response = self._error(400, 'INVALID_REQUEST', str(error))
+        return response if len(response) == 3 else (response[0], response[1], {})
+
+    def _dispatch(self, request, target):
+        error = self._take_error(request)
+        if error and (not error['in_task'] or request.method == 'GET'):
+            return self._error(error['status'], error['error_code'], error['message'])
+
+        if request.path == '/rest/version' and request.method == 'GET':
+            return 200, dict(currentVersion=self.api_version, minimumVersion=self.MINIMUM_API_VERSION)
+        if request.path == '/rest/login-sessions':
+            return self._login(request)
+        if request.headers.get('auth') not in self.sessions:
+            return self._error(401, 'AUTHORIZATION', 'The session is not valid or it has expired.')
+
+        if error:
+            return self._task(self._task_name(request.method), self._resources_for_task(request), error)
+
+        for method, pattern, handler in self._routes:
+            if method == request.method and pattern.match(request.path):
+                return handler(self, request)
+
+        if request.method == 'GET':
+            return self._read(request, target)
+        elif request.method == 'POST':
+            return self._create(request)
+        elif request.method in ('PUT', 'PATCH', 'DELETE'):
+            return self._change(request)
+        return self._error(405, 'METHOD_NOT_ALLOWED', 'Method not allowed: {0}'.format(request.method))
+
+    def _take_error(self, request):
+        for error in self._errors:
+            if (not error['method'] or error['method'] == request.method) and \
+                    (not error['path'] or error['path'].search(request.path)):
+                error['times'] -= 1
+                if not error['times']:
+                    self._errors.remove(error)
+                return error
+        if self.error_rate and self._random.random() < self.error_rate:
+            return dict(status=500, error_code='INTERNAL_ERROR', message='Random error of the simulator.',
+                        in_task=False)
+        return None
+
+    @staticmethod
+    def _error(status, error_code, message):
+        return status, dict(errorCode=error_code, message=message, details='', recommendedActions=[])
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+    def _etag(self):
+        return str(next(self._etags))
+
+    def _login(self, request):
+        if request.method == 'POST':
+            credentials = request.body if isinstance(request.body, dict) else {}
+            if credentials.get('userName') != self.USERNAME or credentials.get('password') != self.PASSWORD:
+                return self._error(401, 'AUTHN_AUTH_FAIL', 'Invalid user name or password.')
+            session_id = uuid.uuid4().hex
+            self.sessions.add(session_id)
+            return 200, dict(sessionID=session_id, partnerData={})
+
+        session_id = request.headers.get('auth')
+        if session_id not in self.sessions:
+            return self._error(401, 'AUTHORIZATION', 'The session is not valid or it has expired.')
+        if request.method == 'PUT':
+            return 200, dict(sessionID=session_id, partnerData={})
+        if request.method == 'DELETE':
+            self.sessions.discard(session_id)
+            return 204, None
+        return self._error(405, 'METHOD_NOT_ALLOWED', 'Method not allowed: {0}'.format(request.method))
+
+    def _store(self, collection_uri, resource):
+        now = self._now()
+        resource.setdefault('uri', '{0}/{1}'.format(collection_uri, uuid.uuid4()))
+        resource.setdefault('category', collection_uri.rstrip('/').split('/')[-1])
+        resource.setdefault('created', now)
+        resource.setdefault('modified', now)
+        resource.setdefault('eTag', self._etag())
+        self.collections.setdefault(collection_uri, OrderedDict())[resource['uri']] = resource
+        self._resources[resource['uri']] = collection_uri
+        return resource
+
+    def _read(self, request, target):
+        collection_uri = self._resources.get(request.path)
+        if collection_uri:
+            resource = self.collections[collection_uri][request.path]
+            return 200, resource, {'ETag': resource['eTag']}
+        if request.path.rsplit('/', 1)[0] in self.collections:
+            return self._error(404, 'RESOURCE_NOT_FOUND', 'Resource not found: {0}'.format(request.path))
+        return 200, self._page(request, target)
+
+    def _page(self, request, target):
+        query = request.query
+        members = list(self.collections.get(request.path, {}).values())
+        for expression in query.get('filter', []):
+            members = [member for member in members if self._matches(member, expression)]
+        for sort in query.get('sort', [])[:1]:
+            field, _, order = sort.partition(':')
+            members.sort(key=lambda member: str(member.get(field, '')), reverse=order.lower() == 'descending')
+
+        start = int(query.get('start', ['0'])[0])
+        count = int(query.get('count', ['-1'])[0])
+        page = members[start:start + (self.page_size if count < 0 else min(count, self.page_size))]
+        if query.get('fields'):
+            fields = query['fields'][0].split(',')
+            page = [dict((field, member[field]) for field in fields if field in member) for member in page]
+
+        next_page_uri = None
+        if start + len(page) < len(members) and (count < 0 or len(page) < count):
+            next_query = dict(query, start=[str(start + len(page))], count=[str(count if count < 0 else count - len(page))])
+            next_page_uri = '{0}?{1}'.format(request.path, urlencode(next_query, doseq=True))
+        prev_page_uri = None
+        if start:
+            prev_query = dict(query, start=[str(max(0, start - self.page_size))], count=[str(self.page_size)])
+            prev_page_uri = '{0}?{1}'.format(request.path, urlencode(prev_query, doseq=True))
+
+        return dict(type='{0}CollectionV1'.format(request.path.rstrip('/').split('/')[-1]),
+                    category=request.path.rstrip('/').split('/')[-1],
+                    uri=target,
+                    start=start,
+                    count=len(page),
+                    total=len(members),
+                    members=page,
+                    nextPageUri=next_page_uri,
+                    prevPageUri=prev_page_uri)
+
+    def _matches(self, resource, expression):
+        expression = expression.strip()
+        if len(expression) > 1 and expression[0] == expression[-1] == '"':
+            expression = expression[1:-1]
+        for alternative in re.split(r'\s+OR\s+', expression, flags=re.IGNORECASE):
+            if all(self._matches_term(resource, term.strip())
+                   for term in re.split(r'\s+AND\s+', alternative, flags=re.IGNORECASE)):
+                return True
+        return False
+
+    def _matches_term(self, resource, term):
+        match = self.FILTER_TERM.match(term)
+        if not match:
+            raise ValueError('Filter not supported by the simulator: {0}'.format(term))
+        field, operator, value = match.group(1), match.group(2), next(v for v in match.group(3, 4, 5) if v is not None)
+        current = resource
+        for key in field.split('.'):
+            current = current.get(key) if isinstance(current, dict) else None
+        equal = current is not None and str(current).lower() == value.lower()
+        return equal if operator == '=' else not equal
+
+    def _create(self, request):
+        if not isinstance(request.body, dict):
+            return self._error(400, 'INVALID_REQUEST', 'The body of the request is not a JSON object.')
+        resource = deepcopy(request.body)
+        resource.pop('uri', None)
+        resource.pop('eTag', None)
+        return self._task('Create', [self._store(request.path, resource)])
+
+    def _change(self, request):
+        collection_uri = self._resources.get(request.path)
+        if not collection_uri:
+            return self._error(404, 'RESOURCE_NOT_FOUND', 'Resource not found: {0}'.format(request.path))
+        resource = self.collections[collection_uri][request.path]
+
+        if_match = request.headers.get('if-match')
+        if if_match != '*':
+            expected = if_match or (request.body.get('eTag') if isinstance(request.body, dict) else None)
+            if expected and expected != resource['eTag']:
+                return self._error(412, self.ETAG_ERROR_CODE,
+                                   'The eTag {0} is not the current one of {1}.'.format(expected, request.path))
+
+        if request.method == 'DELETE':
+            del self.collections[collection_uri][request.path]
+            del self._resources[request.path]
+            return self._task('Delete', [resource])
+
+        if request.method == 'PUT':
+            if not isinstance(request.body, dict):
+                return self._error(400, 'INVALID_REQUEST', 'The body of the request is not a JSON object.')
+            changed = deepcopy(request.body)
+        else:
+            changed = deepcopy(resource)
+            for operation in request.body if isinstance(request.body, list) else [request.body]:
+                self._apply_patch(changed, operation)
+        changed.update(uri=resource['uri'], created=resource['created'], modified=self._now(), eTag=self._etag())
+        changed.setdefault('category', resource['category'])
+        self.collections[collection_uri][request.path] = changed
+        return self._task('Update', [changed])
+
+    @staticmethod
+    def _apply_patch(resource, operation):
+        if not isinstance(operation, dict) or operation.get('op') not in ('add', 'replace', 'remove'):
+            raise ValueError('Patch operation not supported by the simulator: {0}'.format(operation))
+        keys = [key for key in operation.get('path', '').split('/') if key]
+        if not keys:
+            raise ValueError('Patch path not supported by the simulator: {0}'.format(operation.get('path')))
+        target = resource
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        if operation['op'] == 'remove':
+            target.pop(keys[-1], None)
+        else:
+            target[keys[-1]] = operation.get('value')
+
+    @staticmethod
+    def _task_name(method):
+        return dict(POST='Create', DELETE='Delete').get(method, 'Update')
+
+    def _resources_for_task(self, request):
+        collection_uri = self._resources.get(request.path)
+        return [self.collections[collection_uri][request.path]] if collection_uri else []
+
+    def _task(self, name, resources, error=None):
+        resource = resources[0] if resources else {}
+        task = dict(type='TaskResourceV2',
+                    name=name,
+                    owner=self.USERNAME,
+                    taskState='Error' if error else 'Completed',
+                    taskStatus=error['message'] if error else '{0} {1}.'.format(name, resource.get('name', '')).strip(),
+                    taskErrors=[dict(errorCode=error['error_code'], message=error['message'])] if error else [],
+                    percentComplete=100,
+                    computedPercentComplete=100,
+                    associatedResource=dict(resourceUri=resource.get('uri'),
+                                            resourceName=resource.get('name'),
+                                            resourceCategory=resource.get('category')))
+        task = self._store(self.TASKS_URI, task)
+        return 202, task, {'Location': task['uri']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serves a local stand-in for the OneView REST API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='Port to listen on, a free one by default.')
+    parser.add_argument('--fixtures', action='append', default=[], help='JSON fixture file or directory.')
+    parser.add_argument('--latency', type=float, default=0, help='Seconds added to each request.')
+    parser.add_argument('--page-size', type=int, default=OneViewSimulator.DEFAULT_PAGE_SIZE)
+    parser.add_argument('--api-version', type=int, default=OneViewSimulator.DEFAULT_API_VERSION)
+    parser.add_argument('--error-rate', type=float, default=0, help='Probability of each request failing.')
+    parser.add_argument('--seed', type=int, help='Seed of the random errors.')
+    parser.add_argument('--certfile')
+    parser.add_argument('--keyfile')
+    args = parser.parse_args()
+
+    simulator = OneViewSimulator(fixtures=args.fixtures, latency=args.latency, page_size=args.page_size,
+                                 api_version=args.api_version, error_rate=args.error_rate, seed=args.seed,
+                                 certfile=args.certfile, keyfile=args.keyfile)
+    simulator.start(args.host, args.port)
+    print('OneView simulator listening on {0}, username {1}, password {2}. Press Ctrl+C to stop.'.format(
+        simulator.hostname, simulator.USERNAME, simulator.PASSWORD))
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+    print(json.dumps(simulator.summary(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -70,7 +70,12 @@ class TestIcspOsDeployment():
         self.patcher_icsp_service = mock.patch(MODULE_NAME + '.hpICsp')
         self.mock_icsp = self.patcher_icsp_service.start()
 
-        self.patcher_time_sleep = mock.patch('time.sleep', return_value=None)
+        # the sleeps advance the clock, so the waits reach their deadline without sleeping
+        self.clock = [0]
+        self.patcher_time_time = mock.patch('time.time', side_effect=lambda: self.clock[0])
+        self.patcher_time_time.start()
+        self.patcher_time_sleep = mock.patch('time.sleep', side_effect=lambda seconds: self.clock.append(
+            self.clock.pop() + seconds))
         self.mock_time_sleep = self.patcher_time_sleep.start()
 
         self.mock_connection = mock.Mock()
@@ -93,6 +98,7 @@ class TestIcspOsDeployment():
         self.patcher_ansible_module.stop()
         self.patcher_icsp_service.stop()
         self.patcher_time_sleep.stop()
+        self.patcher_time_time.stop()
 
     def get_as_rest_collection(self, server):
         return {
@@ -118,7 +124,7 @@ class TestIcspOsDeployment():
             changed=False, msg="Server already deployed.", ansible_facts={'icsp_server': server_already_deployed}
         )
 
-    def test_should_fail_after_try_get_server_by_serial_21_times(self):
+    def test_should_fail_after_try_get_server_by_serial_until_the_timeout(self):
         self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN])]
 
         self.mock_server_service.get_server.return_value = DEFAULT_SERVER
@@ -129,12 +135,14 @@ class TestIcspOsDeployment():
             mock_get_srv_ser.return_value = None
             hpe_icsp_os_deployment.main()
 
-        times_sleep_called = self.mock_time_sleep.call_count
-        assert 21 == times_sleep_called
+        assert self.clock[0] == pytest.approx(hpe_icsp_os_deployment.SERVER_TIMEOUT)
+        delays = [call[0][0] for call in self.mock_time_sleep.call_args_list]
+        assert delays[0] <= hpe_icsp_os_deployment.SERVER_POLL_INITIAL_DELAY
+        assert max(delays) <= hpe_icsp_os_deployment.SERVER_POLL_MAX_DELAY
 
         self.mock_ansible_instance.fail_json.assert_called_once_with(msg='Cannot find server in ICSP.')
 
-    def test_should_fail_after_try_get_server_by_ilo_address_21_times(self):
+    def test_should_fail_after_try_get_server_by_ilo_address_until_the_timeout(self):
         task_os_deployment = dict(TASK_OS_DEPLOYMENT, server_id=None, server_ipAddress="16.124.135.239")
 
         self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN])]
@@ -147,8 +155,10 @@ class TestIcspOsDeployment():
             mock_get_srv_ser.return_value = None
             hpe_icsp_os_deployment.main()
 
-        times_sleep_called = self.mock_time_sleep.call_count
-        assert 21 == times_sleep_called
+        assert self.clock[0] == pytest.approx(hpe_icsp_os_deployment.SERVER_TIMEOUT)
+        delays = [call[0][0] for call in self.mock_time_sleep.call_args_list]
+        assert delays[0] <= hpe_icsp_os_deployment.SERVER_POLL_INITIAL_DELAY
+        assert max(delays) <= hpe_icsp_os_deployment.SERVER_POLL_MAX_DELAY
 
         self.mock_ansible_instance.fail_json.assert_called_once_with(msg='Cannot find server in ICSP.')
 
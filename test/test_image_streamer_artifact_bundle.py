@@ -22,7 +22,7 @@ import yaml
 
 from copy import deepcopy
 from hpe_test_utils import ImageStreamerBaseTest
-from oneview_module_loader import ArtifactBundleModule
+from oneview_module_loader import ArtifactBundleModule, OneViewModuleException
 
 
 YAML_ARTIFACT_BUNDLE = """
@@ -116,6 +116,21 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
     ImageStreamerBaseTest has common tests for main function,
     also provides the mocks used in this test case
     """
+    @pytest.fixture(autouse=True)
+    def setUpFile(self, tmpdir):
+        self.file_path = str(tmpdir.join('ab.zip'))
+        with open(self.file_path, 'wb') as artifact_bundle_file:
+            artifact_bundle_file.write(b'artifact bundle content')
+        self.checksum_dir = str(tmpdir.join('uploads'))
+        self.resource.URI = '/rest/artifact-bundles'
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.190'
+
+    def upload_params(self, yaml_params, file_key, **params):
+        upload_params = yaml.load(yaml_params)
+        upload_params['data'][file_key] = self.file_path
+        upload_params.update(params)
+        return upload_params
+
     def test_should_create_when_resource_not_exist(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
@@ -161,14 +176,34 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
         self.resource.get_by_name.return_value = None
         self.resource.upload_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_UPLOAD)
+        self.mock_ansible_module.params = self.upload_params(YAML_ARTIFACT_BUNDLE_UPLOAD, 'localArtifactBundleFilePath')
 
         ArtifactBundleModule().run()
 
+        self.resource.upload_bundle_from_file.assert_called_once_with(self.file_path)
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ArtifactBundleModule.MSG_UPLOADED,
-            ansible_facts=dict(artifact_bundle=DICT_DEFAULT_ARTIFACT_BUNDLE)
+            ansible_facts=dict(artifact_bundle=DICT_DEFAULT_ARTIFACT_BUNDLE, artifact_bundle_upload=dict(
+                path=self.file_path, size=23, checksum=None, transfers=0, skipped=False))
+        )
+
+    def test_should_not_upload_again_a_file_with_the_same_checksum(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.upload_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.mock_ov_client.connection.get.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.mock_ansible_module.params = self.upload_params(YAML_ARTIFACT_BUNDLE_UPLOAD, 'localArtifactBundleFilePath',
+                                                             checksum_dir=self.checksum_dir)
+
+        ArtifactBundleModule().run()
+        ArtifactBundleModule().run()
+
+        self.resource.upload_bundle_from_file.assert_called_once_with(self.file_path)
+        self.mock_ov_client.connection.get.assert_called_once_with(DICT_DEFAULT_ARTIFACT_BUNDLE['uri'])
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=False,
+            msg=ArtifactBundleModule.MSG_ALREADY_PRESENT,
+            ansible_facts=dict(artifact_bundle=DICT_DEFAULT_ARTIFACT_BUNDLE, artifact_bundle_upload=mock.ANY)
         )
 
     def test_should_delete_when_resource_exist(self):
@@ -194,17 +229,45 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
             msg=ArtifactBundleModule.MSG_ALREADY_ABSENT,
         )
 
-    def test_should_download(self):
+    @pytest.fixture
+    def mock_download(self):
+        self.resource.DOWNLOAD_PATH = '/rest/artifact-bundles/download'
+        self.resource.BACKUP_ARCHIVE_PATH = '/rest/artifact-bundles/backups/archive'
+        with mock.patch('image_streamer_artifact_bundle.OneViewFileDownload') as mock_download_class:
+            mock_download = mock_download_class.return_value
+            mock_download.download.return_value = True
+            mock_download.skipped = False
+            mock_download.manifest = dict(path='ab_path', size=100, skipped=False)
+            yield mock_download_class
+
+    def test_should_download(self, mock_download):
+        self.resource.data = dict(DICT_DEFAULT_ARTIFACT_BUNDLE, eTag='2021-06-01T12:00:00.000Z')
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
+
+        ArtifactBundleModule().run()
+
+        mock_download.assert_called_once_with(
+            self.mock_ov_client.connection, '/rest/artifact-bundles/download/4671582d-1746-4122-9cf0-642a59543509',
+            'ab_path', '2021-06-01T12:00:00.000Z', mock.ANY, mock.ANY, log=mock.ANY)
+        self.resource.download.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ArtifactBundleModule.MSG_DOWNLOADED,
+            ansible_facts=dict(artifact_bundle_download=mock_download.return_value.manifest)
+        )
+
+    def test_should_not_download_again_an_unchanged_artifact_bundle(self, mock_download):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.resource.download.return_value = True
+        mock_download.return_value.download.return_value = False
+        mock_download.return_value.skipped = True
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
 
         ArtifactBundleModule().run()
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
-            msg=ArtifactBundleModule.MSG_DOWNLOADED,
-            ansible_facts=dict()
+            msg=ArtifactBundleModule.MSG_ALREADY_DOWNLOADED,
+            ansible_facts=dict(artifact_bundle_download=mock_download.return_value.manifest)
         )
 
     def test_download_should_fail(self):
@@ -249,19 +312,22 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
             ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE)
         )
 
-    def test_should_download_backup(self):
+    def test_should_download_backup(self, mock_download):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.get_all_backups.return_value = [DICT_DEFAULT_ARTIFACT_BUNDLE]
         self.resource.get_backup.return_value = self.resource
-        self.resource.download_archive.return_value = True
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD)
 
         ArtifactBundleModule().run()
 
+        mock_download.assert_called_once_with(
+            self.mock_ov_client.connection,
+            '/rest/artifact-bundles/backups/archive/4671582d-1746-4122-9cf0-642a59543509', 'ab_backup', None,
+            mock.ANY, mock.ANY, log=mock.ANY)
         self.mock_ansible_module.exit_json.assert_called_once_with(
-            changed=False,
+            changed=True,
             msg=ArtifactBundleModule.MSG_ARCHIVE_DOWNLOADED,
-            ansible_facts=dict()
+            ansible_facts=dict(artifact_bundle_download=mock_download.return_value.manifest)
         )
 
     def test_backup_download_should_fail(self):
@@ -298,16 +364,115 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
     def test_should_upload_backup(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.upload_backup_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_UPLOAD)
+        self.mock_ansible_module.params = self.upload_params(YAML_ARTIFACT_BUNDLE_BACKUP_UPLOAD,
+                                                             'localBackupArtifactBundleFilePath')
 
         ArtifactBundleModule().run()
 
+        self.resource.upload_backup_bundle_from_file.assert_called_once_with(self.file_path,
+                                                                             '/rest/deployment-groups/test')
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ArtifactBundleModule.MSG_BACKUP_UPLOADED,
-            ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE)
+            ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE,
+                               artifact_bundle_upload=dict(path=self.file_path, size=23, checksum=None, transfers=0,
+                                                           skipped=False))
+        )
+
+    def test_should_upload_the_same_backup_again_with_the_checksum_dir(self, tmpdir):
+        self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.resource.upload_backup_bundle_from_file.return_value = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.mock_ansible_module.params = self.upload_params(YAML_ARTIFACT_BUNDLE_BACKUP_UPLOAD,
+                                                             'localBackupArtifactBundleFilePath',
+                                                             checksum_dir=str(tmpdir.join('checksums')))
+
+        ArtifactBundleModule().run()
+        ArtifactBundleModule().run()
+
+        assert self.resource.upload_backup_bundle_from_file.call_count == 2
+        assert [call[1]['changed'] for call in self.mock_ansible_module.exit_json.call_args_list] == [True, True]
+        assert not tmpdir.join('checksums').check()
+
+    @pytest.fixture
+    def mock_i3s_clients(self):
+        i3s_clients = dict((hostname, mock.Mock()) for hostname in ('172.16.101.190', '172.16.101.191'))
+        for hostname, i3s_client in i3s_clients.items():
+            i3s_client.artifact_bundles.URI = '/rest/artifact-bundles'
+            i3s_client.artifact_bundles.get_by_name.return_value = None
+            i3s_client.artifact_bundles.upload_bundle_from_file.return_value = dict(
+                DICT_DEFAULT_ARTIFACT_BUNDLE, uri='/rest/artifact-bundles/' + hostname)
+        with mock.patch('image_streamer_artifact_bundle.create_image_streamer_client',
+                        side_effect=lambda oneview_client, hostname: i3s_clients[hostname]):
+            yield i3s_clients
+
+    def distribution_params(self):
+        return self.upload_params(YAML_ARTIFACT_BUNDLE_UPLOAD, 'localArtifactBundleFilePath',
+                                  image_streamer_hostnames=['172.16.101.190', '172.16.101.191'], max_concurrency=2)
+
+    def test_should_upload_to_all_image_streamer_hostnames(self, mock_i3s_clients):
+        self.mock_ansible_module.params = self.distribution_params()
+
+        ArtifactBundleModule().run()
+
+        for i3s_client in mock_i3s_clients.values():
+            i3s_client.artifact_bundles.upload_bundle_from_file.assert_called_once_with(self.file_path)
+        self.mock_ov_client.create_image_streamer_client.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ArtifactBundleModule.MSG_DISTRIBUTED,
+            ansible_facts=dict(artifact_bundle_distribution=[
+                dict(name='172.16.101.190', status='uploaded', uri='/rest/artifact-bundles/172.16.101.190',
+                     transfers=0, seconds=mock.ANY, bytes_per_second=mock.ANY),
+                dict(name='172.16.101.191', status='uploaded', uri='/rest/artifact-bundles/172.16.101.191',
+                     transfers=0, seconds=mock.ANY, bytes_per_second=mock.ANY)])
         )
 
+    def test_should_not_upload_to_the_image_streamers_with_the_artifact_bundle(self, mock_i3s_clients):
+        for i3s_client in mock_i3s_clients.values():
+            i3s_client.artifact_bundles.get_by_name.return_value = mock.Mock(data=DICT_DEFAULT_ARTIFACT_BUNDLE)
+        self.mock_ansible_module.params = self.distribution_params()
+
+        ArtifactBundleModule().run()
+
+        for i3s_client in mock_i3s_clients.values():
+            i3s_client.artifact_bundles.get_by_name.assert_called_once_with('AB')
+            i3s_client.artifact_bundles.upload_bundle_from_file.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ArtifactBundleModule.MSG_ALREADY_PRESENT,
+            ansible_facts=dict(artifact_bundle_distribution=mock.ANY)
+        )
+
+    def test_should_fail_with_the_errors_of_each_image_streamer(self, mock_i3s_clients):
+        mock_i3s_clients['172.16.101.191'].artifact_bundles.upload_bundle_from_file.side_effect = \
+            OneViewModuleException('Upload failed')
+        self.mock_ansible_module.params = self.distribution_params()
+
+        ArtifactBundleModule().run()
+
+        mock_i3s_clients['172.16.101.190'].artifact_bundles.upload_bundle_from_file.assert_called_once_with(
+            self.file_path)
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY,
+                                                                   msg='172.16.101.191: Upload failed')
+
+    def test_should_require_the_file_to_upload_to_the_image_streamer_hostnames(self, mock_i3s_clients):
+        self.mock_ansible_module.params = dict(yaml.load(YAML_ARTIFACT_BUNDLE_PRESENT),
+                                               image_streamer_hostnames=['172.16.101.190'])
+
+        ArtifactBundleModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ArtifactBundleModule.MSG_DISTRIBUTION_FILE_REQUIRED)
+
+    def test_should_only_upload_to_the_image_streamer_hostnames_on_state_present(self, mock_i3s_clients):
+        self.mock_ansible_module.params = dict(yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD),
+                                               image_streamer_hostnames=['172.16.101.190'])
+
+        ArtifactBundleModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ArtifactBundleModule.MSG_DISTRIBUTION_STATE_NOT_SUPPORTED)
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -41,6 +41,18 @@ class TestArtifactBundleFactsModule(ImageStreamerBaseFactsTest):
             ansible_facts=dict(artifact_bundles=[self.ARTIFACT_BUNDLE])
         )
 
+    def test_should_get_only_the_given_fields_of_all_artifact_bundles(self):
+        self.resource.get_all.return_value = [self.ARTIFACT_BUNDLE]
+        self.mock_ansible_module.params = dict(config='config.json', name=None, fields=['name'])
+
+        ArtifactBundleFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(fields='name')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(artifact_bundles=[dict(name=self.ARTIFACT_BUNDLE['name'])])
+        )
+
     def test_get_an_artifact_bundle_by_name(self):
         self.resource.get_by.return_value = [self.ARTIFACT_BUNDLE]
         self.mock_ansible_module.params = self.EXAMPLES[4]['image_streamer_artifact_bundle_facts']
@@ -70,6 +70,18 @@ class TestDeploymentPlanFactsModule(ImageStreamerBaseFactsTest):
             ansible_facts=dict(deployment_plans=[self.DEPLOYMENT_PLAN])
         )
 
+    def test_should_get_only_the_given_fields_of_all_deployment_plans(self):
+        self.resource.get_all.return_value = [self.DEPLOYMENT_PLAN]
+        self.mock_ansible_module.params = dict(config='config.json', name=None, fields=['name'])
+
+        DeploymentPlanFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(fields='name')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(deployment_plans=[dict(name=DEPLOYMENT_PLAN_NAME)])
+        )
+
     def test_get_a_deployment_plan_by_name(self):
         self.resource.get_by.return_value = [self.DEPLOYMENT_PLAN]
         self.mock_ansible_module.params = PARAMS_GET_BY_NAME
@@ -33,7 +33,12 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
     """
 
     @pytest.fixture(autouse=True)
-    def specific_set_up(self):
+    def specific_set_up(self, tmpdir):
+        self.image_file_path = str(tmpdir.join('image_file.zip'))
+        with open(self.image_file_path, 'wb') as image_file:
+            image_file.write(b'golden image content')
+        self.resource.URI = '/rest/golden-images'
+
         # Load scenarios from module examples
         self.GOLDEN_IMAGE_UPLOAD = dict(
             config='config.json',
@@ -41,7 +46,7 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
             data=dict(
                 name='Demo Golden Image upload',
                 description='Test',
-                localImageFilePath='~/image_file.zip'
+                localImageFilePath=self.image_file_path
             )
         )
 
@@ -132,7 +137,8 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_UPLOADED,
-            ansible_facts=dict(golden_image={"name": "name"})
+            ansible_facts=dict(golden_image={"name": "name"}, golden_image_upload=dict(
+                path=file_path, size=20, checksum=None, transfers=0, skipped=False))
         )
 
     def test_update_golden_image(self):
@@ -149,9 +155,19 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
             ansible_facts=dict(golden_image={"name": "name"})
         )
 
-    def test_golden_image_download(self):
+    @pytest.fixture
+    def mock_download(self):
+        with mock.patch('image_streamer_golden_image.OneViewFileDownload') as mock_download_class:
+            mock_download = mock_download_class.return_value
+            mock_download.download.return_value = True
+            mock_download.skipped = False
+            mock_download.manifest = dict(path='/backups/image.zip', size=100, skipped=False)
+            yield mock_download_class
+
+    def test_golden_image_download(self, mock_download):
         golden_image = self.GOLDEN_IMAGE_CREATE['data']
         golden_image['uri'] = '/rest/golden-images/1'
+        golden_image['eTag'] = '2021-06-01T12:00:00.000Z'
 
         self.resource.get_by.return_value = [golden_image]
         self.mock_ansible_module.params = self.GOLDEN_IMAGE_DOWNLOAD
@@ -159,12 +175,31 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download.assert_called_once_with('/rest/golden-images/1', download_file)
+        mock_download.assert_called_once_with(self.mock_ov_client.connection, '/rest/golden-images/download/1',
+                                              download_file, '2021-06-01T12:00:00.000Z', mock.ANY, mock.ANY,
+                                              log=mock.ANY)
+        self.resource.download.assert_not_called()
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_DOWNLOADED,
-            ansible_facts={})
+            ansible_facts=dict(golden_image_download=mock_download.return_value.manifest))
+
+    def test_golden_image_download_skipped_when_unchanged(self, mock_download):
+        golden_image = self.GOLDEN_IMAGE_CREATE['data']
+        golden_image['uri'] = '/rest/golden-images/1'
+        mock_download.return_value.download.return_value = False
+        mock_download.return_value.skipped = True
+
+        self.resource.get_by.return_value = [golden_image]
+        self.mock_ansible_module.params = self.GOLDEN_IMAGE_DOWNLOAD
+
+        GoldenImageModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=GoldenImageModule.MSG_ALREADY_DOWNLOADED,
+            ansible_facts=dict(golden_image_download=mock_download.return_value.manifest))
 
     def test_golden_image_download_nonexistent(self):
         self.resource.get_by.return_value = []
@@ -174,7 +209,7 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=GoldenImageModule.MSG_WAS_NOT_FOUND,)
 
-    def test_golden_image_archive_download(self):
+    def test_golden_image_archive_download(self, mock_download):
         golden_image = self.GOLDEN_IMAGE_CREATE['data']
         golden_image['uri'] = '/rest/golden-images/1'
 
@@ -184,12 +219,13 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_ARCHIVE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download_archive.assert_called_once_with('/rest/golden-images/1', download_file)
+        mock_download.assert_called_once_with(self.mock_ov_client.connection, '/rest/golden-images/archive/1',
+                                              download_file, None, mock.ANY, mock.ANY, log=mock.ANY)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=GoldenImageModule.MSG_ARCHIVE_DOWNLOADED,
-            ansible_facts={})
+            ansible_facts=dict(golden_image_download=mock_download.return_value.manifest))
 
     def test_golden_image_archive_download_nonexistent(self):
         self.resource.get_by.return_value = []
@@ -282,6 +318,29 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=GoldenImageModule.MSG_BUILD_PLAN_WAS_NOT_FOUND)
 
+    def test_upload_a_golden_image_to_the_image_streamer_hostnames(self):
+        i3s_clients = dict((hostname, mock.Mock()) for hostname in ('172.16.101.190', '172.16.101.191'))
+        i3s_clients['172.16.101.190'].golden_images.get_by.return_value = [{"name": "name", "uri": "/rest/gi/1"}]
+        i3s_clients['172.16.101.191'].golden_images.get_by.return_value = []
+        i3s_clients['172.16.101.191'].golden_images.upload.return_value = {"name": "name", "uri": "/rest/gi/2"}
+        self.mock_ansible_module.params = dict(self.GOLDEN_IMAGE_UPLOAD,
+                                               image_streamer_hostnames=['172.16.101.190', '172.16.101.191'])
+
+        with mock.patch('image_streamer_golden_image.create_image_streamer_client',
+                        side_effect=lambda oneview_client, hostname: i3s_clients[hostname]):
+            GoldenImageModule().run()
+
+        i3s_clients['172.16.101.190'].golden_images.upload.assert_not_called()
+        i3s_clients['172.16.101.191'].golden_images.upload.assert_called_once_with(
+            self.image_file_path, dict(name='Demo Golden Image upload', description='Test'))
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=GoldenImageModule.MSG_DISTRIBUTED,
+            ansible_facts=dict(golden_image_distribution=[
+                dict(name='172.16.101.190', status='present', uri='/rest/gi/1', transfers=0, seconds=mock.ANY),
+                dict(name='172.16.101.191', status='uploaded', uri='/rest/gi/2', transfers=0, seconds=mock.ANY,
+                     bytes_per_second=mock.ANY)]))
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import os
+import pytest
+import sys
+
+import oneview_module_loader  # noqa: F401 registers ansible.module_utils.oneview
+from module_utils import oneview
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import inventory_loader
+
+inventory_loader.add_directory(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                            'inventory_plugins'))
+oneview_inventory = sys.modules[type(inventory_loader.get('oneview')).__module__]
+
+COLLECTIONS = dict(
+    server_hardware=[
+        dict(uri='/rest/server-hardware/1', name='172.18.6.15', serverName='web01', serialNumber='SN1',
+             model='SY 480 Gen10', powerState='On', status='OK', locationUri='/rest/enclosures/1',
+             serverHardwareTypeUri='/rest/server-hardware-types/1', serverProfileUri='/rest/server-profiles/1'),
+        dict(uri='/rest/server-hardware/2', name='172.18.6.16', powerState='Off', locationUri='/rest/enclosures/2',
+             serverHardwareTypeUri='/rest/server-hardware-types/1', serverProfileUri=None)],
+    server_profiles=[dict(uri='/rest/server-profiles/1', name='web01-profile',
+                          serverProfileTemplateUri='/rest/server-profile-templates/1')],
+    server_profile_templates=[dict(uri='/rest/server-profile-templates/1', name='Web Template')],
+    server_hardware_types=[dict(uri='/rest/server-hardware-types/1', name='SY 480 Gen10 1')],
+    enclosures=[dict(uri='/rest/enclosures/1', name='Encl1'), dict(uri='/rest/enclosures/2', name='Encl2')],
+    scopes=[dict(uri='/rest/scopes/1', name='Production')],
+    server_hardware_scopes=[dict(uri='/rest/server-hardware/1', scopeUris=['/rest/scopes/1'])],
+)
+
+
+class TestOneViewInventoryPlugin():
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.plugin = inventory_loader.get('oneview')
+        self.inventory = InventoryData()
+
+        patcher = mock.patch.object(oneview_inventory, 'create_oneview_client')
+        self.mock_create_client = patcher.start()
+        self.mock_ov_client = self.mock_create_client.return_value
+        for collection, (attribute, fields, params) in oneview_inventory.InventoryModule.COLLECTIONS.items():
+            getattr(self.mock_ov_client, attribute).get_all.side_effect = \
+                lambda collection=collection, **kwargs: COLLECTIONS[collection]
+        yield
+        patcher.stop()
+
+    def _parse(self, use_cache=True, **options):
+        path = self.tmpdir.join('oneview.yml')
+        lines = ['plugin: oneview', 'config: /etc/oneview_config.json']
+        lines.extend('{0}: {1}'.format(key, value) for key, value in options.items())
+        path.write('\n'.join(lines))
+        self.plugin.parse(self.inventory, DataLoader(), str(path), cache=use_cache)
+
+    def _group(self, name):
+        return sorted(host.name for host in self.inventory.groups[name].get_hosts())
+
+    def test_should_verify_only_oneview_files(self):
+        self.tmpdir.join('oneview.yml').write('plugin: oneview')
+        self.tmpdir.join('hosts.yml').write('plugin: oneview')
+
+        assert self.plugin.verify_file(str(self.tmpdir.join('oneview.yml')))
+        assert not self.plugin.verify_file(str(self.tmpdir.join('hosts.yml')))
+
+    def test_should_create_the_client_with_the_options(self):
+        self._parse(hostname='172.16.101.48', api_version=1600)
+
+        params = self.mock_create_client.call_args[0][0]
+        assert params['config'] == '/etc/oneview_config.json'
+        assert params['hostname'] == '172.16.101.48'
+        assert params['api_version'] == 1600
+
+    def test_should_build_the_client_configuration_from_the_hostname(self):
+        self.mock_create_client.side_effect = oneview.create_oneview_client
+
+        with mock.patch.dict('os.environ', clear=True), mock.patch.object(oneview, 'OneViewClient') as mock_client:
+            mock_client.return_value = self.mock_ov_client
+            self._parse(hostname='172.16.101.48', username='administrator', password='secret', api_version=2800)
+
+        mock_client.assert_called_once_with(dict(ip='172.16.101.48',
+                                                 credentials=dict(userName='administrator', password='secret',
+                                                                  authLoginDomain=None),
+                                                 api_version=2800, image_streamer_ip=None))
+        assert self._group('enclosure_Encl1') == ['172.18.6.15']
+
+    def test_should_request_only_the_fields_of_the_inventory(self):
+        self._parse()
+
+        self.mock_ov_client.server_hardware.get_all.assert_called_once_with(fields=mock.ANY)
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(category='server-hardware',
+                                                                            fields='uri,scopeUris')
+
+    def test_should_add_the_server_hardware_with_their_variables(self):
+        self._parse()
+
+        host_vars = self.inventory.get_host('172.18.6.15').get_vars()
+        assert host_vars['oneview_server_name'] == 'web01'
+        assert host_vars['oneview_enclosure'] == 'Encl1'
+        assert host_vars['oneview_server_profile'] == 'web01-profile'
+        assert host_vars['oneview_server_profile_template'] == 'Web Template'
+        assert host_vars['oneview_scopes'] == ['Production']
+        assert self.inventory.get_host('172.18.6.16').get_vars()['oneview_server_profile'] is None
+
+    def test_should_group_the_server_hardware(self):
+        self._parse(keyed_groups='[{key: oneview_power_state, prefix: power}]')
+
+        assert self._group('enclosure_Encl1') == ['172.18.6.15']
+        assert self._group('enclosure_Encl2') == ['172.18.6.16']
+        assert self._group('server_hardware_type_SY_480_Gen10_1') == ['172.18.6.15', '172.18.6.16']
+        assert self._group('server_profile_template_Web_Template') == ['172.18.6.15']
+        assert self._group('scope_Production') == ['172.18.6.15']
+        assert self._group('power_Off') == ['172.18.6.16']
+
+    def test_should_reuse_the_cached_collections(self):
+        cache_options = dict(cache='true', cache_plugin='jsonfile', cache_connection=str(self.tmpdir.join('cache')),
+                             cache_timeout=600)
+        self._parse(use_cache=False, **cache_options)
+        self.plugin._cache.set_cache()
+        self.mock_create_client.reset_mock()
+
+        self.plugin = inventory_loader.get('oneview')
+        self.inventory = InventoryData()
+        self._parse(**cache_options)
+
+        self.mock_create_client.assert_not_called()
+        assert self._group('enclosure_Encl1') == ['172.18.6.15']
@@ -16,10 +16,18 @@
 # limitations under the License.
 ###
 
+import collections
+import hashlib
+import io
+import json
 import mock
 import logging
+import os
 import pytest
+import random
 import sys
+import threading
+import time
 
 from module_utils import oneview
 
@@ -28,10 +36,12 @@ ONEVIEW_MODULE_UTILS_PATH = 'module_utils.oneview'
 sys.modules['ansible.module_utils.oneview'] = oneview
 
 from copy import deepcopy
+from hpeOneView.connection import connection
 from module_utils.oneview import (OneViewModuleBase,
                                   OneViewModule,
                                   OneViewClient,
                                   OneViewModuleException,
+                                  OneViewModuleTaskError,
                                   OneViewModuleValueError,
                                   OneViewModuleResourceNotFound,
                                   SPKeys,
@@ -42,9 +52,41 @@ from module_utils.oneview import (OneViewModuleBase,
                                   _sort_by_keys,
                                   _str_sorted,
                                   merge_list_by_key,
+                                  dict_merge,
+                                  OneViewFileCache,
+                                  OneViewFactsSnapshot,
+                                  OneViewInventory,
+                                  OneViewSessionCache,
+                                  OneViewApiVersionCache,
+                                  OneViewNameResolver,
+                                  OneViewNetworkResolver,
+                                  OneViewRangeIndex,
+                                  create_cached_oneview_client,
+                                  HPEOneViewException,
+                                  build_oneview_config,
                                   transform_list_to_dict,
                                   compare,
                                   compare_lig,
+                                  compare_list,
+                                  json_patch,
+                                  run_concurrently,
+                                  iter_concurrently,
+                                  iter_pages,
+                                  stream_to_file,
+                                  get_all_projected,
+                                  FACTS_COMMON_FIELDS,
+                                  OneViewModuleConcurrentCallsError,
+                                  OneViewModuleTimeoutError,
+                                  OneViewRetryPolicy,
+                                  OneViewStateChangeListener,
+                                  OneViewWaiter,
+                                  OneViewServerHardwareReservations,
+                                  OneViewFileUpload,
+                                  OneViewFileDownload,
+                                  OneViewFileDistribution,
+                                  create_image_streamer_client,
+                                  choose_server_hardware,
+                                  file_checksum,
                                   get_logger)
 
 MSG_GENERIC_ERROR = 'Generic error message'
@@ -114,6 +156,7 @@ class TestOneViewModule():
         patcher_ansible = mock.patch(OneViewModule.__module__ + '.AnsibleModule')
         self.mock_ansible_module_init = patcher_ansible.start()
         self.mock_ansible_module = mock.Mock()
+        self.mock_ansible_module._diff = False
         self.mock_ansible_module_init.return_value = self.mock_ansible_module
 
         yield
@@ -462,6 +505,224 @@ class TestOneViewModule():
         assert dict(changed=facts['changed'], msg=facts['msg']) == dict(changed=True,
                                                                         msg=OneViewModule.MSG_UPDATED)
 
+    def test_should_return_diff_of_the_update_when_diff_mode_is_enabled(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+        self.mock_ansible_module._diff = True
+
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.current_resource.data = self.RESOURCE_COMMON.copy()
+        ov_base.data = {'newName': 'Resource Name New'}
+        ov_base.execute_module = lambda: ov_base.resource_present('resource')
+        ov_base.run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=OneViewModule.MSG_UPDATED,
+            ansible_facts=mock.ANY,
+            diff=dict(before=self.RESOURCE_COMMON,
+                      after=dict(self.RESOURCE_COMMON, name='Resource Name New'),
+                      patch=[dict(op='replace', path='/name', value='Resource Name New')]))
+
+    def test_should_not_return_diff_when_diff_mode_is_disabled(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.current_resource.data = self.RESOURCE_COMMON.copy()
+        ov_base.data = {'newName': 'Resource Name New'}
+        ov_base.execute_module = lambda: ov_base.resource_present('resource')
+        ov_base.run()
+
+        assert 'diff' not in self.mock_ansible_module.exit_json.call_args[1]
+
+    def test_to_check_resource_present_should_record_the_diff(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+
+        ov_base = OneViewModule()
+        ov_base.resource_client = mock.Mock()
+        ov_base.set_resource_object(ov_base.resource_client)
+        ov_base.current_resource.data = self.RESOURCE_COMMON.copy()
+        ov_base.data = {'newName': 'Resource Name New'}
+        ov_base.check_resource_present('resource')
+
+        assert ov_base.diff['patch'] == [dict(op='replace', path='/name', value='Resource Name New')]
+
+    def _batch_module(self, items, check_mode=False, **params):
+        self.mock_ansible_module.params = dict(config='config.json', state='present', items=items, **params)
+        self.mock_ansible_module.check_mode = check_mode
+        ov_base = OneViewModule(batch_support=True)
+        ov_base.set_resource_object(mock.Mock())
+        ov_base.resource_client.get_all.return_value = [
+            dict(uri='/rest/resource/1', name='Unchanged', type='resource', scopeUris=['/rest/scopes/1']),
+            dict(uri='/rest/resource/2', name='Changed', type='resource'),
+            dict(uri='/rest/resource/3', name='Removed', type='resource')]
+        ov_base.resource_client.create.side_effect = lambda data: mock.Mock(data=dict(data, uri='/rest/resource/4'))
+        ov_base.resource_client.new.side_effect = lambda connection, data: mock.Mock(data=data)
+        return ov_base
+
+    BATCH_ITEMS = [dict(data=dict(name='Unchanged', type='resource')),
+                   dict(data=dict(name='Changed', type='new type')),
+                   dict(state='absent', data=dict(name='Removed')),
+                   dict(data=dict(name='Created')),
+                   dict(state='absent', data=dict(name='Absent'))]
+
+    def test_should_add_items_argument_when_batch_is_supported(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+
+        OneViewModule(additional_arg_spec=dict(data=dict(required=True, type='dict')), batch_support=True)
+
+        expected_arg_spec = deepcopy(self.EXPECTED_ARG_SPEC)
+        expected_arg_spec.pop('validate_etag')
+        expected_arg_spec.update(data=dict(required=False, type='dict'),
+                                 items=dict(type='list', elements='dict',
+                                            options=dict(data=dict(type='dict', required=True),
+                                                         state=dict(type='str', choices=['present', 'absent']))),
+                                 max_concurrency=dict(type='int', default=OneViewModule.DEFAULT_MAX_CONCURRENCY))
+        self.mock_ansible_module_init.assert_called_once_with(argument_spec=expected_arg_spec,
+                                                              supports_check_mode=True,
+                                                              required_one_of=[['data', 'items']],
+                                                              mutually_exclusive=[['data', 'items']])
+
+    def test_should_apply_the_items_with_a_single_get_all(self):
+        ov_base = self._batch_module(deepcopy(self.BATCH_ITEMS))
+        ov_base.execute_module = mock.Mock()
+        ov_base.run()
+
+        ov_base.execute_module.assert_not_called()
+        ov_base.resource_client.get_all.assert_called_once_with()
+        ov_base.resource_client.get_by_name.assert_not_called()
+        ov_base.resource_client.create.assert_called_once_with(dict(name='Created'))
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=OneViewModule.MSG_BATCH_APPLIED.format(1, 1, 1),
+            items=[dict(name='Unchanged', state='present', changed=False, msg=OneViewModule.MSG_ALREADY_PRESENT,
+                        resource=dict(uri='/rest/resource/1', name='Unchanged', type='resource',
+                                      scopeUris=['/rest/scopes/1'])),
+                   dict(name='Changed', state='present', changed=True, msg=OneViewModule.MSG_UPDATED,
+                        resource=dict(uri='/rest/resource/2', name='Changed', type='resource')),
+                   dict(name='Removed', state='absent', changed=True, msg=OneViewModule.MSG_DELETED),
+                   dict(name='Created', state='present', changed=True, msg=OneViewModule.MSG_CREATED,
+                        resource=dict(name='Created', uri='/rest/resource/4')),
+                   dict(name='Absent', state='absent', changed=False, msg=OneViewModule.MSG_ALREADY_ABSENT)])
+
+    def test_should_update_and_delete_the_items_through_resource_objects(self):
+        ov_base = self._batch_module(deepcopy(self.BATCH_ITEMS))
+        resources = {}
+
+        def new(connection, data):
+            resources[data['name']] = mock.Mock(data=data)
+            return resources[data['name']]
+
+        ov_base.resource_client.new.side_effect = new
+        ov_base.run()
+
+        assert sorted(resources) == ['Changed', 'Removed']
+        resources['Changed'].update.assert_called_once_with(
+            dict(uri='/rest/resource/2', name='Changed', type='new type'))
+        resources['Removed'].delete.assert_called_once_with()
+
+    def test_should_not_apply_the_items_on_check_mode(self):
+        ov_base = self._batch_module(deepcopy(self.BATCH_ITEMS), check_mode=True)
+        ov_base.run()
+
+        ov_base.resource_client.create.assert_not_called()
+        ov_base.resource_client.new.assert_not_called()
+        result = self.mock_ansible_module.exit_json.call_args[1]
+        assert result['changed']
+        assert [item['changed'] for item in result['items']] == [False, True, True, True, False]
+
+    def test_should_replace_the_scopes_of_the_items(self):
+        ov_base = self._batch_module([dict(data=dict(name='Unchanged', scopeUris=['/rest/scopes/1'])),
+                                      dict(data=dict(name='Changed', scopeUris=['/rest/scopes/2']))])
+        ov_base.run()
+
+        ov_base.resource_client.new.assert_called_once_with(
+            self.mock_ov_client.connection, dict(uri='/rest/resource/2', name='Changed', type='resource'))
+        result = self.mock_ansible_module.exit_json.call_args[1]
+        assert [item['changed'] for item in result['items']] == [False, True]
+        assert result['items'][1]['msg'] == OneViewModule.MSG_UPDATED
+
+    def test_should_patch_the_scopes_of_the_items(self):
+        ov_base = self._batch_module([dict(data=dict(name='Changed', scopeUris=['/rest/scopes/2']))])
+        resource = mock.Mock(data=dict(uri='/rest/resource/2', name='Changed', type='resource'))
+        ov_base.resource_client.new.side_effect = None
+        ov_base.resource_client.new.return_value = resource
+        resource.patch.return_value = mock.Mock(data=dict(resource.data, scopeUris=['/rest/scopes/2']))
+        ov_base.run()
+
+        resource.update.assert_not_called()
+        resource.patch.assert_called_once_with(operation='replace', path='/scopeUris', value=['/rest/scopes/2'])
+        result = self.mock_ansible_module.exit_json.call_args[1]
+        assert result['items'][0]['resource']['scopeUris'] == ['/rest/scopes/2']
+
+    def test_should_report_the_failed_items_after_applying_the_others(self):
+        ov_base = self._batch_module(deepcopy(self.BATCH_ITEMS) + [dict(data=dict(name='Invalid'))])
+
+        def create(data):
+            if data['name'] == 'Invalid':
+                raise OneViewModuleException('Invalid name')
+            return mock.Mock(data=data)
+
+        ov_base.resource_client.create.side_effect = create
+        ov_base.run()
+
+        assert ov_base.resource_client.create.call_count == 2
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            msg=OneViewModule.MSG_BATCH_FAILED.format(1, 6, 'Invalid: Invalid name'), changed=True, items=mock.ANY)
+        items = self.mock_ansible_module.fail_json.call_args[1]['items']
+        assert items[5] == dict(name='Invalid', state='present', changed=False, failed=True, msg='Invalid name')
+
+    def test_should_fail_when_items_have_duplicated_names(self):
+        ov_base = self._batch_module([dict(data=dict(name='Created')), dict(data=dict(name='Created'))])
+        ov_base.run()
+
+        ov_base.resource_client.get_all.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=OneViewModule.MSG_BATCH_DUPLICATED_NAME.format('Created'))
+
+    def test_should_fail_when_an_item_has_no_data(self):
+        ov_base = self._batch_module([dict(state='absent')])
+        ov_base.run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=OneViewModule.MSG_BATCH_ITEM_DATA_MISSING)
+
+    def test_should_fail_when_an_item_has_an_invalid_state(self):
+        ov_base = self._batch_module([dict(data=dict(name='Created')), dict(state='absnt', data=dict(name='Removed'))])
+        ov_base.run()
+
+        ov_base.resource_client.get_all.assert_not_called()
+        ov_base.resource_client.create.assert_not_called()
+        ov_base.resource_client.new.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=OneViewModule.MSG_BATCH_INVALID_STATE.format('Removed', 'absnt', 'present, absent'))
+
+    def test_should_apply_the_items_with_at_most_max_concurrency_requests(self):
+        ov_base = self._batch_module([dict(data=dict(name='Created {0}'.format(i))) for i in range(12)],
+                                     max_concurrency=3)
+        lock = threading.Lock()
+        running = []
+        concurrency = []
+
+        def create(data):
+            with lock:
+                running.append(data['name'])
+                concurrency.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(data['name'])
+            return mock.Mock(data=data)
+
+        ov_base.resource_client.create.side_effect = create
+        ov_base.run()
+
+        assert 1 < max(concurrency) <= 3
+        result = self.mock_ansible_module.exit_json.call_args[1]
+        assert [item['name'] for item in result['items']] == ['Created {0}'.format(i) for i in range(12)]
+
     def test_resource_absent_should_remove(self):
         self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
 
@@ -691,6 +952,108 @@ class TestOneViewModule():
 
         assert res is None
 
+    PARAMS_FOR_FACTS_FIELDS = dict(config='config.json', name=None, params=None, fields=['name', 'powerState'])
+
+    def _facts_fields_module(self, resource_client):
+        self.mock_ansible_module.params = self.PARAMS_FOR_FACTS_FIELDS
+        ov_base = OneViewModule(additional_arg_spec=dict(name=dict(type='str'), params=dict(type='dict')))
+        ov_base.resource_client = resource_client
+
+        def execute_module():
+            return dict(changed=False,
+                        ansible_facts=dict(resources=ov_base.resource_client.get_all(**ov_base.facts_params)))
+
+        ov_base.execute_module = execute_module
+        return ov_base
+
+    def test_should_add_fields_argument_to_facts_modules(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_FACTS_FIELDS
+
+        OneViewModule(additional_arg_spec=dict(name=dict(type='str'), params=dict(type='dict')))
+
+        expected_arg_spec = deepcopy(self.EXPECTED_ARG_SPEC)
+        expected_arg_spec.pop('validate_etag')
+        expected_arg_spec.update(name=dict(type='str'), params=dict(type='dict'),
+                                 fields=dict(type='list', elements='str'))
+        self.mock_ansible_module_init.assert_called_once_with(argument_spec=expected_arg_spec,
+                                                              supports_check_mode=True)
+
+    def test_should_not_add_fields_argument_to_resource_modules(self):
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+
+        OneViewModule(additional_arg_spec=dict(state=dict(type='str'), params=dict(type='dict')))
+
+        argument_spec = self.mock_ansible_module_init.call_args[1]['argument_spec']
+        assert 'fields' not in argument_spec
+
+    def test_should_request_the_fields_as_server_side_projection(self):
+        resource_client = mock.Mock(URI='/rest/server-hardware')
+        resource_client.get_all.return_value = [dict(name='Server 1', powerState='On')]
+
+        self._facts_fields_module(resource_client).run()
+
+        resource_client.get_all.assert_called_once_with(fields='name,powerState')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=[dict(name='Server 1', powerState='On')]))
+
+    def test_should_project_the_fields_client_side_when_the_api_does_not_support_them(self):
+        class ResourceClient(object):
+            URI = '/rest/server-hardware'
+
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                return [dict(name='Server 1', powerState='On', uri='/rest/server-hardware/1', model='Gen10'),
+                        dict(name='Server 2', uri='/rest/server-hardware/2')]
+
+        self._facts_fields_module(ResourceClient()).run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=[dict(name='Server 1', powerState='On'),
+                                                         dict(name='Server 2')]))
+
+    def test_should_request_the_fields_to_the_helper_of_resource_objects(self):
+        class ResourceClient(object):
+            URI = '/rest/server-hardware'
+            _helper = mock.Mock()
+
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                raise AssertionError('not projected')
+
+        ResourceClient._helper.get_all.return_value = [dict(name='Server 1', powerState='On')]
+
+        self._facts_fields_module(ResourceClient()).run()
+
+        ResourceClient._helper.get_all.assert_called_once_with(fields='name,powerState')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=[dict(name='Server 1', powerState='On')]))
+
+    def test_should_fail_when_the_fields_are_unknown(self):
+        self.PARAMS_FOR_FACTS_FIELDS = dict(self.PARAMS_FOR_FACTS_FIELDS, fields=['name', 'unknownField'])
+        resource_client = mock.Mock(URI='/rest/server-hardware')
+
+        self._facts_fields_module(resource_client).run()
+
+        resource_client.get_all.assert_not_called()
+        msg = self.mock_ansible_module.fail_json.call_args[1]['msg']
+        assert msg.startswith(OneViewModule.MSG_UNKNOWN_FIELDS.format('/rest/server-hardware', 'unknownField', '')[:-2])
+        assert all(field in msg for field in FACTS_COMMON_FIELDS + ('powerState',))
+
+    def test_should_not_validate_the_fields_of_unregistered_resources(self):
+        self.PARAMS_FOR_FACTS_FIELDS = dict(self.PARAMS_FOR_FACTS_FIELDS, fields=['anyField'])
+        resource_client = mock.Mock(URI='/rest/unregistered')
+        resource_client.get_all.return_value = [dict(name='Resource', anyField=1)]
+
+        self._facts_fields_module(resource_client).run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=[dict(anyField=1)]))
+
+    def test_should_fail_when_fields_are_set_without_resource_client(self):
+        ov_base = self._facts_fields_module(None)
+        ov_base.run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=OneViewModule.MSG_FIELDS_NOT_SUPPORTED)
+
 
 class TestOneViewModuleBase():
     """
@@ -744,6 +1107,7 @@ class TestOneViewModuleBase():
         patcher_ansible = mock.patch(OneViewModuleBase.__module__ + '.AnsibleModule')
         self.mock_ansible_module_init = patcher_ansible.start()
         self.mock_ansible_module = mock.Mock()
+        self.mock_ansible_module._diff = False
         self.mock_ansible_module_init.return_value = self.mock_ansible_module
 
         yield
@@ -2118,29 +2482,41 @@ class TestServerProfileReplaceNamesByUris():
 
     def test_replace_network_name_by_uri_with_connections(self):
         sp_data = deepcopy(self.BASIC_PROFILE)
-        sp_data[SPKeys.CONNECTIONS] = self.PROFILE_CONNECTIONS
+        sp_data[SPKeys.CONNECTIONS] = deepcopy(self.PROFILE_CONNECTIONS)
 
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(category='fc-networks', name='FC Network', uri='/rest/fc-networks/14'),
+            dict(category='fcoe-networks', name='FCoE Network', uri='/rest/fcoe-networks/16'),
+            dict(category='network-sets', name='Network Set', uri='/rest/network-sets/20'),
+            dict(category='ethernet-networks', name='Ethernet Network', uri='/rest/ethernet-networks/18')]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['fc-networks', 'fcoe-networks', 'network-sets', 'ethernet-networks'],
+            filter='"name=\'FC Network\' OR name=\'FCoE Network\' OR name=\'Network Set\' OR name=\'Ethernet Network\'"')
+        self.mock_ov_client.fc_networks.get_by.assert_not_called()
+
         expected_connections = self.PROFILE_CONNECTIONS_WITH_NETWORK_URIS
         assert sp_data.get(SPKeys.CONNECTIONS) == expected_connections
 
     def test_replace_network_name_by_uri_with_connection_settings(self):
         sp_data = deepcopy(self.BASIC_PROFILE)
-        sp_data["connectionSettings"] = {SPKeys.CONNECTIONS: self.PROFILE_CONNECTIONS}
+        sp_data["connectionSettings"] = {SPKeys.CONNECTIONS: deepcopy(self.PROFILE_CONNECTIONS)}
 
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(category='fc-networks', name='FC Network', uri='/rest/fc-networks/14'),
+            dict(category='fcoe-networks', name='FCoE Network', uri='/rest/fcoe-networks/16'),
+            dict(category='network-sets', name='Network Set', uri='/rest/network-sets/20'),
+            dict(category='ethernet-networks', name='Ethernet Network', uri='/rest/ethernet-networks/18')]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['fc-networks', 'fcoe-networks', 'network-sets', 'ethernet-networks'],
+            filter='"name=\'FC Network\' OR name=\'FCoE Network\' OR name=\'Network Set\' OR name=\'Ethernet Network\'"')
+        self.mock_ov_client.fc_networks.get_by.assert_not_called()
+
         expected_connections = self.PROFILE_CONNECTIONS_WITH_NETWORK_URIS
         assert sp_data["connectionSettings"][SPKeys.CONNECTIONS] == expected_connections
 
@@ -2150,10 +2526,7 @@ class TestServerProfileReplaceNamesByUris():
         sp_data = deepcopy(self.BASIC_PROFILE)
         sp_data[SPKeys.CONNECTIONS] = [conn]
 
-        self.mock_ov_client.fc_networks.get_by.return_value = []
-        self.mock_ov_client.fcoe_networks.get_by.return_value = []
-        self.mock_ov_client.network_sets.get_by.return_value = []
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
+        self.mock_ov_client.index_resources.get_all.return_value = []
 
         expected_error = ServerProfileReplaceNamesByUris.SERVER_PROFILE_NETWORK_NOT_FOUND + "FC Network"
 
@@ -2206,10 +2579,12 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeUri": "/rest/storage-volumes/1"}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
-        self.mock_ov_client.volumes.get_by.side_effect = [[volume1], [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume1, volume2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.volumes.get_all.assert_called_once_with(filter='"name=\'volume1\' OR name=\'volume2\'"')
+
         assert sp_data == expected_dict
 
     def test_should_not_replace_volume_names_when_volume_uri_is_none(self):
@@ -2225,7 +2600,7 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeName": "volume1", "volumeUri": None}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
-        self.mock_ov_client.volumes.get_by.side_effect = [{}, [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
@@ -2282,10 +2657,13 @@ class TestServerProfileReplaceNamesByUris():
         expected_dict['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeStoragePoolUri": "/rest/storage-pools/1"}
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeStoragePoolUri": "/rest/storage-pools/2"}
 
-        self.mock_ov_client.storage_pools.get_by.side_effect = [[pool1], [pool2]]
+        self.mock_ov_client.storage_pools.get_all.return_value = [pool1, pool2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.storage_pools.get_all.assert_called_once()
+        self.mock_ov_client.storage_pools.get_by.assert_not_called()
+
         assert sp_data == expected_dict
 
     def test_should_not_replace_when_inform_storage_pool_uri(self):
@@ -2358,10 +2736,12 @@ class TestServerProfileReplaceNamesByUris():
         expected['sanStorage']['volumeAttachments'][0] = {"id": 1, "volumeStorageSystemUri": "/rest/storage-systems/1"}
         expected['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeStorageSystemUri": "/rest/storage-systems/2"}
 
-        self.mock_ov_client.storage_systems.get_by.side_effect = [[storage_system1], [storage_system2]]
+        self.mock_ov_client.storage_systems.get_all.return_value = [storage_system1, storage_system2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.storage_systems.get_all.assert_called_once()
+
         assert sp_data == expected
 
     def test_should_replace_volume_template_names_by_uri(self):
@@ -2495,10 +2875,12 @@ class TestServerProfileReplaceNamesByUris():
         expected['connections'][0] = {"id": 1, "interconnectUri": "/rest/interconnects/1"}
         expected['connections'][1] = {"id": 2, "interconnectUri": "/rest/interconnects/2"}
 
-        self.mock_ov_client.interconnects.get_by.side_effect = [[interconnect1], [interconnect2]]
+        self.mock_ov_client.interconnects.get_all.return_value = [interconnect1, interconnect2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.interconnects.get_all.assert_called_once()
+
         assert sp_data == expected
 
     def test_should_not_replace_when_inform_interconnect_uri(self):
@@ -2603,10 +2985,12 @@ class TestServerProfileReplaceNamesByUris():
         expected['localStorage']['sasLogicalJBODs'][0] = {"id": 1, "sasLogicalJBODUri": "/rest/sas-logical-jbods/1"}
         expected['localStorage']['sasLogicalJBODs'][1] = {"id": 2, "sasLogicalJBODUri": "/rest/sas-logical-jbods/2"}
 
-        self.mock_ov_client.sas_logical_jbods.get_by.side_effect = [[sas_logical_jbod1], [sas_logical_jbod2]]
+        self.mock_ov_client.sas_logical_jbods.get_all.return_value = [sas_logical_jbod1, sas_logical_jbod2]
 
         ServerProfileReplaceNamesByUris().replace(self.mock_ov_client, sp_data)
 
+        self.mock_ov_client.sas_logical_jbods.get_all.assert_called_once()
+
         assert sp_data == expected
 
     def test_should_not_replace_when_inform_sas_logical_jbod_uris(self):
@@ -3564,5 +3948,2218 @@ class TestServerProfileMerger():
         mock_logging_config.not_been_called()
 
 
+class TestOneViewSessionCache():
+    CONFIG = dict(ip='172.16.1.1', api_version=2800, image_streamer_ip=None,
+                  credentials=dict(userName='admin', password='mypass', authLoginDomain=''))
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.cache_dir = str(tmpdir)
+        patcher_ov_client = mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.OneViewClient')
+        self.mock_ov_client_class = patcher_ov_client.start()
+        self.mock_ov_client_class.return_value.connection.get_session_id.return_value = 'session-1'
+
+        yield
+        patcher_ov_client.stop()
+
+    def test_file_cache_should_return_stored_value(self):
+        cache = OneViewFileCache(self.cache_dir, 'test', ttl=60)
+        cache.set(['key'], 'value')
+
+        assert cache.get(['key']) == 'value'
+
+    def test_file_cache_should_expire_entries(self):
+        cache = OneViewFileCache(self.cache_dir, 'test', ttl=-1)
+        cache.set(['key'], 'value')
+
+        assert cache.get(['key']) is None
+
+    def test_file_cache_should_invalidate_entries(self):
+        cache = OneViewFileCache(self.cache_dir, 'test', ttl=60)
+        cache.set(['key'], 'value')
+        cache.invalidate(['key'])
+
+        assert cache.get(['key']) is None
+
+    def test_file_cache_should_lock_entries(self):
+        cache = OneViewFileCache(self.cache_dir, 'test', ttl=60)
+
+        with cache.lock(['key']):
+            cache.set(['key'], 'value')
+
+        assert cache.get(['key']) == 'value'
+
+    def test_should_login_and_store_session_when_cache_is_empty(self):
+        OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        self.mock_ov_client_class.assert_called_once_with(self.CONFIG)
+        assert OneViewSessionCache(self.cache_dir).cache.get(OneViewSessionCache._key(self.CONFIG)) == 'session-1'
+
+    def test_should_reuse_cached_session(self):
+        OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+        self.mock_ov_client_class.reset_mock()
+
+        OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        config = self.mock_ov_client_class.call_args[0][0]
+        assert self.mock_ov_client_class.call_count == 1
+        assert config['credentials']['sessionID'] == 'session-1'
+        assert 'sessionID' not in self.CONFIG['credentials']
+
+    def test_should_keep_the_expiration_when_reusing_cached_session(self):
+        session_cache = OneViewSessionCache(self.cache_dir)
+        session_cache.create_client(self.CONFIG)
+        path = session_cache.cache._path(OneViewSessionCache._key(self.CONFIG))
+        with open(path) as cache_file:
+            expires = json.load(cache_file)['expires']
+
+        with mock.patch.object(oneview.time, 'time', return_value=expires - 1):
+            OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        with open(path) as cache_file:
+            assert json.load(cache_file)['expires'] == expires
+
+    def _unauthorized_once(self):
+        connection = self.mock_ov_client_class.return_value.connection
+        connection.do_http.side_effect = [(mock.Mock(status=401), {}), (mock.Mock(status=200), dict(members=[]))]
+        return connection, connection.do_http
+
+    def test_should_login_again_when_session_is_rejected_during_the_task(self):
+        connection, do_http = self._unauthorized_once()
+        connection.login.side_effect = lambda credentials: setattr(
+            connection.get_session_id, 'return_value', 'session-2')
+        client = OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        response, body = client.connection.do_http('GET', '/rest/resources', '')
+
+        assert response.status == 200
+        assert body == dict(members=[])
+        assert do_http.call_count == 2
+        connection.login.assert_called_once_with(self.CONFIG['credentials'])
+        assert OneViewSessionCache(self.cache_dir).cache.get(OneViewSessionCache._key(self.CONFIG)) == 'session-2'
+
+    def test_should_use_the_session_of_another_process_when_rejected_during_the_task(self):
+        connection, do_http = self._unauthorized_once()
+        client = OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+        OneViewSessionCache(self.cache_dir).cache.set(OneViewSessionCache._key(self.CONFIG), 'session-2')
+
+        response, body = client.connection.do_http('GET', '/rest/resources', '')
+
+        assert response.status == 200
+        assert do_http.call_count == 2
+        connection.login.assert_not_called()
+        connection.set_session_id.assert_called_once_with('session-2')
+
+    def test_should_not_login_again_when_the_login_is_unauthorized(self):
+        connection, do_http = self._unauthorized_once()
+        client = OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        response, body = client.connection.do_http('POST', '/rest/login-sessions', '{}')
+
+        assert response.status == 401
+        assert do_http.call_count == 1
+        connection.login.assert_not_called()
+
+    def test_should_not_share_sessions_between_users(self):
+        OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+        self.mock_ov_client_class.reset_mock()
+
+        other_config = deepcopy(self.CONFIG)
+        other_config['credentials']['userName'] = 'other'
+        OneViewSessionCache(self.cache_dir).create_client(other_config)
+
+        self.mock_ov_client_class.assert_called_once_with(other_config)
+
+    def test_should_login_again_when_cached_session_is_rejected(self):
+        OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+        self.mock_ov_client_class.reset_mock()
+
+        new_client = mock.Mock()
+        new_client.connection.get_session_id.return_value = 'session-2'
+        self.mock_ov_client_class.side_effect = [HPEOneViewException({'errorCode': 'AUTHORIZATION'}), new_client]
+
+        client = OneViewSessionCache(self.cache_dir).create_client(self.CONFIG)
+
+        assert client == new_client
+        assert self.mock_ov_client_class.call_count == 2
+        self.mock_ov_client_class.assert_called_with(self.CONFIG)
+        assert OneViewSessionCache(self.cache_dir).cache.get(OneViewSessionCache._key(self.CONFIG)) == 'session-2'
+
+    def test_should_not_cache_when_session_id_is_provided(self):
+        config = deepcopy(self.CONFIG)
+        config['credentials']['sessionID'] = 'provided'
+
+        OneViewSessionCache(self.cache_dir).create_client(config)
+
+        self.mock_ov_client_class.assert_called_once_with(config)
+        assert OneViewSessionCache(self.cache_dir).cache.get(OneViewSessionCache._key(config)) is None
+
+    def test_should_be_disabled_when_env_var_is_not_set(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            assert OneViewSessionCache.from_environment() is None
+
+    def test_should_be_created_from_env_vars(self):
+        env = {'ONEVIEW_SESSION_CACHE_DIR': self.cache_dir, 'ONEVIEW_SESSION_CACHE_TTL': '120'}
+        with mock.patch.dict('os.environ', env, clear=True):
+            session_cache = OneViewSessionCache.from_environment()
+
+        assert session_cache.cache.ttl == 120
+
+    def test_module_should_use_session_cache_when_enabled(self):
+        params = {'hostname': '172.16.1.1', 'username': 'admin', 'password': 'mypass', 'api_version': 2800,
+                  'image_streamer_hostname': None}
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.AnsibleModule') as mock_ansible_module:
+            mock_ansible_module.return_value.params = params
+            with mock.patch.dict('os.environ', {'ONEVIEW_SESSION_CACHE_DIR': self.cache_dir}):
+                OneViewModule()
+                OneViewModule()
+
+        assert self.mock_ov_client_class.call_count == 2
+        assert self.mock_ov_client_class.call_args[0][0]['credentials']['sessionID'] == 'session-1'
+
+    def test_build_config_from_json_file(self, tmpdir):
+        config_file = tmpdir.join('config.json')
+        config_file.write('{"ip": "172.16.1.1", "credentials": {"userName": "admin"}}')
+
+        config = build_oneview_config({'config': str(config_file)})
+
+        assert config == {'ip': '172.16.1.1', 'credentials': {'userName': 'admin'}}
+
+    def test_build_config_from_env_vars(self):
+        env = {'ONEVIEWSDK_IP': '172.16.1.1', 'ONEVIEWSDK_USERNAME': 'admin', 'ONEVIEWSDK_API_VERSION': '2800'}
+        with mock.patch.dict('os.environ', env, clear=True):
+            config = build_oneview_config({'config': None})
+
+        assert config['ip'] == '172.16.1.1'
+        assert config['api_version'] == '2800'
+        assert config['credentials']['userName'] == 'admin'
+
+
+class TestOneViewApiVersionCache():
+    PARAMS = {'hostname': '172.16.1.1', 'username': 'admin', 'password': 'mypass', 'api_version': None,
+              'image_streamer_hostname': None}
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.cache_dir = str(tmpdir)
+        self.requests = []
+        self.current_version = 2800
+
+        patcher_do_http = mock.patch.object(connection, 'do_http', autospec=True, side_effect=self.fake_appliance)
+        patcher_do_http.start()
+        patcher_ansible = mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.AnsibleModule')
+        patcher_ansible.start().return_value.params = self.PARAMS
+
+        yield
+        patcher_do_http.stop()
+        patcher_ansible.stop()
+
+    def fake_appliance(self, connection, method, path, body, custom_headers=None):
+        """Records the requests sent to the appliance and answers the version and login calls"""
+        self.requests.append((method, path))
+        response = mock.Mock(status=200)
+        if path == '/rest/version':
+            return response, {'currentVersion': self.current_version, 'minimumVersion': 120}
+        if connection._apiVersion > self.current_version:
+            return mock.Mock(status=400), {'message': 'Unsupported API Version'}
+        return response, {'sessionID': 'session-1'}
+
+    def requests_per_task(self, env, tasks=10):
+        self.requests = []
+        with mock.patch.dict('os.environ', env):
+            for _ in range(tasks):
+                OneViewModule()
+        return len(self.requests) / float(tasks)
+
+    def test_should_apply_cached_version(self):
+        version_cache = OneViewApiVersionCache(self.cache_dir)
+        version_cache.store(dict(ip='172.16.1.1'), 2600)
+        config = dict(ip='172.16.1.1', api_version=None)
+
+        assert version_cache.apply(config)
+        assert config['api_version'] == 2600
+
+    def test_should_not_override_configured_version(self):
+        version_cache = OneViewApiVersionCache(self.cache_dir)
+        version_cache.store(dict(ip='172.16.1.1'), 2600)
+        config = dict(ip='172.16.1.1', api_version=2000)
+
+        assert not version_cache.apply(config)
+        assert config['api_version'] == 2000
+
+    def test_should_store_negotiated_version(self):
+        with mock.patch.dict('os.environ', {'ONEVIEW_API_VERSION_CACHE_DIR': self.cache_dir}):
+            client = create_cached_oneview_client(self.PARAMS)
+
+        assert client.api_version == 2800
+        assert OneViewApiVersionCache(self.cache_dir).cache.get(['172.16.1.1']) == 2800
+
+    def test_should_negotiate_again_when_cached_version_is_rejected(self):
+        OneViewApiVersionCache(self.cache_dir).store(dict(ip='172.16.1.1'), 3000)
+
+        with mock.patch.dict('os.environ', {'ONEVIEW_API_VERSION_CACHE_DIR': self.cache_dir}):
+            client = create_cached_oneview_client(self.PARAMS)
+
+        assert client.api_version == 2800
+        assert OneViewApiVersionCache(self.cache_dir).cache.get(['172.16.1.1']) == 2800
+
+    def test_should_return_none_when_caches_are_disabled(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            assert create_cached_oneview_client(self.PARAMS) is None
+
+    def test_benchmark_requests_saved_per_task(self):
+        without_cache = self.requests_per_task({})
+        with_cache = self.requests_per_task({'ONEVIEW_API_VERSION_CACHE_DIR': self.cache_dir})
+
+        print("Requests per task: {0} without cache, {1} with the API version cache".format(without_cache, with_cache))
+        # The first task negotiates the version, the others reuse it
+        assert without_cache == 3
+        assert with_cache == 2.1
+
+
+class TestOneViewNameResolver():
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.resource_client = mock.Mock(URI='/rest/fc-networks')
+        self.resource_client.get_all.return_value = [dict(name='Net 1', uri='/rest/fc-networks/1'),
+                                                     dict(name='Net 2', uri='/rest/fc-networks/2')]
+        self.resource_client.get_by.return_value = [dict(name='Net 1', uri='/rest/fc-networks/1')]
+
+    def test_should_memoize_lookups(self):
+        resolver = OneViewNameResolver()
+
+        assert resolver.get(self.resource_client, 'Net 1')['uri'] == '/rest/fc-networks/1'
+        assert resolver.get(self.resource_client, 'net 1')['uri'] == '/rest/fc-networks/1'
+
+        self.resource_client.get_by.assert_called_once_with('name', 'Net 1')
+
+    def test_should_remember_misses(self):
+        self.resource_client.get_by.return_value = []
+        resolver = OneViewNameResolver()
+
+        assert resolver.get(self.resource_client, 'Missing') is None
+        assert resolver.get(self.resource_client, 'Missing') is None
+
+        self.resource_client.get_by.assert_called_once_with('name', 'Missing')
+
+    def test_should_prefetch_names_with_a_single_query(self):
+        resolver = OneViewNameResolver()
+
+        resolver.prefetch(self.resource_client, ['Net 1', 'Net 2', 'Net 3', 'Net 1', None])
+
+        assert resolver.get(self.resource_client, 'Net 2')['uri'] == '/rest/fc-networks/2'
+        assert resolver.get(self.resource_client, 'Net 3') is None
+        self.resource_client.get_all.assert_called_once_with(filter='"name=\'Net 1\' OR name=\'Net 2\' OR name=\'Net 3\'"')
+        self.resource_client.get_by.assert_not_called()
+
+    def test_should_split_prefetch_in_batches(self):
+        resolver = OneViewNameResolver()
+        resolver.PREFETCH_BATCH_SIZE = 2
+
+        resolver.prefetch(self.resource_client, ['Net 1', 'Net 2', 'Net 3'])
+
+        assert self.resource_client.get_all.call_count == 2
+
+    def test_should_keep_collections_apart(self):
+        other_client = mock.Mock(URI='/rest/ethernet-networks')
+        other_client.get_by.return_value = []
+        resolver = OneViewNameResolver()
+
+        resolver.get(self.resource_client, 'Net 1')
+
+        assert resolver.get(other_client, 'Net 1') is None
+
+    def test_should_share_names_through_disk_cache(self, tmpdir):
+        with mock.patch.dict('os.environ', {'ONEVIEW_NAME_CACHE_DIR': str(tmpdir)}):
+            OneViewNameResolver.from_environment('172.16.1.1').get(self.resource_client, 'Net 1')
+            resource = OneViewNameResolver.from_environment('172.16.1.1').get(self.resource_client, 'Net 1')
+
+        assert resource == dict(name='Net 1', uri='/rest/fc-networks/1')
+        self.resource_client.get_by.assert_called_once_with('name', 'Net 1')
+
+    def test_should_not_use_disk_cache_when_disabled(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            assert OneViewNameResolver.from_environment('172.16.1.1').cache is None
+
+
+class TestOneViewNetworkResolver():
+    INDEX_RESOURCES = [dict(category='fc-networks', name='Net FC', uri='/rest/fc-networks/1'),
+                       dict(category='ethernet-networks', name='Net Eth', uri='/rest/ethernet-networks/2'),
+                       dict(category='network-sets', name='Shared', uri='/rest/network-sets/3'),
+                       dict(category='ethernet-networks', name='Shared', uri='/rest/ethernet-networks/4')]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.oneview_client = mock.Mock()
+        self.oneview_client.index_resources.get_all.return_value = self.INDEX_RESOURCES
+
+    def test_should_resolve_names_with_a_single_request(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+
+        resolved = resolver.resolve(['Net FC', 'net eth', 'Missing'], ['fc-networks', 'ethernet-networks'])
+
+        assert resolved == {'Net FC': ('fc-networks', '/rest/fc-networks/1'),
+                            'net eth': ('ethernet-networks', '/rest/ethernet-networks/2')}
+        self.oneview_client.index_resources.get_all.assert_called_once_with(
+            category=['fc-networks', 'ethernet-networks'],
+            filter='"name=\'Net FC\' OR name=\'net eth\' OR name=\'Missing\'"')
+
+    def test_should_not_search_names_twice(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+        resolver.search(['Net FC', 'Net Eth'])
+
+        assert resolver.get_uri('Net Eth', ['ethernet-networks']) == '/rest/ethernet-networks/2'
+        assert resolver.get_uri('Net FC') == '/rest/fc-networks/1'
+        self.oneview_client.index_resources.get_all.assert_called_once()
+
+    def test_should_search_again_for_new_categories(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+        resolver.search(['Net FC'], ['ethernet-networks'])
+
+        assert resolver.get_uri('Net FC', ['fc-networks']) == '/rest/fc-networks/1'
+        assert self.oneview_client.index_resources.get_all.call_count == 2
+
+    def test_should_fail_when_name_is_ambiguous(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+
+        with pytest.raises(OneViewModuleValueError) as exc_info:
+            resolver.resolve(['Shared'])
+
+        assert exc_info.value.msg == OneViewNetworkResolver.MSG_AMBIGUOUS_NAME.format(
+            'Shared', '/rest/network-sets/3, /rest/ethernet-networks/4')
+
+    def test_should_not_be_ambiguous_when_category_is_given(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+
+        assert resolver.get_uri('Shared', ['ethernet-networks']) == '/rest/ethernet-networks/4'
+
+    def test_should_split_search_in_batches(self):
+        resolver = OneViewNetworkResolver(self.oneview_client)
+        resolver.SEARCH_BATCH_SIZE = 2
+
+        resolver.search(['Net FC', 'Net Eth', 'Shared'])
+
+        assert self.oneview_client.index_resources.get_all.call_count == 2
+
+    def test_benchmark_requests_to_replace_profile_names(self):
+        networks = [dict(category='ethernet-networks', name='Ethernet {0}'.format(i),
+                         uri='/rest/ethernet-networks/{0}'.format(i)) for i in range(16)]
+        self.oneview_client.index_resources.get_all.return_value = networks
+        data = dict(connections=[dict(id=i, networkName=n['name']) for i, n in enumerate(networks)])
+
+        ServerProfileReplaceNamesByUris().replace(self.oneview_client, data)
+
+        requests = self.oneview_client.index_resources.get_all.call_count
+        print("Requests to resolve 16 connection networks: {0} (up to 64 with per-type lookups)".format(requests))
+        assert requests == 1
+        assert [c['networkUri'] for c in data['connections']] == [n['uri'] for n in networks]
+
+
+class TestOneViewRangeIndex():
+    SUBNETS = [dict(uri='/rest/id-pools/ipv4/subnets/1',
+                    rangeUris=['/rest/id-pools/ipv4/ranges/1', '/rest/id-pools/ipv4/ranges/2']),
+               dict(uri='/rest/id-pools/ipv4/subnets/2', rangeUris=['/rest/id-pools/ipv4/ranges/3'])]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.resource_client = mock.Mock()
+        self.resource_client.get_by_uri.side_effect = self.get_by_uri
+
+    @staticmethod
+    def get_by_uri(uri):
+        resource = mock.Mock()
+        resource.data = dict(uri=uri, name='Range {0}'.format(uri.split('/')[-1]))
+        return resource
+
+    def requested_uris(self):
+        return sorted(call[0][0] for call in self.resource_client.get_by_uri.call_args_list)
+
+    def test_should_get_the_ranges_of_all_subnets_in_order(self):
+        index = OneViewRangeIndex(self.resource_client)
+
+        ranges = index.get_all(self.SUBNETS)
+
+        assert [resource.data['name'] for resource in ranges] == ['Range 1', 'Range 2', 'Range 3']
+
+    def test_should_request_each_range_once(self):
+        index = OneViewRangeIndex(self.resource_client)
+        index.get_all(self.SUBNETS)
+
+        assert index.get_by_name(self.SUBNETS[0], 'Range 2').data['uri'] == '/rest/id-pools/ipv4/ranges/2'
+        assert index.get_by_name(self.SUBNETS[1], 'Range 3').data['uri'] == '/rest/id-pools/ipv4/ranges/3'
+        assert index.fetch(['/rest/id-pools/ipv4/ranges/1', '/rest/id-pools/ipv4/ranges/1'])[1].data['name'] == \
+            'Range 1'
+        assert self.requested_uris() == ['/rest/id-pools/ipv4/ranges/1', '/rest/id-pools/ipv4/ranges/2',
+                                         '/rest/id-pools/ipv4/ranges/3']
+
+    def test_should_only_get_the_ranges_of_the_subnet_by_name(self):
+        index = OneViewRangeIndex(self.resource_client)
+
+        assert index.get_by_name(self.SUBNETS[0], 'Range 3') is None
+        assert self.requested_uris() == ['/rest/id-pools/ipv4/ranges/1', '/rest/id-pools/ipv4/ranges/2']
+
+    def test_should_request_the_range_again_when_invalidated(self):
+        index = OneViewRangeIndex(self.resource_client)
+        index.get_by_name(self.SUBNETS[0], 'Range 1')
+
+        index.invalidate('/rest/id-pools/ipv4/ranges/1')
+
+        assert index.get_by_name(self.SUBNETS[0], 'Range 1').data['uri'] == '/rest/id-pools/ipv4/ranges/1'
+        assert self.resource_client.get_by_uri.call_count == 3
+
+    def test_should_get_the_ranges_concurrently(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_get_by_uri(uri):
+            with lock:
+                in_flight.append(uri)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(uri)
+            return self.get_by_uri(uri)
+
+        self.resource_client.get_by_uri.side_effect = slow_get_by_uri
+        subnet = dict(uri='/rest/id-pools/ipv4/subnets/1',
+                      rangeUris=['/rest/id-pools/ipv4/ranges/{0}'.format(i) for i in range(12)])
+
+        ranges = OneViewRangeIndex(self.resource_client, max_concurrency=4).get_all([subnet])
+
+        assert [resource.data['uri'] for resource in ranges] == subnet['rangeUris']
+        assert 1 < max(peak) <= 4
+
+    def test_should_fail_with_the_ranges_not_found(self):
+        def get_by_uri(uri):
+            if uri.endswith('/2'):
+                raise OneViewModuleResourceNotFound('Resource not found.')
+            return self.get_by_uri(uri)
+
+        self.resource_client.get_by_uri.side_effect = get_by_uri
+
+        with pytest.raises(OneViewModuleConcurrentCallsError) as exc_info:
+            OneViewRangeIndex(self.resource_client).get_all(self.SUBNETS)
+
+        assert list(exc_info.value.errors) == ['/rest/id-pools/ipv4/ranges/2']
+
+
+class LegacyComparison(object):
+    """
+    Copy of compare, compare_list, compare_lig and compare_list_lig as they were before the sort keys were reused
+    and the debug output became lazy, used as reference by the equivalence tests and by test/benchmark_oneview.py.
+    """
+
+    def __init__(self, lig=False):
+        self.lig = lig
+
+    @staticmethod
+    def _sort_key(obj):
+        return json.dumps(obj, sort_keys=True) if isinstance(obj, dict) else str(obj)
+
+    @staticmethod
+    def _different(message, debug_resources):
+        oneview.logger.debug(message + debug_resources)
+        return False
+
+    def compare(self, resource1, resource2):
+        debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
+        if resource1 and not resource2:
+            return self._different("resource1 and not resource2. ", debug_resources)
+
+        for key in resource1:
+            message = OneViewModuleBase.MSG_DIFF_AT_KEY.format(key)
+            if self.lig and key == 'logicalPortConfigInfos':
+                if sort_by_uplink_set_location(resource1[key], resource2[key]):
+                    continue
+                return self._different(message, debug_resources)
+            if key not in resource2:
+                if resource1[key] is not None:
+                    return self._different(message, debug_resources)
+            elif not resource1[key] and not resource2[key]:
+                continue
+            elif isinstance(resource1[key], dict):
+                if not self.compare(resource1[key], resource2[key]):
+                    return self._different(message, debug_resources)
+            elif isinstance(resource1[key], list):
+                if not self.compare_list(resource1[key], resource2[key]):
+                    return self._different(message, debug_resources)
+            elif oneview._standardize_value(resource1[key]) != oneview._standardize_value(resource2[key]):
+                return self._different(message, debug_resources)
+
+        for key in resource2.keys():
+            if key not in resource1 and resource2[key] is not None:
+                return self._different(OneViewModuleBase.MSG_DIFF_AT_KEY.format(key), debug_resources)
+        return True
+
+    def compare_list(self, resource1, resource2):
+        debug_resources = "resource1 = {0}, resource2 = {1}".format(resource1, resource2)
+        if not resource2:
+            return self._different("resource 2 is null. ", debug_resources)
+        if len(resource1) != len(resource2):
+            return self._different("resources have different length. ", debug_resources)
+
+        resource1 = sorted(resource1, key=self._sort_key)
+        resource2 = sorted(resource2, key=self._sort_key)
+        if self.lig:
+            resource1, resource2 = _sort_by_keys(resource1, resource2)
+
+        for i, val in enumerate(resource1):
+            if isinstance(val, dict):
+                if not self.compare(val, resource2[i]):
+                    return self._different("resources are different. ", debug_resources)
+            elif isinstance(val, list):
+                if not self.compare_list(val, resource2[i]):
+                    return self._different("lists are different. ", debug_resources)
+            elif oneview._standardize_value(val) != oneview._standardize_value(resource2[i]):
+                return self._different("values are different. ", debug_resources)
+        return True
+
+
+def build_large_profile(connections=512, volumes=256):
+    return dict(
+        name='Profile', type='ServerProfileV12', uri='/rest/server-profiles/1', description=None,
+        connectionSettings=dict(manageConnections=True, connections=[
+            dict(id=i, name='Connection {0}'.format(i), functionType='Ethernet', portId='Mezz 3:{0}-a'.format(i % 4 + 1),
+                 networkUri='/rest/ethernet-networks/{0}'.format(i), requestedMbps='2500', requestedVFs='0',
+                 boot=dict(priority='NotBootable', ethernetBootType=None, iscsi=None), lagName=None,
+                 ipv4=dict(ipAddress='10.0.{0}.{1}'.format(i // 250, i % 250), gateway=None, subnetMask=None),
+                 allocatedMbps=2500.0, macType='Virtual', managed=True)
+            for i in range(connections)]),
+        sanStorage=dict(manageSanStorage=True, hostOSType='VMware (ESXi)', volumeAttachments=[
+            dict(id=i, volumeUri='/rest/storage-volumes/{0}'.format(i), lunType='Auto', lun=None,
+                 storagePaths=[dict(connectionId=j, isEnabled=True, targetSelector='Auto', targets=[])
+                               for j in range(1, 5)])
+            for i in range(volumes)]),
+        bios=dict(manageBios=True,
+                  overriddenSettings=[dict(id='setting{0}'.format(i), value=str(i)) for i in range(64)]))
+
+
+def build_large_lig(uplink_sets=64, ports=16):
+    return dict(
+        name='LIG', enclosureType='SY12000', uplinkSets=[
+            dict(name='Uplink Set {0}'.format(u), networkType='Ethernet', mode='Auto',
+                 networkUris=['/rest/ethernet-networks/{0}'.format(u * 10 + n) for n in range(10)],
+                 logicalPortConfigInfos=[dict(desiredSpeed='Auto', logicalLocation=dict(locationEntries=[
+                     dict(relativeValue=port, type='Port'), dict(relativeValue=u % 6 + 1, type='Bay'),
+                     dict(relativeValue=1, type='Enclosure')])) for port in range(1, ports + 1)])
+            for u in range(uplink_sets)],
+        interconnectMapTemplate=dict(interconnectMapEntryTemplates=[
+            dict(permittedInterconnectTypeUri='/rest/interconnect-types/{0}'.format(bay), enclosureIndex=1,
+                 logicalLocation=dict(locationEntries=[dict(relativeValue=bay, type='Bay'),
+                                                       dict(relativeValue=1, type='Enclosure')]))
+            for bay in range(1, 7)]))
+
+
+def build_compared_resources(resource):
+    """
+    Returns a copy of a large profile or LIG with its longest list shuffled, which compares equal to it, and one with
+    its last element changed, which does not, each paired with the expected comparison.
+    """
+    shuffled = deepcopy(resource)
+    changed = deepcopy(resource)
+    if 'uplinkSets' in resource:
+        random.Random(1).shuffle(shuffled['uplinkSets'])
+        changed['uplinkSets'][-1]['mode'] = 'Failover'
+    else:
+        random.Random(1).shuffle(shuffled['connectionSettings']['connections'])
+        changed['connectionSettings']['connections'][-1]['requestedMbps'] = '3000'
+    return [(shuffled, True), (changed, False)]
+
+
+class TestCompare():
+    MUTATIONS = ['shuffle', 'to_str', 'to_float', 'to_none', 'to_empty', 'to_false', 'remove_key', 'add_none',
+                 'change', 'remove_item', 'empty_list_item']
+
+    def _containers(self, resource, found):
+        items = resource.items() if isinstance(resource, dict) else enumerate(resource)
+        for key, value in list(items):
+            found.append((resource, key))
+            if isinstance(value, (dict, list)):
+                self._containers(value, found)
+        return found
+
+    def _mutate(self, resource, rnd):
+        container, key = rnd.choice(self._containers(resource, []))
+        value = container[key]
+        mutation = rnd.choice(self.MUTATIONS)
+        if mutation == 'shuffle' and isinstance(value, list):
+            rnd.shuffle(value)
+        elif mutation == 'to_str' and isinstance(value, (int, float)):
+            container[key] = str(value)
+        elif mutation == 'to_float' and isinstance(value, int) and not isinstance(value, bool):
+            container[key] = float(value)
+        elif mutation in ('to_none', 'to_empty', 'to_false'):
+            container[key] = {'to_none': None, 'to_empty': '', 'to_false': False}[mutation]
+        elif mutation == 'remove_key' and isinstance(container, dict):
+            container.pop(key)
+        elif mutation == 'add_none' and isinstance(container, dict):
+            container['added'] = None
+        elif mutation == 'remove_item' and isinstance(value, list) and value:
+            value.pop(rnd.randrange(len(value)))
+        elif mutation == 'empty_list_item' and isinstance(value, list):
+            value.append([])
+        elif not isinstance(value, (dict, list)):
+            container[key] = '{0}-changed'.format(value)
+
+    @staticmethod
+    def _outcome(function, resource1, resource2):
+        try:
+            return function(resource1, resource2)
+        except Exception as e:
+            return type(e)
+
+    @pytest.mark.parametrize('build, new_compare, lig', [
+        (lambda: build_large_profile(connections=6, volumes=3), compare, False),
+        (lambda: build_large_lig(uplink_sets=3, ports=3), compare_lig, True)])
+    def test_should_match_the_legacy_comparison_on_random_changes(self, build, new_compare, lig):
+        rnd = random.Random(1234)
+        legacy = LegacyComparison(lig=lig)
+        for _ in range(300):
+            resource1 = build()
+            resource2 = deepcopy(resource1)
+            for _ in range(rnd.randint(1, 3)):
+                self._mutate(rnd.choice([resource1, resource2]), rnd)
+
+            assert self._outcome(new_compare, resource1, resource2) == self._outcome(legacy.compare, resource1, resource2)
+            assert self._outcome(new_compare, resource2, resource1) == self._outcome(legacy.compare, resource2, resource1)
+
+    @staticmethod
+    def _apply_patch(resource, patch):
+        for operation in patch:
+            if not operation['path']:
+                resource = deepcopy(operation['value'])
+                continue
+            keys = [k.replace('~1', '/').replace('~0', '~') for k in operation['path'].split('/')[1:]]
+            parent = resource
+            for key in keys[:-1]:
+                parent = parent[key]
+            if operation['op'] == 'remove':
+                del parent[keys[-1]]
+            else:
+                parent[keys[-1]] = deepcopy(operation['value'])
+        return resource
+
+    def test_json_patch_should_be_empty_for_equivalent_resources(self):
+        resource1 = dict(name='name', value=10, values=[1, 2], empty=None, nested=dict(a='1'))
+        resource2 = dict(name='name', value='10', values=[2, 1], empty=[], nested=dict(a=1, b=None))
+
+        assert json_patch(resource1, resource2) == []
+
+    def test_json_patch_should_return_the_changed_paths(self):
+        resource1 = dict(name='name', values=[1, 2], nested={'a/b': 1, 'c': 2}, removed='value')
+        resource2 = dict(name='name', values=[1, 3], nested={'a/b': 2, 'c': 2}, added='value')
+
+        assert json_patch(resource1, resource2) == [
+            dict(op='replace', path='/values', value=[1, 3]),
+            dict(op='replace', path='/nested/a~1b', value=2),
+            dict(op='remove', path='/removed'),
+            dict(op='add', path='/added', value='value')]
+
+    def test_json_patch_should_be_consistent_with_compare_on_random_changes(self):
+        rnd = random.Random(4321)
+        for _ in range(300):
+            resource1 = build_large_profile(connections=6, volumes=3)
+            resource2 = deepcopy(resource1)
+            for _ in range(rnd.randint(1, 3)):
+                self._mutate(rnd.choice([resource1, resource2]), rnd)
+
+            patch = json_patch(resource1, resource2)
+
+            assert (patch == []) == compare(resource1, resource2)
+            if compare(resource2, deepcopy(resource2)):
+                # Resources with empty lists inside lists are never equivalent, not even to themselves
+                assert compare(self._apply_patch(deepcopy(resource1), patch), resource2)
+
+    def test_should_not_consider_empty_lists_inside_lists_equal(self):
+        resource = dict(values=[[], [1]])
+
+        assert not compare(resource, deepcopy(resource))
+        assert not compare_list([dict(values=[[]])], [dict(values=[[]])])
+
+    def test_should_only_format_resources_when_debug_is_enabled(self):
+        formatted = []
+
+        class Value(object):
+            def __str__(self):
+                return 'value'
+
+            def __repr__(self):
+                formatted.append(self)
+                return 'value'
+
+        value = Value()
+        resource1 = dict(name='name', values=[value], other=1)
+        resource2 = dict(name='name', values=[value], other=2)
+
+        assert not compare(resource1, resource2)
+        assert not formatted
+
+        with mock.patch.object(oneview.logger, 'isEnabledFor', return_value=True):
+            assert not compare(resource1, resource2)
+        assert formatted
+
+    @pytest.mark.parametrize('build, new_compare, lig', [
+        (build_large_profile, compare, False),
+        (build_large_lig, compare_lig, True)])
+    def test_should_compare_large_resources_like_the_legacy_comparison(self, build, new_compare, lig):
+        resource1 = build()
+        legacy = LegacyComparison(lig=lig)
+
+        for other, expected in build_compared_resources(resource1):
+            assert new_compare(resource1, other) is expected
+            assert legacy.compare(resource1, other) is expected
+
+
+def legacy_dict_merge(original_resource_dict, data_dict):
+    """Copy of dict_merge before the copy-on-write merge, used as reference by the tests and test/benchmark_oneview.py."""
+    resource_dict = deepcopy(original_resource_dict)
+    for key, val in data_dict.items():
+        if not resource_dict.get(key):
+            resource_dict[key] = val
+        elif isinstance(resource_dict[key], dict) and isinstance(data_dict[key], dict):
+            resource_dict[key] = legacy_dict_merge(resource_dict[key], data_dict[key])
+        elif isinstance(resource_dict[key], list) and isinstance(data_dict[key], list):
+            resource_dict[key] = data_dict[key]
+        else:
+            resource_dict[key] = val
+    return resource_dict
+
+
+class LegacyServerProfileMerger(ServerProfileMerger):
+    """ServerProfileMerger with the deep copies it made before the copy-on-write merge."""
+
+    def merge_data(self, resource, data):
+        merged_data = deepcopy(resource)
+        merged_data = legacy_dict_merge(merged_data, data)
+
+        merged_data = self._merge_bios_and_boot(merged_data, resource, data)
+        merged_data = self._merge_connections(merged_data, resource, data)
+        merged_data = self._merge_san_storage(merged_data, data, resource)
+        merged_data = self._merge_os_deployment_settings(merged_data, resource, data)
+        merged_data = self._merge_local_storage(merged_data, resource, data)
+        return merged_data
+
+    def _merge_connections_boot(self, merged_data, resource):
+        existing_connection_map = {x[SPKeys.ID]: x.copy() for x in resource[SPKeys.CONNECTIONS]}
+        for merged_connection in merged_data[SPKeys.CONNECTIONS]:
+            conn_id = merged_connection[SPKeys.ID]
+            if conn_id in existing_connection_map and SPKeys.BOOT in existing_connection_map[conn_id] \
+                    and SPKeys.BOOT in merged_connection:
+                boot_settings_merged = deepcopy(existing_connection_map[conn_id][SPKeys.BOOT])
+                merged_connection[SPKeys.BOOT] = legacy_dict_merge(boot_settings_merged, merged_connection[SPKeys.BOOT])
+        return merged_data
+
+    def _merge_dict(self, merged_data, resource, data, key):
+        merged_dict = deepcopy(resource[key])
+        merged_dict.update(deepcopy(data[key]))
+        merged_data[key] = merged_dict
+        return merged_data
+
+
+def build_profile_changes(profile, rnd):
+    """Returns the data of a server profile update changing half of the connections and volumes of the profile."""
+    connections = profile['connectionSettings']['connections']
+    volumes = profile['sanStorage']['volumeAttachments']
+    return dict(
+        name='Renamed',
+        bios=dict(overriddenSettings=[dict(id='setting1', value='changed')]),
+        connectionSettings=dict(connections=[
+            dict(id=c['id'], requestedMbps='5000', boot=dict(priority='Primary'))
+            for c in rnd.sample(connections, len(connections) // 2)] + [dict(id=1000, name='New')]),
+        sanStorage=dict(hostOSType='Windows 2012 / WS2012 R2', volumeAttachments=[
+            dict(id=v['id'], storagePaths=[dict(connectionId=1, isEnabled=False)])
+            for v in rnd.sample(volumes, len(volumes) // 2)]))
+
+
+class TestDictMerge():
+    def _random_data(self, resource, rnd):
+        data = {}
+        for key, value in resource.items():
+            choice = rnd.random()
+            if choice < 0.5:
+                continue
+            elif isinstance(value, dict) and choice < 0.8:
+                data[key] = self._random_data(value, rnd)
+            elif isinstance(value, list):
+                data[key] = rnd.sample(value, rnd.randint(0, len(value)))
+            else:
+                data[key] = rnd.choice([None, '', 'changed', 10, dict(added=True)])
+        if rnd.random() < 0.2:
+            data['added'] = rnd.choice([None, 'value', dict(nested='value')])
+        return data
+
+    @staticmethod
+    def _measure(function, *args):
+        tracemalloc = pytest.importorskip('tracemalloc')
+        tracemalloc.start()
+        try:
+            result = function(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return result, peak
+
+    def test_should_share_the_untouched_values_without_modifying_the_arguments(self):
+        original = dict(name='name', bios=dict(settings=[1, 2]), boot=dict(order=['PXE'], manageBoot=True))
+        data = dict(boot=dict(order=['HardDisk']), description='new')
+        original_copy = deepcopy(original)
+        data_copy = deepcopy(data)
+
+        merged = dict_merge(original, data)
+
+        assert merged == dict(name='name', bios=dict(settings=[1, 2]),
+                              boot=dict(order=['HardDisk'], manageBoot=True), description='new')
+        assert original == original_copy
+        assert data == data_copy
+        assert merged['bios'] is original['bios']
+        assert merged['boot'] is not original['boot']
+
+    def test_should_match_the_legacy_merge_on_random_data(self):
+        rnd = random.Random(42)
+        for _ in range(300):
+            original = build_large_profile(connections=4, volumes=2)
+            data = self._random_data(original, rnd)
+            original_copy = deepcopy(original)
+
+            assert dict_merge(original, data) == legacy_dict_merge(deepcopy(original), deepcopy(data))
+            assert original == original_copy
+
+    def test_server_profile_merger_should_match_the_legacy_merger(self):
+        rnd = random.Random(7)
+        for _ in range(20):
+            resource = build_large_profile(connections=8, volumes=4)
+            data = build_profile_changes(resource, rnd)
+            resource_copy = deepcopy(resource)
+
+            expected = LegacyServerProfileMerger().merge_data(deepcopy(resource), deepcopy(data))
+            merged = ServerProfileMerger().merge_data(resource, deepcopy(data))
+
+            assert merged == expected
+            assert resource == resource_copy
+
+    @pytest.mark.parametrize('legacy_merge, new_merge', [
+        (legacy_dict_merge, dict_merge),
+        (LegacyServerProfileMerger().merge_data, ServerProfileMerger().merge_data)])
+    def test_should_merge_large_resources_like_the_legacy_merge(self, legacy_merge, new_merge):
+        resource = build_large_profile()
+        data = build_profile_changes(resource, random.Random(1))
+
+        legacy_merged, legacy_memory = self._measure(legacy_merge, resource, deepcopy(data))
+        merged, memory = self._measure(new_merge, resource, deepcopy(data))
+
+        assert merged == legacy_merged
+        # the legacy merge deep copies the whole profile, the new one only the changed branches
+        assert memory < legacy_memory
+
+
+def legacy_merge_list_by_key(original_list, updated_list, key, ignore_when_null=None, replace_key=None, replace_value=None):
+    """Copy of merge_list_by_key before only the updated items were copied, used as reference by the tests."""
+    ignore_when_null = [] if ignore_when_null is None else ignore_when_null
+    if not original_list:
+        return updated_list
+    items_map = collections.OrderedDict([(i[key], i.copy()) for i in original_list])
+    merged_items = collections.OrderedDict()
+    for item in updated_list:
+        item_key = item[key]
+        if item_key in items_map:
+            for ignored_key in ignore_when_null:
+                if ignored_key in item and item[ignored_key] is None:
+                    item.pop(ignored_key)
+            if replace_key and item.get(replace_key) == replace_value:
+                item[replace_key] = items_map[item_key][replace_key]
+            merged_items[item_key] = items_map[item_key]
+            merged_items[item_key].update(item)
+        else:
+            merged_items[item_key] = item
+    return list(merged_items.values())
+
+
+def legacy_sort_by_uplink_set_location(resource1, resource2):
+    """Copy of sort_by_uplink_set_location before the locations were indexed, used as reference by the tests and test/benchmark_oneview.py."""
+    for config_dict in resource1:
+        each_location = [e.get('type', '') + "_" + str(e.get('relativeValue', ''))
+                         for e in config_dict["logicalLocation"]["locationEntries"]]
+        all_entries = []
+        for config_dict_res2 in resource2:
+            each_location_res2 = [e.get('type', '') + "_" + str(e.get('relativeValue', ''))
+                                  for e in config_dict_res2["logicalLocation"]["locationEntries"]]
+            if each_location_res2 not in all_entries:
+                all_entries.append(sorted(each_location_res2))
+        if not sorted(each_location) in all_entries:
+            return False
+    return True
+
+
+class LegacyLIGMerger(LIGMerger):
+    """LIGMerger with the nested loop over the uplink sets it had before they were indexed by name."""
+
+    def _merge_uplink_set(self, current_resource, data):
+        existing_uplinksets = data['uplinkSets']
+        current_uplinksets = current_resource['uplinkSets']
+        current_uplinks_left = deepcopy(current_uplinksets)
+        for index, existing_uplink in enumerate(existing_uplinksets):
+            for current_uplink in current_uplinksets:
+                if current_uplink['name'] == existing_uplink['name']:
+                    current_uplinks_left.remove(current_uplink)
+                    if not compare_lig(current_uplink, existing_uplink):
+                        existing_uplinksets[index] = dict_merge(current_uplink, existing_uplink)
+            if existing_uplink.get('logicalPortConfigInfos') and isinstance(existing_uplink['logicalPortConfigInfos'], list):
+                for port_config in existing_uplink['logicalPortConfigInfos']:
+                    if not port_config.get('desiredFecMode'):
+                        port_config['desiredFecMode'] = "Auto"
+        existing_uplinksets += current_uplinks_left
+        return existing_uplinksets
+
+
+def build_lig_changes(lig, rnd):
+    """Returns the data of a LIG update changing half of the uplink sets of the LIG and adding a new one."""
+    uplink_sets = rnd.sample(lig['uplinkSets'], len(lig['uplinkSets']) // 2)
+    changes = [dict(name=u['name'], mode=rnd.choice(['Auto', 'Failover']),
+                    logicalPortConfigInfos=deepcopy(u['logicalPortConfigInfos'][:rnd.randint(0, 3)]))
+               for u in uplink_sets]
+    return dict(name='LIG', uplinkSets=changes + [dict(name='New Uplink Set', networkType='Ethernet')])
+
+
+class TestIndexedMerge():
+    def _port_configs(self, count, rnd):
+        return [dict(desiredSpeed='Auto', logicalLocation=dict(locationEntries=rnd.sample([
+            dict(relativeValue=rnd.randint(1, count), type='Port'),
+            dict(relativeValue=rnd.choice([3, '3', 6]), type='Bay'),
+            dict(relativeValue=rnd.randint(1, 3), type='Enclosure')], 3)))
+            for _ in range(count)]
+
+    def test_merge_list_by_key_should_match_the_legacy_merge(self):
+        rnd = random.Random(3)
+        for _ in range(200):
+            original = [dict(id=i, name='item {0}'.format(i), value=rnd.randint(0, 5)) for i in range(rnd.randint(0, 8))]
+            updated = [dict(id=rnd.randint(0, 10), value=rnd.choice([None, 0, 1, 'x'])) for _ in range(rnd.randint(0, 8))]
+            original_copy = deepcopy(original)
+
+            expected = legacy_merge_list_by_key(deepcopy(original), deepcopy(updated), key='id',
+                                                ignore_when_null=['value'], replace_key='value', replace_value='x')
+            merged = merge_list_by_key(original, deepcopy(updated), key='id',
+                                       ignore_when_null=['value'], replace_key='value', replace_value='x')
+
+            assert merged == expected
+            assert original == original_copy
+
+    def test_sort_by_uplink_set_location_should_match_the_legacy_comparison(self):
+        rnd = random.Random(5)
+        for _ in range(300):
+            resource2 = self._port_configs(rnd.randint(0, 6), rnd)
+            resource1 = rnd.sample(resource2, rnd.randint(0, len(resource2))) + self._port_configs(rnd.randint(0, 1), rnd)
+
+            assert sort_by_uplink_set_location(resource1, resource2) == legacy_sort_by_uplink_set_location(resource1, resource2)
+
+    def test_lig_merger_should_match_the_legacy_merger(self):
+        rnd = random.Random(9)
+        for _ in range(20):
+            lig = build_large_lig(uplink_sets=12, ports=4)
+            data = build_lig_changes(lig, rnd)
+
+            expected = LegacyLIGMerger().merge_data(deepcopy(lig), deepcopy(data))
+            merged = LIGMerger().merge_data(deepcopy(lig), deepcopy(data))
+
+            assert merged == expected
+            assert [u['name'] for u in merged['uplinkSets']] == [u['name'] for u in expected['uplinkSets']]
+
+    def test_sort_by_uplink_set_location_should_match_the_legacy_comparison_on_large_lists(self):
+        resource2 = build_large_lig(uplink_sets=1, ports=300)['uplinkSets'][0]['logicalPortConfigInfos']
+        resource1 = list(reversed(resource2))
+
+        assert sort_by_uplink_set_location(resource1, resource2)
+        assert legacy_sort_by_uplink_set_location(resource1, resource2)
+
+    def test_lig_merger_should_match_the_legacy_merger_on_large_ligs(self):
+        lig = build_large_lig(uplink_sets=400, ports=8)
+        data = build_lig_changes(lig, random.Random(1))
+
+        assert LIGMerger().merge_data(deepcopy(lig), deepcopy(data)) == \
+            LegacyLIGMerger().merge_data(deepcopy(lig), deepcopy(data))
+
+
+class TestRunConcurrently():
+    def test_should_return_the_results_in_the_order_of_the_calls(self):
+        def call(index):
+            time.sleep(0.001 * (10 - index))
+            return index * 10
+
+        results = run_concurrently([('call {0}'.format(i), lambda i=i: call(i)) for i in range(10)], max_concurrency=4)
+
+        assert list(results.items()) == [('call {0}'.format(i), i * 10) for i in range(10)]
+
+    def test_should_return_empty_when_there_are_no_calls(self):
+        assert run_concurrently([]) == collections.OrderedDict()
+
+    def test_should_run_at_most_max_concurrency_calls_at_the_same_time(self):
+        lock = threading.Lock()
+        running = []
+        concurrency = []
+
+        def call():
+            with lock:
+                running.append(1)
+                concurrency.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        run_concurrently([(i, call) for i in range(12)], max_concurrency=3)
+
+        assert 1 < max(concurrency) <= 3
+
+    def test_should_run_in_the_calling_thread_when_max_concurrency_is_one(self):
+        threads = run_concurrently([(i, threading.current_thread) for i in range(3)], max_concurrency=1)
+
+        assert set(threads.values()) == {threading.current_thread()}
+
+    def test_should_aggregate_the_errors_in_the_order_of_the_calls_after_running_all(self):
+        called = []
+
+        def call(index):
+            called.append(index)
+            if index in (1, 3):
+                time.sleep(0.01 if index == 1 else 0)
+                raise OneViewModuleException('error {0}'.format(index))
+            if index == 4:
+                raise ValueError('value error')
+            return index
+
+        with pytest.raises(OneViewModuleConcurrentCallsError) as error:
+            run_concurrently([(i, lambda i=i: call(i)) for i in range(6)], max_concurrency=6)
+
+        assert sorted(called) == list(range(6))
+        assert error.value.msg == '1: error 1; 3: error 3; 4: value error'
+        assert list(error.value.errors) == [1, 3, 4]
+        assert isinstance(error.value.errors[4], ValueError)
+
+    def test_should_report_the_duration_of_each_call(self):
+        def call(index):
+            time.sleep(0.02 * index)
+            if index == 2:
+                raise OneViewModuleException('error')
+
+        timings = {}
+        with pytest.raises(OneViewModuleConcurrentCallsError):
+            run_concurrently([(i, lambda i=i: call(i)) for i in range(3)], max_concurrency=3, timings=timings)
+
+        assert sorted(timings) == [0, 1, 2]
+        assert timings[0] < 0.02 <= timings[1] < 0.04 <= timings[2]
+
+    def test_should_yield_the_results_in_the_order_of_the_items_while_the_others_run(self):
+        barrier = threading.Barrier(3, timeout=5)
+        released = threading.Event()
+
+        def call(index):
+            if index < 3:
+                barrier.wait()
+            else:
+                # the last item only finishes after the first results were consumed
+                released.wait(5)
+            return index * 10
+
+        results = iter_concurrently(call, range(4), max_concurrency=4)
+        first = [next(results) for i in range(3)]
+        released.set()
+
+        assert first == [0, 10, 20]
+        assert list(results) == [30]
+
+    def test_should_yield_the_results_sequentially_without_concurrency(self):
+        assert list(iter_concurrently(lambda index: index * 10, range(3), max_concurrency=1)) == [0, 10, 20]
+
+
+class TestOneViewWaiter():
+    @pytest.fixture(autouse=True)
+    def clock(self):
+        # the sleeps advance the clock instead of sleeping
+        self.now = [1000.0]
+        with mock.patch('time.time', side_effect=lambda: self.now[0]):
+            with mock.patch('time.sleep', side_effect=lambda seconds: self.now.append(self.now.pop() + seconds)) \
+                    as self.mock_sleep:
+                yield
+
+    def test_should_poll_until_the_condition_is_met_with_growing_delays(self):
+        condition = mock.Mock(side_effect=[None, False, {}, 'done'])
+
+        result = OneViewWaiter(initial_delay=2, max_delay=5).until(condition, 'the task')
+
+        assert result == 'done'
+        assert condition.call_count == 4
+        delays = [call[0][0] for call in self.mock_sleep.call_args_list]
+        assert 1 <= delays[0] <= 2 and 2 <= delays[1] <= 4 and 2.5 <= delays[2] <= 5
+
+    def test_should_not_sleep_when_the_condition_is_met_at_once(self):
+        assert OneViewWaiter().until(lambda: 'done', 'the task') == 'done'
+        self.mock_sleep.assert_not_called()
+
+    def test_should_fail_at_the_deadline(self):
+        condition = mock.Mock(return_value=None)
+
+        with pytest.raises(OneViewModuleTimeoutError) as error:
+            OneViewWaiter(timeout=60, initial_delay=1, max_delay=10).until(condition, 'the task')
+
+        assert error.value.msg == OneViewWaiter.MSG_TIMEOUT.format(60, 'the task')
+        assert self.now[0] == pytest.approx(1060)
+        assert condition.call_count > 6
+
+    def test_should_randomize_the_delays_between_their_half_and_their_whole(self):
+        waiter = OneViewWaiter(initial_delay=1, max_delay=30, factor=2)
+        delays = [waiter.delay(attempt) for attempt in range(1, 9) for i in range(20)]
+
+        assert all(0.5 <= delay <= 1 for delay in delays[:20])
+        assert all(15 <= delay <= 30 for delay in delays[-20:])
+        assert len(set(delays[:20])) > 1
+
+    def test_should_wait_for_the_changes_of_the_listener_instead_of_sleeping(self):
+        listener = mock.Mock()
+        condition = mock.Mock(side_effect=[None, 'done'])
+
+        with OneViewWaiter(initial_delay=4, listener=listener) as waiter:
+            assert waiter.until(condition, 'the task') == 'done'
+
+        self.mock_sleep.assert_not_called()
+        assert 2 <= listener.wait.call_args[0][0] <= 4
+        listener.close.assert_called_once_with()
+
+    def test_should_not_end_the_min_delay_on_the_changes_of_the_listener(self):
+        listener = mock.Mock()
+        waiter = OneViewWaiter(listener=listener, min_delay=10)
+
+        waiter.sleep(25)
+        waiter.sleep(4)
+
+        assert self.mock_sleep.call_args_list == [mock.call(10), mock.call(4)]
+        assert listener.wait.call_args_list == [mock.call(15), mock.call(0)]
+
+
+class TestOneViewRetryPolicy():
+    ONGOING = OneViewModuleException(dict(errorCode='ONGOING', message='Ongoing operation'))
+
+    @pytest.fixture(autouse=True)
+    def clock(self):
+        self.now = [1000.0]
+        with mock.patch('time.time', side_effect=lambda: self.now[0]):
+            with mock.patch('time.sleep', side_effect=lambda seconds: self.now.append(self.now.pop() + seconds)) \
+                    as self.mock_sleep:
+                yield
+
+    def test_should_retry_only_the_failed_operation_on_the_registered_errors(self):
+        operation = mock.Mock(side_effect=[self.ONGOING, OneViewModuleTaskError('Busy', error_code='BUSY'), 'done'])
+
+        assert OneViewRetryPolicy(['ONGOING', 'BUSY'], initial_delay=4).run(operation) == 'done'
+
+        assert operation.call_count == 3
+        delays = [call[0][0] for call in self.mock_sleep.call_args_list]
+        assert 2 <= delays[0] <= 4 and 4 <= delays[1] <= 8
+
+    def test_should_raise_the_errors_not_registered_at_once(self):
+        operation = mock.Mock(side_effect=OneViewModuleException('Fake message error'))
+
+        with pytest.raises(OneViewModuleException):
+            OneViewRetryPolicy(['ONGOING']).run(operation)
+
+        operation.assert_called_once_with()
+        self.mock_sleep.assert_not_called()
+
+    def test_should_raise_the_error_at_the_deadline(self):
+        operation = mock.Mock(side_effect=self.ONGOING)
+
+        with pytest.raises(OneViewModuleException) as error:
+            OneViewRetryPolicy(['ONGOING'], timeout=100, max_delay=10).run(operation)
+
+        assert error.value is self.ONGOING
+        assert self.now[0] == pytest.approx(1100)
+        assert operation.call_count > 10
+
+    def test_should_wait_with_the_waiter_created_on_the_first_retry(self):
+        operation = mock.Mock(side_effect=[self.ONGOING, 'done'])
+        create_waiter = mock.Mock(return_value=mock.Mock(delay=mock.Mock(return_value=3)))
+
+        OneViewRetryPolicy(['ONGOING'], timeout=60, routing_keys=['scmb.enclosures.#']).run(operation, create_waiter)
+
+        create_waiter.assert_called_once_with(['scmb.enclosures.#'], timeout=60, initial_delay=1, max_delay=30,
+                                              factor=2)
+        create_waiter.return_value.sleep.assert_called_once_with(3)
+        create_waiter.return_value.close.assert_called_once_with()
+
+    def test_should_not_retry_without_registered_errors(self, mock_ansible_module, mock_ov_client):
+        mock_ansible_module.params = dict(config='config.json')
+        operation = mock.Mock(side_effect=self.ONGOING)
+
+        with pytest.raises(OneViewModuleException):
+            OneViewModule().retry(operation, 'argument', key='value')
+
+        operation.assert_called_once_with('argument', key='value')
+
+
+class TestOneViewStateChangeListener():
+    @pytest.fixture
+    def fake_amqp(self):
+        fake_amqp = mock.Mock()
+        fake_amqp.Connection.return_value.drain_events.side_effect = oneview.socket.timeout
+        with mock.patch.object(oneview, 'amqp', fake_amqp, create=True), \
+                mock.patch.object(oneview, 'HAS_AMQP', True), \
+                mock.patch.object(OneViewStateChangeListener, '_ssl_context'), \
+                mock.patch.dict('os.environ', {OneViewStateChangeListener.ENABLED_ENV: 'true'}):
+            yield fake_amqp
+
+    @pytest.fixture
+    def oneview_client(self):
+        oneview_client = mock.Mock()
+        oneview_client.connection.get_host.return_value = '10.0.0.1'
+        oneview_client.certificate_rabbitmq.get_key_pair.return_value = dict(base64SSLCertData='cert',
+                                                                             base64SSLKeyData='key')
+        oneview_client.certificate_authority.get_all.return_value = [dict(certificateDetails=dict(base64Data='ca'))]
+        return oneview_client
+
+    def test_should_not_listen_when_it_is_not_enabled(self, oneview_client):
+        with mock.patch.dict('os.environ', clear=True):
+            assert OneViewStateChangeListener.from_environment(oneview_client, ['scmb.#']) is None
+        oneview_client.certificate_rabbitmq.get_key_pair.assert_not_called()
+
+    def test_should_not_listen_without_the_amqp_package(self, oneview_client):
+        with mock.patch.object(oneview, 'HAS_AMQP', False), \
+                mock.patch.dict('os.environ', {OneViewStateChangeListener.ENABLED_ENV: 'true'}):
+            assert OneViewStateChangeListener.from_environment(oneview_client, ['scmb.#']) is None
+
+    def test_should_subscribe_to_the_routing_keys(self, fake_amqp, oneview_client):
+        listener = OneViewStateChangeListener.from_environment(
+            oneview_client, ['scmb.server-hardware.#', 'scmb.server-profiles.#'])
+        listener.close()
+
+        assert (listener.host, listener.ca_certificates, listener.certificate, listener.key) == \
+            ('10.0.0.1', 'ca', 'cert', 'key')
+        fake_amqp.Connection.assert_called_once_with('10.0.0.1:5671', login_method='EXTERNAL', ssl=mock.ANY)
+        channel = fake_amqp.Connection.return_value.channel.return_value
+        queue = channel.queue_declare.return_value.queue
+        assert channel.queue_bind.call_args_list == [
+            mock.call(queue, exchange='scmb', routing_key='scmb.server-hardware.#'),
+            mock.call(queue, exchange='scmb', routing_key='scmb.server-profiles.#')]
+        channel.basic_consume.assert_called_once_with(queue, callback=listener.notify, no_ack=True)
+        fake_amqp.Connection.return_value.close.assert_called_once_with()
+
+    def test_should_poll_only_when_the_bus_is_not_available(self, fake_amqp, oneview_client):
+        fake_amqp.Connection.return_value.connect.side_effect = IOError('Connection refused')
+
+        assert OneViewStateChangeListener.from_environment(oneview_client, ['scmb.#']) is None
+
+    def test_should_end_the_wait_when_a_change_arrives(self):
+        listener = OneViewStateChangeListener('10.0.0.1', 'ca', 'cert', 'key', ['scmb.#'])
+        threading.Timer(0.01, listener.notify).start()
+
+        assert listener.wait(5) is True
+        assert listener.wait(0.01) is False
+
+
+class TestStreamToFile():
+    @staticmethod
+    def _collection(size):
+        members = [dict(name='Resource {0}'.format(i), uri='/rest/resources/{0}'.format(i)) for i in range(size)]
+        get_all = mock.Mock(side_effect=lambda start, count, **params: members[start:start + count])
+        return members, get_all
+
+    def test_should_walk_all_pages(self):
+        members, get_all = self._collection(25)
+
+        pages = list(iter_pages(get_all, dict(filter="name='x'"), page_size=10))
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == members
+        assert get_all.call_args_list == [mock.call(start=0, count=10, filter="name='x'"),
+                                          mock.call(start=10, count=10, filter="name='x'"),
+                                          mock.call(start=20, count=10, filter="name='x'")]
+
+    def test_should_request_one_more_page_when_the_last_one_is_full(self):
+        members, get_all = self._collection(20)
+
+        pages = list(iter_pages(get_all, page_size=10))
+
+        assert sum(pages, []) == members
+        assert get_all.call_count == 3
+
+    def test_should_walk_the_members_delimited_by_start_and_count(self):
+        members, get_all = self._collection(100)
+
+        pages = list(iter_pages(get_all, dict(start=5, count=23), page_size=10))
+
+        assert sum(pages, []) == members[5:28]
+        assert get_all.call_args_list == [mock.call(start=5, count=10), mock.call(start=15, count=10),
+                                          mock.call(start=25, count=3)]
+
+    def test_should_walk_all_members_when_count_is_negative(self):
+        members, get_all = self._collection(15)
+
+        assert sum(iter_pages(get_all, dict(count=-1), page_size=10), []) == members
+
+    def test_should_write_the_members_as_ndjson_and_return_the_manifest(self, tmpdir):
+        members, get_all = self._collection(25)
+        path = str(tmpdir.join('resources.ndjson'))
+
+        manifest = stream_to_file(get_all, path, page_size=10)
+
+        with open(path, 'rb') as ndjson_file:
+            content = ndjson_file.read()
+        assert [json.loads(line) for line in content.decode('utf-8').splitlines()] == members
+        assert manifest == dict(path=path, count=25, checksum=hashlib.sha256(content).hexdigest())
+        assert tmpdir.listdir() == [tmpdir.join('resources.ndjson')]
+
+    def test_should_write_an_empty_file_for_an_empty_collection(self, tmpdir):
+        path = str(tmpdir.join('resources.ndjson'))
+
+        manifest = stream_to_file(mock.Mock(return_value=[]), path)
+
+        assert manifest == dict(path=path, count=0, checksum=hashlib.sha256(b'').hexdigest())
+
+    def test_should_keep_the_previous_file_when_a_page_fails(self, tmpdir):
+        members, get_all = self._collection(25)
+        get_all.side_effect = [members[:10], OneViewModuleException('Page error')]
+        ndjson_file = tmpdir.join('resources.ndjson')
+        ndjson_file.write('previous\n')
+
+        with pytest.raises(OneViewModuleException):
+            stream_to_file(get_all, str(ndjson_file), page_size=10)
+
+        assert ndjson_file.read() == 'previous\n'
+        assert tmpdir.listdir() == [ndjson_file]
+
+    def test_should_hold_a_single_page_in_memory(self, tmpdir):
+        alive = []
+
+        class Member(dict):
+            def __init__(self, **kwargs):
+                super(Member, self).__init__(**kwargs)
+                alive.append(1)
+
+            def __del__(self):
+                alive.pop()
+
+        peak = []
+
+        def get_all(start, count):
+            peak.append(len(alive))
+            return [Member(name='Resource {0}'.format(i)) for i in range(start, min(start + count, 1000))]
+
+        manifest = stream_to_file(get_all, str(tmpdir.join('resources.ndjson')), page_size=100)
+
+        assert manifest['count'] == 1000
+        assert max(peak) <= 100
+
+
+class FakeCollection(object):
+    """Collection of resources that filters by name and modified, like the appliance"""
+
+    def __init__(self, size):
+        self.clock = 0
+        self.members = []
+        self.requests = []
+        for i in range(size):
+            self.create('Resource {0}'.format(i))
+
+    def _timestamp(self):
+        self.clock += 1
+        return '2026-10-18T10:{0:02d}:{1:02d}.000Z'.format(self.clock // 60, self.clock % 60)
+
+    def create(self, name):
+        self.members.append(dict(name=name, uri='/rest/resources/' + name, modified=self._timestamp(), status='OK'))
+
+    def update(self, index, **data):
+        self.members[index] = dict(self.members[index], modified=self._timestamp(), **data)
+
+    def get_all(self, filter='', sort='', fields=''):
+        self.requests.append(dict(filter=filter, fields=fields))
+        filters = filter if isinstance(filter, list) else [filter]
+        members = self.members
+        for member_filter in [f for f in filters if f]:
+            attribute, operator, value = member_filter.split(' ', 2)
+            value = value.strip("'")
+            if operator == '>=':
+                members = [m for m in members if m[attribute] >= value]
+            else:
+                members = [m for m in members if m[attribute] == value]
+        if sort == 'name:descending':
+            members = sorted(members, key=lambda m: m['name'], reverse=True)
+        if fields:
+            members = [dict((field, m[field]) for field in fields.split(',')) for m in members]
+        return deepcopy(members)
+
+
+class TestOneViewFactsSnapshot():
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.snapshot = OneViewFactsSnapshot(str(tmpdir))
+        self.collection = FakeCollection(10)
+
+    def _refresh(self, params=None):
+        def list_uris(**params):
+            return [member['uri'] for member in self.collection.get_all(fields='uri', **params)]
+
+        self.collection.requests = []
+        return self.snapshot.refresh(['appliance', '/rest/resources', params], self.collection.get_all, list_uris,
+                                     params)
+
+    def test_should_list_the_whole_collection_without_snapshot(self):
+        assert self._refresh() == self.collection.members
+        assert self.collection.requests == [dict(filter='', fields='')]
+
+    def test_should_request_only_the_changes_since_the_last_refresh(self):
+        self._refresh()
+        self.collection.update(3, status='Warning')
+
+        assert self._refresh() == self.collection.members
+        assert self.collection.requests == [dict(filter='', fields='uri'),
+                                            dict(filter=["modified >= '2026-10-18T10:00:10.000Z'"], fields='')]
+
+    def test_should_return_the_same_as_a_full_listing_after_many_changes(self):
+        params = dict(filter="status = 'OK'", sort='name:descending')
+        self._refresh(params)
+
+        for step in range(5):
+            self.collection.update(step, status='Warning')
+            self.collection.update(9 - step, name='Renamed {0}'.format(step))
+            self.collection.create('New {0}'.format(step))
+            del self.collection.members[step + 1]
+            self.collection.update(step + 2, status='OK')
+
+            resources = self._refresh(params)
+
+            assert [request['fields'] for request in self.collection.requests] == ['uri', '']
+            assert self.collection.requests[1]['filter'][0] == "status = 'OK'"
+            assert resources == self.collection.get_all(**params)
+
+    def test_should_list_the_whole_collection_when_a_resource_was_not_retrieved(self):
+        self._refresh()
+        # a resource created with a timestamp older than the last refresh
+        self.collection.members.append(dict(name='Late', uri='/rest/resources/Late', modified='2026-01-01T00:00:00Z'))
+
+        assert self._refresh() == self.collection.members
+        assert self.collection.requests[-1] == dict(filter='', fields='')
+
+    def test_should_not_store_resources_without_modified(self):
+        for member in self.collection.members:
+            del member['modified']
+
+        self._refresh()
+
+        assert self._refresh() == self.collection.members
+        assert self.collection.requests == [dict(filter='', fields='')]
+
+    def test_should_list_the_whole_collection_when_the_snapshot_expires(self, tmpdir):
+        self.snapshot = OneViewFactsSnapshot(str(tmpdir), ttl=-1)
+        self._refresh()
+
+        self._refresh()
+
+        assert self.collection.requests == [dict(filter='', fields='')]
+
+
+class TestOneViewInventory():
+    APPLIANCE = '172.16.101.48'
+    COLLECTION = '/rest/enclosures'
+    ENCLOSURES = [dict(name='Encl1', uri='/rest/enclosures/1', serialNumber='SN1', scopeUris=['/rest/scopes/a'],
+                       activeOaPreferredIP='10.0.0.1', standbyOaPreferredIP='10.0.0.2'),
+                  dict(name='Encl2', uri='/rest/enclosures/2', serialNumber='SN2',
+                       scopeUris=['/rest/scopes/a', '/rest/scopes/b'])]
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.inventory = OneViewInventory(str(tmpdir.join('inventory.db')))
+        self.inventory.sync(self.APPLIANCE, self.COLLECTION, self.ENCLOSURES)
+
+    def test_should_resolve_the_uris_by_each_index(self):
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'name', 'Encl2') == ['/rest/enclosures/2']
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'uri', '/rest/enclosures/1') == \
+            ['/rest/enclosures/1']
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'serialNumber', 'SN1') == ['/rest/enclosures/1']
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'hostname', '10.0.0.2') == ['/rest/enclosures/1']
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'scope', '/rest/scopes/a') == \
+            ['/rest/enclosures/1', '/rest/enclosures/2']
+
+    def test_should_return_an_empty_list_when_the_value_is_missing(self):
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'name', 'Encl3') == []
+
+    def test_should_return_none_when_the_collection_was_not_synced(self):
+        assert self.inventory.lookup('other appliance', self.COLLECTION, 'name', 'Encl1') is None
+        assert self.inventory.lookup(self.APPLIANCE, '/rest/interconnects', 'name', 'Encl1') is None
+
+    def test_should_return_none_when_the_collection_is_stale(self):
+        self.inventory.max_age = -1
+
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'name', 'Encl1') is None
+
+    def test_should_replace_the_resources_of_the_collection(self):
+        self.inventory.sync(self.APPLIANCE, self.COLLECTION, [dict(name='Encl1', uri='/rest/enclosures/3')])
+
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'name', 'Encl1') == ['/rest/enclosures/3']
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'name', 'Encl2') == []
+
+    def test_should_remove_an_invalidated_resource(self):
+        self.inventory.invalidate(self.APPLIANCE, self.COLLECTION, '/rest/enclosures/1')
+
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'hostname', '10.0.0.2') == []
+        assert self.inventory.lookup(self.APPLIANCE, self.COLLECTION, 'scope', '/rest/scopes/a') == \
+            ['/rest/enclosures/2']
+
+    def test_should_match_the_indexed_values_ignoring_the_case(self):
+        assert OneViewInventory.matches(self.ENCLOSURES[0], 'name', 'encl1')
+        assert OneViewInventory.matches(self.ENCLOSURES[0], 'hostname', '10.0.0.2')
+        assert OneViewInventory.matches(self.ENCLOSURES[1], 'scope', '/rest/scopes/b')
+        assert not OneViewInventory.matches(self.ENCLOSURES[0], 'name', 'Encl2')
+        assert not OneViewInventory.matches(self.ENCLOSURES[0], 'serialNumber', '10.0.0.1')
+
+    def test_should_be_enabled_by_the_environment(self):
+        with mock.patch.dict('os.environ', {OneViewInventory.PATH_ENV: '/tmp/inventory.db',
+                                            OneViewInventory.MAX_AGE_ENV: '60'}):
+            inventory = OneViewInventory.from_environment()
+
+        assert (inventory.path, inventory.max_age) == ('/tmp/inventory.db', 60)
+
+        with mock.patch.dict('os.environ', clear=True):
+            assert OneViewInventory.from_environment() is None
+
+
+class TestOneViewModuleGetByIndex():
+    @pytest.fixture(autouse=True)
+    def setUp(self, mock_ansible_module, mock_ov_client, tmpdir):
+        mock_ansible_module.params = dict(config='config.json', name=None)
+        mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        inventory = OneViewInventory(str(tmpdir.join('inventory.db')))
+        inventory.sync('172.16.101.48', '/rest/enclosures', [dict(name='Encl1', uri='/rest/enclosures/1')])
+
+        with mock.patch.dict('os.environ', {OneViewInventory.PATH_ENV: inventory.path}):
+            self.ov_base = OneViewModule()
+        self.ov_base.resource_client = mock.Mock(URI='/rest/enclosures')
+        self.ov_base.resource_client.get_by_uri.return_value.data = dict(name='Encl1', uri='/rest/enclosures/1')
+        self.fallback = mock.Mock(return_value='resource from the API')
+
+    def test_should_get_the_resource_by_the_uri_of_the_inventory(self):
+        resource = self.ov_base.get_by_index('name', 'Encl1', self.fallback)
+
+        assert resource == self.ov_base.resource_client.get_by_uri.return_value
+        self.ov_base.resource_client.get_by_uri.assert_called_once_with('/rest/enclosures/1')
+        self.fallback.assert_not_called()
+
+    def test_should_fall_back_to_the_api_when_the_inventory_misses(self):
+        assert self.ov_base.get_by_index('name', 'Encl2', self.fallback) == 'resource from the API'
+
+        self.ov_base.resource_client.get_by_uri.assert_not_called()
+
+    def test_should_fall_back_to_the_api_when_the_resource_was_removed(self):
+        self.ov_base.resource_client.get_by_uri.side_effect = HPEOneViewException('Resource not found')
+
+        assert self.ov_base.get_by_index('name', 'Encl1', self.fallback) == 'resource from the API'
+        assert self.ov_base.inventory.lookup('172.16.101.48', '/rest/enclosures', 'name', 'Encl1') == []
+
+    def test_should_fall_back_to_the_api_when_the_resource_no_longer_has_the_value(self):
+        self.ov_base.resource_client.get_by_uri.return_value.data = dict(name='Renamed', uri='/rest/enclosures/1')
+
+        assert self.ov_base.get_by_index('name', 'Encl1', self.fallback) == 'resource from the API'
+        self.fallback.assert_called_once_with()
+        assert self.ov_base.inventory.lookup('172.16.101.48', '/rest/enclosures', 'name', 'Encl1') == []
+
+    def test_should_fall_back_to_the_api_when_the_inventory_is_disabled(self):
+        self.ov_base.inventory = None
+
+        assert self.ov_base.get_by_index('name', 'Encl1', self.fallback) == 'resource from the API'
+
+    def test_should_resolve_the_name_of_the_resource_object_from_the_inventory(self):
+        resource_client = mock.Mock(URI='/rest/enclosures')
+        resource_client.get_by_uri.return_value.data = dict(name='Encl1', uri='/rest/enclosures/1')
+        self.ov_base.module.params = dict(name='Encl1')
+
+        self.ov_base.set_resource_object(resource_client)
+
+        assert self.ov_base.current_resource == resource_client.get_by_uri.return_value
+        resource_client.get_by_name.assert_not_called()
+
+
+class TestGetAllProjected():
+    MEMBERS = [dict(uri='/rest/resources/1', name='Resource 1', status='OK')]
+
+    def test_should_request_the_fields_to_the_resource_client(self):
+        resource_client = mock.Mock()
+        resource_client.get_all.return_value = [dict(uri='/rest/resources/1', name='Resource 1')]
+
+        resources = get_all_projected(resource_client, ['uri', 'name'], filter="status='OK'")
+
+        resource_client.get_all.assert_called_once_with(filter="status='OK'", fields='uri,name')
+        assert resources == [dict(uri='/rest/resources/1', name='Resource 1')]
+
+    def test_should_request_the_fields_to_the_helper_of_resource_objects(self):
+        class Resource(object):
+            _helper = mock.Mock()
+
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                raise AssertionError('not projected')
+
+        Resource._helper.get_all.return_value = [dict(uri='/rest/resources/1')]
+
+        assert get_all_projected(Resource(), ['uri']) == [dict(uri='/rest/resources/1')]
+        Resource._helper.get_all.assert_called_once_with(fields='uri')
+
+    def test_should_project_client_side_when_the_fields_are_not_supported(self):
+        class ResourceClient(object):
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                return deepcopy(TestGetAllProjected.MEMBERS)
+
+        assert get_all_projected(ResourceClient(), ['uri', 'name']) == [dict(uri='/rest/resources/1', name='Resource 1')]
+
+
+class TestChooseServerHardware():
+    CANDIDATES = ['/rest/server-hardware/{0}'.format(index) for index in range(8)]
+
+    def test_should_choose_the_first_candidate_by_default(self):
+        assert choose_server_hardware(self.CANDIDATES) == self.CANDIDATES[0]
+
+    def test_should_choose_none_without_candidates(self):
+        assert choose_server_hardware([], 'hash', key='profile') is None
+
+    def test_should_choose_a_random_candidate(self):
+        with mock.patch.object(oneview.random, 'choice', return_value=self.CANDIDATES[3]) as mock_choice:
+            assert choose_server_hardware(self.CANDIDATES, 'random') == self.CANDIDATES[3]
+        mock_choice.assert_called_once_with(self.CANDIDATES)
+
+    def test_should_choose_by_hash_the_same_candidate_regardless_of_the_order(self):
+        chosen = choose_server_hardware(self.CANDIDATES, 'hash', key='profile-1')
+
+        assert choose_server_hardware(list(reversed(self.CANDIDATES)), 'hash', key='profile-1') == chosen
+
+    def test_should_spread_the_keys_by_hash(self):
+        chosen = set(choose_server_hardware(self.CANDIDATES, 'hash', key='profile-{0}'.format(index))
+                     for index in range(16))
+
+        assert len(chosen) > 1
+
+    def test_should_keep_the_choice_by_hash_when_other_candidates_are_removed(self):
+        chosen = choose_server_hardware(self.CANDIDATES, 'hash', key='profile-1')
+        others = [uri for uri in self.CANDIDATES if uri != chosen]
+
+        assert choose_server_hardware([chosen] + others[:3], 'hash', key='profile-1') == chosen
+
+    def test_should_reserve_with_the_reservation_strategy(self):
+        reservations = mock.Mock()
+        reservations.reserve.return_value = self.CANDIDATES[2]
+
+        assert choose_server_hardware(self.CANDIDATES, 'reservation', key='profile', reservations=reservations,
+                                      appliance='172.16.101.48') == self.CANDIDATES[2]
+        reservations.reserve.assert_called_once_with('172.16.101.48', self.CANDIDATES, 'profile')
+
+
+class TestOneViewServerHardwareReservations():
+    CANDIDATES = ['/rest/server-hardware/1', '/rest/server-hardware/2']
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.reservations = OneViewServerHardwareReservations(str(tmpdir))
+
+    def test_should_reserve_different_server_hardware_for_each_owner(self):
+        first = self.reservations.reserve('appliance', self.CANDIDATES, 'profile-1')
+        second = self.reservations.reserve('appliance', self.CANDIDATES, 'profile-2')
+
+        assert sorted([first, second]) == self.CANDIDATES
+
+    def test_should_keep_the_reservation_of_the_owner(self):
+        first = self.reservations.reserve('appliance', self.CANDIDATES, 'profile-1')
+
+        assert self.reservations.reserve('appliance', self.CANDIDATES, 'profile-1') == first
+
+    def test_should_choose_a_reserved_candidate_without_reserving_it_when_all_are_reserved(self):
+        first = self.reservations.reserve('appliance', self.CANDIDATES, 'profile-1')
+        second = self.reservations.reserve('appliance', self.CANDIDATES, 'profile-2')
+
+        assert self.reservations.reserve('appliance', self.CANDIDATES, 'profile-3') in self.CANDIDATES
+        assert self.reservations.reserve('appliance', self.CANDIDATES, 'profile-1') == first
+        assert self.reservations.reserve('appliance', self.CANDIDATES, 'profile-2') == second
+
+    def test_should_return_none_without_candidates(self):
+        assert self.reservations.reserve('appliance', [], 'profile-1') is None
+
+    def test_should_not_share_the_reservations_between_appliances(self):
+        self.reservations.reserve('appliance-1', self.CANDIDATES[:1], 'profile-1')
+
+        assert self.reservations.reserve('appliance-2', self.CANDIDATES[:1], 'profile-2') == self.CANDIDATES[0]
+
+    def test_should_release_the_expired_reservations(self):
+        self.reservations.reserve('appliance', self.CANDIDATES[:1], 'profile-1')
+
+        with mock.patch('time.time', return_value=time.time() + OneViewServerHardwareReservations.DEFAULT_TTL + 1):
+            assert self.reservations.reserve('appliance', self.CANDIDATES[:1], 'profile-2') == self.CANDIDATES[0]
+
+
+class TestOneViewFileUpload():
+    CONTENT = b'0123456789' * 10
+    RESOURCE = dict(uri='/rest/firmware-drivers/1', name='Firmware')
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.file_path = str(tmpdir.join('bundle.iso'))
+        with open(self.file_path, 'wb') as local_file:
+            local_file.write(self.CONTENT)
+        self.checksum_dir = str(tmpdir.join('uploads'))
+
+        self.connection = mock.Mock()
+        self.connection.get_host.return_value = '172.16.101.48'
+        self.connection._headers = dict(auth='session-id')
+        self.connection._apiVersion = 1600
+        self.sent = []
+        self.http_connections = []
+        self.connection.get_connection.side_effect = self.new_http_connection
+
+    def new_http_connection(self, status=200, body=None):
+        http_connection = mock.Mock()
+        http_connection.send.side_effect = self.sent.append
+        http_connection.getresponse.return_value.status = status
+        http_connection.getresponse.return_value.read.return_value = json.dumps(self.RESOURCE).encode('utf-8')
+        self.http_connections.append(http_connection)
+        return http_connection
+
+    def sdk_upload(self):
+        # the SDK upload functions end in connection.post_multipart_with_response_handling
+        response, body = self.connection.post_multipart('/rest/firmware-bundles', None, self.file_path,
+                                                        'bundle.iso')
+        return body
+
+    def test_should_stream_the_file_in_chunks(self):
+        upload = OneViewFileUpload(self.connection, self.file_path, chunk_size=30)
+
+        result = upload.upload('/rest/firmware-bundles', self.sdk_upload)
+
+        assert result == self.RESOURCE
+        assert [len(part) for part in self.sent[1:-1]] == [30, 30, 30, 10]
+        assert b''.join(self.sent[1:-1]) == self.CONTENT
+        assert b'filename="bundle.iso"' in self.sent[0]
+        http_connection = self.http_connections[0]
+        http_connection.putrequest.assert_called_once_with('POST', '/rest/firmware-bundles')
+        http_connection.putheader.assert_any_call('auth', 'session-id')
+        http_connection.putheader.assert_any_call('Content-Length', sum(len(part) for part in self.sent))
+        http_connection.close.assert_called_once_with()
+        assert upload.manifest == dict(path=self.file_path, size=100, checksum=hashlib.sha256(self.CONTENT).hexdigest(),
+                                       transfers=1, skipped=False)
+
+    def test_should_restore_the_post_multipart_of_the_connection(self):
+        class Connection(object):
+            def post_multipart(self, uri, fields, files, baseName, verbose=False):
+                raise AssertionError('not streamed')
+
+        sdk_connection = Connection()
+        upload = OneViewFileUpload(sdk_connection, self.file_path)
+        upload._send = mock.Mock(return_value=(None, self.RESOURCE))
+
+        upload.upload('/rest/firmware-bundles', lambda: sdk_connection.post_multipart('/rest/firmware-bundles', None,
+                                                                                      self.file_path, 'bundle.iso'))
+
+        upload._send.assert_called_once_with('/rest/firmware-bundles', 'bundle.iso')
+        assert sdk_connection.post_multipart.__func__ is Connection.post_multipart
+
+    def test_should_log_the_progress(self):
+        log = mock.Mock()
+
+        OneViewFileUpload(self.connection, self.file_path, chunk_size=10, log=log).upload(
+            '/rest/firmware-bundles', self.sdk_upload)
+
+        assert log.call_count == 10
+        log.assert_called_with('Uploading {0}: 100 of 100 bytes sent.'.format(self.file_path))
+
+    def test_should_send_the_file_again_when_the_transfer_is_interrupted(self):
+        interrupted = mock.Mock()
+        interrupted.send.side_effect = IOError('Connection reset by peer')
+        self.connection.get_connection.side_effect = [interrupted, self.new_http_connection()]
+        upload = OneViewFileUpload(self.connection, self.file_path)
+
+        with mock.patch('time.sleep') as mock_sleep:
+            result = upload.upload('/rest/firmware-bundles', self.sdk_upload)
+
+        assert result == self.RESOURCE
+        assert upload.manifest['transfers'] == 2
+        interrupted.close.assert_called_once_with()
+        mock_sleep.assert_called_once_with(mock.ANY)
+
+    def test_should_fail_after_the_last_attempt(self):
+        interrupted = mock.Mock()
+        interrupted.send.side_effect = IOError('Connection reset by peer')
+        self.connection.get_connection.side_effect = None
+        self.connection.get_connection.return_value = interrupted
+
+        with mock.patch('time.sleep'):
+            with pytest.raises(IOError):
+                OneViewFileUpload(self.connection, self.file_path, attempts=2).upload('/rest/firmware-bundles',
+                                                                                      self.sdk_upload)
+
+        assert interrupted.close.call_count == 2
+
+    def test_should_raise_the_errors_of_the_appliance(self):
+        self.connection.get_connection.side_effect = lambda: self.new_http_connection(status=400)
+
+        with pytest.raises(HPEOneViewException):
+            OneViewFileUpload(self.connection, self.file_path).upload('/rest/firmware-bundles', self.sdk_upload)
+
+        assert len(self.http_connections) == 1
+
+    def test_should_not_find_uploads_without_checksum_dir(self):
+        upload = OneViewFileUpload(self.connection, self.file_path)
+
+        assert upload.find_uploaded('/rest/firmware-bundles') is None
+        assert upload.manifest['checksum'] is None
+
+    def test_should_find_the_resource_of_a_previous_upload_of_the_same_file(self):
+        OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir).upload(
+            '/rest/firmware-bundles', self.sdk_upload)
+        self.connection.get.return_value = self.RESOURCE
+
+        upload = OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir)
+
+        assert upload.find_uploaded('/rest/firmware-bundles') == self.RESOURCE
+        assert upload.manifest['skipped'] is True
+        self.connection.get.assert_called_once_with(self.RESOURCE['uri'])
+
+    def test_should_not_find_the_upload_of_a_changed_file(self):
+        OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir).upload(
+            '/rest/firmware-bundles', self.sdk_upload)
+        with open(self.file_path, 'ab') as local_file:
+            local_file.write(b'changed')
+
+        upload = OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir)
+
+        assert upload.find_uploaded('/rest/firmware-bundles') is None
+        self.connection.get.assert_not_called()
+
+    def test_should_forget_the_upload_when_the_resource_was_removed(self):
+        OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir).upload(
+            '/rest/firmware-bundles', self.sdk_upload)
+        self.connection.get.side_effect = HPEOneViewException('Resource not found')
+
+        assert OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir).find_uploaded(
+            '/rest/firmware-bundles') is None
+        assert OneViewFileUpload(self.connection, self.file_path, checksum_dir=self.checksum_dir).find_uploaded(
+            '/rest/firmware-bundles') is None
+        self.connection.get.assert_called_once_with(self.RESOURCE['uri'])
+
+    def test_should_compute_the_checksum_of_a_file(self):
+        assert file_checksum(self.file_path, chunk_size=7) == hashlib.sha256(self.CONTENT).hexdigest()
+
+
+class FakeDownloadServer(object):
+    """Serves a file to OneViewFileDownload, honoring the range requests, optionally cutting the transfers short."""
+
+    def __init__(self, content, etag='"1"', ranges=True):
+        self.content = content
+        self.etag = etag
+        self.ranges = ranges
+        self.cut_at = []
+        self.requests = []
+
+    def get_connection(self):
+        server = self
+        http_connection = mock.Mock()
+
+        def request(method, uri, body, headers):
+            server.requests.append((uri, dict(headers)))
+
+        def getresponse():
+            headers = server.requests[-1][1]
+            status, start = 200, 0
+            if server.ranges and 'Range' in headers and headers.get('If-Range', server.etag) == server.etag:
+                start = int(headers['Range'].split('=')[1].rstrip('-'))
+                status = 206 if start < len(server.content) else 416
+            body = server.content[start:]
+            response_headers = {'ETag': server.etag, 'Content-Length': str(len(body))}
+            if status == 206:
+                end = len(server.content) - 1
+                response_headers['Content-Range'] = 'bytes {0}-{1}/{2}'.format(start, end, len(server.content))
+            if server.cut_at:
+                body = body[:server.cut_at.pop(0) - start]
+            stream = io.BytesIO(body)
+            response = mock.Mock(status=status)
+            response.getheader.side_effect = lambda name, default=None: response_headers.get(name, default)
+            response.read.side_effect = lambda size=-1: stream.read(size)
+            return response
+
+        http_connection.request.side_effect = request
+        http_connection.getresponse.side_effect = getresponse
+        return http_connection
+
+
+class TestOneViewFileDownload():
+    CONTENT = b'0123456789' * 10
+    URI = '/rest/artifact-bundles/download/1'
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.destination = str(tmpdir.join('bundle.zip'))
+        self.checksum_dir = str(tmpdir.join('transfers'))
+        self.server = FakeDownloadServer(self.CONTENT)
+        self.connection = mock.Mock()
+        self.connection.get_host.return_value = '172.16.101.190'
+        self.connection._headers = dict(auth='session-id')
+        self.connection.get_connection.side_effect = self.server.get_connection
+        with mock.patch('time.sleep') as self.mock_sleep:
+            yield
+
+    def new_download(self, **kwargs):
+        return OneViewFileDownload(self.connection, self.URI, self.destination, **kwargs)
+
+    def read_destination(self):
+        with open(self.destination, 'rb') as local_file:
+            return local_file.read()
+
+    def test_should_download_the_file_in_chunks(self):
+        log = mock.Mock()
+        download = self.new_download(chunk_size=10, log=log)
+
+        assert download.download() is True
+
+        assert self.read_destination() == self.CONTENT
+        assert not os.path.exists(self.destination + OneViewFileDownload.PART_SUFFIX)
+        assert download.manifest == dict(path=self.destination, size=100,
+                                         checksum=hashlib.sha256(self.CONTENT).hexdigest(), transfers=1,
+                                         resumed_from=0, skipped=False)
+        assert self.server.requests == [(self.URI, dict(auth='session-id', **OneViewFileDownload.HEADERS))]
+        assert log.call_count == 10
+
+    def test_should_resume_an_interrupted_transfer_with_a_range_request(self):
+        self.server.cut_at = [40]
+        download = self.new_download(chunk_size=16)
+
+        download.download()
+
+        assert self.read_destination() == self.CONTENT
+        assert download.manifest['transfers'] == 2
+        assert download.manifest['resumed_from'] == 40
+        assert download.manifest['checksum'] == hashlib.sha256(self.CONTENT).hexdigest()
+        assert self.server.requests[1][1]['Range'] == 'bytes=40-'
+        assert self.server.requests[1][1]['If-Range'] == '"1"'
+        self.mock_sleep.assert_called_once_with(mock.ANY)
+
+    def test_should_start_again_when_the_appliance_does_not_support_ranges(self):
+        self.server.ranges = False
+        self.server.cut_at = [40]
+        download = self.new_download()
+
+        download.download()
+
+        assert self.read_destination() == self.CONTENT
+        assert download.manifest['transfers'] == 2
+        assert download.manifest['resumed_from'] == 0
+
+    def test_should_fail_after_the_last_attempt_without_replacing_the_destination(self):
+        with open(self.destination, 'wb') as local_file:
+            local_file.write(b'previous backup')
+        self.server.cut_at = [10, 20]
+
+        with pytest.raises(IOError) as error:
+            self.new_download(attempts=2).download()
+
+        assert str(error.value) == OneViewFileDownload.MSG_INCOMPLETE.format(self.destination, 20, 100)
+        assert self.read_destination() == b'previous backup'
+
+    def test_should_follow_the_redirects(self):
+        redirect = mock.Mock(status=302)
+        redirect.getheader.return_value = '/rest/artifact-bundles/download/1/file'
+        redirected = mock.Mock()
+        redirected.getresponse.return_value = redirect
+        self.connection.get_connection.side_effect = [redirected, self.server.get_connection()]
+
+        self.new_download().download()
+
+        assert self.read_destination() == self.CONTENT
+        assert self.server.requests[-1][0] == '/rest/artifact-bundles/download/1/file'
+        redirected.close.assert_called_once_with()
+
+    def test_should_raise_the_errors_of_the_appliance(self):
+        error_connection = mock.Mock()
+        error_connection.getresponse.return_value.status = 404
+        error_connection.getresponse.return_value.read.return_value = b'{"errorCode": "RESOURCE_NOT_FOUND"}'
+        self.connection.get_connection.side_effect = None
+        self.connection.get_connection.return_value = error_connection
+
+        with pytest.raises(HPEOneViewException):
+            self.new_download().download()
+
+        error_connection.close.assert_called_once_with()
+        assert not os.path.exists(self.destination)
+
+    def test_should_skip_the_download_of_the_same_version(self):
+        self.new_download(version='v1', checksum_dir=self.checksum_dir).download()
+        download = self.new_download(version='v1', checksum_dir=self.checksum_dir)
+
+        assert download.download() is False
+
+        assert len(self.server.requests) == 1
+        assert download.manifest == dict(path=self.destination, size=100,
+                                         checksum=hashlib.sha256(self.CONTENT).hexdigest(), transfers=0,
+                                         resumed_from=0, skipped=True)
+
+    def test_should_download_again_a_new_version(self):
+        self.new_download(version='v1', checksum_dir=self.checksum_dir).download()
+        self.server.content = b'new content'
+
+        assert self.new_download(version='v2', checksum_dir=self.checksum_dir).download() is True
+
+        assert self.read_destination() == b'new content'
+
+    def test_should_download_again_when_the_destination_was_changed(self):
+        self.new_download(version='v1', checksum_dir=self.checksum_dir).download()
+        with open(self.destination, 'ab') as local_file:
+            local_file.write(b'changed')
+
+        assert self.new_download(version='v1', checksum_dir=self.checksum_dir).download() is True
+
+        assert self.read_destination() == self.CONTENT
+
+    def test_should_not_skip_without_version(self):
+        self.new_download(checksum_dir=self.checksum_dir).download()
+
+        assert self.new_download(checksum_dir=self.checksum_dir).download() is True
+
+    def test_should_resume_on_the_next_run_the_download_of_the_same_version(self):
+        self.server.cut_at = [30, 30]
+        with pytest.raises(IOError):
+            self.new_download(version='v1', checksum_dir=self.checksum_dir, attempts=1).download()
+
+        download = self.new_download(version='v1', checksum_dir=self.checksum_dir)
+        download.download()
+
+        assert self.read_destination() == self.CONTENT
+        assert download.manifest['resumed_from'] == 30
+
+    def test_should_discard_the_part_of_another_version(self):
+        self.server.cut_at = [30]
+        with pytest.raises(IOError):
+            self.new_download(version='v1', checksum_dir=self.checksum_dir, attempts=1).download()
+        self.server.content = b'new content'
+
+        download = self.new_download(version='v2', checksum_dir=self.checksum_dir)
+        download.download()
+
+        assert self.read_destination() == b'new content'
+        assert 'Range' not in self.server.requests[-1][1]
+
+    def test_should_start_again_when_the_part_does_not_fit_the_file(self):
+        with open(self.destination + OneViewFileDownload.PART_SUFFIX, 'wb') as part_file:
+            part_file.write(b'x' * 200)
+        download = self.new_download()
+
+        # a part recorded for the same version by a previous run
+        with mock.patch.object(download, '_ledger_get', side_effect=lambda kind: dict(etag='"1"')
+                               if kind == 'partial' else None):
+            download.download()
+
+        assert self.read_destination() == self.CONTENT
+        assert download.manifest['transfers'] == 2
+
+
+class TestOneViewFileDistribution():
+    CONTENT = b'0123456789' * 10
+    RESOURCE = dict(uri='/rest/artifact-bundles/1', name='Artifact Bundle')
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, tmpdir):
+        self.file_path = str(tmpdir.join('bundle.zip'))
+        with open(self.file_path, 'wb') as local_file:
+            local_file.write(self.CONTENT)
+        self.checksum_dir = str(tmpdir.join('uploads'))
+        self.sent = collections.defaultdict(list)
+
+    def new_connection(self, hostname):
+        connection = mock.Mock()
+        connection.get_host.return_value = hostname
+        connection._headers = dict(auth='session-id')
+        http_connection = connection.get_connection.return_value
+        http_connection.send.side_effect = lambda data: self.sent[hostname].append(bytes(data))
+        http_connection.getresponse.return_value.status = 200
+        http_connection.getresponse.return_value.read.return_value = json.dumps(
+            dict(self.RESOURCE, uri='/rest/artifact-bundles/' + hostname)).encode('utf-8')
+        return connection
+
+    def upload_to(self, hostname, upload):
+        def sdk_upload():
+            response, body = upload.connection.post_multipart('/rest/artifact-bundles', None, self.file_path,
+                                                              'bundle.zip')
+            return body
+        return True, upload.upload('/rest/artifact-bundles', sdk_upload)
+
+    def test_should_upload_the_file_to_all_targets(self):
+        targets = [(hostname, self.new_connection(hostname)) for hostname in ('i3s-1', 'i3s-2', 'i3s-3')]
+
+        distribution = OneViewFileDistribution(self.file_path, chunk_size=30, max_concurrency=2).distribute(
+            targets, self.upload_to)
+
+        assert [(target['name'], target['status'], target['uri'], target['transfers']) for target in distribution] == [
+            ('i3s-1', 'uploaded', '/rest/artifact-bundles/i3s-1', 1),
+            ('i3s-2', 'uploaded', '/rest/artifact-bundles/i3s-2', 1),
+            ('i3s-3', 'uploaded', '/rest/artifact-bundles/i3s-3', 1)]
+        for hostname in ('i3s-1', 'i3s-2', 'i3s-3'):
+            assert b''.join(self.sent[hostname][1:-1]) == self.CONTENT
+        assert all('seconds' in target and 'bytes_per_second' in target for target in distribution)
+
+    def test_should_map_the_file_once_for_all_targets(self):
+        targets = [(hostname, self.new_connection(hostname)) for hostname in ('i3s-1', 'i3s-2')]
+
+        with mock.patch.object(oneview.mmap, 'mmap', wraps=oneview.mmap.mmap) as mock_mmap:
+            with mock.patch.object(oneview, 'file_checksum') as mock_file_checksum:
+                distribution = OneViewFileDistribution(self.file_path, checksum_dir=self.checksum_dir)
+                distribution.distribute(targets, self.upload_to)
+
+        mock_mmap.assert_called_once_with(mock.ANY, 0, access=oneview.mmap.ACCESS_READ)
+        mock_file_checksum.assert_not_called()
+
+    def test_should_slice_the_mapped_file_on_python_2(self):
+        targets = [('i3s-1', self.new_connection('i3s-1'))]
+
+        with mock.patch.object(oneview.six, 'PY2', True):
+            with mock.patch.object(oneview, 'memoryview', create=True, side_effect=TypeError) as mock_memoryview:
+                OneViewFileDistribution(self.file_path, chunk_size=30).distribute(targets, self.upload_to)
+
+        mock_memoryview.assert_not_called()
+        assert self.sent['i3s-1'][1:-1] == [self.CONTENT[offset:offset + 30] for offset in range(0, 100, 30)]
+
+    def test_should_report_the_resources_already_present(self):
+        targets = [('i3s-1', self.new_connection('i3s-1'))]
+
+        distribution = OneViewFileDistribution(self.file_path).distribute(
+            targets, lambda hostname, upload: (False, self.RESOURCE))
+
+        assert distribution == [dict(name='i3s-1', status='present', uri=self.RESOURCE['uri'], transfers=0,
+                                     seconds=mock.ANY)]
+        assert not self.sent
+
+    def test_should_upload_to_the_other_targets_when_one_fails(self):
+        targets = [(hostname, self.new_connection(hostname)) for hostname in ('i3s-1', 'i3s-2')]
+        targets[0][1].get_connection.return_value.getresponse.return_value.status = 500
+        targets[0][1].get_connection.return_value.getresponse.return_value.read.return_value = \
+            b'{"message": "Internal error"}'
+
+        distribution = OneViewFileDistribution(self.file_path).distribute(targets, self.upload_to)
+
+        assert distribution[0]['status'] == 'failed'
+        assert distribution[0]['msg'] == 'Internal error'
+        assert distribution[1]['status'] == 'uploaded'
+
+    def test_should_upload_an_empty_file(self):
+        open(self.file_path, 'wb').close()
+        targets = [('i3s-1', self.new_connection('i3s-1'))]
+
+        distribution = OneViewFileDistribution(self.file_path).distribute(targets, self.upload_to)
+
+        assert distribution[0]['status'] == 'uploaded'
+        assert self.sent['i3s-1'][1:-1] == []
+
+
+class TestCreateImageStreamerClient():
+    def test_should_share_the_session_of_the_oneview_client(self):
+        oneview_client = mock.Mock()
+        oneview_client.connection.get_session_id.return_value = 'session-id'
+        oneview_client.connection._apiVersion = 1600
+        oneview_client.connection._sslBundle = False
+
+        with mock.patch.object(oneview, 'ImageStreamerClient') as mock_client:
+            i3s_client = create_image_streamer_client(oneview_client, '172.16.101.190')
+
+        assert i3s_client is mock_client.return_value
+        mock_client.assert_called_once_with('172.16.101.190', 'session-id', 1600, False)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -17,6 +17,8 @@
 ###
 
 import copy
+import json
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
@@ -75,6 +77,22 @@ class TestAlertFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(alerts=ALL_ALERTS)
         )
 
+    def test_should_stream_all_alerts_to_a_file(self, tmpdir):
+        members = [dict(name='Resource {0}'.format(i)) for i in range(5)]
+        self.resource.get_all.side_effect = lambda start, count, **params: members[start:start + count]
+        path = str(tmpdir.join('alerts.ndjson'))
+        self.mock_ansible_module.params = dict(dict(config='config.json', params=None), stream_to=path, page_size=2)
+
+        AlertFactsModule().run()
+
+        assert self.resource.get_all.call_count == 3
+        assert self.resource.get_all.call_args_list[0] == mock.call(start=0, count=2)
+        assert tmpdir.join('alerts.ndjson').read().splitlines() == [json.dumps(member) for member in members]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(alerts_manifest=dict(path=path, count=5, checksum=mock.ANY))
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
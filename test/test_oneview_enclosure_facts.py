@@ -16,10 +16,12 @@
 # limitations under the License.
 ###
 
+import json
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
-from oneview_module_loader import EnclosureFactsModule
+from oneview_module_loader import EnclosureFactsModule, OneViewModuleException
 
 ERROR_MSG = 'Fake message error'
 
@@ -158,6 +160,114 @@ class TestEnclosureFactsModule(OneViewBaseFactsTest):
         self.resource.get_utilization.assert_called_once_with(fields='AveragePower',
                                                               filter=date_filter, view='day', refresh=True)
 
+    def test_should_refresh_all_enclosures_incrementally_from_the_snapshot(self, tmpdir):
+        enclosures = [dict(PRESENT_ENCLOSURES[0], modified='2026-10-18T10:00:00.000Z'),
+                      dict(name='Removed', uri='/rest/enclosures/removed', modified='2026-10-18T10:00:01.000Z')]
+        changed = dict(enclosures[0], state='Monitored', modified='2026-10-18T10:05:00.000Z')
+        self.resource.URI = '/rest/enclosures'
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, snapshot_dir=str(tmpdir))
+
+        self.resource.get_all.return_value = enclosures
+        EnclosureFactsModule().run()
+
+        self.resource.get_all.reset_mock()
+        self.resource.get_all.side_effect = lambda fields='', **params: \
+            [dict(uri=changed['uri'])] if fields == 'uri' else [changed]
+        EnclosureFactsModule().run()
+
+        assert self.resource.get_all.call_args_list == [
+            mock.call(fields='uri'), mock.call(filter=["modified >= '2026-10-18T10:00:01.000Z'"])]
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=False,
+            ansible_facts=dict(enclosures=[changed])
+        )
+
+    def test_should_not_refresh_the_whole_enclosures_from_a_snapshot_of_their_fields(self, tmpdir):
+        enclosures = [dict(PRESENT_ENCLOSURES[0], modified='2026-10-18T10:00:00.000Z')]
+        self.resource.URI = '/rest/enclosures'
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        self.resource.get_all.return_value = enclosures
+
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, snapshot_dir=str(tmpdir),
+                                               fields=['uri', 'name', 'modified'])
+        EnclosureFactsModule().run()
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, snapshot_dir=str(tmpdir))
+        EnclosureFactsModule().run()
+
+        assert self.resource.get_all.call_args_list == [mock.call(fields='uri,name,modified'), mock.call()]
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=False,
+            ansible_facts=dict(enclosures=enclosures)
+        )
+
+    def test_should_list_all_enclosures_when_the_snapshot_expires(self, tmpdir):
+        enclosures = [dict(PRESENT_ENCLOSURES[0], modified='2026-10-18T10:00:00.000Z')]
+        self.resource.URI = '/rest/enclosures'
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        self.resource.get_all.return_value = enclosures
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, snapshot_dir=str(tmpdir), snapshot_ttl=-1)
+
+        EnclosureFactsModule().run()
+        EnclosureFactsModule().run()
+
+        assert self.resource.get_all.call_args_list == [mock.call(), mock.call()]
+
+    def test_should_stream_all_enclosures_to_a_file(self, tmpdir):
+        members = [dict(name='Encl{0}'.format(i)) for i in range(5)]
+        self.resource.get_all.side_effect = lambda start, count, **params: members[start:start + count]
+        path = str(tmpdir.join('enclosures.ndjson'))
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, stream_to=path, page_size=2)
+
+        EnclosureFactsModule().run()
+
+        assert self.resource.get_all.call_count == 3
+        assert self.resource.get_all.call_args_list[0] == mock.call(start=0, count=2)
+        assert tmpdir.join('enclosures.ndjson').read().splitlines() == [json.dumps(member) for member in members]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(enclosures_manifest=dict(path=path, count=5, checksum=mock.ANY))
+        )
+
+    def test_should_gather_the_options_of_many_enclosures_by_uri(self):
+        enclosures = [dict(name='Encl{0}'.format(i), uri='/rest/enclosures/{0}'.format(i)) for i in range(2)]
+        self.resource.get_all.return_value = enclosures
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            get_script=mock.Mock(return_value=data['name'] + ' script'),
+            get_utilization=mock.Mock(return_value=ENCLOSURE_UTILIZATION))
+        self.mock_ansible_module.params = dict(config='config.json', names=['Encl0', 'Encl1'],
+                                               options=['script', 'utilization'], params=None)
+
+        EnclosureFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(enclosures=enclosures,
+                               enclosures_options={
+                                   '/rest/enclosures/0': dict(enclosure_script='Encl0 script',
+                                                              enclosure_utilization=ENCLOSURE_UTILIZATION),
+                                   '/rest/enclosures/1': dict(enclosure_script='Encl1 script',
+                                                              enclosure_utilization=ENCLOSURE_UTILIZATION)})
+        )
+
+    def test_should_report_the_enclosures_whose_options_failed(self):
+        enclosures = [dict(name='Encl{0}'.format(i), uri='/rest/enclosures/{0}'.format(i)) for i in range(3)]
+        self.resource.get_all.return_value = enclosures
+
+        def new(connection, data):
+            error = OneViewModuleException('No script') if data['name'] == 'Encl1' else None
+            return mock.Mock(get_script=mock.Mock(return_value='script', side_effect=error))
+
+        self.resource.new.side_effect = new
+        self.mock_ansible_module.params = dict(config='config.json', options=['script'],
+                                               params=dict(filter="status='Critical'"))
+
+        EnclosureFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY,
+                                                                   msg='/rest/enclosures/1: No script')
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -79,6 +79,38 @@ class TestFcNetworkModule(OneViewBaseTest):
     OneViewBaseTestCase provides the mocks used in this test case
     """
 
+    def test_should_create_the_items_with_a_single_get_all(self):
+        self.resource.get_all.return_value = [dict(DEFAULT_FC_NETWORK_TEMPLATE, uri='/rest/fc-networks/1')]
+        self.resource.create.side_effect = lambda data: mock.Mock(data=data)
+        self.mock_ansible_module.check_mode = False
+        self.mock_ansible_module.params = dict(config='config.json', state='present', items=[
+            dict(data=dict(name=DEFAULT_FC_NETWORK_TEMPLATE['name'])),
+            dict(data=dict(name='New FC Network 3', fabricType='DirectAttach'))])
+
+        FcNetworkModule().run()
+
+        self.resource.get_by_name.assert_not_called()
+        self.resource.create.assert_called_once_with(dict(name='New FC Network 3', fabricType='DirectAttach'))
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=FcNetworkModule.MSG_BATCH_APPLIED.format(1, 0, 0),
+            items=[dict(name=DEFAULT_FC_NETWORK_TEMPLATE['name'], state='present', changed=False,
+                        msg=FcNetworkModule.MSG_ALREADY_PRESENT,
+                        resource=dict(DEFAULT_FC_NETWORK_TEMPLATE, uri='/rest/fc-networks/1')),
+                   dict(name='New FC Network 3', state='present', changed=True, msg=FcNetworkModule.MSG_CREATED,
+                        resource=dict(name='New FC Network 3', fabricType='DirectAttach'))]
+        )
+
+    def test_should_fail_when_items_have_bandwidth(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='present', items=[
+            dict(data=dict(name=DEFAULT_FC_NETWORK_TEMPLATE['name'], bandwidth=dict(maximumBandwidth=3000)))])
+
+        FcNetworkModule().run()
+
+        self.resource.get_all.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FcNetworkModule.MSG_BANDWIDTH_NOT_SUPPORTED)
+
     def test_should_create_new_fc_network(self):
         self.resource.get_by_name.return_value = []
         self.mock_ansible_module.check_mode = False
@@ -16,13 +16,17 @@
 # limitations under the License.
 ###
 
+import hashlib
+import mock
 import pytest
 
+from hpeOneView.exceptions import HPEOneViewException
+
 from hpe_test_utils import OneViewBaseTest
 from oneview_module_loader import FirmwareBundleModule
 
 FAKE_MSG_ERROR = 'Fake message error'
-DEFAULT_FIRMWARE_FILE_PATH = '/path/to/file.rpm'
+DEFAULT_FIRMWARE_FILE_CONTENT = b'firmware bundle content'
 
 DEFAULT_FIRMWARE_TEMPLATE = dict(
     bundleSize='4837926',
@@ -32,30 +36,72 @@ DEFAULT_FIRMWARE_TEMPLATE = dict(
     fwComponents=[dict(componentVersion='HPGH',
                        fileName='hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm',
                        name='Supplemental Update',
-                       swKeyNameList=['hp-firmware-hdd-a1b08f8a6b'])]
-)
-
-PARAMS_FOR_PRESENT = dict(
-    config='config.json',
-    state='present',
-    file_path=DEFAULT_FIRMWARE_FILE_PATH
+                       swKeyNameList=['hp-firmware-hdd-a1b08f8a6b'])],
+    uri='/rest/firmware-drivers/hp-firmware-hdd-a1b08f8a6b-HPGH-1_1_x86_64'
 )
 
 
 @pytest.mark.resource(TestFirmwareBundleModule='firmware_bundles')
 class TestFirmwareBundleModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def setUpFile(self, tmpdir):
+        self.file_path = str(tmpdir.join('file.rpm'))
+        with open(self.file_path, 'wb') as firmware_file:
+            firmware_file.write(DEFAULT_FIRMWARE_FILE_CONTENT)
+        self.checksum_dir = str(tmpdir.join('uploads'))
+        self.resource.URI = '/rest/firmware-bundles'
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        self.params = dict(config='config.json', state='present', file_path=self.file_path)
+
     def test_should_upload(self):
         self.mock_ov_client.firmware_drivers.get_by_file_name.return_value = None
         self.resource.upload.side_effect = [DEFAULT_FIRMWARE_TEMPLATE]
 
-        self.mock_ansible_module.params = PARAMS_FOR_PRESENT
+        self.mock_ansible_module.params = self.params
 
         FirmwareBundleModule().run()
 
+        self.resource.upload.assert_called_once_with(self.file_path)
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_UPLOADED,
-            ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE)
+            ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE, firmware_bundle_upload=dict(
+                path=self.file_path, size=len(DEFAULT_FIRMWARE_FILE_CONTENT), checksum=None, transfers=0,
+                skipped=False))
+        )
+
+    def test_should_not_upload_again_a_file_with_the_same_checksum(self):
+        self.resource.upload.return_value = DEFAULT_FIRMWARE_TEMPLATE
+        self.mock_ov_client.connection.get.return_value = DEFAULT_FIRMWARE_TEMPLATE
+        self.mock_ansible_module.params = dict(self.params, checksum_dir=self.checksum_dir)
+
+        FirmwareBundleModule().run()
+        FirmwareBundleModule().run()
+
+        self.resource.upload.assert_called_once_with(self.file_path)
+        self.mock_ov_client.connection.get.assert_called_once_with(DEFAULT_FIRMWARE_TEMPLATE['uri'])
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=False,
+            msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+            ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE, firmware_bundle_upload=mock.ANY)
+        )
+        upload = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['firmware_bundle_upload']
+        assert upload['skipped'] is True
+        assert upload['checksum'] == hashlib.sha256(DEFAULT_FIRMWARE_FILE_CONTENT).hexdigest()
+
+    def test_should_upload_again_when_the_uploaded_firmware_was_removed(self):
+        self.resource.upload.return_value = DEFAULT_FIRMWARE_TEMPLATE
+        self.mock_ov_client.connection.get.side_effect = HPEOneViewException('Resource not found')
+        self.mock_ansible_module.params = dict(self.params, checksum_dir=self.checksum_dir)
+
+        FirmwareBundleModule().run()
+        FirmwareBundleModule().run()
+
+        assert self.resource.upload.call_count == 2
+        self.mock_ansible_module.exit_json.assert_called_with(
+            changed=True,
+            msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_UPLOADED,
+            ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE, firmware_bundle_upload=mock.ANY)
         )
 
 
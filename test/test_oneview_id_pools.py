@@ -17,6 +17,8 @@
 import mock
 import pytest
 
+from collections import OrderedDict
+
 from hpe_test_utils import OneViewBaseTest
 from oneview_module_loader import IdPoolsModule, OneViewModuleValueError
 
@@ -226,6 +228,127 @@ class TestIdPoolsModule(OneViewBaseTest):
             ansible_facts=dict(id_pool=invalid_data)
         )
 
+    def allocate(self, information, pool_type):
+        if 'idList' in information:
+            return dict(poolType=pool_type, idList=list(information['idList']))
+        start = len(self.allocated)
+        self.allocated.extend('VMAC{0:03d}'.format(i) for i in range(start, start + information['count']))
+        return dict(poolType=pool_type, idList=self.allocated[start:], count=information['count'])
+
+    def test_should_allocate_the_ids_of_many_consumers_with_the_minimum_of_calls(self):
+        self.allocated = []
+        self.resource.allocate.side_effect = self.allocate
+        self.mock_ansible_module.params = dict(config='config.json', state='allocate', data=dict(poolType='vmac'),
+                                               batch_size=4,
+                                               consumers=[dict(name='profile-01', count=3),
+                                                          dict(name='profile-02', idList=['VMAC900']),
+                                                          dict(name='profile-03'),
+                                                          dict(name='profile-04', count=2)])
+
+        IdPoolsModule().run()
+
+        assert self.resource.allocate.call_args_list == [mock.call({'idList': ['VMAC900']}, 'vmac'),
+                                                         mock.call({'count': 4}, 'vmac'),
+                                                         mock.call({'count': 2}, 'vmac')]
+        self.resource.collect.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=IdPoolsModule.MSG_ALLOCATED,
+            ansible_facts=dict(
+                id_pool=dict(poolType='vmac', count=7,
+                             idList=['VMAC000', 'VMAC001', 'VMAC002', 'VMAC900', 'VMAC003', 'VMAC004', 'VMAC005']),
+                id_pool_assignments=OrderedDict([('profile-01', ['VMAC000', 'VMAC001', 'VMAC002']),
+                                                 ('profile-02', ['VMAC900']),
+                                                 ('profile-03', ['VMAC003']),
+                                                 ('profile-04', ['VMAC004', 'VMAC005'])]))
+        )
+
+    def test_should_collect_back_the_ids_allocated_when_the_pool_runs_out(self):
+        self.resource.allocate.side_effect = [dict(idList=['VMAC000', 'VMAC001']), dict(idList=['VMAC002'])]
+        self.mock_ansible_module.params = dict(config='config.json', state='allocate', data=dict(poolType='vmac'),
+                                               batch_size=2,
+                                               consumers=[dict(name='profile-01', count=2),
+                                                          dict(name='profile-02', count=2)])
+
+        IdPoolsModule().run()
+
+        assert self.resource.collect.call_args_list == [mock.call({'idList': ['VMAC000', 'VMAC001']}, 'vmac'),
+                                                        mock.call({'idList': ['VMAC002']}, 'vmac')]
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=IdPoolsModule.MSG_IDS_NOT_AVAILABLE)
+
+    def test_should_collect_the_ids_of_many_consumers_in_batches(self):
+        self.resource.collect.side_effect = [dict(idList=['VMAC000', 'VMAC001']), dict(idList=[])]
+        self.mock_ansible_module.params = dict(config='config.json', state='collect', data=dict(poolType='vmac'),
+                                               batch_size=2,
+                                               consumers=[dict(name='profile-01', idList=['VMAC000']),
+                                                          dict(name='profile-02', idList=['VMAC001', 'VMAC002'])])
+
+        IdPoolsModule().run()
+
+        assert self.resource.collect.call_args_list == [mock.call({'idList': ['VMAC000', 'VMAC001']}, 'vmac'),
+                                                        mock.call({'idList': ['VMAC002']}, 'vmac')]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=IdPoolsModule.MSG_COLLECTED,
+            ansible_facts=dict(id_pool=dict(poolType='vmac', idList=['VMAC000', 'VMAC001'], count=2),
+                               id_pool_assignments=OrderedDict([('profile-01', ['VMAC000']),
+                                                                ('profile-02', ['VMAC001'])]))
+        )
+
+    def test_should_validate_the_ids_of_many_consumers_with_a_single_call(self):
+        self.resource.validate.return_value = dict(idList=['VMAC000', 'VMAC002'])
+        self.mock_ansible_module.params = dict(config='config.json', state='validate', data=dict(poolType='vmac'),
+                                               batch_size=1,
+                                               consumers=[dict(name='profile-01', idList=['VMAC000', 'VMAC001']),
+                                                          dict(name='profile-02', idList=['VMAC002'])])
+
+        IdPoolsModule().run()
+
+        self.resource.validate.assert_called_once_with({'idList': ['VMAC000', 'VMAC001', 'VMAC002']}, 'vmac')
+        self.resource.allocate.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=IdPoolsModule.MSG_IDS_NOT_VALID.format('VMAC001'),
+            ansible_facts=dict(id_pool=dict(poolType='vmac', idList=['VMAC000', 'VMAC002'], count=2),
+                               id_pool_assignments=OrderedDict([('profile-01', ['VMAC000']),
+                                                                ('profile-02', ['VMAC002'])]))
+        )
+
+    def test_should_fail_when_consumer_names_are_repeated(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='allocate', data=dict(poolType='vmac'),
+                                               consumers=[dict(name='profile-01'), dict(name='profile-01')])
+
+        IdPoolsModule().run()
+
+        self.resource.allocate.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=IdPoolsModule.MSG_CONSUMER_NAME_REQUIRED)
+
+    def test_should_fail_to_collect_when_consumer_has_no_id_list(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='collect', data=dict(poolType='vmac'),
+                                               consumers=[dict(name='profile-01', count=2)])
+
+        IdPoolsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=IdPoolsModule.MSG_CONSUMER_ID_LIST_REQUIRED.format('profile-01'))
+
+    def test_should_fail_when_consumers_are_given_to_update_pool_type(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='update_pool_type',
+                                               data=dict(poolType='vmac', enabled=True),
+                                               consumers=[dict(name='profile-01')])
+
+        IdPoolsModule().run()
+
+        self.resource.update_pool_type.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=IdPoolsModule.MSG_CONSUMERS_STATE_NOT_SUPPORTED.format('update_pool_type'))
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
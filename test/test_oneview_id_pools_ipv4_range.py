@@ -264,6 +264,27 @@ class TestIdPoolsIpv4RangeModule(OneViewBaseTest):
             msg=IdPoolsIpv4RangeModule.MSG_ALREADY_ABSENT
         )
 
+    def test_should_allocate_id_to_ip_range_found_by_name(self):
+        ranges = {DEFAULT_NOT_RANGE_TEMPLATE['uri']: DEFAULT_NOT_RANGE_TEMPLATE,
+                  DEFAULT_RANGE_TEMPLATE['uri']: DEFAULT_RANGE_TEMPLATE_Alocator_and_Collector}
+        self.mock_ov_client.id_pools_ipv4_subnets.get_by_uri.return_value = mock.Mock(data=DEFAULT_SUBNET_TEMPLATE)
+        self.resource.get_by_uri.side_effect = lambda uri: mock.Mock(data=ranges[uri])
+        self.resource.update_allocator.return_value = DEFAULT_RANGE_TEMPLATE_Alocator_and_Collector
+        self.mock_ansible_module.params = dict(config='config.json',
+                                               state='present',
+                                               data=dict(name=DEFAULT_RANGE_TEMPLATE['name'],
+                                                         subnetUri=DEFAULT_RANGE_TEMPLATE['subnetUri'],
+                                                         idList=['10.0.0.0', '10.1.1.1'],
+                                                         count=2,
+                                                         update_allocator=True))
+
+        IdPoolsIpv4RangeModule().run()
+
+        assert sorted(call[0][0] for call in self.resource.get_by_uri.call_args_list) == \
+            sorted(DEFAULT_SUBNET_TEMPLATE['rangeUris'])
+        self.resource.update_allocator.assert_called_once_with(dict(idList=['10.0.0.0', '10.1.1.1'], count=2),
+                                                               DEFAULT_RANGE_TEMPLATE['uri'])
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -133,6 +133,21 @@ class TestIdPoolsIpv4RangeFactsModule(OneViewBaseTest):
             ansible_facts=dict(id_pools_ipv4_ranges=ranges)
         )
 
+    def test_should_get_only_the_fields_of_the_id_pools_ipv4_ranges(self):
+        obj = mock.Mock()
+        obj.data = DEFAULT_SUBNET_TEMPLATE_2
+        self.mock_ov_client.id_pools_ipv4_subnets.get_by_uri.return_value = obj
+        self.resource.get_by_uri.return_value = self.resource
+        self.resource.data = DEFAULT_RANGE_TEMPLATE.copy()
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL_FROM_SUBNET, fields=['name', 'gateway'])
+
+        IdPoolsIpv4RangeFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(id_pools_ipv4_ranges=[dict(name='Ipv4Range', gateway='10.10.0.1')] * 2)
+        )
+
     def test_should_get_id_pools_ipv4_range_from_subnet_and_name(self):
         obj = mock.Mock()
         obj.data = DEFAULT_SUBNET_TEMPLATE_2
@@ -84,7 +84,7 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
     OneViewBaseTestCase provides the mocks used in this test case
     """
     def test_should_create_new_id_pools_ipv4_subnet(self):
-        self.resource.get_by_field.return_value = None
+        self.resource.get_by.return_value = []
         self.resource.create.return_value = self.resource
 
         self.resource.data = DEFAULT_SUBNET_TEMPLATE
@@ -101,7 +101,8 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
 
     def test_should_not_update_when_data_is_equals(self):
         self.resource.data = DEFAULT_SUBNET_TEMPLATE
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
 
         self.mock_ansible_module.params = PARAMS_FOR_PRESENT
 
@@ -115,12 +116,15 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
 
     def test_should_get_the_same_resource_by_networkid(self):
         self.resource.data = DEFAULT_SUBNET_TEMPLATE
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
 
         self.mock_ansible_module.params = PARAMS_FOR_PRESENT
 
         IdPoolsIpv4SubnetModule().run()
 
+        self.resource.get_by.assert_called_once_with('networkId', DEFAULT_SUBNET_TEMPLATE['networkId'])
+        self.resource.get_all.assert_not_called()
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
             msg=IdPoolsIpv4SubnetModule.MSG_ALREADY_PRESENT,
@@ -146,7 +150,8 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
         data_merged['domain'] = 'diffdomain.com'
 
         self.resource.data = data_merged
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
         self.resource.update.return_value = data_merged
 
         self.mock_ansible_module.params = PARAMS_WITH_CHANGES
@@ -165,7 +170,8 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
         data_merged['count'] = 2
         data_merged['allocatorUri'] = '/rest/fake'
         self.resource.data = data_merged
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
         self.resource.allocate.return_value = {'idList': ['172.9.0.1', '172.9.0.2']}
 
         self.mock_ansible_module.params = PARAMS_FOR_ALLOCATE
@@ -185,7 +191,8 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
         data_merged['allocatorUri'] = '/rest/fake'
         self.resource.data = data_merged
 
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
         self.resource.collect.return_value = {'idList': ['10.1.1.1', '10.1.1.1']}
 
         self.mock_ansible_module.params = PARAMS_FOR_COLLECT
@@ -200,7 +207,8 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
 
     def test_should_remove_id_pools_ipv4_subnet(self):
         self.resource.data = DEFAULT_SUBNET_TEMPLATE
-        self.resource.get_by_field.return_value = self.resource
+        self.resource.get_by.return_value = [self.resource.data]
+        self.resource.new.return_value = self.resource
 
         self.mock_ansible_module.params = PARAMS_FOR_ABSENT
 
@@ -212,7 +220,7 @@ class TestIdPoolsIpv4SubnetModule(OneViewBaseTest):
         )
 
     def test_should_do_nothing_when_id_pools_ipv4_subnet_not_exist(self):
-        self.resource.get_by_field.return_value = None
+        self.resource.get_by.return_value = []
 
         self.mock_ansible_module.params = PARAMS_FOR_ABSENT
 
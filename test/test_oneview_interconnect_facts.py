@@ -16,6 +16,8 @@
 # limitations under the License.
 ###
 
+import json
+import mock
 import pytest
 import yaml
 
@@ -135,7 +137,8 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
-            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_name_servers=fake_name_servers)
+            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_name_servers=fake_name_servers,
+                               interconnect_option_timings=mock.ANY)
         )
 
     def test_should_get_interconnect_statistics_by_interconnect_name(self):
@@ -156,7 +159,7 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(
                 interconnects=MOCK_INTERCONNECTS,
                 interconnect_statistics=fake_statistics,
-
+                interconnect_option_timings=mock.ANY
             )
         )
 
@@ -177,6 +180,7 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(
                 interconnects=MOCK_INTERCONNECTS,
                 interconnect_port_statistics=fake_statistics,
+                interconnect_option_timings=mock.ANY
             )
         )
 
@@ -199,7 +203,8 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 interconnects=MOCK_INTERCONNECTS,
-                interconnect_subport_statistics=fake_statistics
+                interconnect_subport_statistics=fake_statistics,
+                interconnect_option_timings=mock.ANY
             )
         )
 
@@ -218,7 +223,8 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
-            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_ports=fake_ports)
+            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_ports=fake_ports,
+                               interconnect_option_timings=mock.ANY)
         )
 
     def test_should_get_interconnect_port(self, testing_module):
@@ -239,7 +245,8 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
-            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_port=fake_port)
+            ansible_facts=dict(interconnects=MOCK_INTERCONNECTS, interconnect_port=fake_port,
+                               interconnect_option_timings=mock.ANY)
         )
 
     def test_should_get_pluggable_module_information(self):
@@ -255,7 +262,79 @@ class TestInterconnectFactsModule(OneViewBaseFactsTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=False,
             ansible_facts=dict(interconnects=MOCK_INTERCONNECTS,
-                               interconnect_pluggable_module_information=fake_sfp_info)
+                               interconnect_pluggable_module_information=fake_sfp_info,
+                               interconnect_option_timings=mock.ANY)
+        )
+
+    def test_should_stream_all_interconnects_to_a_file(self, tmpdir):
+        members = [dict(name='Resource {0}'.format(i)) for i in range(5)]
+        self.resource.get_all.side_effect = lambda start, count, **params: members[start:start + count]
+        path = str(tmpdir.join('interconnects.ndjson'))
+        self.mock_ansible_module.params = dict(dict(config='config.json', name=None, params=None), stream_to=path, page_size=2)
+
+        InterconnectFactsModule().run()
+
+        assert self.resource.get_all.call_count == 3
+        assert self.resource.get_all.call_args_list[0] == mock.call(start=0, count=2)
+        assert tmpdir.join('interconnects.ndjson').read().splitlines() == [json.dumps(member) for member in members]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(interconnects_manifest=dict(path=path, count=5, checksum=mock.ANY))
+        )
+
+    def test_should_gather_the_options_of_many_interconnects_by_uri(self):
+        interconnects = [dict(name='Interconnect {0}'.format(i), uri='/rest/interconnects/{0}'.format(i))
+                         for i in range(3)]
+        self.resource.get_all.return_value = interconnects
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data, get_statistics=mock.Mock(return_value=dict(uri=data['uri'] + '/statistics')))
+        self.mock_ansible_module.params = dict(config='config.json', names=['Interconnect 2', 'Interconnect 0'],
+                                               options=['statistics'], params=None)
+
+        InterconnectFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with()
+        self.resource.get_by_name.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(
+                interconnects=[interconnects[2], interconnects[0]],
+                interconnects_options={
+                    '/rest/interconnects/2': dict(interconnect_statistics=dict(uri='/rest/interconnects/2/statistics')),
+                    '/rest/interconnects/0': dict(interconnect_statistics=dict(uri='/rest/interconnects/0/statistics'))
+                })
+        )
+
+    def test_should_fail_when_any_of_the_names_is_not_found(self):
+        self.resource.get_all.return_value = [dict(name='Interconnect 0', uri='/rest/interconnects/0')]
+        self.mock_ansible_module.params = dict(config='config.json', names=['Interconnect 0', 'Interconnect 1'],
+                                               options=['statistics'], params=None)
+
+        InterconnectFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=InterconnectFactsModule.MSG_NAMES_NOT_FOUND.format('Interconnect 1'))
+
+    def test_should_stream_the_options_of_the_filtered_interconnects(self, tmpdir):
+        interconnects = [dict(name='Interconnect {0}'.format(i), uri='/rest/interconnects/{0}'.format(i))
+                         for i in range(3)]
+        self.resource.get_all.return_value = interconnects
+        self.resource.new.side_effect = lambda connection, data: mock.Mock(
+            data=data, get_ports=mock.Mock(return_value=[data['name'] + ' port']))
+        path = str(tmpdir.join('ports.ndjson'))
+        self.mock_ansible_module.params = dict(config='config.json', options=['ports'], stream_to=path,
+                                               params=dict(filter="enclosureName='Encl1'"))
+
+        InterconnectFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="enclosureName='Encl1'")
+        lines = [json.loads(line) for line in tmpdir.join('ports.ndjson').read().splitlines()]
+        assert lines == [dict(uri=interconnect['uri'], interconnect_ports=[interconnect['name'] + ' port'])
+                         for interconnect in interconnects]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(interconnects=interconnects,
+                               interconnects_options_manifest=dict(path=path, count=3, checksum=mock.ANY))
         )
 
 
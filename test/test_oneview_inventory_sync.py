@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import InventorySyncModule, OneViewInventory
+
+APPLIANCE = '172.16.101.48'
+
+ENCLOSURES = [dict(name='Encl1', uri='/rest/enclosures/1', serialNumber='SN1', activeOaPreferredIP='10.0.0.1'),
+              dict(name='Encl2', uri='/rest/enclosures/2', serialNumber='SN2', activeOaPreferredIP='10.0.0.2')]
+
+INTERCONNECTS = [dict(name='Encl1, interconnect 1', uri='/rest/interconnects/1', interconnectIP='10.0.1.1')]
+
+
+@pytest.mark.resource(TestInventorySyncModule='enclosures')
+class TestInventorySyncModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def setUpCollections(self, tmpdir):
+        self.path = str(tmpdir.join('inventory.db'))
+        self.mock_ov_client.connection.get_host.return_value = APPLIANCE
+        self.resource.URI = '/rest/enclosures'
+        self.resource.get_all.return_value = ENCLOSURES
+        self.mock_ov_client.interconnects.URI = '/rest/interconnects'
+        self.mock_ov_client.interconnects.get_all.return_value = INTERCONNECTS
+
+    def test_should_sync_the_collections_to_the_inventory(self):
+        self.mock_ansible_module.params = dict(config='config.json', path=self.path,
+                                               collections=['enclosures', 'interconnects'])
+
+        InventorySyncModule().run()
+
+        self.resource.get_all.assert_called_once_with()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=InventorySyncModule.MSG_SYNCED,
+            ansible_facts=dict(oneview_inventory=dict(path=self.path, collections=dict(enclosures=2, interconnects=1)))
+        )
+        inventory = OneViewInventory(self.path)
+        assert inventory.lookup(APPLIANCE, '/rest/enclosures', 'hostname', '10.0.0.2') == ['/rest/enclosures/2']
+        assert inventory.lookup(APPLIANCE, '/rest/interconnects', 'ip', '10.0.1.1') == ['/rest/interconnects/1']
+
+    def test_should_use_the_inventory_path_of_the_environment(self):
+        self.mock_ansible_module.params = dict(config='config.json', path=None, collections=['enclosures'])
+
+        with mock.patch.dict('os.environ', {OneViewInventory.PATH_ENV: self.path}):
+            InventorySyncModule().run()
+
+        assert OneViewInventory(self.path).lookup(APPLIANCE, '/rest/enclosures', 'name', 'Encl1') == \
+            ['/rest/enclosures/1']
+
+    def test_should_fail_without_inventory_path(self):
+        self.mock_ansible_module.params = dict(config='config.json', path=None, collections=['enclosures'])
+
+        with mock.patch.dict('os.environ', clear=True):
+            InventorySyncModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=InventorySyncModule.MSG_PATH_REQUIRED.format(OneViewInventory.PATH_ENV))
+
+    def test_should_fail_when_a_collection_is_not_supported(self):
+        self.mock_ov_client.api_version = 1600
+        self.mock_ansible_module.params = dict(config='config.json', path=self.path,
+                                               collections=['enclosures', 'api_version'])
+
+        InventorySyncModule().run()
+
+        self.resource.get_all.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=InventorySyncModule.MSG_UNSUPPORTED_COLLECTION.format('api_version'))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
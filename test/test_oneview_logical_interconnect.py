@@ -20,7 +20,7 @@ import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import LogicalInterconnectModule
+from oneview_module_loader import LogicalInterconnectModule, OneViewModuleException
 
 FAKE_MSG_ERROR = 'Fake message error'
 
@@ -294,6 +294,40 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
             ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT)
         )
 
+    def test_should_retry_the_compliance_while_another_operation_is_ongoing(self):
+        ongoing = OneViewModuleException(dict(errorCode='CRM_ONGOING_OPERATION_ON_LOGICAL_INTERCONNECT',
+                                              message='Ongoing operation'))
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.update_compliance.side_effect = [ongoing, ongoing, LOGICAL_INTERCONNECT]
+
+        self.mock_ansible_module.params = PARAMS_COMPLIANCE
+
+        with mock.patch('time.sleep') as mock_sleep:
+            LogicalInterconnectModule().run()
+
+        assert self.resource.update_compliance.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert self.mock_ov_client.logical_interconnects.get_by_name.call_count == 1
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectModule.MSG_CONSISTENT,
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT)
+        )
+
+    def test_should_not_retry_the_compliance_on_other_errors(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.update_compliance.side_effect = OneViewModuleException(dict(errorCode='OTHER',
+                                                                                  message='Fake message error'))
+
+        self.mock_ansible_module.params = PARAMS_COMPLIANCE
+
+        with mock.patch('time.sleep') as mock_sleep:
+            LogicalInterconnectModule().run()
+
+        self.resource.update_compliance.assert_called_once_with()
+        mock_sleep.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=mock.ANY)
+
     def test_should_fail_when_logical_interconnect_not_found(self):
         self.resource.get_by_name.return_value = None
 
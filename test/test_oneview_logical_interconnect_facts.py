@@ -18,9 +18,10 @@
 
 import mock
 import pytest
+import threading
 
 from hpe_test_utils import OneViewBaseFactsTest
-from oneview_module_loader import LogicalInterconnectFactsModule
+from oneview_module_loader import LogicalInterconnectFactsModule, OneViewModuleException
 
 ERROR_MSG = 'Fake message error'
 LOGICAL_INTERCONNECT_NAME = "test"
@@ -151,7 +152,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                qos_aggregated_configuration=QOS_CONFIGURATION
+                qos_aggregated_configuration=QOS_CONFIGURATION,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -168,7 +170,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                snmp_configuration=SNMP_CONFIGURATION
+                snmp_configuration=SNMP_CONFIGURATION,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -185,7 +188,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                igmp_settings=IGMP_SETTINGS
+                igmp_settings=IGMP_SETTINGS,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -202,7 +206,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                port_monitor=PORT_MONITOR
+                port_monitor=PORT_MONITOR,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -219,7 +224,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                internal_vlans=INTERNAL_VLANS
+                internal_vlans=INTERNAL_VLANS,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -236,7 +242,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                internal_vlans=INTERNAL_VLANS
+                internal_vlans=INTERNAL_VLANS,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -253,7 +260,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                firmware=FIRMWARE
+                firmware=FIRMWARE,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -270,7 +278,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                unassigned_uplink_ports=UNASSIGNED_UPLINK_PORTS
+                unassigned_uplink_ports=UNASSIGNED_UPLINK_PORTS,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -287,7 +296,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                unassigned_ports=UNASSIGNED_PORTS
+                unassigned_ports=UNASSIGNED_PORTS,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -313,7 +323,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                ethernet_settings=ethernet_settings
+                ethernet_settings=ethernet_settings,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -330,7 +341,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
             changed=False,
             ansible_facts=dict(
                 logical_interconnects=LOGICAL_INTERCONNECT,
-                telemetry_configuration=TELEMETRY_CONFIGURATION
+                telemetry_configuration=TELEMETRY_CONFIGURATION,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -372,7 +384,8 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
                 port_monitor=PORT_MONITOR,
                 unassigned_uplink_ports=UNASSIGNED_UPLINK_PORTS,
                 unassigned_ports=UNASSIGNED_PORTS,
-                telemetry_configuration=TELEMETRY_CONFIGURATION
+                telemetry_configuration=TELEMETRY_CONFIGURATION,
+                logical_interconnect_option_timings=mock.ANY
             )
         )
 
@@ -387,6 +400,40 @@ class TestLogicalInterconnectFactsModule(OneViewBaseFactsTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=LogicalInterconnectFactsModule.MSG_NOT_FOUND)
 
+    def test_should_gather_the_options_concurrently_with_their_timings(self):
+        options = ['forwarding_information_base', 'unassigned_ports', 'firmware']
+        # each option only returns once all of them are running
+        barrier = threading.Barrier(len(options), timeout=5)
+
+        def get_after_barrier(value):
+            barrier.wait()
+            return value
+
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.get_forwarding_information_base.side_effect = lambda: get_after_barrier(INTERNAL_VLANS)
+        self.resource.get_unassigned_ports.side_effect = lambda: get_after_barrier(UNASSIGNED_PORTS)
+        self.resource.get_firmware.side_effect = lambda: get_after_barrier(FIRMWARE)
+        self.mock_ansible_module.params = dict(create_params(options), max_concurrency=3)
+
+        LogicalInterconnectFactsModule().run()
+
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']
+        assert facts['unassigned_ports'] == UNASSIGNED_PORTS
+        assert sorted(facts['logical_interconnect_option_timings']) == sorted(options)
+        assert all(isinstance(timing, float) for timing in facts['logical_interconnect_option_timings'].values())
+
+    def test_should_report_the_errors_of_all_failed_options(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.get_firmware.side_effect = OneViewModuleException('Firmware error')
+        self.resource.get_unassigned_ports.side_effect = OneViewModuleException('Ports error')
+        self.mock_ansible_module.params = create_params(['firmware', 'port_monitor', 'unassigned_ports'])
+
+        LogicalInterconnectFactsModule().run()
+
+        self.resource.get_port_monitor.assert_called_once_with()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg='firmware: Firmware error; unassigned_ports: Ports error')
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -18,6 +18,7 @@
 
 import mock
 import pytest
+import re
 
 from copy import deepcopy
 from hpe_test_utils import OneViewBaseTest
@@ -291,8 +292,18 @@ UPLINK_SETS = [dict(
 ]
 
 
+def index_search_all_found(category, filter):
+    """Fakes the index search, finding each searched name in all the searched categories."""
+    names = re.findall("name='([^']*)'", filter)
+    return [dict(name=name, category=c, uri='/rest/{0}/{1}'.format(c, name)) for name in names for c in category]
+
+
 @pytest.mark.resource(TestLogicalInterconnectGroupModule='logical_interconnect_groups')
 class TestLogicalInterconnectGroupModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def index_search(self, mock_ov_client):
+        mock_ov_client.index_resources.get_all.side_effect = index_search_all_found
+
     def test_should_create_new_lig(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
@@ -313,13 +324,18 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.data = DEFAULT_LIG_TEMPLATE_WITH_UPLINKSETS
         self.resource.create.return_value = self.resource
 
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/7568956')]
-        self.mock_ov_client.network_sets.get_by.return_value = [dict(uri='/rest/network-sets/8985690')]
-
-        self.mock_ansible_module.params = PARAMS_FOR_CREATE
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_CREATE)
 
         LogicalInterconnectGroupModule().run()
 
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks', 'fc-networks', 'network-sets'],
+            filter="\"name='test1' OR name='TestNetwork_1' OR name='test_1'\"")
+        created_data = self.resource.create.call_args[0][0]
+        assert created_data['internalNetworkUris'] == ['/rest/ethernet-networks/test1']
+        assert created_data['uplinkSets'][0]['networkUris'] == ['/rest/ethernet-networks/TestNetwork_1']
+        assert created_data['uplinkSets'][0]['networkSetUris'] == ['/rest/network-sets/test_1']
+
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=LogicalInterconnectGroupModule.MSG_CREATED,
@@ -331,13 +347,13 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.data = deepcopy(DEFAULT_LIG_TEMPLATE_WITH_FC_NETWORK_UPLINKSETS['data'])
         self.resource.create.return_value = self.resource
 
-        self.mock_ov_client.fc_networks.get_by.return_value = [dict(uri='/rest/fc-networks/7568956')]
-        self.mock_ov_client.network_sets.get_by.return_value = [dict(uri='/rest/network-sets/8985690')]
-
-        self.mock_ansible_module.params = PARAMS_FOR_CREATE_FC
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_CREATE_FC)
 
         LogicalInterconnectGroupModule().run()
 
+        created_data = self.resource.create.call_args[0][0]
+        assert created_data['uplinkSets'][0]['networkUris'] == ['/rest/fc-networks/FC1']
+
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=LogicalInterconnectGroupModule.MSG_CREATED,
@@ -348,7 +364,6 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
         self.resource.data = PARAMS_FOR_PRESENT
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
         self.mock_ov_client.logical_interconnect_groups.get_by.return_value = UPLINK_SETS
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
@@ -426,8 +441,8 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
 
     def test_should_fail_when_uplinkset_network_not_found(self):
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.ethernet_networks.get_by_name.return_value = None
-        self.mock_ov_client.fc_networks.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.side_effect = None
+        self.mock_ov_client.index_resources.get_all.return_value = []
 
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
@@ -438,7 +453,8 @@ class TestLogicalInterconnectGroupModule(OneViewBaseTest):
 
     def test_should_fail_when_uplinkset_network_set_not_found(self):
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.network_sets.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.side_effect = lambda category, filter: [
+            x for x in index_search_all_found(category, filter) if x['category'] != 'network-sets']
 
         self.mock_ansible_module.params = deepcopy(PARAMS_LIG_TEMPLATE_WITH_MAP)
 
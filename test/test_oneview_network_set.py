@@ -20,6 +20,7 @@ import mock
 import pytest
 import yaml
 
+from copy import deepcopy
 from hpe_test_utils import OneViewBaseTest
 from oneview_module_loader import NetworkSetModule
 
@@ -30,6 +31,10 @@ NETWORK_SET = dict(
     networkUris=['/rest/ethernet-networks/aaa-bbb-ccc']
 )
 
+ETHERNET_NETWORK = dict(name='Name of a Network',
+                        category='ethernet-networks',
+                        uri='/rest/ethernet-networks/ggg-hhh-iii')
+
 NETWORK_SET_WITH_NEW_NAME = dict(name='OneViewSDK Test Network Set - Renamed')
 
 CONNECTION_TEMPLATE = dict(bandwidth=dict(maximumBandwidth=15000,
@@ -130,11 +135,15 @@ class TestNetworkSetModule(OneViewBaseTest):
                            )
 
         self.resource.data = data_merged
+        self.mock_ov_client.index_resources.get_all.return_value = [ETHERNET_NETWORK]
 
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES
+        self.mock_ansible_module.params = deepcopy(PARAMS_WITH_CHANGES)
 
         NetworkSetModule().run()
 
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks'], filter="\"name='Name of a Network'\"")
+
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=NetworkSetModule.MSG_UPDATED,
@@ -144,8 +153,8 @@ class TestNetworkSetModule(OneViewBaseTest):
     def test_should_raise_exception_when_ethernet_network_not_found(self):
         self.resource.get_by.side_effect = [NETWORK_SET], []
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES.copy()
+        self.mock_ov_client.index_resources.get_all.return_value = []
+        self.mock_ansible_module.params = deepcopy(PARAMS_WITH_CHANGES)
         self.mock_ansible_module.params['data']['networkUris'] = ['Name of a Network']
 
         NetworkSetModule().run()
@@ -156,8 +165,8 @@ class TestNetworkSetModule(OneViewBaseTest):
     def test_should_raise_exception_when_native_ethernet_network_not_found(self):
         self.resource.get_by.side_effect = [NETWORK_SET], []
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES.copy()
+        self.mock_ov_client.index_resources.get_all.return_value = []
+        self.mock_ansible_module.params = deepcopy(PARAMS_WITH_CHANGES)
         self.mock_ansible_module.params['data']['networkUris'] = ['/rest/ethernet-networks/aaa-bbb-ccc']
         self.mock_ansible_module.params['data']['nativeNetworkUri'] = 'Name of a Native Network'
 
@@ -199,8 +208,9 @@ class TestNetworkSetModule(OneViewBaseTest):
         obj = mock.Mock()
         obj.data = {"bandwidth": DICT_PARAMS_WITH_CHANGES['bandwidth']}
         self.mock_ov_client.connection_templates.get_by_uri.return_value = obj
+        self.mock_ov_client.index_resources.get_all.return_value = [ETHERNET_NETWORK]
 
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES
+        self.mock_ansible_module.params = deepcopy(PARAMS_WITH_CHANGES)
 
         NetworkSetModule().run()
 
@@ -296,6 +306,38 @@ class TestNetworkSetModule(OneViewBaseTest):
             msg=NetworkSetModule.MSG_ALREADY_PRESENT
         )
 
+    def test_should_resolve_the_network_names_of_all_items_with_a_single_search(self):
+        self.resource.get_all.return_value = [NETWORK_SET]
+        self.resource.create.side_effect = lambda data: mock.Mock(data=data)
+        self.resource.new.return_value = mock.Mock(data=NETWORK_SET)
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            ETHERNET_NETWORK, dict(ETHERNET_NETWORK, name='Native', uri='/rest/ethernet-networks/jjj')]
+        self.mock_ansible_module.check_mode = False
+        self.mock_ansible_module.params = dict(config='config.json', state='present', items=[
+            dict(data=dict(name=NETWORK_SET['name'], networkUris=['Name of a Network'])),
+            dict(data=dict(name='New Network Set', networkUris=['/rest/ethernet-networks/aaa-bbb-ccc'],
+                           nativeNetworkUri='Native'))])
+
+        NetworkSetModule().run()
+
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks'], filter="\"name='Name of a Network' OR name='Native'\"")
+        self.resource.create.assert_called_once_with(dict(name='New Network Set',
+                                                          networkUris=['/rest/ethernet-networks/aaa-bbb-ccc'],
+                                                          nativeNetworkUri='/rest/ethernet-networks/jjj'))
+        self.resource.new.return_value.update.assert_called_once_with(
+            dict(NETWORK_SET, networkUris=['/rest/ethernet-networks/ggg-hhh-iii']))
+
+    def test_should_fail_when_items_have_bandwidth(self):
+        self.mock_ansible_module.params = dict(config='config.json', state='present', items=[
+            dict(data=dict(name=NETWORK_SET['name'], bandwidth=dict(maximumBandwidth=3000)))])
+
+        NetworkSetModule().run()
+
+        self.resource.get_all.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=NetworkSetModule.MSG_BANDWIDTH_NOT_SUPPORTED)
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -16,10 +16,12 @@
 # limitations under the License.
 ###
 
+import json
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
-from oneview_module_loader import ServerHardwareFactsModule
+from oneview_module_loader import ServerHardwareFactsModule, OneViewModuleException
 
 ERROR_MSG = 'Fake message error'
 
@@ -159,6 +161,47 @@ class TestServerHardwareFactsModule(OneViewBaseFactsTest):
             }
         )
 
+    def test_should_report_the_errors_of_all_failed_options(self):
+        self.resource.data = [{"name": "Server Hardware Name", "uri": "res_uri"}]
+        self.resource.get_bios.side_effect = OneViewModuleException('BIOS error')
+        self.resource.get_firmware.side_effect = OneViewModuleException('Firmware error')
+        self.mock_ansible_module.params = dict(PARAMS_WITH_OPTIONS, max_concurrency=2)
+
+        ServerHardwareFactsModule().run()
+
+        self.resource.get_remote_console_url.assert_called_once_with()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg='server_hardware_bios: BIOS error; server_hardware_firmware: Firmware error')
+
+    def test_should_stream_all_server_hardwares_to_a_file(self, tmpdir):
+        members = [dict(name='Resource {0}'.format(i)) for i in range(5)]
+        self.resource.get_all.side_effect = lambda start, count, **params: members[start:start + count]
+        path = str(tmpdir.join('server_hardwares.ndjson'))
+        self.mock_ansible_module.params = dict(dict(config='config.json', name=None), stream_to=path, page_size=2)
+
+        ServerHardwareFactsModule().run()
+
+        assert self.resource.get_all.call_count == 3
+        assert self.resource.get_all.call_args_list[0] == mock.call(start=0, count=2)
+        assert tmpdir.join('server_hardwares.ndjson').read().splitlines() == [json.dumps(member) for member in members]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares_manifest=dict(path=path, count=5, checksum=mock.ANY))
+        )
+
+    def test_should_get_only_the_given_fields_of_all_server_hardwares(self):
+        self.resource.URI = '/rest/server-hardware'
+        self.resource.get_all.return_value = [dict(name='Server Hardware Name', powerState='On')]
+        self.mock_ansible_module.params = dict(config='config.json', name=None, fields=['name', 'powerState'])
+
+        ServerHardwareFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(fields='name,powerState')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares=[dict(name='Server Hardware Name', powerState='On')])
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -646,6 +646,67 @@ class TestServerProfileModule(OneViewBaseTest):
             ansible_facts=mock_facts
         )
 
+    def test_should_choose_another_hardware_after_a_concurrent_assignment(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.create.side_effect = [TASK_ERROR, self.resource]
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.api_version = 1200
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
+
+        ServerProfileModule().run()
+
+        assert [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list] == [
+            AVAILABLE_SERVERS[1]['serverHardwareUri'], AVAILABLE_SERVERS[2]['serverHardwareUri']]
+        assert self.mock_ansible_module.exit_json.call_args[1]['msg'] == ServerProfileModule.MSG_CREATED
+
+    def test_should_create_the_conflict_waiter_only_after_a_conflict(self):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.api_version = 1200
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT)
+
+        with mock.patch.object(ServerProfileModule, 'create_waiter') as mock_create_waiter:
+            self.resource.create.side_effect = [self.resource]
+            ServerProfileModule().run()
+            mock_create_waiter.assert_not_called()
+
+            self.resource.create.side_effect = [TASK_ERROR, TASK_ERROR, self.resource]
+            ServerProfileModule().run()
+
+        mock_create_waiter.assert_called_once_with(ServerProfileModule.CONFLICT_ROUTING_KEYS,
+                                                   initial_delay=ServerProfileModule.CONFLICT_INITIAL_DELAY,
+                                                   max_delay=ServerProfileModule.CONFLICT_MAX_DELAY,
+                                                   min_delay=ServerProfileModule.CONFLICT_MIN_DELAY)
+        waiter = mock_create_waiter.return_value
+        assert waiter.backoff.call_args_list == [mock.call(1), mock.call(2)]
+        waiter.close.assert_called_once_with()
+
+    def test_should_spread_the_profiles_with_the_reservation_strategy(self, tmpdir):
+        self.resource.get_by_name.return_value = None
+        self.resource.data = CREATED_BASIC_PROFILE
+        self.resource.create.return_value = self.resource
+        self.resource.get_available_servers.return_value = AVAILABLE_SERVERS
+        self.mock_ov_client.api_version = 1200
+        self.mock_ov_client.connection.get_host.return_value = '10.0.0.1'
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+
+        for index in range(3):
+            self.mock_ansible_module.params = dict(deepcopy(PARAMS_FOR_PRESENT),
+                                                   data=dict(BASIC_PROFILE, name='Profile {0}'.format(index)),
+                                                   assignment_strategy='reservation',
+                                                   reservation_dir=str(tmpdir), reservation_ttl=600)
+            ServerProfileModule().run()
+
+        chosen = [call[0][0]['serverHardwareUri'] for call in self.resource.create.call_args_list]
+        assert sorted(chosen) == sorted(server['serverHardwareUri'] for server in AVAILABLE_SERVERS[1:])
+
     def test_should_try_create_with_informed_hardware_25_times_when_not_exists(self):
         param_for_present = deepcopy(PARAMS_FOR_PRESENT)
         param_for_present['data']['serverHardwareName'] = "ServerHardwareName"
@@ -886,10 +947,11 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn_1, conn_2, conn_3, conn_4, conn_5]
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/15')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(category='fc-networks', name='FC Network', uri='/rest/fc-networks/14'),
+            dict(category='fcoe-networks', name='FCoE Network', uri='/rest/fcoe-networks/16'),
+            dict(category='network-sets', name='Network Set', uri='/rest/network-sets/15'),
+            dict(category='ethernet-networks', name='Ethernet Network', uri='/rest/ethernet-networks/18')]
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -911,10 +973,7 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn]
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.fc_networks.get_by.return_value = []
-        self.mock_ov_client.fcoe_networks.get_by.return_value = []
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
-        self.mock_ov_client.network_sets.get_by.return_value = []
+        self.mock_ov_client.index_resources.get_all.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
 
         ServerProfileModule().run()
@@ -967,7 +1026,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected_dict['sanStorage']['volumeAttachments'][1] = {"id": 2, "volumeUri": "/rest/storage-volumes/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.volumes.get_by.side_effect = [[volume1], [volume2]]
+        self.mock_ov_client.volumes.get_all.return_value = [volume1, volume2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1046,7 +1105,7 @@ class TestServerProfileModule(OneViewBaseTest):
                                                                "volumeStoragePoolUri": "/rest/storage-pools/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.storage_pools.get_by.side_effect = [[pool1], [pool2]]
+        self.mock_ov_client.storage_pools.get_all.return_value = [pool1, pool2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1143,7 +1202,7 @@ class TestServerProfileModule(OneViewBaseTest):
                                                           "volumeStorageSystemUri": "/rest/storage-systems/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.storage_systems.get_by.side_effect = [[storage_system1], [storage_system2]]
+        self.mock_ov_client.storage_systems.get_all.return_value = [storage_system1, storage_system2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1268,7 +1327,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected['connections'][1] = {"id": 2, "interconnectUri": "/rest/interconnects/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.interconnects.get_by.side_effect = [[interconnect1], [interconnect2]]
+        self.mock_ov_client.interconnects.get_all.return_value = [interconnect1, interconnect2]
         self.mock_ov_client.api_version = 1200
 
         self.mock_ansible_module.params = params
@@ -1403,7 +1462,7 @@ class TestServerProfileModule(OneViewBaseTest):
         expected['localStorage']['sasLogicalJBODs'][1] = {"id": 2, "sasLogicalJBODUri": "/rest/sas-logical-jbods/2"}
 
         self.resource.get_by_name.return_value = None
-        self.mock_ov_client.sas_logical_jbods.get_by.side_effect = [[sas_logical_jbod1], [sas_logical_jbod2]]
+        self.mock_ov_client.sas_logical_jbods.get_all.return_value = [sas_logical_jbod1, sas_logical_jbod2]
 
         self.mock_ansible_module.params = params
         self.mock_ov_client.api_version = 1200
@@ -1874,10 +1933,11 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn_1, conn_2, conn_3, conn_4, conn_5]
 
         self.resource.data = deepcopy(BASIC_PROFILE)
-        self.mock_ov_client.fc_networks.get_by.side_effect = [[dict(uri='/rest/fc-networks/14')], [], [], []]
-        self.mock_ov_client.fcoe_networks.get_by.side_effect = [[dict(uri='/rest/fcoe-networks/16')], [], []]
-        self.mock_ov_client.network_sets.get_by.side_effect = [[dict(uri='/rest/network-sets/20')], []]
-        self.mock_ov_client.ethernet_networks.get_by.return_value = [dict(uri='/rest/ethernet-networks/18')]
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(category='fc-networks', name='FC Network', uri='/rest/fc-networks/14'),
+            dict(category='fcoe-networks', name='FCoE Network', uri='/rest/fcoe-networks/16'),
+            dict(category='network-sets', name='Network Set', uri='/rest/network-sets/20'),
+            dict(category='ethernet-networks', name='Ethernet Network', uri='/rest/ethernet-networks/18')]
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -1899,10 +1959,7 @@ class TestServerProfileModule(OneViewBaseTest):
         params['data'][SPKeys.CONNECTIONS] = [conn]
 
         self.resource.data = deepcopy(BASIC_PROFILE)
-        self.mock_ov_client.fc_networks.get_by.return_value = []
-        self.mock_ov_client.fcoe_networks.get_by.return_value = []
-        self.mock_ov_client.ethernet_networks.get_by.return_value = []
-        self.mock_ov_client.network_sets.get_by.return_value = []
+        self.mock_ov_client.index_resources.get_all.return_value = []
         self.mock_ansible_module.params = deepcopy(params)
         self.mock_ov_client.api_version = 1200
 
@@ -0,0 +1,228 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2021) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import os
+import time
+
+import pytest
+
+from hpeOneView.exceptions import HPEOneViewException, HPEOneViewTaskError
+from hpeOneView.oneview_client import OneViewClient
+from module_utils.oneview import get_all_projected
+from oneview_module_loader import FcNetworkModule, FcNetworkFactsModule
+from oneview_simulator import OneViewSimulator, HAS_CRYPTOGRAPHY
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'oneview_simulator.json')
+
+# the simulator serves HTTPS with a certificate created by the cryptography package
+pytestmark = pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason='The cryptography Python module is required.')
+
+
+@pytest.fixture
+def simulator():
+    with OneViewSimulator(fixtures=[FIXTURES]) as simulator:
+        yield simulator
+
+
+def networks(count):
+    return [dict(type='fc-networkV4', name='FC Network {0:04d}'.format(i), fabricType='FabricAttach')
+            for i in range(count)]
+
+
+class TestOneViewSimulator():
+    def test_should_login_and_list_the_fixtures(self, simulator):
+        client = OneViewClient(simulator.config())
+
+        assert [network['name'] for network in client.fc_networks.get_all()] == ['FC Network A', 'FC Network B']
+        assert simulator.request_count('GET', '^/rest/version$') == 1
+        assert simulator.request_count('POST', '^/rest/login-sessions$') == 1
+        assert client.connection.get_session_id() in simulator.sessions
+
+    def test_should_reject_invalid_credentials(self, simulator):
+        config = simulator.config(credentials=dict(userName='administrator', password='wrong'))
+
+        with pytest.raises(HPEOneViewException) as exc_info:
+            OneViewClient(config)
+
+        assert exc_info.value.oneview_response['errorCode'] == 'AUTHN_AUTH_FAIL'
+
+    def test_should_reject_requests_without_a_valid_session(self, simulator):
+        client = OneViewClient(simulator.config())
+        client.connection.logout()
+        client.connection.set_session_id('expired')
+
+        with pytest.raises(HPEOneViewException) as exc_info:
+            client.fc_networks.get_all()
+
+        assert exc_info.value.oneview_response['errorCode'] == 'AUTHORIZATION'
+
+    def test_should_reuse_a_session(self, simulator):
+        session_id = OneViewClient(simulator.config()).connection.get_session_id()
+        config = simulator.config(credentials=dict(sessionID=session_id))
+
+        assert OneViewClient(config).connection.get_session_id() == session_id
+        assert simulator.request_count('PUT', '^/rest/login-sessions$') == 1
+
+    def test_should_paginate_the_collections(self, simulator):
+        simulator.page_size = 10
+        simulator.seed('/rest/fc-networks', networks(23))
+        client = OneViewClient(simulator.config())
+        simulator.reset_requests()
+
+        assert len(client.fc_networks.get_all()) == 25
+        assert simulator.request_count('GET', '^/rest/fc-networks$') == 3
+        assert [network['name'] for network in client.fc_networks.get_all(start=5, count=12)] == \
+            ['FC Network {0:04d}'.format(i) for i in range(3, 15)]
+        assert simulator.request_count('GET', '^/rest/fc-networks$') == 5
+
+    def test_should_filter_sort_and_project_the_collections(self, simulator):
+        client = OneViewClient(simulator.config())
+
+        assert client.fc_networks.get_by('name', 'fc network b')[0]['uri'] == '/rest/fc-networks/b'
+        assert [n['name'] for n in client.ethernet_networks.get_all(filter="\"purpose='General' OR vlanId=10\"",
+                                                                    sort='name:descending')] == \
+            ['Production', 'Management']
+        assert get_all_projected(client.enclosures, ['name', 'serialNumber']) == \
+            [dict(name='Encl1', serialNumber='SN0001')]
+        assert 'fields=name%2CserialNumber' in simulator.requests[-1]['target']
+        assert client.scopes.get_all() == []
+
+    def test_should_answer_unsupported_filters_with_bad_request(self, simulator):
+        client = OneViewClient(simulator.config())
+
+        with pytest.raises(HPEOneViewException) as exc_info:
+            client.fc_networks.get_all(filter="name matches 'FC%'")
+
+        assert exc_info.value.oneview_response['errorCode'] == 'INVALID_REQUEST'
+
+    def test_should_create_update_and_delete_through_tasks(self, simulator):
+        client = OneViewClient(simulator.config())
+
+        created = client.fc_networks.create(dict(name='FC Network C', fabricType='DirectAttach'))
+        tasks = simulator.collections['/rest/tasks']
+        assert created.data['uri'].startswith('/rest/fc-networks/')
+        assert simulator.get(created.data['uri'])['fabricType'] == 'DirectAttach'
+
+        created_etag = created.data['eTag']
+        updated = created.update(dict(linkStabilityTime=20))
+        assert updated.data['linkStabilityTime'] == 20
+        assert updated.data['eTag'] != created_etag
+
+        created.delete()
+        assert simulator.get(created.data['uri']) is None
+        assert [task['name'] for task in tasks.values()] == ['Create', 'Update', 'Delete']
+        assert all(task['taskState'] == 'Completed' for task in tasks.values())
+
+    def test_should_reject_changes_with_a_stale_etag(self, simulator):
+        client = OneViewClient(simulator.config())
+        network = client.fc_networks.get_by_uri('/rest/fc-networks/a')
+        stale = dict(network.data, eTag='stale', linkStabilityTime=10)
+
+        with pytest.raises(HPEOneViewException) as exc_info:
+            client.connection.put(network.data['uri'], stale)
+        assert exc_info.value.oneview_response['errorCode'] == OneViewSimulator.ETAG_ERROR_CODE
+
+        client.connection.disable_etag_validation()
+        client.connection.put(network.data['uri'], stale)
+        assert simulator.get(network.data['uri'])['linkStabilityTime'] == 10
+
+    def test_should_fail_the_injected_errors(self, simulator):
+        client = OneViewClient(simulator.config())
+        simulator.inject_error(503, method='GET', path='^/rest/fc-networks', error_code='SERVICE_UNAVAILABLE')
+
+        with pytest.raises(HPEOneViewException) as exc_info:
+            client.fc_networks.get_all()
+
+        assert exc_info.value.oneview_response['errorCode'] == 'SERVICE_UNAVAILABLE'
+        assert len(client.fc_networks.get_all()) == 2
+
+    def test_should_fail_the_task_of_the_injected_errors(self, simulator):
+        client = OneViewClient(simulator.config())
+        simulator.inject_error(method='POST', path='^/rest/fc-networks$', error_code='NETWORK_NAME_IN_USE',
+                               message='The name is in use.', in_task=True)
+
+        with pytest.raises(HPEOneViewTaskError) as exc_info:
+            client.fc_networks.create(dict(name='FC Network A'))
+
+        assert exc_info.value.error_code == 'NETWORK_NAME_IN_USE'
+        assert len(simulator.collections['/rest/fc-networks']) == 2
+
+    def test_should_fail_the_same_random_requests_with_a_seed(self):
+        def failed_requests():
+            simulator = OneViewSimulator(error_rate=0.3, seed=7)
+            return [simulator.handle('GET', '/rest/version', {}, b'')[0] for _ in range(20)]
+
+        assert failed_requests() == failed_requests()
+        assert 0 < failed_requests().count(500) < 20
+
+    def test_should_delay_the_requests(self):
+        with OneViewSimulator(latency=lambda method, path: 0.05 if path == '/rest/version' else 0) as simulator:
+            started = time.time()
+            OneViewClient(simulator.config())
+
+        assert time.time() - started >= 0.05
+        assert [request['seconds'] >= 0.05 for request in simulator.requests] == [True, False]
+
+    def test_should_serve_the_custom_routes(self, simulator):
+        client = OneViewClient(simulator.config())
+        simulator.route('PUT', '/rest/id-pools/vmac/allocator',
+                        lambda simulator, request: (200, dict(idList=['VMAC{0}'.format(i)
+                                                                      for i in range(request.body['count'])])))
+
+        assert client.id_pools.allocate(dict(count=2), 'vmac') == dict(idList=['VMAC0', 'VMAC1'])
+
+    def test_should_serve_the_image_streamer_with_the_oneview_session(self, simulator):
+        image_streamer_client = OneViewClient(simulator.config()).create_image_streamer_client()
+
+        assert [image['name'] for image in image_streamer_client.golden_images.get_all()] == ['RHEL 8']
+
+    def test_should_measure_the_requests(self, simulator):
+        OneViewClient(simulator.config()).fc_networks.get_all()
+
+        summary = simulator.summary()
+
+        assert summary['requests'] == 3
+        assert summary['methods'] == dict(GET=2, POST=1)
+        assert summary['response_bytes'] > summary['request_bytes'] > 0
+
+    def test_should_run_the_modules_end_to_end(self, simulator, mock_ansible_module):
+        mock_ansible_module.check_mode = False
+        mock_ansible_module.params = simulator.module_params(state='present', validate_etag=True,
+                                                             data=dict(name='FC Network C', fabricType='FabricAttach'))
+
+        FcNetworkModule().run()
+        FcNetworkModule().run()
+
+        first, second = [call[1] for call in mock_ansible_module.exit_json.call_args_list]
+        assert (first['changed'], first['msg']) == (True, FcNetworkModule.MSG_CREATED)
+        assert (second['changed'], second['msg']) == (False, FcNetworkModule.MSG_ALREADY_PRESENT)
+        assert simulator.request_count('POST', '^/rest/fc-networks$') == 1
+
+    def test_should_gather_the_facts_of_a_large_collection_in_pages(self, simulator, mock_ansible_module):
+        simulator.seed('/rest/fc-networks', networks(1000))
+        mock_ansible_module.params = simulator.module_params(name=None)
+        simulator.reset_requests()
+
+        FcNetworkFactsModule().run()
+
+        assert len(mock_ansible_module.exit_json.call_args[1]['ansible_facts']['fc_networks']) == 1002
+        assert simulator.request_count('GET', '^/rest/fc-networks$') == 11
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -16,6 +16,8 @@
 # limitations under the License.
 ###
 
+import json
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
@@ -110,6 +112,22 @@ class TestTaskFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(tasks=ALL_TASKS)
         )
 
+    def test_should_stream_all_tasks_to_a_file(self, tmpdir):
+        members = [dict(name='Resource {0}'.format(i)) for i in range(5)]
+        self.mock_ov_client.tasks.get_all.side_effect = lambda start, count, **params: members[start:start + count]
+        path = str(tmpdir.join('tasks.ndjson'))
+        self.mock_ansible_module.params = dict(dict(config='config.json', params=dict(filter=FILTER_BY_ASSOCIATED_RESOURCE_NAME)), stream_to=path, page_size=2)
+
+        TaskFactsModule().run()
+
+        assert self.mock_ov_client.tasks.get_all.call_count == 3
+        assert self.mock_ov_client.tasks.get_all.call_args_list[0] == mock.call(start=0, count=2, filter=FILTER_BY_ASSOCIATED_RESOURCE_NAME)
+        assert tmpdir.join('tasks.ndjson').read().splitlines() == [json.dumps(member) for member in members]
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(tasks_manifest=dict(path=path, count=5, checksum=mock.ANY))
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -178,28 +178,18 @@ class TestUplinkSetModule(OneViewBaseTest):
         obj.data = UPLINK_SETS
         self.resource.create.return_value = obj
 
-        eth_obj = mock.Mock()
-        eth_obj.data = ETHERNET
-        self.mock_ov_client.ethernet_networks.get_by_name.return_value = eth_obj
-
-        fc_obj = mock.Mock()
-        fc_obj.data = FCNETWORK
-        self.mock_ov_client.fc_networks.get_by_name.return_value = fc_obj
-
-        fcoe_obj = mock.Mock()
-        fcoe_obj.data = FCOENETWORK
-        self.mock_ov_client.fcoe_networks.get_by_name.return_value = fcoe_obj
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(ETHERNET, category='ethernet-networks'),
+            dict(FCNETWORK, category='fc-networks'),
+            dict(FCOENETWORK, category='fcoe-networks')]
 
         self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT_WITH_NETWORK_NAME)
 
         UplinkSetModule().run()
 
-        self.mock_ov_client.ethernet_networks.get_by_name.assert_called_once_with(
-            'EthernetNetwork')
-        self.mock_ov_client.fc_networks.get_by_name.assert_called_once_with(
-            'FcNetwork')
-        self.mock_ov_client.fcoe_networks.get_by_name.assert_called_once_with(
-            'FcoeNetwork')
+        self.mock_ov_client.index_resources.get_all.assert_called_once_with(
+            category=['ethernet-networks', 'fc-networks', 'fcoe-networks'],
+            filter="\"name='EthernetNetwork' OR name='FcNetwork' OR name='FcoeNetwork'\"")
         self.resource.create.assert_called_once_with(PARAMS_FOR_PRESENT_WITH_NETWORK['data'])
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
@@ -208,6 +198,20 @@ class TestUplinkSetModule(OneViewBaseTest):
             ansible_facts=dict(uplink_set=UPLINK_SETS)
         )
 
+    def test_should_fail_when_network_name_is_not_found(self):
+        self.resource.get_by_name.return_value = None
+        self.mock_ov_client.index_resources.get_all.return_value = [
+            dict(ETHERNET, category='ethernet-networks'),
+            dict(FCNETWORK, category='fc-networks')]
+
+        self.mock_ansible_module.params = deepcopy(PARAMS_FOR_PRESENT_WITH_NETWORK_NAME)
+
+        UplinkSetModule().run()
+
+        self.resource.create.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=UplinkSetModule.MSG_NETWORK_NOT_FOUND + 'FcoeNetwork')
+
     def test_should_replace_logical_interconnect_name_by_uri(self):
         self.resource.get_by_name.return_value = None
         obj = mock.Mock()
@@ -16,10 +16,11 @@
 # limitations under the License.
 ###
 
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import VersionFactsModule
+from oneview_module_loader import VersionFactsModule, OneViewApiVersionCache
 
 PARAMS_GET = dict(
     config='config.json'
@@ -43,6 +44,24 @@ class TestVersionFactsModule(OneViewBaseTest):
             ansible_facts=dict(version=DICT_DEFAULT_VERSION)
         )
 
+    def test_should_invalidate_api_version_cache(self, tmpdir):
+        self.resource.get_version.return_value = DICT_DEFAULT_VERSION
+        self.mock_ov_client.connection.get_host.return_value = '172.16.1.1'
+        self.mock_ansible_module.params = dict(config='config.json', invalidate_api_version_cache=True)
+
+        version_cache = OneViewApiVersionCache(str(tmpdir))
+        version_cache.store(dict(ip='172.16.1.1'), 2800)
+
+        module = VersionFactsModule()
+        with mock.patch.object(OneViewApiVersionCache, 'from_environment', return_value=version_cache):
+            module.run()
+
+        assert version_cache.cache.get(['172.16.1.1']) is None
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(version=DICT_DEFAULT_VERSION)
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])